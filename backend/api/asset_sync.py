@@ -1,6 +1,6 @@
 # backend/api/asset_sync.py
-from fastapi import APIRouter, HTTPException
-from typing import List, Dict
+from fastapi import APIRouter, HTTPException, Depends
+from typing import List, Dict, Optional
 from pathlib import Path
 import os
 import json
@@ -8,31 +8,14 @@ import logging
 from datetime import datetime
 from backend.core.config_manager import config as atlas_config
 from backend.assetlibrary.database.arango_queries import AssetQueries
+from backend.core.database import get_asset_queries
+from backend.core.executors import run_db, run_fs
 from backend.assetlibrary.database.graph_parser import AtlasGraphParser
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/admin", tags=["admin"])
 
-def get_asset_queries():
-    """Get AssetQueries instance"""
-    try:
-        environment = os.getenv('ATLAS_ENV', 'development')
-        db_config = atlas_config.get('api.database', {})
-        arango_config = {
-            'hosts': [f"http://{db_config.get('host', 'localhost')}:{db_config.get('port', '8529')}"],
-            'database': db_config.get('name', 'blacksmith_atlas'),
-            'username': db_config.get('username', 'root'),
-            'password': db_config.get('password', 'atlas_password'),
-            'collections': {
-                'assets': 'Atlas_Library'
-            }
-        }
-        return AssetQueries(arango_config)
-    except Exception as e:
-        logger.error(f"Failed to get asset queries: {e}")
-        return None
-
 def _process_single_asset(asset_dir: Path, asset_id: str, asset_name: str, category_name: str, assets: List[Dict]):
     """Process a single asset directory and add to assets list"""
     # Look for metadata.json or reconstruction_data.json (Houdini export)
@@ -197,10 +180,9 @@ def scan_asset_directory(base_path: Path) -> List[Dict]:
     return assets
 
 @router.post("/sync")
-async def sync_assets():
+async def sync_assets(asset_queries: Optional[AssetQueries] = Depends(get_asset_queries)):
     """Sync assets from file system to database"""
     try:
-        asset_queries = get_asset_queries()
         if not asset_queries:
             raise HTTPException(status_code=503, detail="Database not available")
         
@@ -209,11 +191,11 @@ async def sync_assets():
         logger.info(f"Syncing assets from: {asset_path}")
         
         # Scan for assets
-        found_assets = scan_asset_directory(asset_path)
+        found_assets = await run_fs(scan_asset_directory, asset_path)
         logger.info(f"Found {len(found_assets)} assets in file system")
         
         # Get existing assets from database
-        existing_assets = asset_queries.search_assets("", None, None)
+        existing_assets = await run_db(asset_queries.search_assets, "", None, None)
         existing_keys = {asset.get('_key') for asset in existing_assets}
         
         # Find assets in DB that are NOT in the file system (for cleanup)
@@ -236,7 +218,7 @@ async def sync_assets():
         
         for orphaned_key in orphaned_assets:
             try:
-                asset_queries.assets.delete({'_key': orphaned_key})
+                await run_db(asset_queries.assets.delete, {'_key': orphaned_key})
                 removed_assets += 1
                 logger.info(f"Successfully removed orphaned asset: {orphaned_key}")
             except Exception as e:
@@ -255,7 +237,7 @@ async def sync_assets():
             if asset_key not in existing_keys:
                 # Insert new asset
                 try:
-                    asset_queries.assets.insert(asset_data)
+                    await run_db(asset_queries.assets.insert, asset_data)
                     new_assets += 1
                     logger.info(f"Added new asset: {asset_data['name']}")
                 except Exception as e:
@@ -279,19 +261,18 @@ async def sync_assets():
         raise HTTPException(status_code=500, detail=f"Sync failed: {str(e)}")
 
 @router.get("/sync/preview")
-async def preview_sync():
+async def preview_sync(asset_queries: Optional[AssetQueries] = Depends(get_asset_queries)):
     """Preview what would be synced without actually syncing"""
     try:
         # Get asset library path from Atlas config
         asset_path = Path(atlas_config.asset_library_3d)
         
         # Scan for assets
-        found_assets = scan_asset_directory(asset_path)
+        found_assets = await run_fs(scan_asset_directory, asset_path)
         
         # Get existing assets from database
-        asset_queries = get_asset_queries()
         if asset_queries:
-            existing_assets = asset_queries.search_assets("", None, None)
+            existing_assets = await run_db(asset_queries.search_assets, "", None, None)
             existing_keys = {asset.get('_key') for asset in existing_assets}
         else:
             existing_keys = set()
@@ -329,22 +310,21 @@ async def preview_sync():
         raise HTTPException(status_code=500, detail=f"Preview failed: {str(e)}")
 
 @router.delete("/asset/{asset_id}")
-async def delete_asset(asset_id: str):
+async def delete_asset(asset_id: str, asset_queries: Optional[AssetQueries] = Depends(get_asset_queries)):
     """Delete a specific asset from the database"""
     try:
-        asset_queries = get_asset_queries()
         if not asset_queries:
             raise HTTPException(status_code=503, detail="Database not available")
         
         # Check if asset exists
-        existing_assets = asset_queries.search_assets("", None, None)
+        existing_assets = await run_db(asset_queries.search_assets, "", None, None)
         asset_exists = any(asset.get('_key') == asset_id for asset in existing_assets)
         
         if not asset_exists:
             raise HTTPException(status_code=404, detail=f"Asset {asset_id} not found")
         
         # Delete the asset
-        asset_queries.assets.delete({'_key': asset_id})
+        await run_db(asset_queries.assets.delete, {'_key': asset_id})
         logger.info(f"Deleted asset: {asset_id}")
         
         return {
@@ -359,10 +339,9 @@ async def delete_asset(asset_id: str):
         raise HTTPException(status_code=500, detail=f"Delete failed: {str(e)}")
 
 @router.post("/sync-graph")
-async def sync_assets_with_graph():
+async def sync_assets_with_graph(asset_queries: Optional[AssetQueries] = Depends(get_asset_queries)):
     """Sync assets using advanced ArangoDB graph relationships"""
     try:
-        asset_queries = get_asset_queries()
         if not asset_queries:
             raise HTTPException(status_code=503, detail="Database not available")
         
@@ -374,9 +353,7 @@ async def sync_assets_with_graph():
         logger.info(f"Graph syncing assets from: {asset_path}")
         
         # Find all metadata.json files
-        metadata_files = []
-        for metadata_file in asset_path.rglob("metadata.json"):
-            metadata_files.append(metadata_file)
+        metadata_files = await run_fs(lambda: list(asset_path.rglob("metadata.json")))
         
         logger.info(f"Found {len(metadata_files)} metadata.json files for graph parsing")
         
@@ -393,10 +370,10 @@ async def sync_assets_with_graph():
                 logger.info(f"Processing metadata file: {metadata_file}")
                 
                 # Parse metadata into graph structure
-                parsed_data = graph_parser.parse_asset_metadata(metadata_file)
+                parsed_data = await run_fs(graph_parser.parse_asset_metadata, metadata_file)
                 
                 # Insert into database
-                stats = graph_parser.insert_parsed_data(parsed_data)
+                stats = await run_db(graph_parser.insert_parsed_data, parsed_data)
                 
                 total_stats['assets_processed'] += 1
                 total_stats['documents_inserted'] += stats['documents_inserted']
@@ -426,90 +403,90 @@ async def sync_assets_with_graph():
         logger.error(f"Graph sync failed: {e}")
         raise HTTPException(status_code=500, detail=f"Graph sync failed: {str(e)}")
 
+def collect_graph_statistics(db) -> Dict:
+    """Collection/edge counts and the most connected assets (blocking: one count per collection + one AQL query)"""
+    # Query collection counts
+    collection_stats = {}
+    collections = ['Atlas_Library', 'textures', 'materials', 'geometry', 'projects', 'users']
+    edge_collections = ['asset_uses_texture', 'asset_has_material', 'material_uses_texture', 
+                      'asset_uses_geometry', 'project_contains_asset', 'user_created_asset']
+    
+    for collection_name in collections:
+        try:
+            collection = db.collection(collection_name)
+            if collection:
+                collection_stats[collection_name] = collection.count()
+            else:
+                collection_stats[collection_name] = 0
+        except:
+            collection_stats[collection_name] = 0
+    
+    relationship_stats = {}
+    for edge_collection_name in edge_collections:
+        try:
+            collection = db.collection(edge_collection_name)
+            if collection:
+                relationship_stats[edge_collection_name] = collection.count()
+            else:
+                relationship_stats[edge_collection_name] = 0
+        except:
+            relationship_stats[edge_collection_name] = 0
+    
+    # Advanced graph queries
+    try:
+        # Most connected assets
+        most_connected_query = """
+        FOR asset IN Atlas_Library
+            LET texture_count = LENGTH(FOR v IN OUTBOUND asset asset_uses_texture RETURN 1)
+            LET material_count = LENGTH(FOR v IN OUTBOUND asset asset_has_material RETURN 1)
+            LET geometry_count = LENGTH(FOR v IN OUTBOUND asset asset_uses_geometry RETURN 1)
+            LET total_connections = texture_count + material_count + geometry_count
+            SORT total_connections DESC
+            LIMIT 5
+            RETURN {
+                asset: asset.name,
+                textures: texture_count,
+                materials: material_count,
+                geometry: geometry_count,
+                total: total_connections
+            }
+        """
+        most_connected = list(db.aql.execute(most_connected_query))
+    except:
+        most_connected = []
+    
+    return {
+        "status": "success",
+        "collection_counts": collection_stats,
+        "relationship_counts": relationship_stats,
+        "total_documents": sum(collection_stats.values()),
+        "total_relationships": sum(relationship_stats.values()),
+        "most_connected_assets": most_connected,
+        "graph_enabled": True
+    }
+
 @router.get("/graph-stats")
-async def get_graph_statistics():
+async def get_graph_statistics(asset_queries: Optional[AssetQueries] = Depends(get_asset_queries)):
     """Get ArangoDB graph statistics"""
     try:
-        asset_queries = get_asset_queries()
         if not asset_queries:
             raise HTTPException(status_code=503, detail="Database not available")
         
-        db = asset_queries.db
-        
-        # Query collection counts
-        collection_stats = {}
-        collections = ['Atlas_Library', 'textures', 'materials', 'geometry', 'projects', 'users']
-        edge_collections = ['asset_uses_texture', 'asset_has_material', 'material_uses_texture', 
-                          'asset_uses_geometry', 'project_contains_asset', 'user_created_asset']
-        
-        for collection_name in collections:
-            try:
-                collection = db.collection(collection_name)
-                if collection:
-                    collection_stats[collection_name] = collection.count()
-                else:
-                    collection_stats[collection_name] = 0
-            except:
-                collection_stats[collection_name] = 0
-        
-        relationship_stats = {}
-        for edge_collection_name in edge_collections:
-            try:
-                collection = db.collection(edge_collection_name)
-                if collection:
-                    relationship_stats[edge_collection_name] = collection.count()
-                else:
-                    relationship_stats[edge_collection_name] = 0
-            except:
-                relationship_stats[edge_collection_name] = 0
-        
-        # Advanced graph queries
-        try:
-            # Most connected assets
-            most_connected_query = """
-            FOR asset IN Atlas_Library
-                LET texture_count = LENGTH(FOR v IN OUTBOUND asset asset_uses_texture RETURN 1)
-                LET material_count = LENGTH(FOR v IN OUTBOUND asset asset_has_material RETURN 1)
-                LET geometry_count = LENGTH(FOR v IN OUTBOUND asset asset_uses_geometry RETURN 1)
-                LET total_connections = texture_count + material_count + geometry_count
-                SORT total_connections DESC
-                LIMIT 5
-                RETURN {
-                    asset: asset.name,
-                    textures: texture_count,
-                    materials: material_count,
-                    geometry: geometry_count,
-                    total: total_connections
-                }
-            """
-            most_connected = list(db.aql.execute(most_connected_query))
-        except:
-            most_connected = []
-        
-        return {
-            "status": "success",
-            "collection_counts": collection_stats,
-            "relationship_counts": relationship_stats,
-            "total_documents": sum(collection_stats.values()),
-            "total_relationships": sum(relationship_stats.values()),
-            "most_connected_assets": most_connected,
-            "graph_enabled": True
-        }
+        return await run_db(collect_graph_statistics, asset_queries.db)
         
     except Exception as e:
         logger.error(f"Graph stats failed: {e}")
         raise HTTPException(status_code=500, detail=f"Graph stats failed: {str(e)}")
 
 @router.post("/clean-orphans")
-async def clean_orphan_assets():
+async def clean_orphan_assets(asset_queries: Optional[AssetQueries] = Depends(get_asset_queries)):
     """Remove assets from database whose paths don't exist in the file system"""
     try:
-        asset_queries = get_asset_queries()
         if not asset_queries:
             raise HTTPException(status_code=503, detail="Database not available")
         
         # Get all assets from database
-        existing_assets = asset_queries.search_assets("", None, None)
+        existing_assets = await run_db(asset_queries.search_assets, "", None, None)
         removed_count = 0
         removed_assets = []
         
@@ -519,9 +496,9 @@ async def clean_orphan_assets():
             if asset_folder:
                 # Check if the asset folder actually exists
                 asset_path = Path(asset_folder)
-                if not asset_path.exists():
+                if not await run_fs(asset_path.exists):
                     try:
-                        asset_queries.assets.delete({'_key': asset.get('_key')})
+                        await run_db(asset_queries.assets.delete, {'_key': asset.get('_key')})
                         removed_count += 1
                         removed_assets.append({
                             'id': asset.get('_key'),
@@ -1,50 +1,46 @@
 # backend/api/assets.py - Fixed ArangoDB integration
-from fastapi import APIRouter, HTTPException, Query, File, UploadFile
-from typing import List, Optional
+from fastapi import APIRouter, HTTPException, Query, File, UploadFile, Depends, Request
+from fastapi.responses import JSONResponse, Response
+from typing import Dict, List, Optional, Tuple
 from pydantic import BaseModel
 from pathlib import Path
 from datetime import datetime
 import os
 import sys
+import time
+import asyncio
 import logging
 import hashlib
 import shutil
 import tempfile
 from backend.core.config_manager import config as atlas_config
+from backend.core.database import db_pool, get_asset_queries
+from backend.core.asset_paths import (
+    thumbnail_index, asset_file_cache, asset_index_key, to_container_path, stat_version, THUMBNAIL_INDEX_FIELD
+)
+from backend.core.http_cache import conditional_file_response
+from backend.core.executors import run_db, run_fs, run_cpu
+from backend.core.structured_logging import sampled_logger, timed, record_count
+from backend.core.jobs import job_queue
+from backend.core.query_cache import query_cache, asset_tag, scope_tag, STATS_TAG
+from backend.core.image_pipeline import (
+    convert_image, read_image_header, run_within_budget, memory_budget, THUMBNAIL_MAX_DIMENSION, KEEP_ORIGINAL_BELOW
+)
+from backend.core.texture_pyramid import build_pyramid, load_manifest, pyramid_dir, tile_path, PYRAMID_FOLDER
+from backend.core.library_sync import library_sync
+from backend.core.library_reconcile import library_reconciler
+from backend.core.asset_versions import version_fields, split_base_id, next_version, next_variant_id
+from backend.core.asset_schema import (
+    canonical_view, normalize_asset_document, patch_updates, derived_after_patch, SCHEMA_VERSION_FIELD
+)
+from backend.assetlibrary.database.arango_queries import AssetQueries
 
 # Setup logging for this module
 logger = logging.getLogger(__name__)
+conversion_logger = sampled_logger(__name__ + ".conversion", every=1000)
 
 router = APIRouter(prefix="/api/v1", tags=["assets"])
 
-def get_asset_queries():
-    """Get AssetQueries instance - create fresh connection each time"""
-    try:
-        from backend.assetlibrary.database.arango_queries import AssetQueries
-        environment = os.getenv('ATLAS_ENV', 'development')
-        
-        # Use new Atlas config for database settings
-        db_config = atlas_config.get('api.database', {})
-        arango_config = {
-            'hosts': [f"http://{db_config.get('host', 'localhost')}:{db_config.get('port', '8529')}"],
-            'database': db_config.get('name', 'blacksmith_atlas'),
-            'username': db_config.get('username', 'root'),
-            'password': db_config.get('password', 'atlas_password'),
-            'collections': {
-                'assets': 'Atlas_Library'
-            }
-        }
-        logger.info(f"🔍 Creating AssetQueries with config: {arango_config}")
-        queries = AssetQueries(arango_config)
-        logger.info(f"✅ AssetQueries created successfully")
-        return queries
-    except Exception as e:
-        logger.error(f"❌ Failed to get asset queries: {e}")
-        import traceback
-        logger.error(f"❌ Traceback: {traceback.format_exc()}")
-        return None
-
-
 def generate_texture_tags(
     asset_name: str,
     subcategory: str,
@@ -212,155 +208,143 @@ class AssetCreateRequest(BaseModel):
     created_at: Optional[str] = None
     created_by: Optional[str] = None
 
+def resolve_asset_identity(metadata_id: Optional[str]) -> Tuple[str, str]:
+    """
+    (_key, id) for a new asset from its metadata ID
+
+    Versioned UIDs (16-char current, 17/14/12-char older exports) and plain
+    UIDs are used as both; legacy ``UID_Name`` IDs keep the full form as
+    ``_key`` and the UID as ``id``. Without an ID a new 11-char UID is generated.
+    """
+    if not metadata_id:
+        import uuid
+        uid = uuid.uuid4().hex[:11].upper()
+        return uid, uid
+    if len(metadata_id) not in (16, 17, 14, 12) and '_' in metadata_id:
+        return metadata_id, metadata_id.split('_')[0]
+    return metadata_id, metadata_id
+
+def build_created_asset_document(asset_request: AssetCreateRequest) -> dict:
+    """ArangoDB document for a create request (thumbnail index not resolved yet)"""
+    metadata = asset_request.metadata or {}
+    asset_key, asset_id = resolve_asset_identity(metadata.get('id'))
+    asset_data = {
+        '_key': asset_key,
+        'id': asset_id,
+        'name': asset_request.name,
+        'category': asset_request.category,
+        'asset_type': metadata.get('hierarchy', {}).get('asset_type', 'Assets'),
+        'dimension': '3D',
+        'hierarchy': metadata.get('hierarchy', {}),
+        'metadata': metadata,
+        'paths': asset_request.paths,
+        'file_sizes': asset_request.file_sizes,
+        'tags': asset_request.tags,
+        'created_at': asset_request.created_at or datetime.now().isoformat(),
+        'created_by': asset_request.created_by or 'unknown',
+        'status': 'active'
+    }
+    # Stored for the indexed version/variant lookups, then the canonical response fields
+    asset_data.update(version_fields(asset_data))
+    return normalize_asset_document(asset_data)
+
 def find_actual_thumbnail(asset_data: dict) -> Optional[str]:
     # Prioritize 'id' field over '_key' since 'id' has the correct format
     asset_id = asset_data.get('id', asset_data.get('_key', ''))
-    asset_name = asset_data.get('name', '')
     if not asset_id:
         return None
     
-    # Check existing thumbnail paths first
-    if 'paths' in asset_data and 'thumbnail' in asset_data['paths']:
-        db_thumbnail_path = asset_data['paths']['thumbnail']
-        if db_thumbnail_path and Path(db_thumbnail_path).exists():
-            return f"http://localhost:8000/thumbnails/{asset_id}"
-    
-    thumbnail_path = asset_data.get('thumbnail_path')
-    if thumbnail_path and Path(thumbnail_path).exists():
+    # Resolved at ingest/sync time - no filesystem access for indexed documents
+    entry = thumbnail_index.lookup(asset_data)
+    if entry.get('path'):
+        # Versioned URL lets the browser cache the image as immutable
+        if entry.get('version'):
+            return f"http://localhost:8000/thumbnails/{asset_id}?v={entry['version']}"
         return f"http://localhost:8000/thumbnails/{asset_id}"
     
-    # Check folder_path from metadata (most accurate path)
-    folder_path = asset_data.get('folder_path')
-    if folder_path:
-        # Convert network path to container path if needed
-        if folder_path.startswith('/net/library/atlaslib/'):
-            container_folder = folder_path.replace('/net/library/atlaslib/', '/app/assets/')
-            thumbnail_folder = Path(container_folder) / "Thumbnail"
-        else:
-            thumbnail_folder = Path(folder_path) / "Thumbnail"
-        
-        if thumbnail_folder.exists() and thumbnail_folder.is_dir():
-            for ext in ['.png', '.jpg', '.jpeg']:
-                for img_file in thumbnail_folder.glob(f"*{ext}"):
-                    return f"http://localhost:8000/thumbnails/{asset_id}"
-    
-    # Check paths.folder_path as well
-    paths_folder_path = asset_data.get('paths', {}).get('folder_path')
-    if paths_folder_path and paths_folder_path != folder_path:
-        if paths_folder_path.startswith('/net/library/atlaslib/'):
-            container_folder = paths_folder_path.replace('/net/library/atlaslib/', '/app/assets/')
-            thumbnail_folder = Path(container_folder) / "Thumbnail"
-        else:
-            thumbnail_folder = Path(paths_folder_path) / "Thumbnail"
-        
-        if thumbnail_folder.exists() and thumbnail_folder.is_dir():
-            for ext in ['.png', '.jpg', '.jpeg']:
-                for img_file in thumbnail_folder.glob(f"*{ext}"):
-                    return f"http://localhost:8000/thumbnails/{asset_id}"
-    
-    # Fallback to pattern-based search
-    folder_patterns = [
-        ASSET_LIBRARY_BASE / f"{asset_id}_{asset_name}" / "Thumbnail",
-        ASSET_LIBRARY_BASE / asset_id / "Thumbnail", 
-        ASSET_LIBRARY_BASE / asset_name / "Thumbnail",
-    ]
-    for folder in folder_patterns:
-        if folder.exists() and folder.is_dir():
-            for ext in ['.png', '.jpg', '.jpeg']:
-                for img_file in folder.glob(f"*{ext}"):
-                    return f"http://localhost:8000/thumbnails/{asset_id}"
-    
     return None
 
+async def resolve_thumbnails(documents: List[dict]):
+    """Resolve the thumbnails of documents from before the index in one hop off the event loop"""
+    documents = [document for document in documents if document]
+    if any(not isinstance(document.get(THUMBNAIL_INDEX_FIELD), dict) for document in documents):
+        await run_fs(thumbnail_index.resolve_missing, documents)
+
+def refresh_thumbnail_index(asset_queries: AssetQueries, asset_data: dict) -> dict:
+    """Re-resolve an asset's thumbnail and persist it on the document"""
+    entry = thumbnail_index.refresh(asset_data)
+    asset_key = asset_data.get('_key') or asset_data.get('id')
+    if asset_queries and asset_key:
+        asset_queries.update_thumbnail_index(asset_key, entry)
+        asset_file_cache.invalidate(asset_key)
+        query_cache.invalidate_assets([asset_key], membership=False)
+    return entry
+
 def convert_asset_to_response(asset_data: dict) -> AssetResponse:
-    thumbnail_url = find_actual_thumbnail(asset_data)
-    artist = asset_data.get('metadata', {}).get('created_by', 'Unknown')
-    if asset_data.get('created_by'):
-        artist = asset_data['created_by']
-    description = asset_data.get('metadata', {}).get('description', '')
-    if not description and asset_data.get('description'):
-        description = asset_data['description']
-    if not description:
-        description = f"{asset_data.get('category', 'General')} asset created in Houdini"
-    paths = asset_data.get('paths', {})
-    if not paths or all(v is None for v in paths.values()):
-        paths = {
-            'usd': asset_data.get('usd_path'),
-            'thumbnail': asset_data.get('thumbnail_path'),
-            'textures': asset_data.get('textures_path'),
-            'fbx': asset_data.get('fbx_path')
-        }
-    
-    # Create comprehensive metadata structure for frontend filtering
-    metadata = asset_data.get('metadata', {})
-    
-    # Debug: Print asset data structure
-    logger.info(f"🔍 Raw asset_data keys: {list(asset_data.keys())}")
-    logger.info(f"🔍 Created at value: {asset_data.get('created_at')} (type: {type(asset_data.get('created_at'))})")
-    logger.info(f"🔍 Created by value: {asset_data.get('created_by')} (type: {type(asset_data.get('created_by'))})")
-    
-    # Add hierarchy data from top-level fields if metadata is structured
-    if isinstance(metadata, dict):
-        try:
-            hierarchy = asset_data.get('hierarchy', {})
-            if not isinstance(hierarchy, dict):
-                logger.warning(f"⚠️ Hierarchy is not a dict: {type(hierarchy)} = {hierarchy}")
-                hierarchy = {}
-            
-            metadata.update({
-                'dimension': asset_data.get('dimension', '3D'),
-                'asset_type': asset_data.get('asset_type', metadata.get('asset_type')),
-                'subcategory': hierarchy.get('subcategory') or asset_data.get('category'),
-                'render_engine': asset_data.get('render_engine')
-            })
-            logger.info(f"🔍 Updated metadata: {metadata}")
-        except Exception as e:
-            logger.error(f"❌ Error updating metadata: {e}")
-            logger.error(f"❌ asset_data type: {type(asset_data)}")
-            logger.error(f"❌ asset_data keys: {list(asset_data.keys()) if isinstance(asset_data, dict) else 'not a dict'}")
-            raise
-    # Extract variant information from asset ID and metadata
-    # Prioritize 'id' field over '_key' since 'id' has the correct format
-    asset_id = asset_data.get('id', asset_data.get('_key', ''))
-    variant_id = None
-    variant_name = None
-    
-    # Extract variant_id from asset ID (characters 11-13 in a 16-character ID)
-    logger.info(f"🔍 Extracting variant info from asset_id: '{asset_id}' (length: {len(asset_id)})")
-    if len(asset_id) >= 13:
-        variant_id = asset_id[11:13]  # Characters 11-13 for 11-char base UID system
-        logger.info(f"🔍 Extracted variant_id: '{variant_id}'")
-    
-    # Extract variant_name from metadata (check export_metadata first, then other locations)
-    if isinstance(metadata, dict):
-        variant_name = (asset_data.get('variant_name') or 
-                       metadata.get('variant_name') or
-                       metadata.get('export_metadata', {}).get('variant_name') or
-                       asset_data.get('metadata', {}).get('variant_name') or
-                       asset_data.get('metadata', {}).get('export_metadata', {}).get('variant_name'))
-        logger.info(f"🔍 Extracted variant_name: '{variant_name}'")
-    
-    
-    thumbnail_frame_value = asset_data.get('thumbnail_frame')
+    """
+    Project a document onto AssetResponse
+
+    Derived attributes (variant, artist, description, paths, metadata filter
+    fields) are stored at ingest by backend.core.asset_schema; documents
+    written before the current schema version are normalized on the fly
+    until scripts/database/migrate_asset_schema.py has rewritten them.
+    """
+    asset_data = canonical_view(asset_data)
+    # Hot path (once per item of a 1000-item page): sampled and lazily formatted
+    conversion_logger.debug("🔍 Converting asset %s (schema %s)", asset_data.get('_key'), asset_data.get(SCHEMA_VERSION_FIELD))
     
     return AssetResponse(
-        id=asset_id,
+        id=asset_data.get('id', asset_data.get('_key', '')),
         name=asset_data.get('name', ''),
         category=asset_data.get('category', 'General'),
         asset_type=asset_data.get('asset_type', '3D'),
-        variant_id=variant_id,
-        variant_name=variant_name,
-        paths=paths,
+        variant_id=asset_data['variant_id'],
+        variant_name=asset_data['variant_name'],
+        paths=asset_data['paths'],
         file_sizes=asset_data.get('file_sizes', {}),
         tags=asset_data.get('tags', []),
-        metadata=metadata,  # Now includes hierarchy data
+        metadata=asset_data['metadata'],
         created_at=asset_data.get('created_at') or datetime.now().isoformat(),
-        thumbnail_path=thumbnail_url,
-        thumbnail_frame=thumbnail_frame_value,
-        artist=artist,
+        thumbnail_path=find_actual_thumbnail(asset_data),
+        thumbnail_frame=asset_data.get('thumbnail_frame'),
+        artist=asset_data['artist'],
         file_format="USD",
-        description=description,
-        folder_path=asset_data.get('folder_path', asset_data.get('paths', {}).get('folder_path'))
+        description=asset_data['description'],
+        folder_path=asset_data['folder_path']
+    )
+
+class AssetSummary(BaseModel):
+    """What a library grid card needs - the full document comes from GET /assets/{id}"""
+    id: str
+    name: str
+    category: str
+    asset_type: str = "3D"
+    dimension: str = "3D"
+    variant_id: Optional[str] = None
+    variant_name: Optional[str] = None
+    tags: List[str] = []
+    metadata: dict = {}  # Only GRID_METADATA_FIELDS
+    created_at: str
+    thumbnail_path: Optional[str] = None
+    thumbnail_frame: Optional[int] = None
+    artist: Optional[str] = None
+
+def convert_asset_to_summary(asset_data: dict) -> AssetSummary:
+    asset_data = canonical_view(asset_data)
+    return AssetSummary(
+        id=asset_data.get('id', asset_data.get('_key', '')),
+        name=asset_data.get('name', ''),
+        category=asset_data.get('category', 'General'),
+        asset_type=asset_data.get('asset_type', '3D'),
+        dimension=asset_data.get('dimension', '3D'),
+        variant_id=asset_data['variant_id'],
+        variant_name=asset_data['variant_name'],
+        tags=asset_data.get('tags', []),
+        metadata=asset_data['metadata'],
+        created_at=asset_data.get('created_at') or datetime.now().isoformat(),
+        thumbnail_path=find_actual_thumbnail(asset_data),
+        thumbnail_frame=asset_data.get('thumbnail_frame'),
+        artist=asset_data['artist']
     )
 
 class PaginationResponse(BaseModel):
@@ -369,6 +353,35 @@ class PaginationResponse(BaseModel):
     limit: int
     offset: int
     has_more: bool
+    next_cursor: Optional[str] = None
+
+# Top-level document attributes read by convert_asset_to_response / find_actual_thumbnail.
+# list_assets projects to these so large export payloads never leave the database.
+ASSET_RESPONSE_FIELDS = [
+    '_key', 'id', 'name', 'category', 'asset_type', 'variant_id', 'variant_name', 'paths',
+    'file_sizes', 'tags', 'metadata', 'created_at', 'artist', 'description', 'folder_path',
+    'thumbnail_frame', THUMBNAIL_INDEX_FIELD, SCHEMA_VERSION_FIELD,
+    # Only read to normalize documents from before the canonical schema
+    'created_by', 'hierarchy', 'dimension', 'render_engine', 'thumbnail_path', 'usd_path',
+    'textures_path', 'fbx_path'
+]
+
+# view=grid: top-level attributes for convert_asset_to_summary (paths/folder_path only
+# feed the thumbnail fallback of unindexed documents) and the small metadata
+# attributes grid cards and filters read - never texture/path mappings or node summaries
+ASSET_SUMMARY_FIELDS = [
+    '_key', 'id', 'name', 'category', 'asset_type', 'variant_id', 'variant_name', 'tags',
+    'created_at', 'artist', 'dimension', 'folder_path', 'paths', 'thumbnail_frame',
+    THUMBNAIL_INDEX_FIELD, SCHEMA_VERSION_FIELD,
+    # Only read to normalize documents from before the canonical schema
+    'created_by', 'hierarchy', 'render_engine', 'thumbnail_path'
+]
+GRID_METADATA_FIELDS = [
+    'subcategory', 'asset_type', 'dimension', 'hierarchy', 'render_engine', 'houdini_version',
+    'created_by', 'variant_name', 'variant_id', 'branded', 'export_metadata.branded',
+    'export_metadata.variant_name', 'file_format', 'resolution', 'dimensions', 'texture_type',
+    'texture_set_info', 'seamless', 'tiling', 'uv_tile', 'uvtile', 'alpha_subcategory', 'location'
+]
 
 @router.get("/assets/debug/test-endpoint")
 async def test_endpoint():
@@ -376,17 +389,15 @@ async def test_endpoint():
     return {"message": "API is working!", "status": "ok"}
 
 @router.get("/assets/{asset_id}/thumbnail-frame")
-async def get_thumbnail_frame(asset_id: str):
+async def get_thumbnail_frame(asset_id: str, asset_queries: Optional[AssetQueries] = Depends(get_asset_queries)):
     """Get thumbnail frame for an asset"""
-    asset_queries = get_asset_queries()
     if not asset_queries:
         raise HTTPException(status_code=503, detail="Database not available")
     
     try:
         # Direct AQL query to get just the thumbnail_frame
         query = "FOR asset IN Atlas_Library FILTER asset._key == @asset_id RETURN asset.thumbnail_frame"
-        cursor = asset_queries.db.aql.execute(query, bind_vars={'asset_id': asset_id})
-        result = list(cursor)
+        result = await run_db(lambda: list(asset_queries.db.aql.execute(query, bind_vars={'asset_id': asset_id})))
         
         if not result:
             raise HTTPException(status_code=404, detail="Asset not found")
@@ -398,14 +409,13 @@ async def get_thumbnail_frame(asset_id: str):
         raise HTTPException(status_code=500, detail=f"Error: {str(e)}")
 
 @router.get("/assets/debug/raw/{asset_id}")
-async def debug_raw_asset(asset_id: str):
+async def debug_raw_asset(asset_id: str, asset_queries: Optional[AssetQueries] = Depends(get_asset_queries)):
     """Debug endpoint to see raw asset data from database"""
-    asset_queries = get_asset_queries()
     if not asset_queries:
         return {"error": "Database not available"}
     
     try:
-        result = asset_queries.get_asset_with_dependencies(asset_id)
+        result = await run_db(asset_queries.get_asset_with_dependencies, asset_id)
         return {
             "raw_result": result,
             "asset_thumbnail_frame": result.get('asset', {}).get('thumbnail_frame') if result.get('asset') else None
@@ -413,71 +423,128 @@ async def debug_raw_asset(asset_id: str):
     except Exception as e:
         return {"error": str(e)}
 
+async def cached_json_response(namespace: str, params: dict, compute) -> Response:
+    """JSON response served from the query cache (``compute`` returns ``(content, tags)`` on a miss)"""
+    body, hit = await query_cache.cached_json(namespace, params, compute)
+    return Response(content=body, media_type="application/json", headers={"X-Cache": "HIT" if hit else "MISS"})
+
 @router.get("/assets", response_model=PaginationResponse)
 async def list_assets(
         search: Optional[str] = Query(None, description="Search term"),
         category: Optional[str] = Query(None, description="Filter by category"),
         tags: Optional[List[str]] = Query(None, description="Filter by tags"),
         limit: int = Query(100, ge=1, le=1000, description="Maximum number of results"),
-        offset: int = Query(0, ge=0, description="Number of items to skip")
+        offset: int = Query(0, ge=0, description="Number of items to skip"),
+        cursor: Optional[str] = Query(None, description="Keyset cursor from a previous page's next_cursor (overrides offset)"),
+        view: str = Query("detail", pattern="^(grid|detail)$", description="grid returns slim AssetSummary items"),
+        fields: Optional[str] = Query(None, description="Comma-separated item fields to return (id is always included)"),
+        asset_queries: Optional[AssetQueries] = Depends(get_asset_queries)
 ):
-    """List all assets from ArangoDB with pagination"""
-    asset_queries = get_asset_queries()
+    """
+    List assets from ArangoDB, paginated and counted inside AQL
+
+    ``view=detail`` (default) returns full AssetResponse items. ``view=grid``
+    returns AssetSummary items projected inside AQL, without the exported
+    texture/path mappings carried in ``metadata``. ``fields`` trims the items of
+    either view further. The full document is available from GET /assets/{id}.
+    """
+    item_model = AssetSummary if view == "grid" else AssetResponse
+    selected_fields = None
+    if fields:
+        selected_fields = {field.strip() for field in fields.split(',') if field.strip()} | {'id'}
+        unknown = selected_fields - set(item_model.model_fields)
+        if unknown:
+            raise HTTPException(status_code=400, detail=f"Unknown fields for view={view}: {', '.join(sorted(unknown))}")
+    
     if not asset_queries:
         logger.error("❌ Database connection failed in list_assets")
         return PaginationResponse(items=[], total=0, limit=limit, offset=offset, has_more=False)
     
-    try:
-        logger.info(f"🔍 Searching assets: search='{search}', category='{category}', tags={tags}, limit={limit}, offset={offset}")
+    async def build_page():
+        logger.debug("🔍 Searching assets: search=%r, category=%r, tags=%s, limit=%s, offset=%s, cursor=%s",
+                     search, category, tags, limit, offset, cursor)
         
-        # Get all matching assets
-        raw_assets = asset_queries.search_assets(
+        # Only the requested page is transferred; fullCount supplies the total
+        page = await run_db(
+            asset_queries.search_assets_page,
             search_term=search or "",
             category=category,
-            tags=tags
+            tags=tags,
+            limit=limit,
+            offset=offset,
+            cursor=cursor,
+            fields=ASSET_SUMMARY_FIELDS if view == "grid" else ASSET_RESPONSE_FIELDS,
+            metadata_fields=GRID_METADATA_FIELDS if view == "grid" else None
         )
         
-        total_count = len(raw_assets)
-        logger.info(f"✅ Found {total_count} total assets")
+        total_count = page['total']
         
-        # Apply pagination
-        paginated_assets = raw_assets[offset:offset + limit]
+        await resolve_thumbnails(page['items'])
         
+        convert = convert_asset_to_summary if view == "grid" else convert_asset_to_response
         assets = []
-        for asset_data in paginated_assets:
-            try:
-                asset_response = convert_asset_to_response(asset_data)
-                assets.append(asset_response)
-            except Exception as e:
-                logger.error(f"❌ Failed to convert asset: {e}")
-                continue
-        
-        has_more = (offset + limit) < total_count
-        
-        logger.info(f"✅ Returning {len(assets)} assets (page {offset//limit + 1})")
-        
-        return PaginationResponse(
-            items=assets,
-            total=total_count,
-            limit=limit,
-            offset=offset,
-            has_more=has_more
-        )
+        with timed('serialize'):
+            for asset_data in page['items']:
+                try:
+                    asset_response = convert(asset_data)
+                    assets.append(asset_response)
+                except Exception as e:
+                    logger.error(f"❌ Failed to convert asset {asset_data.get('_key')}: {e}")
+                    continue
+        record_count('count', len(assets))
         
+        if cursor:
+            has_more = page['next_cursor'] is not None
+        else:
+            has_more = (offset + limit) < total_count
+        
+        with timed('serialize'):
+            items = [asset.model_dump(mode='json') for asset in assets]
+            if selected_fields:
+                items = [{field: value for field, value in item.items() if field in selected_fields}
+                         for item in items]
+        content = {
+            "items": items,
+            "total": total_count,
+            "limit": limit,
+            "offset": 0 if cursor else offset,
+            "has_more": has_more,
+            "next_cursor": page['next_cursor']
+        }
+        # Invalidated when a listed asset changes, or when any asset joins/leaves this category's lists
+        cache_tags = [scope_tag(category)] + [asset_tag(asset_index_key(asset_data)) for asset_data in page['items']]
+        return content, cache_tags
+    
+    try:
+        # Summary and sparse items do not match the detail response model, and cached bodies are
+        # already encoded, so the page is returned as a raw JSON body
+        return await cached_json_response('assets:list', {
+            "search": (search or "").lower(),
+            "category": category,
+            "tags": tags,
+            "limit": limit,
+            "offset": None if cursor else offset,
+            "cursor": cursor,
+            "view": view,
+            "fields": selected_fields
+        }, build_page)
+        
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         logger.error(f"❌ Error in list_assets: {e}")
         raise HTTPException(status_code=500, detail=f"Error loading assets: {str(e)}")
 
 @router.get("/assets/{asset_id}", response_model=AssetResponse)
-async def get_asset(asset_id: str):
-    asset_queries = get_asset_queries()
+async def get_asset(asset_id: str, asset_queries: Optional[AssetQueries] = Depends(get_asset_queries)):
     if not asset_queries:
         raise HTTPException(status_code=503, detail="Database not available")
     
     try:
-        asset_data = asset_queries.get_asset_with_dependencies(asset_id).get('asset')
+        asset_data = (await run_db(asset_queries.get_asset_with_dependencies, asset_id)).get('asset')
         if not asset_data:
             raise HTTPException(status_code=404, detail="Asset not found")
+        await resolve_thumbnails([asset_data])
         return convert_asset_to_response(asset_data)
     except HTTPException:
         raise
@@ -485,88 +552,12 @@ async def get_asset(asset_id: str):
         raise HTTPException(status_code=500, detail=f"Error: {str(e)}")
 
 @router.post("/assets", response_model=AssetResponse)
-async def create_asset(asset_request: AssetCreateRequest):
-    asset_queries = get_asset_queries()
+async def create_asset(asset_request: AssetCreateRequest, asset_queries: Optional[AssetQueries] = Depends(get_asset_queries)):
     if not asset_queries:
         raise HTTPException(status_code=503, detail="Database not available")
     
     try:
-        import uuid
-        import re
-        
-        # Extract ID and name from metadata
-        metadata_id = asset_request.metadata.get('id') if asset_request.metadata else None
-        asset_name = asset_request.name
-        
-        # DEBUG: Log the received metadata_id and its properties
-        logger.info(f"🔍 DEBUG: Received metadata_id = '{metadata_id}' (type: {type(metadata_id)}, length: {len(metadata_id) if metadata_id else 'None'})")
-        logger.info(f"🔍 DEBUG: Asset name = '{asset_name}'")
-        if asset_request.metadata:
-            logger.info(f"🔍 DEBUG: Full metadata keys: {list(asset_request.metadata.keys())}")
-        else:
-            logger.info(f"🔍 DEBUG: No metadata provided")
-        
-        if metadata_id:
-            # For new Houdini exports: metadata_id is just the UID (e.g., "B6A48C5B")
-            # For legacy exports: metadata_id might be the full format (e.g., "B6A48C5B_atlas_asset")
-            
-            # New versioning system: metadata_id is the full 16-character UID 
-            # Use the 16-character UID directly as both _key and id
-            if len(metadata_id) == 16:
-                # New 16-character UID system (11 base + 2 variant + 3 version)
-                asset_key = metadata_id  # Use 16-char UID directly as _key
-                asset_id = metadata_id   # Use 16-char UID as document id
-                logger.info(f"🔍 DEBUG: Using 16-char UID path - asset_key = '{asset_key}', asset_id = '{asset_id}'")
-            elif len(metadata_id) == 17:
-                # Previous 17-character UID system (12 base + 2 variant + 3 version) - still support for existing assets
-                asset_key = metadata_id  # Use 17-char UID directly as _key
-                asset_id = metadata_id   # Use 17-char UID as document id
-                logger.info(f"🔍 DEBUG: Using 17-char UID path - asset_key = '{asset_key}', asset_id = '{asset_id}'")
-            elif len(metadata_id) == 14:
-                # Previous 14-character UID system (9 base + 2 variant + 3 version) - still support for existing assets
-                asset_key = metadata_id  # Use 14-char UID directly as _key
-                asset_id = metadata_id   # Use 14-char UID as document id
-                logger.info(f"🔍 DEBUG: Using 14-char UID path - asset_key = '{asset_key}', asset_id = '{asset_id}'")
-            elif len(metadata_id) == 12:
-                # Legacy 12-character UID system (9 base + 3 version) - still support for existing assets
-                asset_key = metadata_id  # Use 12-char UID directly as _key
-                asset_id = metadata_id   # Use 12-char UID as document id
-                logger.info(f"🔍 DEBUG: Using legacy 12-char UID path - asset_key = '{asset_key}', asset_id = '{asset_id}'")
-            elif '_' in metadata_id:
-                # Legacy format: UID_Name
-                uid_part = metadata_id.split('_')[0]
-                asset_key = metadata_id  # Use full format for _key (legacy)
-                asset_id = uid_part      # Use just UID for document id
-                logger.info(f"🔍 DEBUG: Using legacy UID_Name path - asset_key = '{asset_key}', asset_id = '{asset_id}'")
-            else:
-                # Old format: just UID (use UID only for both key and ID)
-                asset_key = metadata_id  # Use UID only as _key (no name suffix)
-                asset_id = metadata_id   # Use UID for document id
-                logger.info(f"🔍 DEBUG: Using old UID path - asset_key = '{asset_key}', asset_id = '{asset_id}'")
-        else:
-            # Generate new asset ID and key (use UID only, no name suffix)
-            uid = uuid.uuid4().hex[:11].upper()
-            asset_key = uid  # Use UID only as _key
-            asset_id = uid   # Use UID as document id
-            logger.info(f"🔍 DEBUG: Generated new UID - asset_key = '{asset_key}', asset_id = '{asset_id}'")
-        
-        # Create asset document for ArangoDB
-        asset_data = {
-            '_key': asset_key,
-            'id': asset_id,
-            'name': asset_request.name,
-            'category': asset_request.category,
-            'asset_type': asset_request.metadata.get('hierarchy', {}).get('asset_type', 'Assets'),
-            'dimension': '3D',
-            'hierarchy': asset_request.metadata.get('hierarchy', {}),
-            'metadata': asset_request.metadata,
-            'paths': asset_request.paths,
-            'file_sizes': asset_request.file_sizes,
-            'tags': asset_request.tags if hasattr(asset_request, 'tags') else [],
-            'created_at': getattr(asset_request, 'created_at', None) or datetime.now().isoformat(),
-            'created_by': getattr(asset_request, 'created_by', None) or 'unknown',
-            'status': 'active'
-        }
+        asset_data = build_created_asset_document(asset_request)
         
         # DEBUG: Log the final database document structure
         logger.info(f"🔍 DEBUG: Final asset_data._key = '{asset_data['_key']}'")
@@ -574,39 +565,176 @@ async def create_asset(asset_request: AssetCreateRequest):
         logger.info(f"🔍 DEBUG: Final asset_data.name = '{asset_data['name']}'")
         logger.info(f"🔍 DEBUG: Final asset_data.category = '{asset_data['category']}'")
         
-        # Use existing asset queries to insert
-        asset_queries = get_asset_queries()
-        if not asset_queries:
-            raise HTTPException(status_code=503, detail="Database not available")
+        # Resolve the thumbnail once at ingest so listings never probe the filesystem
+        asset_data[THUMBNAIL_INDEX_FIELD] = await run_fs(thumbnail_index.refresh, asset_data)
         
         # Insert into ArangoDB using collection
         collection = asset_queries.db.collection('Atlas_Library')
-        result = collection.insert(asset_data)
+        result = await run_db(collection.insert, asset_data)
         
         logger.info(f"✅ Asset inserted with key: {result['_key']}")
+        await query_cache.ainvalidate_assets([result['_key']], [asset_data.get('category')])
         
         # Get the inserted document from database for proper response
-        inserted_asset = collection.get(result['_key'])
+        inserted_asset = await run_db(collection.get, result['_key'])
         
         return convert_asset_to_response(inserted_asset)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error creating asset: {str(e)}")
 
+_bulk_config = atlas_config.get('api.bulk_ingest', {}) or {}
+BULK_INGEST_BATCH_SIZE = int(_bulk_config.get('batch_size', 500))
+BULK_INGEST_MAX_ITEMS = int(_bulk_config.get('max_items', 100000))
+BULK_INGEST_CONTENT_TYPES = ('', 'application/json', 'application/x-ndjson', 'application/ndjson',
+                             'application/jsonl', 'application/x-jsonlines', 'text/plain')
+
+def _bulk_item_id(item) -> Optional[str]:
+    metadata = item.get('metadata') if isinstance(item, dict) else None
+    return metadata.get('id') if isinstance(metadata, dict) else None
+
+async def _write_bulk_batch(asset_queries: AssetQueries, batch: List[dict]) -> List[dict]:
+    """Upsert one batch of validated items with a single bulk import; returns per-item results"""
+    documents = [entry['document'] for entry in batch]
+    entries = await asyncio.gather(*(run_fs(thumbnail_index.refresh, document) for document in documents))
+    for document, entry in zip(documents, entries):
+        document[THUMBNAIL_INDEX_FIELD] = entry
+
+    existing = set(await run_db(asset_queries.existing_asset_keys, [document['_key'] for document in documents]))
+    statuses = []
+    for entry in batch:
+        key = entry['document']['_key']
+        statuses.append('updated' if key in existing else 'created')
+        if key in existing and not entry['created_at_given']:
+            # Keep the original creation date of assets that are re-ingested
+            entry['document'].pop('created_at', None)
+        existing.add(key)
+
+    try:
+        result = await run_db(asset_queries.upsert_assets_bulk, documents)
+        failed = result['failed_positions']
+    except Exception as e:
+        logger.error(f"❌ Bulk import of {len(documents)} assets failed: {e}")
+        failed = dict.fromkeys(range(len(documents)), str(e))
+
+    written = [document for position, document in enumerate(documents) if position not in failed]
+    if any(status == 'updated' for status in statuses):
+        # Replaced documents may have left categories that are not known here - drop every cached query
+        await run_db(query_cache.invalidate_all)
+    elif written:
+        await query_cache.ainvalidate_assets([document['_key'] for document in written],
+                                             {document.get('category') for document in written})
+
+    results = []
+    for position, (entry, status) in enumerate(zip(batch, statuses)):
+        key = entry['document']['_key']
+        if position in failed:
+            results.append({"index": entry['index'], "id": key, "status": "error", "error": failed[position]})
+        else:
+            asset_file_cache.invalidate(key)
+            results.append({"index": entry['index'], "id": key, "status": status})
+    return results
+
+@router.post("/assets:bulk")
+async def bulk_create_assets(
+    request: Request,
+    errors_only: bool = Query(False, description="Only list failed items in results"),
+    asset_queries: Optional[AssetQueries] = Depends(get_asset_queries)
+):
+    """
+    Create or update many assets in one request
+
+    The body is NDJSON (one AssetCreateRequest per line) or a JSON array of
+    them, optionally gzip-encoded. Items are validated as the body streams in
+    and written with one bulk import per ``bulk_ingest.batch_size`` items, so
+    memory stays flat however many assets are sent. Existing assets (same
+    metadata id) are updated.
+
+    Returns counts and per-item results (index, id, status created/updated/error,
+    error). A body that cannot be parsed past some point returns 400 with the
+    results of the items before it, which were already written.
+    """
+    if not asset_queries:
+        raise HTTPException(status_code=503, detail="Database not available")
+
+    from pydantic import ValidationError
+    from backend.core.json_stream import iter_json_items, JSONStreamError
+
+    content_type = request.headers.get('content-type', '').split(';')[0].strip().lower()
+    if content_type not in BULK_INGEST_CONTENT_TYPES:
+        raise HTTPException(status_code=415, detail=f"Expected NDJSON or a JSON array, got {content_type}")
+
+    started = time.perf_counter()
+    results = []
+    batch = []
+    received = 0
+    body_error = None
+    status_code = 200
+
+    try:
+        async for index, item, error in iter_json_items(request.stream()):
+            if index >= BULK_INGEST_MAX_ITEMS:
+                body_error = f"More than {BULK_INGEST_MAX_ITEMS} items; items from index {index} on were not processed"
+                status_code = 413
+                break
+            received += 1
+            if error is None and not isinstance(item, dict):
+                error = "Expected a JSON object"
+            if error is None:
+                try:
+                    asset_request = AssetCreateRequest(**item)
+                    batch.append({
+                        "index": index,
+                        "document": build_created_asset_document(asset_request),
+                        "created_at_given": bool(asset_request.created_at)
+                    })
+                except ValidationError as e:
+                    error = "; ".join(f"{'.'.join(str(part) for part in detail['loc'])}: {detail['msg']}"
+                                      for detail in e.errors())
+            if error is not None:
+                results.append({"index": index, "id": _bulk_item_id(item), "status": "error", "error": error})
+            if len(batch) >= BULK_INGEST_BATCH_SIZE:
+                results.extend(await _write_bulk_batch(asset_queries, batch))
+                batch = []
+    except JSONStreamError as e:
+        body_error = str(e)
+        status_code = 400
+
+    if batch:
+        results.extend(await _write_bulk_batch(asset_queries, batch))
+    results.sort(key=lambda result: result['index'])
+
+    counts = {status: sum(1 for result in results if result['status'] == status)
+              for status in ('created', 'updated', 'error')}
+    elapsed = time.perf_counter() - started
+    logger.info(f"📦 Bulk ingest: {received} items, {counts['created']} created, {counts['updated']} updated, "
+                f"{counts['error']} failed in {elapsed:.2f}s" + (f" ({body_error})" if body_error else ""))
+
+    content = {
+        "received": received,
+        "created": counts['created'],
+        "updated": counts['updated'],
+        "failed": counts['error'],
+        "elapsed_seconds": round(elapsed, 3),
+        "results": [result for result in results if result['status'] == 'error'] if errors_only else results
+    }
+    if body_error:
+        content["error"] = body_error
+    return JSONResponse(status_code=status_code, content=content)
+
 @router.put("/assets/{asset_id}", response_model=AssetResponse)
-async def update_asset(asset_id: str, asset_request: AssetCreateRequest):
+async def update_asset(asset_id: str, asset_request: AssetCreateRequest, asset_queries: Optional[AssetQueries] = Depends(get_asset_queries)):
     """Full update of an asset - replaces entire document"""
-    asset_queries = get_asset_queries()
     if not asset_queries:
         raise HTTPException(status_code=503, detail="Database not available")
     
     try:
         # Check if asset exists
         collection = asset_queries.db.collection('Atlas_Library')
-        if not collection.has(asset_id):
+        if not await run_db(collection.has, asset_id):
             raise HTTPException(status_code=404, detail=f"Asset {asset_id} not found")
         
         # Get existing asset for metadata preservation
-        existing_asset = collection.get(asset_id)
+        existing_asset = await run_db(collection.get, asset_id)
         
         # Create updated asset document
         asset_data = {
@@ -627,8 +755,14 @@ async def update_asset(asset_id: str, asset_request: AssetCreateRequest):
             'status': 'active'
         }
         
+        asset_data.update(version_fields(asset_data))
+        normalize_asset_document(asset_data)
+        asset_data[THUMBNAIL_INDEX_FIELD] = await run_fs(thumbnail_index.refresh, asset_data)
+        
         # Replace document in ArangoDB
-        result = collection.replace(asset_id, asset_data)
+        result = await run_db(collection.replace, asset_id, asset_data)
+        asset_file_cache.invalidate(asset_id)
+        await query_cache.ainvalidate_assets([asset_id], [existing_asset.get('category'), asset_data.get('category')])
         
         logger.info(f"✅ Asset {asset_id} updated successfully")
         
@@ -639,7 +773,7 @@ async def update_asset(asset_id: str, asset_request: AssetCreateRequest):
         raise HTTPException(status_code=500, detail=f"Error updating asset: {str(e)}")
 
 @router.patch("/assets/{asset_id}")
-async def patch_asset(asset_id: str, asset_update: dict):
+async def patch_asset(asset_id: str, asset_update: dict, asset_queries: Optional[AssetQueries] = Depends(get_asset_queries)):
     """Partial update of an asset - updates only provided fields"""
     try:
         logger.info(f"🔍 PATCH Debug: Received PATCH request for asset {asset_id}")
@@ -647,22 +781,22 @@ async def patch_asset(asset_id: str, asset_update: dict):
         if 'thumbnail_frame' in asset_update:
             logger.info(f"🔍 PATCH Debug: thumbnail_frame in update: {asset_update['thumbnail_frame']}, type: {type(asset_update['thumbnail_frame'])}")
         
-        # Get database connection
-        asset_queries = get_asset_queries()
+        # Check database connection
         if not asset_queries:
             raise HTTPException(status_code=503, detail="Database not available")
         
         # Check if asset exists and update
         collection = asset_queries.db.collection('Atlas_Library')
-        if not collection.has(asset_id):
+        if not await run_db(collection.has, asset_id):
             raise HTTPException(status_code=404, detail=f"Asset {asset_id} not found")
         
         # Get current asset data for comparison
-        current_asset = collection.get(asset_id)
+        current_asset = await run_db(collection.get, asset_id)
         logger.info(f"🔍 PATCH Debug: Current thumbnail_frame in DB: {current_asset.get('thumbnail_frame')}")
         
         # Add update timestamp
         asset_update['updated_at'] = datetime.now().isoformat()
+        updates = patch_updates(asset_update)
         
         # Use AQL for reliable updates (collection.update has issues)
         aql_query = """
@@ -671,14 +805,21 @@ async def patch_asset(asset_id: str, asset_update: dict):
             UPDATE doc WITH @updates IN Atlas_Library
             RETURN NEW
         """
-        bind_vars = {'asset_id': asset_id, 'updates': asset_update}
+        bind_vars = {'asset_id': asset_id, 'updates': updates}
         
-        cursor = asset_queries.db.aql.execute(aql_query, bind_vars=bind_vars)
-        result_list = list(cursor)
+        result_list = await run_db(lambda: list(asset_queries.db.aql.execute(aql_query, bind_vars=bind_vars)))
         
         if not result_list:
             raise HTTPException(status_code=404, detail=f"Asset {asset_id} not found or update failed")
         
+        # Re-derive the canonical response fields the patch may have affected (fields it sets win)
+        updated_asset = result_list[0]
+        derived = derived_after_patch(updated_asset, updates)
+        if derived:
+            await run_db(asset_queries.update_assets_bulk, [{'_key': asset_id, **derived}])
+        
+        asset_file_cache.invalidate(asset_id)
+        await query_cache.ainvalidate_assets([asset_id], [current_asset.get('category'), updated_asset.get('category')])
         logger.info(f"✅ Asset {asset_id} updated with fields: {list(asset_update.keys())}")
         
         return {
@@ -891,23 +1032,22 @@ def move_asset_to_trashbin(asset_folder_path: str, dimension: str = "3D") -> dic
         }
 
 @router.delete("/assets/{asset_id}")
-async def delete_asset(asset_id: str):
+async def delete_asset(asset_id: str, asset_queries: Optional[AssetQueries] = Depends(get_asset_queries)):
     """
     Securely delete an asset: remove from database and move folder to TrashBin.
     NEVER permanently deletes folders - always moves to TrashBin for recovery.
     🚫 PROTECTION: Will NOT delete assets from protected mount areas.
     """
-    asset_queries = get_asset_queries()
     if not asset_queries:
         raise HTTPException(status_code=503, detail="Database not available")
     
     try:
         # Get asset data before deletion
         collection = asset_queries.db.collection('Atlas_Library')
-        if not collection.has(asset_id):
+        if not await run_db(collection.has, asset_id):
             raise HTTPException(status_code=404, detail=f"Asset {asset_id} not found")
         
-        asset_data = collection.get(asset_id)
+        asset_data = await run_db(collection.get, asset_id)
         asset_name = asset_data.get('name', 'Unknown')
         
         # DEBUG: Log the entire asset data structure to understand what's available
@@ -1007,12 +1147,12 @@ async def delete_asset(asset_id: str):
         folder_moved = False
         folder_move_result = None
         
-        if not folder_path.exists():
+        if not await run_fs(folder_path.exists):
             logger.warning(f"⚠️ Folder does not exist at container path: {container_folder_path} (original: {asset_folder_path})")
             logger.info(f"🧹 Treating as orphaned database entry - will delete from database without folder move")
             folder_moved = False
             folder_move_result = {"success": False, "message": "Folder did not exist - orphaned database entry"}
-        elif not folder_path.is_dir():
+        elif not await run_fs(folder_path.is_dir):
             logger.error(f"❌ CRITICAL: Path exists but is not a directory: {container_folder_path} (original: {asset_folder_path})")
             raise HTTPException(
                 status_code=400, 
@@ -1021,7 +1161,7 @@ async def delete_asset(asset_id: str):
         else:
             # Folder exists, attempt to move it to TrashBin
             logger.info(f"🗑️ Attempting to move asset folder to TrashBin: {container_folder_path} (original: {asset_folder_path})")
-            folder_move_result = move_asset_to_trashbin(container_folder_path, dimension)
+            folder_move_result = await run_fs(move_asset_to_trashbin, container_folder_path, dimension)
             
             if not folder_move_result["success"]:
                 # If folder move fails, don't delete from database
@@ -1038,7 +1178,7 @@ async def delete_asset(asset_id: str):
         
         # Delete from database ONLY after confirmed successful folder move
         try:
-            result = collection.delete(asset_id)
+            result = await run_db(collection.delete, asset_id)
             logger.info(f"✅ Database deletion successful for asset {asset_id}")
         except Exception as db_error:
             logger.error(f"❌ Database deletion failed: {db_error}")
@@ -1050,6 +1190,9 @@ async def delete_asset(asset_id: str):
             )
         
         logger.info(f"✅ Asset {asset_id} ({asset_name}) deleted successfully from database")
+        thumbnail_index.invalidate(asset_id)
+        asset_file_cache.invalidate(asset_id)
+        await query_cache.ainvalidate_assets([asset_id], [asset_data.get('category')])
         
         return {
             "success": True,
@@ -1073,18 +1216,19 @@ async def delete_asset(asset_id: str):
 async def expand_asset(
     asset_id: str,
     relations: Optional[List[str]] = Query(None, description="Relations to expand (e.g., dependencies, materials, textures)"),
-    depth: int = Query(1, ge=1, le=3, description="Depth of graph traversal")
+    depth: int = Query(1, ge=1, le=3, description="Depth of graph traversal"),
+    asset_queries: Optional[AssetQueries] = Depends(get_asset_queries)
 ):
     """Get asset with expanded relationships using ArangoDB graph traversal"""
-    asset_queries = get_asset_queries()
     if not asset_queries:
         raise HTTPException(status_code=503, detail="Database not available")
     
     try:
         # Get the main asset
-        asset_data = asset_queries.get_asset_with_dependencies(asset_id)
+        asset_data = await run_db(asset_queries.get_asset_with_dependencies, asset_id)
         if not asset_data or not asset_data.get('asset'):
             raise HTTPException(status_code=404, detail=f"Asset {asset_id} not found")
+        await resolve_thumbnails([asset_data['asset'], *(asset_data.get('dependencies') or [])])
         
         expanded_result = {
             "asset": convert_asset_to_response(asset_data['asset']),
@@ -1115,16 +1259,15 @@ async def expand_asset(
                     RETURN related
                 """
                 
-                cursor = asset_queries.db.aql.execute(
+                related_assets = await run_db(lambda: list(asset_queries.db.aql.execute(
                     query,
                     bind_vars={
                         'relation': relation,
                         'asset': asset_data['asset']
                     }
-                )
-                
-                related_assets = list(cursor)
+                )))
                 if related_assets:
+                    await resolve_thumbnails(related_assets)
                     expanded_result["relations"][relation] = [
                         convert_asset_to_response(asset) for asset in related_assets
                     ]
@@ -1146,9 +1289,63 @@ async def expand_asset(
         logger.error(f"❌ Error in expand_asset: {e}")
         raise HTTPException(status_code=500, detail=f"Error expanding asset: {str(e)}")
 
+@router.get("/assets/{base_id}/versions")
+async def get_asset_versions(base_id: str, asset_queries: Optional[AssetQueries] = Depends(get_asset_queries)):
+    """
+    Existing versions of a variant (base UID + 2-letter variant) and the next free version number
+
+    With a bare base UID, versions of every variant are listed and
+    ``next_version`` is null (see /variants).
+    """
+    if not asset_queries:
+        raise HTTPException(status_code=503, detail="Database not available")
+    try:
+        ids = split_base_id(base_id)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    try:
+        result = await run_db(asset_queries.get_asset_versions, ids['base_uid'], ids['variant_id'])
+        versions = result['versions']
+        latest = result['latest']
+        await resolve_thumbnails([latest])
+        return {
+            "base_uid": ids['base_uid'],
+            "variant_id": ids['variant_id'],
+            "versions": versions,
+            "existing_versions": sorted({entry['version'] for entry in versions}),
+            "next_version": next_version(entry['version'] for entry in versions) if ids['variant_id'] else None,
+            "latest": convert_asset_to_response(latest) if latest else None
+        }
+    except Exception as e:
+        logger.error(f"❌ Version lookup failed for {base_id}: {e}")
+        raise HTTPException(status_code=500, detail=f"Version lookup failed: {str(e)}")
+
+@router.get("/assets/{base_id}/variants")
+async def get_asset_variants(base_id: str, asset_queries: Optional[AssetQueries] = Depends(get_asset_queries)):
+    """Existing variants of a base UID (latest version of each) and the next free variant ID"""
+    if not asset_queries:
+        raise HTTPException(status_code=503, detail="Database not available")
+    try:
+        ids = split_base_id(base_id)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if ids['variant_id']:
+        raise HTTPException(status_code=400, detail="Variants are looked up by the base UID, without a variant")
+
+    try:
+        variants = await run_db(asset_queries.get_asset_variants, ids['base_uid'])
+        return {
+            "base_uid": ids['base_uid'],
+            "variants": variants,
+            "next_variant_id": next_variant_id(variant['variant_id'] for variant in variants)
+        }
+    except Exception as e:
+        logger.error(f"❌ Variant lookup failed for {base_id}: {e}")
+        raise HTTPException(status_code=500, detail=f"Variant lookup failed: {str(e)}")
+
 @router.get("/assets/stats/summary")
-async def get_asset_stats():
-    asset_queries = get_asset_queries()
+async def get_asset_stats(asset_queries: Optional[AssetQueries] = Depends(get_asset_queries)):
     if not asset_queries:
         return {
             "total_assets": 0,
@@ -1159,8 +1356,8 @@ async def get_asset_stats():
             "note": "Database not available"
         }
     
-    try:
-        stats = asset_queries.get_asset_statistics()
+    async def build_stats():
+        stats = await run_db(asset_queries.get_asset_statistics)
         total_size = stats.get('total_size_bytes', 0)
         return {
             "total_assets": stats.get('total_assets', 0),
@@ -1168,14 +1365,16 @@ async def get_asset_stats():
             "by_type": stats.get('by_type', {}),
             "total_size_gb": round(total_size / (1024 ** 3), 2),
             "assets_this_week": stats.get('assets_this_week', 0)
-        }
+        }, [STATS_TAG]
+    
+    try:
+        return await cached_json_response('stats:summary', {}, build_stats)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error: {str(e)}")
 
 @router.get("/database/status")
-async def get_database_status():
+async def get_database_status(asset_queries: Optional[AssetQueries] = Depends(get_asset_queries)):
     """Get detailed database status and connection information"""
-    asset_queries = get_asset_queries()
     if not asset_queries:
         return {
             "status": "disconnected",
@@ -1187,8 +1386,8 @@ async def get_database_status():
     
     try:
         # Get database connection info
-        db_info = asset_queries.db.properties()
-        collections = list(asset_queries.db.collections())
+        db_info = await run_db(asset_queries.db.properties)
+        collections = await run_db(asset_queries.db.collections)
         
         return {
             "status": "connected",
@@ -1196,9 +1395,10 @@ async def get_database_status():
             "database_id": db_info.get('id', 'unknown'),
             "collections_count": len(collections),
             "collections": [c['name'] for c in collections],
-            "active_connections": 1,  # ArangoDB HTTP connection
-            "pool_size": 1,
-            "max_connections": 100,
+            "active_connections": 1 if db_pool.connected else 0,  # Shared ArangoDB HTTP session
+            "pool_size": db_pool.pool_size,
+            "max_connections": db_pool.pool_size,
+            "reconnect_count": db_pool.reconnect_count,
             "version": db_info.get('version', 'unknown'),
             "engine": "ArangoDB Community Edition"
         }
@@ -1212,13 +1412,13 @@ async def get_database_status():
         }
 
 @router.get("/assets/recent/{limit}")
-async def get_recent_assets(limit: int = 10):
-    asset_queries = get_asset_queries()
+async def get_recent_assets(limit: int = 10, asset_queries: Optional[AssetQueries] = Depends(get_asset_queries)):
     if not asset_queries:
         return []
     
     try:
-        raw_assets = asset_queries.get_recent_assets(limit=limit)
+        raw_assets = await run_db(asset_queries.get_recent_assets, limit=limit)
+        await resolve_thumbnails(raw_assets)
         recent_assets = []
         for asset_data in raw_assets:
             try:
@@ -1231,8 +1431,7 @@ async def get_recent_assets(limit: int = 10):
         raise HTTPException(status_code=500, detail=f"Error: {str(e)}")
 
 @router.get("/categories")
-async def get_categories():
-    asset_queries = get_asset_queries()
+async def get_categories(asset_queries: Optional[AssetQueries] = Depends(get_asset_queries)):
     if not asset_queries:
         return {
             "categories": [],
@@ -1240,20 +1439,22 @@ async def get_categories():
             "note": "Database not available"
         }
     
-    try:
-        stats = asset_queries.get_asset_statistics()
+    async def build_categories():
+        stats = await run_db(asset_queries.get_asset_statistics)
         categories = [c['category'] for c in stats.get('by_category', [])]
         return {
             "categories": categories,
             "count": len(categories)
-        }
+        }, [STATS_TAG]
+    
+    try:
+        return await cached_json_response('categories', {}, build_categories)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error: {str(e)}")
 
 
 @router.get("/creators")
-async def get_creators():
-    asset_queries = get_asset_queries()
+async def get_creators(asset_queries: Optional[AssetQueries] = Depends(get_asset_queries)):
     if not asset_queries:
         return {
             "creators": [],
@@ -1261,28 +1462,30 @@ async def get_creators():
             "note": "Database not available"
         }
     
-    try:
+    async def build_creators():
         # This assumes you have a by_creator field in your stats, otherwise adjust accordingly
-        stats = asset_queries.get_asset_statistics()
+        stats = await run_db(asset_queries.get_asset_statistics)
         creators = list(stats.get('by_creator', {}).keys()) if 'by_creator' in stats else []
         return {
             "creators": creators,
             "count": len(creators)
-        }
+        }, [STATS_TAG]
+    
+    try:
+        return await cached_json_response('creators', {}, build_creators)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error: {str(e)}")
 
 @router.post("/assets/{asset_id}/copy-folder-path")
-async def copy_asset_folder_path(asset_id: str):
+async def copy_asset_folder_path(asset_id: str, asset_queries: Optional[AssetQueries] = Depends(get_asset_queries)):
     """Get asset folder path for copying to clipboard"""
     
     # Get asset from database
-    asset_queries = get_asset_queries()
     if not asset_queries:
         raise HTTPException(status_code=503, detail="Database not available")
     
     try:
-        asset_data = asset_queries.get_asset_with_dependencies(asset_id).get('asset')
+        asset_data = (await run_db(asset_queries.get_asset_with_dependencies, asset_id)).get('asset')
         if not asset_data:
             raise HTTPException(status_code=404, detail="Asset not found")
         
@@ -1303,13 +1506,13 @@ async def copy_asset_folder_path(asset_id: str):
         from pathlib import Path
         folder_exists = False
         
-        if Path(folder_path).exists():
+        if await run_fs(Path(folder_path).exists):
             folder_exists = True
             logger.info(f"✅ Folder exists at network path: {folder_path}")
         else:
             # Try container mount path as fallback for verification
             container_fallback = folder_path.replace('/net/library/atlaslib/', '/app/assets/')
-            if Path(container_fallback).exists():
+            if await run_fs(Path(container_fallback).exists):
                 folder_exists = True
                 logger.info(f"✅ Folder exists at container mount: {container_fallback}, using network path: {folder_path}")
         
@@ -1333,263 +1536,244 @@ async def copy_asset_folder_path(asset_id: str):
         logger.error(f"Error getting folder path for asset {asset_id}: {e}")
         raise HTTPException(status_code=500, detail=f"Failed to get folder path: {str(e)}")
 
+# Slot order used when texture set metadata lists provided paths
+TEXTURE_SLOT_ORDER = {
+    'baseColor': 0,
+    'metallic': 1,
+    'roughness': 2,
+    'normal': 3,
+    'opacity': 4,
+    'displacement': 5
+}
+
+# Filename keyword -> position for files without explicit positions
+TEXTURE_TYPE_PRIORITY = {
+    'basecolor': 0, 'albedo': 0, 'diffuse': 0,
+    'metallic': 1, 'metalness': 1, 'metal': 1,
+    'roughness': 2, 'rough': 2,
+    'normal': 3, 'bump': 3,
+    'opacity': 4, 'alpha': 4, 'transparency': 4,
+    'displacement': 5, 'height': 5, 'disp': 5
+}
+
+def get_texture_position(image_info: dict, asset_data: dict) -> int:
+    """Sort position of a texture image: explicit texture set mappings first, then filename fallback"""
+    # Preview images always come first
+    if image_info.get('is_preview', False):
+        return -1  # Preview comes before all texture maps
+
+    filename = image_info['filename'].lower()
+
+    # For texture sets, use explicit mapping from metadata instead of guessing from filename
+    texture_set_info = asset_data.get('metadata', {}).get('texture_set_info', {})
+    if texture_set_info and texture_set_info.get('type') == 'texture_set':
+        provided_paths = texture_set_info.get('provided_paths', {})
+        texture_slots = texture_set_info.get('texture_slots', {})
+
+        # First, try to match by original filename from texture slots
+        for slot_key, slot_info in texture_slots.items():
+            if slot_info.get('original_filename', '').lower() == filename:
+                return int(slot_info.get('position', 99))
+
+        # Second, try to match by checking if the image filename appears in any provided path
+        for slot_key, file_path in provided_paths.items():
+            if file_path and Path(file_path).name.lower() == filename:
+                return TEXTURE_SLOT_ORDER.get(slot_key, 99)
+
+    # Fallback to filename-based position pattern for legacy assets: Name_Position_Type_
+    parts = filename.split('_')
+    for i, part in enumerate(parts):
+        if part.isdigit() and i > 0:  # Position should not be the first part
+            # Check if next part matches texture type
+            if i + 1 < len(parts):
+                next_part = parts[i + 1]
+                if any(tex_type in next_part for tex_type in ['basecolor', 'metallic', 'roughness', 'normal', 'opacity', 'displacement']):
+                    return int(part)
+
+    # Final fallback to texture type priority for files without position numbers
+    for tex_type, position in TEXTURE_TYPE_PRIORITY.items():
+        if tex_type in filename:
+            return position
+
+    # Unknown texture types go last
+    return 99
+
+def map_thumbnail_to_original(thumbnail_name: str, asset_data: dict) -> str:
+    """Map a texture thumbnail filename back to the original texture filename via texture_set_info"""
+    if '_thumbnail' not in thumbnail_name:
+        return thumbnail_name
+
+    texture_slots = asset_data.get('metadata', {}).get('texture_set_info', {}).get('texture_slots', {})
+
+    # Parse thumbnail name to extract position and type
+    # Example: Faux_2_0_BaseColor_thumbnail.png -> position=0, type=BaseColor
+    # We need to find the position digit that comes BEFORE a texture type keyword
+    name_parts = thumbnail_name.replace('_thumbnail.png', '').split('_')
+    texture_types = ['BaseColor', 'Metallic', 'Roughness', 'Normal', 'Opacity', 'Displacement']
+
+    found_position = None
+    for i, part in enumerate(name_parts):
+        if part in texture_types:
+            # Position should be the previous part if it's a digit
+            if i > 0 and name_parts[i-1].isdigit():
+                found_position = name_parts[i-1]
+            break
+
+    if found_position is None:
+        logger.warning(f"Could not parse position from thumbnail: {thumbnail_name}")
+        return thumbnail_name
+
+    for slot_key, slot_info in texture_slots.items():
+        if str(slot_info.get('position', '')) == found_position:
+            return slot_info.get('original_filename', thumbnail_name)
+    return thumbnail_name
+
+def existing_library_path(path: str) -> Optional[Path]:
+    """Return the path as stored or its container-mount equivalent, whichever exists"""
+    for candidate in (Path(path), Path(to_container_path(path))):
+        if candidate.exists():
+            return candidate
+    return None
+
+def find_original_texture(original_filename: str, asset_data: dict) -> Optional[str]:
+    """Copied full-resolution texture behind a thumbnail (single textures have exactly one)"""
+    copied_files = [path for path in asset_data.get('paths', {}).get('copied_files', []) or []
+                    if '/Extras/' not in path]
+    for path in copied_files:
+        if Path(path).name == original_filename:
+            return path
+    return copied_files[0] if len(copied_files) == 1 else None
+
+def collect_texture_images(asset_data: dict):
+    """
+    Ordered preview + texture thumbnail list for a texture asset
+
+    Returns ``(result, watched_paths)`` where result is ``{"images", "resolutions"}``
+    or None when the asset folder cannot be found.
+    """
+    folder_path = asset_data.get('folder_path') or asset_data.get('paths', {}).get('folder_path')
+    if not folder_path:
+        return None, []
+    
+    # Prefer the network path, fall back to the container mount
+    folder = existing_library_path(convert_to_network_path(folder_path))
+    if folder is None:
+        return None, []
+    
+    preview_folder = folder / "Preview"
+    thumbnail_folder = folder / "Thumbnail"
+    watched_paths = [folder, preview_folder, thumbnail_folder, folder / PYRAMID_FOLDER]
+    resolution = asset_data.get('metadata', {}).get('resolution', 'Unknown')
+    images = []
+    resolutions = {}
+    
+    # First, check if there's a preview image
+    preview_files = (asset_data.get('paths', {}).get('preview_files', []) or 
+                    asset_data.get('metadata', {}).get('paths', {}).get('preview_files', []))
+    
+    preview_path = existing_library_path(preview_files[0]) if preview_files else None
+    
+    # Fallback: Scan Preview folder directly if not found in database
+    if preview_path is None and preview_folder.exists():
+        for file_path in sorted(preview_folder.iterdir()):
+            if file_path.is_file() and file_path.name.lower() == 'preview.png':
+                preview_path = file_path
+                break
+    
+    if preview_path is not None:
+        watched_paths.append(preview_path)
+        images.append({
+            "filename": "Preview.png",
+            # For the API response, convert to network path for external access
+            "path": convert_to_network_path(str(preview_path)),
+            "relative_path": "Preview/Preview.png",
+            "is_original": False,
+            "is_preview": True
+        })
+        resolutions[0] = resolution
+    
+    # Then, get thumbnail files from the database (NOT copied_files)
+    thumbnail_files = asset_data.get('paths', {}).get('thumbnails', [])
+    
+    if thumbnail_files:
+        for file_path in thumbnail_files:
+            # Skip missing files so list indexes match what texture-image can serve
+            if existing_library_path(file_path) is None:
+                continue
+            file_path_obj = Path(file_path)
+            original_filename = map_thumbnail_to_original(file_path_obj.name, asset_data)
+            images.append({
+                "filename": original_filename,
+                "path": str(file_path),  # Full path to thumbnail file
+                "original_path": find_original_texture(original_filename, asset_data),  # Pyramid source
+                "relative_path": f"Thumbnail/{file_path_obj.name}",
+                "is_original": False,  # These are thumbnails, not originals
+                "is_thumbnail": True,
+                "is_preview": False
+            })
+            resolutions[len(images) - 1] = resolution
+    
+    # Fallback: Scan Thumbnail folder if no thumbnails in database
+    elif thumbnail_folder.exists():
+        image_extensions = {'.png', '.jpg', '.jpeg', '.tiff', '.tga', '.exr', '.tif'}
+        
+        for file_path in sorted(thumbnail_folder.iterdir()):
+            if file_path.is_file() and file_path.suffix.lower() in image_extensions:
+                # Extract original filename from thumbnail name
+                original_filename = file_path.name.replace('_thumbnail', '') if '_thumbnail' in file_path.name else file_path.name
+                
+                images.append({
+                    "filename": original_filename,
+                    "path": str(file_path),  # Full path to thumbnail file
+                    "original_path": find_original_texture(original_filename, asset_data),  # Pyramid source
+                    "relative_path": str(file_path.relative_to(folder)),
+                    "is_original": False,
+                    "is_thumbnail": True,
+                    "is_preview": False
+                })
+                resolutions[len(images) - 1] = resolution
+    
+    images.sort(key=lambda image_info: get_texture_position(image_info, asset_data))
+    logger.info(f"📸 Indexed {len(images)} texture images for asset {asset_data.get('_key')}")
+    
+    return {"images": images, "resolutions": resolutions}, watched_paths
+
+def get_cached_texture_images(asset_id: str, asset_data: dict) -> Optional[dict]:
+    """Texture image list shared by texture-images and texture-image/{index}"""
+    return asset_file_cache.get(asset_id, 'texture_images', lambda: collect_texture_images(asset_data))
+
+def is_texture_asset(asset_data: dict) -> bool:
+    return (asset_data.get('asset_type') or asset_data.get('category')) == 'Textures'
+
 @router.get("/assets/{asset_id}/texture-images")
-async def get_texture_images(asset_id: str):
+async def get_texture_images(asset_id: str, asset_queries: Optional[AssetQueries] = Depends(get_asset_queries)):
     """Get list of texture images for navigation"""
     
     # Get asset from database
-    asset_queries = get_asset_queries()
     if not asset_queries:
         raise HTTPException(status_code=503, detail="Database not available")
     
     try:
-        asset_data = asset_queries.get_asset_with_dependencies(asset_id).get('asset')
+        asset_data = await run_db(asset_file_cache.get_asset, asset_id, asset_queries)
         if not asset_data:
             raise HTTPException(status_code=404, detail="Asset not found")
         
         # Check if this is a texture asset
-        asset_type = asset_data.get('asset_type') or asset_data.get('category')
-        if asset_type != 'Textures':
-            return {"images": [], "resolutions": {}}
-        
-        # Get folder path
-        folder_path = asset_data.get('folder_path') or asset_data.get('paths', {}).get('folder_path')
-        if not folder_path:
+        if not is_texture_asset(asset_data):
             return {"images": [], "resolutions": {}}
         
-        # Convert container mount path if needed
-        if folder_path.startswith('/app/assets/'):
-            folder_path = folder_path.replace('/app/assets/', '/net/library/atlaslib/')
-        
-        # Check if folder exists
-        from pathlib import Path
-        folder = Path(folder_path)
-        if not folder.exists():
-            # Try container mount as fallback
-            container_folder = Path(folder_path.replace('/net/library/atlaslib/', '/app/assets/'))
-            if container_folder.exists():
-                folder = container_folder
-            else:
-                return {"images": [], "resolutions": {}}
-        
-        # Look for original texture files in the asset subfolder (for copying)
-        # Use asset_subfolder from metadata if available, otherwise fallback to "Assets"
-        asset_subfolder_path = asset_data.get('paths', {}).get('asset_subfolder')
-        if asset_subfolder_path:
-            # Extract just the subfolder name from the full path
-            assets_folder = Path(asset_subfolder_path)
-        else:
-            # Fallback to hardcoded "Assets" for legacy assets
-            assets_folder = folder / "Assets"
-        preview_folder = folder / "Preview"
-        images = []
-        resolutions = {}
-        
-        # First, check if there's a preview image
-        preview_files = (asset_data.get('paths', {}).get('preview_files', []) or 
-                        asset_data.get('metadata', {}).get('paths', {}).get('preview_files', []))
-        
-        preview_found = False
-        if preview_files and len(preview_files) > 0:
-            # Add preview image as the first image (use container path directly)
-            preview_path = Path(preview_files[0])
-            if preview_path.exists():
-                # For the API response, convert to network path for external access
-                network_path = str(preview_path).replace('/app/assets/', '/net/library/atlaslib/')
-                images.append({
-                    "filename": "Preview.png",
-                    "path": network_path,
-                    "relative_path": "Preview/Preview.png",
-                    "is_original": False,
-                    "is_preview": True
-                })
-                resolutions[0] = asset_data.get('metadata', {}).get('resolution', 'Unknown')
-                logger.info(f"🖼️ Added preview image from database: {preview_path}")
-                preview_found = True
-        
-        # Fallback: Scan Preview folder directly if not found in database
-        if not preview_found and (folder / "Preview").exists():
-            preview_folder = folder / "Preview"
-            for file_path in preview_folder.iterdir():
-                if file_path.is_file() and file_path.name.lower() == 'preview.png':
-                    # Convert to network path for external access
-                    network_path = str(file_path).replace('/app/assets/', '/net/library/atlaslib/')
-                    images.append({
-                        "filename": "Preview.png",
-                        "path": network_path,
-                        "relative_path": "Preview/Preview.png",
-                        "is_original": False,
-                        "is_preview": True
-                    })
-                    resolutions[0] = asset_data.get('metadata', {}).get('resolution', 'Unknown')
-                    logger.info(f"🖼️ Added preview image from filesystem scan: {file_path}")
-                    preview_found = True
-                    break
-        
-        # Then, get thumbnail files from the database (NOT copied_files)
-        thumbnail_files = asset_data.get('paths', {}).get('thumbnails', [])
-        
-        if thumbnail_files:
-            logger.info(f"🖼️ Using thumbnails from database: {len(thumbnail_files)} files")
-            for i, file_path in enumerate(thumbnail_files):
-                file_path_obj = Path(file_path)
-                # Offset index by 1 if preview was actually found and added
-                res_index = i + 1 if preview_found else i
-                
-                # Extract original filename from thumbnail name for texture slot mapping
-                thumbnail_name = file_path_obj.name
-                original_filename = thumbnail_name
-                
-                # For texture sets, map thumbnail to original using texture_set_info
-                if '_thumbnail' in thumbnail_name:
-                    texture_set_info = asset_data.get('metadata', {}).get('texture_set_info', {})
-                    texture_slots = texture_set_info.get('texture_slots', {})
-
-                    # Parse thumbnail name to extract position and type
-                    # Example: Faux_2_0_BaseColor_thumbnail.png -> position=0, type=BaseColor
-                    # We need to find the position digit that comes BEFORE a texture type keyword
-                    name_without_ext = thumbnail_name.replace('_thumbnail.png', '')
-                    name_parts = name_without_ext.split('_')
-
-                    # Known texture type keywords
-                    texture_types = ['BaseColor', 'Metallic', 'Roughness', 'Normal', 'Opacity', 'Displacement']
-
-                    # Find position and type by looking for texture type keywords
-                    found_position = None
-                    found_type = None
-                    for i, part in enumerate(name_parts):
-                        if part in texture_types:
-                            found_type = part
-                            # Position should be the previous part if it's a digit
-                            if i > 0 and name_parts[i-1].isdigit():
-                                found_position = name_parts[i-1]
-                            break
-
-                    # Find matching texture slot using position
-                    if found_position is not None:
-                        for slot_key, slot_info in texture_slots.items():
-                            if str(slot_info.get('position', '')) == found_position:
-                                original_filename = slot_info.get('original_filename', thumbnail_name)
-                                logger.debug(f"Mapped thumbnail position {found_position} to original: {original_filename}")
-                                break
-                    else:
-                        logger.warning(f"Could not parse position from thumbnail: {thumbnail_name}")
-                
-                images.append({
-                    "filename": original_filename,
-                    "path": str(file_path),  # Full path to thumbnail file
-                    "relative_path": f"Thumbnail/{file_path_obj.name}",
-                    "is_original": False,  # These are thumbnails, not originals
-                    "is_thumbnail": True,
-                    "is_preview": False
-                })
-                resolutions[res_index] = asset_data.get('metadata', {}).get('resolution', 'Unknown')
-        
-        # Fallback: Scan Thumbnail folder if no thumbnails in database
-        elif (folder / "Thumbnail").exists():
-            thumbnail_folder = folder / "Thumbnail"
-            logger.info(f"🖼️ Scanning Thumbnail folder: {thumbnail_folder}")
-            image_extensions = {'.png', '.jpg', '.jpeg', '.tiff', '.tga', '.exr', '.tif'}
-            
-            for file_path in thumbnail_folder.iterdir():
-                if file_path.is_file() and file_path.suffix.lower() in image_extensions:
-                    # Extract original filename from thumbnail name
-                    original_filename = file_path.name.replace('_thumbnail', '') if '_thumbnail' in file_path.name else file_path.name
-                    
-                    images.append({
-                        "filename": original_filename,
-                        "path": str(file_path),  # Full path to thumbnail file
-                        "relative_path": str(file_path.relative_to(folder)),
-                        "is_original": False,
-                        "is_thumbnail": True,
-                        "is_preview": False
-                    })
-                    # Try to get resolution from asset metadata
-                    resolutions[len(images) - 1] = asset_data.get('metadata', {}).get('resolution', 'Unknown')
+        texture_images = await run_fs(get_cached_texture_images, asset_id, asset_data)
         
-        # If no images found, return empty result
-        else:
+        # If no folder or no images found, return empty result
+        if not texture_images or not texture_images["images"]:
             logger.warning(f"⚠️ No Preview or Thumbnail files found for {asset_id}")
             return {"images": [], "resolutions": {}}
         
-        # Sort images by position using explicit texture set mappings first, then filename fallback
-        def get_texture_position(image_info):
-            # Preview images always come first
-            if image_info.get('is_preview', False):
-                return -1  # Preview comes before all texture maps
-
-            filename = image_info['filename'].lower()
-
-            # For texture sets, use explicit mapping from metadata instead of guessing from filename
-            texture_set_info = asset_data.get('metadata', {}).get('texture_set_info', {})
-            if texture_set_info and texture_set_info.get('type') == 'texture_set':
-                provided_paths = texture_set_info.get('provided_paths', {})
-                texture_slots = texture_set_info.get('texture_slots', {})
-
-                # First, try to match by original filename from texture slots
-                for slot_key, slot_info in texture_slots.items():
-                    if slot_info.get('original_filename', '').lower() == image_info['filename'].lower():
-                        slot_position = int(slot_info.get('position', 99))
-                        logger.info(f"📍 Matched {image_info['filename']} to slot {slot_key} at position {slot_position}")
-                        return slot_position
-
-                # Second, try to match by checking if the image filename appears in any provided path
-                for slot_key, file_path in provided_paths.items():
-                    if file_path and Path(file_path).name.lower() == image_info['filename'].lower():
-                        # Get position from the defined texture order
-                        texture_order = {
-                            'baseColor': 0,
-                            'metallic': 1,
-                            'roughness': 2,
-                            'normal': 3,
-                            'opacity': 4,
-                            'displacement': 5
-                        }
-                        slot_position = texture_order.get(slot_key, 99)
-                        logger.info(f"📍 Matched {image_info['filename']} to provided path {slot_key} at position {slot_position}")
-                        return slot_position
-
-            # Fallback to filename-based position pattern for legacy assets: Name_Position_Type_
-            parts = filename.split('_')
-            for i, part in enumerate(parts):
-                if part.isdigit() and i > 0:  # Position should not be the first part
-                    # Check if next part matches texture type
-                    if i + 1 < len(parts):
-                        next_part = parts[i + 1]
-                        if any(tex_type in next_part for tex_type in ['basecolor', 'metallic', 'roughness', 'normal', 'opacity', 'displacement']):
-                            return int(part)
-
-            # Final fallback to texture type priority for files without position numbers
-            texture_priority = {
-                'basecolor': 0, 'albedo': 0, 'diffuse': 0,
-                'metallic': 1, 'metalness': 1, 'metal': 1,
-                'roughness': 2, 'rough': 2,
-                'normal': 3, 'bump': 3,
-                'opacity': 4, 'alpha': 4, 'transparency': 4,
-                'displacement': 5, 'height': 5, 'disp': 5
-            }
-
-            for tex_type, position in texture_priority.items():
-                if tex_type in filename:
-                    logger.info(f"📍 Fallback: Matched {image_info['filename']} to texture type {tex_type} at position {position}")
-                    return position
-
-            # Unknown texture types go last
-            logger.info(f"📍 Unknown texture type for {image_info['filename']}, assigning position 99")
-            return 99
-            
-        images.sort(key=get_texture_position)
-        
-        # Debug logging to verify order
-        for i, img in enumerate(images):
-            is_preview = img.get('is_preview', False)
-            logger.info(f"📸 Image {i}: {img.get('filename')} (preview: {is_preview})")
-        
-        logger.info(f"📸 Found {len(images)} texture images for asset {asset_id}")
+        images = texture_images["images"]
         
         return {
             "images": images,
-            "resolutions": resolutions,
+            "resolutions": texture_images["resolutions"],
             "asset_id": asset_id,
             "asset_name": asset_data.get('name', 'Unknown'),
             "total_images": len(images)
@@ -1601,184 +1785,154 @@ async def get_texture_images(asset_id: str):
         logger.error(f"Error getting texture images for asset {asset_id}: {e}")
         raise HTTPException(status_code=500, detail=f"Failed to get texture images: {str(e)}")
 
-@router.get("/assets/{asset_id}/texture-image/{image_index}")
-async def get_texture_image_by_index(asset_id: str, image_index: int):
-    """Serve a specific texture image by index - uses same ordering as texture-images endpoint"""
-    
-    # Get asset from database
-    asset_queries = get_asset_queries()
+async def resolve_texture_image(asset_id: str, image_index: int, asset_queries: Optional[AssetQueries]) -> Tuple[dict, dict]:
+    """(asset document, texture-images entry) for an index, or the HTTPException to raise"""
     if not asset_queries:
         raise HTTPException(status_code=503, detail="Database not available")
     
+    asset_data = await run_db(asset_file_cache.get_asset, asset_id, asset_queries)
+    if not asset_data:
+        raise HTTPException(status_code=404, detail="Asset not found")
+    
+    # Check if this is a texture asset
+    if not is_texture_asset(asset_data):
+        raise HTTPException(status_code=404, detail="Not a texture asset")
+    
+    # Same cached, ordered list as the texture-images endpoint
+    texture_images = await run_fs(get_cached_texture_images, asset_id, asset_data)
+    if texture_images is None:
+        raise HTTPException(status_code=404, detail="Asset folder not found")
+    images = texture_images["images"]
+    
+    # Check if image_index is valid
+    if image_index < 0 or image_index >= len(images):
+        raise HTTPException(status_code=404, detail=f"Image index {image_index} out of range (0-{len(images)-1})")
+    
+    return asset_data, images[image_index]
+
+def texture_pyramid_location(selected_image: dict) -> Tuple[Optional[Path], Optional[Path]]:
+    """(full-resolution texture, pyramid folder) for a texture-images entry; (None, None) without an original"""
+    original_path = selected_image.get("original_path")
+    source = existing_library_path(original_path) if original_path else None
+    if source is None:
+        return None, None
+    # Originals live in <asset folder>/Asset/
+    return source, pyramid_dir(source.parent.parent, source)
+
+def get_cached_pyramid_manifest(asset_id: str, image_index: int, source: Path, target: Path) -> Optional[dict]:
+    return asset_file_cache.get(asset_id, f'pyramid:{image_index}', lambda: load_manifest(target, source))
+
+# Last build this process asked for: pyramid folder -> (job id, source version it built), to
+# report failures; the queue itself keeps one queued/running build per folder (unique=True)
+_pyramid_jobs: Dict[str, Tuple[str, Optional[str]]] = {}
+
+async def queue_pyramid_build(source: Path, target: Path) -> JSONResponse:
+    """Start (or report) the background build of a missing/stale pyramid"""
+    job_id, built_version = _pyramid_jobs.get(str(target), (None, None))
+    job = await run_fs(job_queue.get, job_id) if job_id else None
+    source_version = await run_fs(stat_version, source)
+    if job is not None and job['status'] == 'failed':
+        if source_version == built_version:
+            raise HTTPException(status_code=500, detail=f"Pyramid build failed: {job['error']}")
+        # The source was replaced since the failed attempt: build it again
+        job = None
+    if job is None or job['status'] == 'succeeded':
+        # One build per pyramid folder across requests and API processes
+        job = await job_queue.enqueue('texture_pyramid', {"source": str(source), "target": str(target)}, unique=True)
+        _pyramid_jobs[str(target)] = (job['id'], source_version)
+    return JSONResponse(status_code=202, content={
+        "status": "building",
+        "job_id": job['id'],
+        "status_url": f"/api/v1/jobs/{job['id']}"
+    })
+
+def parse_tile(tile: str) -> Tuple[int, int]:
     try:
-        asset_data = asset_queries.get_asset_with_dependencies(asset_id).get('asset')
-        if not asset_data:
-            raise HTTPException(status_code=404, detail="Asset not found")
+        column, row = (int(part) for part in tile.split(','))
+    except ValueError:
+        raise HTTPException(status_code=400, detail=f"Invalid tile '{tile}', expected 'x,y'")
+    return column, row
+
+TEXTURE_IMAGE_HEADERS = {
+    "Access-Control-Allow-Origin": "*",
+    "Access-Control-Allow-Methods": "GET",
+    "Access-Control-Allow-Headers": "*"
+}
+
+@router.get("/assets/{asset_id}/texture-image/{image_index}/pyramid")
+async def get_texture_image_pyramid(asset_id: str, image_index: int, asset_queries: Optional[AssetQueries] = Depends(get_asset_queries)):
+    """
+    Deep-zoom manifest (levels, tile grid, tile URL template) for a texture image
+    
+    Level 0 is full resolution and each level halves it. Answers 202 with a
+    job id while the pyramid is being built.
+    """
+    try:
+        _, selected_image = await resolve_texture_image(asset_id, image_index, asset_queries)
+        source, target = await run_fs(texture_pyramid_location, selected_image)
+        if source is None:
+            raise HTTPException(status_code=404, detail=f"No full-resolution texture for image {image_index}")
         
-        # Check if this is a texture asset
-        asset_type = asset_data.get('asset_type') or asset_data.get('category')
-        if asset_type != 'Textures':
-            raise HTTPException(status_code=404, detail="Not a texture asset")
+        manifest = await run_fs(get_cached_pyramid_manifest, asset_id, image_index, source, target)
+        if manifest is None:
+            return await queue_pyramid_build(source, target)
         
-        # Use same image gathering logic as get_texture_images endpoint
-        images = []
+        return {
+            **manifest,
+            "asset_id": asset_id,
+            "image_index": image_index,
+            "tile_url": f"/api/v1/assets/{asset_id}/texture-image/{image_index}"
+                        f"?level={{level}}&tile={{x}},{{y}}&v={manifest['version']}"
+        }
         
-        # Get folder path for fallback scanning
-        folder_path = asset_data.get('folder_path') or asset_data.get('paths', {}).get('folder_path')
-        if not folder_path:
-            raise HTTPException(status_code=404, detail="Asset folder path not found")
-            
-        # Convert container mount path if needed
-        if folder_path.startswith('/app/assets/'):
-            folder_path = folder_path.replace('/app/assets/', '/net/library/atlaslib/')
-            
-        # Check if folder exists
-        from pathlib import Path
-        folder = Path(folder_path)
-        if not folder.exists():
-            # Try container mount as fallback
-            container_folder = Path(folder_path.replace('/net/library/atlaslib/', '/app/assets/'))
-            if container_folder.exists():
-                folder = container_folder
-            else:
-                raise HTTPException(status_code=404, detail="Asset folder not found")
-        
-        # First, check if there's a preview image
-        preview_files = (asset_data.get('paths', {}).get('preview_files', []) or 
-                        asset_data.get('metadata', {}).get('paths', {}).get('preview_files', []))
-        
-        preview_found = False
-        if preview_files and len(preview_files) > 0:
-            # Add preview image as the first image (use container path directly)
-            preview_path = Path(preview_files[0])
-            if preview_path.exists():
-                images.append({
-                    "filename": "Preview.png", 
-                    "path": str(preview_path),
-                    "is_preview": True
-                })
-                preview_found = True
-                
-        # Fallback: Scan Preview folder directly if not found in database
-        if not preview_found and (folder / "Preview").exists():
-            preview_folder = folder / "Preview"
-            for file_path in preview_folder.iterdir():
-                if file_path.is_file() and file_path.name.lower() == 'preview.png':
-                    images.append({
-                        "filename": "Preview.png",
-                        "path": str(file_path),  # Use actual file path for serving
-                        "is_preview": True
-                    })
-                    preview_found = True
-                    break
-        
-        # Then add texture images from thumbnails (NOT copied_files)
-        thumbnail_files = asset_data.get('paths', {}).get('thumbnails', [])
-        if thumbnail_files:
-            for file_path_str in thumbnail_files:
-                file_path = Path(file_path_str)
-                if file_path.exists():
-                    # Map thumbnail name back to original filename for frontend consistency
-                    thumbnail_name = file_path.name
-                    
-                    # Extract original filename using texture slot mapping
-                    original_filename = thumbnail_name
-                    if '_thumbnail' in thumbnail_name:
-                        texture_set_info = asset_data.get('metadata', {}).get('texture_set_info', {})
-                        texture_slots = texture_set_info.get('texture_slots', {})
-                        
-                        # Parse thumbnail name to extract position (Stone_Wall_0_BaseColor_thumbnail.png -> position=0)
-                        name_parts = thumbnail_name.replace('_thumbnail.png', '').split('_')
-                        found_position = None
-                        for part in name_parts:
-                            if part.isdigit():
-                                found_position = part
-                                break
-                        
-                        # Find matching texture slot using position
-                        if found_position is not None:
-                            for slot_key, slot_info in texture_slots.items():
-                                if str(slot_info.get('position', '')) == found_position:
-                                    original_filename = slot_info.get('original_filename', thumbnail_name)
-                                    break
-                    
-                    images.append({
-                        "filename": original_filename,
-                        "path": str(file_path),  # Path to thumbnail file
-                        "is_preview": False,
-                        "is_thumbnail": True
-                    })
-        
-        # Sort images by position using explicit texture set mappings first, then filename fallback
-        def get_texture_position(image_info):
-            # Preview images always come first
-            if image_info.get('is_preview', False):
-                return -1  # Preview comes before all texture maps
-
-            filename = image_info['filename'].lower()
-
-            # For texture sets, use explicit mapping from metadata instead of guessing from filename
-            texture_set_info = asset_data.get('metadata', {}).get('texture_set_info', {})
-            if texture_set_info and texture_set_info.get('type') == 'texture_set':
-                provided_paths = texture_set_info.get('provided_paths', {})
-                texture_slots = texture_set_info.get('texture_slots', {})
-
-                # First, try to match by original filename from texture slots
-                for slot_key, slot_info in texture_slots.items():
-                    if slot_info.get('original_filename', '').lower() == image_info['filename'].lower():
-                        slot_position = int(slot_info.get('position', 99))
-                        return slot_position
-
-                # Second, try to match by checking if the image filename appears in any provided path
-                for slot_key, file_path in provided_paths.items():
-                    if file_path and Path(file_path).name.lower() == image_info['filename'].lower():
-                        # Get position from the defined texture order
-                        texture_order = {
-                            'baseColor': 0,
-                            'metallic': 1,
-                            'roughness': 2,
-                            'normal': 3,
-                            'opacity': 4,
-                            'displacement': 5
-                        }
-                        slot_position = texture_order.get(slot_key, 99)
-                        return slot_position
-
-            # Fallback to filename-based position pattern for legacy assets: Name_Position_Type_
-            parts = filename.split('_')
-            for i, part in enumerate(parts):
-                if part.isdigit() and i > 0:  # Position should not be the first part
-                    # Check if next part matches texture type
-                    if i + 1 < len(parts):
-                        next_part = parts[i + 1]
-                        if any(tex_type in next_part for tex_type in ['basecolor', 'metallic', 'roughness', 'normal', 'opacity', 'displacement']):
-                            return int(part)
-
-            # Final fallback to texture type priority for files without position numbers
-            texture_priority = {
-                'basecolor': 0, 'albedo': 0, 'diffuse': 0,
-                'metallic': 1, 'metalness': 1, 'metal': 1,
-                'roughness': 2, 'rough': 2,
-                'normal': 3, 'bump': 3,
-                'opacity': 4, 'alpha': 4, 'transparency': 4,
-                'displacement': 5, 'height': 5, 'disp': 5
-            }
-
-            for tex_type, position in texture_priority.items():
-                if tex_type in filename:
-                    return position
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error getting pyramid for texture image {image_index} of asset {asset_id}: {e}")
+        raise HTTPException(status_code=500, detail=f"Failed to get texture pyramid: {str(e)}")
 
-            # Unknown texture types go last
-            return 99
-        
-        images.sort(key=get_texture_position)
-        
-        # Check if image_index is valid
-        if image_index < 0 or image_index >= len(images):
-            raise HTTPException(status_code=404, detail=f"Image index {image_index} out of range (0-{len(images)-1})")
+@router.get("/assets/{asset_id}/texture-image/{image_index}")
+async def get_texture_image_by_index(
+        asset_id: str,
+        image_index: int,
+        request: Request,
+        level: Optional[int] = Query(None, ge=0, description="Pyramid level (0 = full resolution)"),
+        tile: str = Query("0,0", description="Tile column,row within the level"),
+        asset_queries: Optional[AssetQueries] = Depends(get_asset_queries)
+):
+    """
+    Serve a specific texture image by index - uses same ordering as texture-images endpoint
+    
+    With ``level`` a single pyramid tile is served instead (see .../pyramid).
+    """
+    try:
+        _, selected_image = await resolve_texture_image(asset_id, image_index, asset_queries)
+        
+        if level is not None:
+            column, row = parse_tile(tile)
+            source, target = await run_fs(texture_pyramid_location, selected_image)
+            if source is None:
+                raise HTTPException(status_code=404, detail=f"No full-resolution texture for image {image_index}")
+            manifest = await run_fs(get_cached_pyramid_manifest, asset_id, image_index, source, target)
+            if manifest is None:
+                return await queue_pyramid_build(source, target)
+            tile_file = tile_path(target, manifest, level, column, row)
+            if tile_file is None:
+                raise HTTPException(status_code=404, detail=f"Tile {column},{row} of level {level} is outside the pyramid")
+            # Tiles only change with the source, so ?v=<version> URLs are immutable
+            return await conditional_file_response(
+                request,
+                tile_file,
+                media_type=manifest['media_type'],
+                cache_control="public, max-age=86400",
+                version=manifest['version'],
+                headers=TEXTURE_IMAGE_HEADERS
+            )
         
-        selected_image = images[image_index]
-        image_path = Path(selected_image["path"])
+        image_path = await run_fs(existing_library_path, selected_image["path"])
+        if image_path is None:
+            logger.error(f"❌ Image file not found: {selected_image['path']}")
+            raise HTTPException(status_code=404, detail=f"Image file not found: {selected_image['filename']}")
         
         # Determine content type based on file extension
         if image_path.suffix.lower() == '.png':
@@ -1790,51 +1944,16 @@ async def get_texture_image_by_index(asset_id: str, image_index: int):
         else:
             content_type = "image/png"  # Default
         
-        # Since we're now using thumbnail paths directly, just serve the file
-        if image_path.exists():
-            logger.info(f"🖼️ ✅ Serving image: {image_path}")
-            try:
-                import mimetypes
-                from fastapi.responses import FileResponse
-                
-                # Use FileResponse for better file serving
-                return FileResponse(
-                    path=str(image_path),
-                    media_type=content_type,
-                    filename=selected_image["filename"],
-                    headers={
-                        "Access-Control-Allow-Origin": "*",
-                        "Access-Control-Allow-Methods": "GET",
-                        "Access-Control-Allow-Headers": "*"
-                    }
-                )
-            except Exception as e:
-                logger.error(f"❌ Error serving image file: {e}")
-                # Fallback to manual file reading
-                pass
-        
-        # Fallback: serve file manually if FileResponse fails
-        if image_path.exists():
-            try:
-                with open(image_path, "rb") as f:
-                    image_data = f.read()
-                
-                from fastapi.responses import Response
-                return Response(
-                    content=image_data,
-                    media_type=content_type,
-                    headers={
-                        "Cache-Control": "public, max-age=3600",
-                        "Content-Disposition": f'inline; filename="{selected_image["filename"]}"'
-                    }
-                )
-            except Exception as e:
-                logger.error(f"❌ Error reading image file: {e}")
-                raise HTTPException(status_code=500, detail=f"Error reading image file: {str(e)}")
-        else:
-            logger.error(f"❌ Image file not found: {image_path}")
-            raise HTTPException(status_code=404, detail=f"Image file not found: {selected_image['filename']}")
+        logger.info(f"🖼️ ✅ Serving image: {image_path}")
         
+        return await conditional_file_response(
+            request,
+            image_path,
+            media_type=content_type,
+            cache_control="public, max-age=3600",
+            filename=selected_image["filename"],
+            headers=TEXTURE_IMAGE_HEADERS
+        )
         
     except HTTPException:
         raise
@@ -1843,161 +1962,18 @@ async def get_texture_image_by_index(asset_id: str, image_index: int):
         raise HTTPException(status_code=500, detail=f"Failed to serve texture image: {str(e)}")
 
 @router.post("/admin/sync")
-async def sync_filesystem_to_database():
-    """Scan filesystem for metadata.json files and sync all assets to database"""
-    import json
-    import uuid
-    from datetime import datetime
-    
+async def sync_filesystem_to_database(
+        full: bool = Query(False, description="Re-parse and rewrite every asset, ignoring the change manifest"),
+        asset_queries: Optional[AssetQueries] = Depends(get_asset_queries)
+):
+    """Sync asset folders (metadata.json) into the database; only changed folders are re-read by default"""
+    if not asset_queries:
+        raise HTTPException(status_code=503, detail="Database not available")
     try:
-        # Asset library base path from Atlas config
-        library_root = Path(atlas_config.asset_library_3d)
-        
-        if not library_root.exists():
-            raise HTTPException(status_code=404, detail=f"Asset library not found: {library_root}")
-        
-        logger.info(f"🔄 Starting filesystem to database sync from: {library_root}")
-        
-        # Get database connection
-        asset_queries = get_asset_queries()
-        if not asset_queries:
-            raise HTTPException(status_code=503, detail="Database not available")
-        
-        # Scan for assets
-        assets_found = []
-        assets_synced = 0
-        assets_failed = 0
-        
-        # Scan asset types: Assets, FX, Materials, HDAs
-        asset_types = ["Assets", "FX", "Materials", "HDAs"]
-        
-        for asset_type in asset_types:
-            asset_type_path = library_root / asset_type
-            if not asset_type_path.exists():
-                continue
-                
-            logger.info(f"📂 Scanning {asset_type}...")
-            
-            # Scan subcategories
-            for subcategory_path in asset_type_path.iterdir():
-                if not subcategory_path.is_dir():
-                    continue
-                    
-                subcategory = subcategory_path.name
-                logger.info(f"   📋 Scanning {subcategory}...")
-                
-                # Scan individual asset folders
-                for asset_path in subcategory_path.iterdir():
-                    if not asset_path.is_dir():
-                        continue
-                        
-                    # Look for metadata.json
-                    metadata_file = asset_path / "metadata.json"
-                    if metadata_file.exists():
-                        try:
-                            with open(metadata_file, 'r') as f:
-                                metadata = json.load(f)
-                            
-                            asset_id = metadata.get("asset_id", asset_path.name.split("_")[0])
-                            asset_name = metadata.get("name", asset_path.name)
-                            
-                            # Prepare asset data for database
-                            asset_db_data = {
-                                "_key": asset_id,
-                                "id": asset_id,
-                                "name": asset_name,
-                                "asset_type": asset_type,
-                                "category": subcategory,
-                                "render_engine": metadata.get("render_engine", "Redshift"),
-                                "metadata": metadata,
-                                "tags": metadata.get("tags", []),
-                                "description": metadata.get("description", f"{asset_type} asset: {asset_name}"),
-                                "created_by": metadata.get("created_by", "unknown"),
-                                "created_at": metadata.get("created_at", datetime.now().isoformat()),
-                                "status": "active",
-                                
-                                # Frontend filtering hierarchy
-                                "dimension": "3D",
-                                "hierarchy": {
-                                    "dimension": "3D",
-                                    "asset_type": asset_type,
-                                    "subcategory": subcategory,
-                                    "render_engine": metadata.get("render_engine", "Redshift")
-                                },
-                                
-                                # File paths
-                                "paths": {
-                                    "asset_folder": str(asset_path),
-                                    "metadata": str(metadata_file),
-                                    "textures": str(asset_path / "Textures") if (asset_path / "Textures").exists() else None,
-                                    "geometry": str(asset_path / "Geometry") if (asset_path / "Geometry").exists() else None,
-                                    "template": None
-                                },
-                                
-                                # Find template file
-                                "file_sizes": metadata.get("file_sizes", {}),
-                                "dependencies": {},
-                                "copied_files": []
-                            }
-                            
-                            # Look for template file in Clipboard folder
-                            clipboard_folder = asset_path / "Clipboard"
-                            if clipboard_folder.exists():
-                                for template_file in clipboard_folder.glob("*_template.hip"):
-                                    asset_db_data["paths"]["template"] = str(template_file)
-                                    break
-                            
-                            # Store in database using new collection manager
-                            from backend.assetlibrary.database.arango_collection_manager import get_collection_manager
-                            environment = os.getenv('ATLAS_ENV', 'development')
-                            collection_manager = get_collection_manager(environment)
-                            
-                            # Prepare data for collection manager
-                            sync_asset_data = {
-                                "asset_id": asset_id,
-                                "name": asset_name,
-                                "asset_type": asset_type,
-                                "category": subcategory,
-                                "path": str(asset_path),
-                                "metadata_file": str(metadata_file),
-                                "metadata": metadata,
-                                "last_modified": metadata_file.stat().st_mtime
-                            }
-                            
-                            success = collection_manager.add_asset_to_database(sync_asset_data)
-                            if success:
-                                assets_synced += 1
-                                logger.info(f"      ✅ Synced: {asset_name}")
-                            else:
-                                assets_failed += 1
-                                logger.error(f"      ❌ Failed to sync: {asset_name}")
-                            
-                            assets_found.append({
-                                "name": asset_name,
-                                "path": str(asset_path),
-                                "asset_type": asset_type,
-                                "subcategory": subcategory,
-                                "synced": success
-                            })
-                            
-                        except Exception as e:
-                            assets_failed += 1
-                            logger.error(f"      ❌ Error processing {asset_path.name}: {e}")
-                            continue
-        
-        logger.info(f"🏁 Sync complete: {assets_synced} synced, {assets_failed} failed, {len(assets_found)} total")
-        
-        return {
-            "success": True,
-            "message": f"Sync complete: {assets_synced} assets synced, {assets_failed} failed",
-            "stats": {
-                "assets_found": len(assets_found),
-                "assets_synced": assets_synced,
-                "assets_failed": assets_failed
-            },
-            "assets": assets_found
-        }
-        
+        # The scan walks the library mount and writes in bulk, so it runs in the I/O pool
+        return await run_fs(library_sync.sync, asset_queries, full)
+    except FileNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
     except Exception as e:
         logger.error(f"❌ Sync failed: {e}")
         import traceback
@@ -2005,378 +1981,114 @@ async def sync_filesystem_to_database():
         raise HTTPException(status_code=500, detail=f"Sync failed: {str(e)}")
 
 @router.post("/admin/sync-bidirectional")
-async def sync_bidirectional():
-    """Perform intelligent bidirectional sync between filesystem and database"""
+async def sync_bidirectional(
+        dry_run: bool = Query(False, description="Only return the plan (what would be added, updated, moved, removed)"),
+        asset_queries: Optional[AssetQueries] = Depends(get_asset_queries)
+):
+    """Reconcile the database with the asset folders: add new, rewrite changed/moved, remove orphaned assets"""
+    if not asset_queries:
+        raise HTTPException(status_code=503, detail="Database not available")
     try:
-        logger.info("🔄 Starting intelligent bidirectional sync...")
-        
-        # Get collection manager
-        from backend.assetlibrary.database.arango_collection_manager import get_collection_manager
-        environment = os.getenv('ATLAS_ENV', 'development')
-        collection_manager = get_collection_manager(environment)
-        
-        if not collection_manager.is_connected():
-            raise HTTPException(status_code=503, detail="Database not available")
-        
-        # Perform full bidirectional sync
-        stats = collection_manager.full_bidirectional_sync()
-        
-        if "error" in stats:
-            raise HTTPException(status_code=500, detail=stats["error"])
-        
+        logger.info(f"🔄 Starting bidirectional reconcile{' (dry run)' if dry_run else ''}...")
+        result = await run_fs(library_reconciler.reconcile, asset_queries, dry_run)
+        if dry_run:
+            return {"success": True, "dry_run": True, "plan": result, "timestamp": datetime.now().isoformat()}
+
         return {
             "success": True,
-            "message": f"Bidirectional sync complete: {stats['assets_added']} added, {stats['assets_updated']} updated, {stats['assets_removed']} removed",
-            "stats": stats,
+            "message": f"Bidirectional sync complete: {result['assets_added']} added, {result['assets_updated']} updated, "
+                       f"{result['assets_moved']} moved, {result['assets_removed']} removed",
+            "stats": result,
             "sync_type": "bidirectional",
             "timestamp": datetime.now().isoformat()
         }
-        
-    except HTTPException:
-        raise
     except Exception as e:
         logger.error(f"❌ Bidirectional sync failed: {e}")
         import traceback
         logger.error(f"❌ Traceback: {traceback.format_exc()}")
         raise HTTPException(status_code=500, detail=f"Bidirectional sync failed: {str(e)}")
 
-def convert_hdr_to_exact_png(hdr_path, png_path):
-    """Proper HDRI EXR to PNG conversion with tone mapping using oiiotool
-    Returns: tuple (success: bool, resolution: dict)
-    """
+@router.post("/admin/thumbnails/reindex")
+async def reindex_thumbnails(
+        missing_only: bool = Query(True, description="Only index assets without a resolved thumbnail"),
+        asset_queries: Optional[AssetQueries] = Depends(get_asset_queries)
+):
+    """Resolve and store thumbnail paths on asset documents (backfill for the thumbnail index)"""
+    if not asset_queries:
+        raise HTTPException(status_code=503, detail="Database not available")
+    
     try:
-        logger.info(f"🔧 Converting EXR to PNG: {hdr_path} -> {png_path}")
-        resolution_info = {}
+        sources = await run_db(asset_queries.get_thumbnail_index_sources, missing_only=missing_only)
+        logger.info(f"🔄 Reindexing thumbnails for {len(sources)} assets")
         
-        # Method 1: Try oiiotool first (BEST for HDR tone mapping)
-        try:
-            import subprocess
-            import os
-            
-            logger.info(f"🔧 Using oiiotool for EXR conversion with proper tone mapping")
-            
-            # Check if oiiotool is available
-            result = subprocess.run(['which', 'oiiotool'], capture_output=True, text=True)
-            if result.returncode != 0:
-                raise Exception("oiiotool not found in PATH")
-            
-            # Use oiiotool with color space conversion for proper tone mapping
-            cmd = [
-                'oiiotool',
-                str(hdr_path),
-                '--colorconvert', 'linear', 'srgb',  # Convert from linear to sRGB for proper display
-                '-o', str(png_path)
-            ]
-            
-            result = subprocess.run(cmd, capture_output=True, text=True)
-            
-            if result.returncode == 0:
-                logger.info(f"✅ Successfully converted EXR with tone mapping using oiiotool")
-                
-                # Get image dimensions using oiiotool
-                info_cmd = ['oiiotool', '--info', str(hdr_path)]
-                info_result = subprocess.run(info_cmd, capture_output=True, text=True)
-                
-                if info_result.returncode == 0:
-                    # Parse output for dimensions
-                    output = info_result.stdout
-                    # Look for pattern like "2048 x 1024"
-                    import re
-                    match = re.search(r'(\d+)\s*x\s*(\d+)', output)
-                    if match:
-                        width = int(match.group(1))
-                        height = int(match.group(2))
-                        resolution_info = {
-                            "width": width,
-                            "height": height,
-                            "resolution": f"{width}x{height}",
-                            "channels": 4  # Default to 4 for PNG output
-                        }
-                        logger.info(f"📏 Extracted resolution: {resolution_info['resolution']}")
-                
-                return True, resolution_info
-            else:
-                logger.warning(f"⚠️ oiiotool conversion failed: {result.stderr}")
-                raise Exception(f"oiiotool failed: {result.stderr}")
-                
-        except Exception as e:
-            logger.info(f"   ℹ️ oiiotool not available or failed: {e}")
+        with_thumbnail = 0
+        for asset_data in sources:
+            entry = await run_fs(refresh_thumbnail_index, asset_queries, asset_data)
+            if entry.get('path'):
+                with_thumbnail += 1
         
-        # Method 2: Try ImageIO fallback (excellent EXR support)
-        try:
-            import imageio.v3 as iio
-            import numpy as np
-            from PIL import Image
-            
-            logger.info(f"🔧 Using ImageIO for EXR conversion")
-            
-            # Read EXR image
-            image_array = iio.imread(str(hdr_path))
-            if image_array is None:
-                raise Exception(f"Could not read {hdr_path}")
-            
-            height, width = image_array.shape[:2]
-            channels = image_array.shape[2] if len(image_array.shape) > 2 else 1
-            
-            # Store resolution information
-            resolution_info = {
-                "width": int(width),
-                "height": int(height),
-                "resolution": f"{width}x{height}",
-                "channels": int(channels)
-            }
-            
-            logger.info(f"📏 Original EXR dimensions: {width}x{height} ({channels} channels)")
-            logger.info(f"📊 Value range: min={np.min(image_array):.3f}, max={np.max(image_array):.3f}")
-            
-            # Handle negative values and infinities
-            image_array = np.nan_to_num(image_array, nan=0.0, posinf=1.0, neginf=0.0)
-            image_array = np.maximum(image_array, 0.0)  # Remove negative values
-            
-            # Automatic exposure adjustment based on image content
-            # Find a reasonable exposure level by looking at the 95th percentile
-            if np.max(image_array) > 1.0:
-                p95 = np.percentile(image_array[image_array > 0], 95)
-                if p95 > 1.0:
-                    # Scale down so 95th percentile maps to ~0.8
-                    exposure_scale = 0.8 / p95
-                    image_array = image_array * exposure_scale
-                    logger.info(f"🔧 Applied exposure scale: {exposure_scale:.3f}")
-            
-            # Soft clamp to avoid hard cutoffs
-            image_array = image_array / (image_array + 1.0)  # Soft compression
-            image_array = np.clip(image_array, 0.0, 1.0)
-            
-            # Convert to 8-bit
-            image_array = (image_array * 255).astype(np.uint8)
-            
-            # Handle channel configuration
-            if channels >= 4:
-                # RGBA
-                image_array = image_array[:, :, :4]
-                mode = 'RGBA'
-            elif channels == 3:
-                # RGB - add alpha channel
-                alpha_channel = np.ones((height, width, 1), dtype=np.uint8) * 255
-                image_array = np.concatenate([image_array, alpha_channel], axis=2)
-                mode = 'RGBA'
-            else:
-                # Grayscale
-                if len(image_array.shape) == 2:
-                    # Convert to RGBA
-                    gray_rgb = np.repeat(image_array[:, :, np.newaxis], 3, axis=2)
-                    alpha_channel = np.ones((height, width, 1), dtype=np.uint8) * 255
-                    image_array = np.concatenate([gray_rgb, alpha_channel], axis=2)
-                else:
-                    # Single channel with shape (h, w, 1)
-                    gray_rgb = np.repeat(image_array[:, :, :1], 3, axis=2)
-                    alpha_channel = np.ones((height, width, 1), dtype=np.uint8) * 255
-                    image_array = np.concatenate([gray_rgb, alpha_channel], axis=2)
-                mode = 'RGBA'
-            
-            # Create and save PNG
-            pil_image = Image.fromarray(image_array, mode)
-            pil_image.save(png_path, 'PNG')
-            logger.info(f"✅ Converted EXR to PNG: {width}x{height} -> {png_path}")
-            return True, resolution_info
-            
-        except ImportError:
-            logger.info(f"   ℹ️ ImageIO not available")
-        except Exception as e:
-            logger.info(f"   ⚠️ ImageIO conversion failed: {e}")
+        logger.info(f"✅ Thumbnail reindex complete: {with_thumbnail}/{len(sources)} assets have thumbnails")
         
-        # Method 3: Try OpenCV fallback
-        try:
-            import cv2
-            import numpy as np
-            from PIL import Image
-            
-            logger.info(f"🔧 Using OpenCV for EXR conversion")
-            
-            # Read EXR file
-            img = cv2.imread(str(hdr_path), cv2.IMREAD_UNCHANGED)
-            if img is None:
-                raise Exception(f"Could not read {hdr_path}")
-            
-            original_height, original_width = img.shape[:2]
-            channels = img.shape[2] if len(img.shape) > 2 else 1
-            
-            # Store resolution information for OpenCV branch
-            resolution_info = {
-                "width": int(original_width),
-                "height": int(original_height),
-                "resolution": f"{original_width}x{original_height}",
-                "channels": int(channels)
-            }
-            
-            logger.info(f"📏 Original EXR dimensions: {original_width}x{original_height}")
-            
-            # Convert BGR to RGB if needed
-            if len(img.shape) == 3 and img.shape[2] == 3:
-                img = cv2.cvtColor(img, cv2.COLOR_BGR2RGB)
-            elif len(img.shape) == 3 and img.shape[2] == 4:
-                img = cv2.cvtColor(img, cv2.COLOR_BGRA2RGBA)
-            
-            # Handle negative values and infinities
-            img = np.nan_to_num(img, nan=0.0, posinf=1.0, neginf=0.0)
-            img = np.maximum(img, 0.0)
-            
-            # Automatic exposure adjustment
-            if np.max(img) > 1.0:
-                p95 = np.percentile(img[img > 0], 95)
-                if p95 > 1.0:
-                    exposure_scale = 0.8 / p95
-                    img = img * exposure_scale
-                    logger.info(f"🔧 Applied exposure scale: {exposure_scale:.3f}")
-            
-            # Soft compression and clamp
-            img = img / (img + 1.0)
-            img = np.clip(img, 0.0, 1.0)
-            img = (img * 255).astype(np.uint8)
-            
-            # Ensure RGBA format
-            if len(img.shape) == 2:
-                # Grayscale to RGBA
-                gray = img[:, :, np.newaxis]
-                rgb = np.repeat(gray, 3, axis=2)
-                alpha = np.ones((img.shape[0], img.shape[1], 1), dtype=np.uint8) * 255
-                img = np.concatenate([rgb, alpha], axis=2)
-            elif len(img.shape) == 3 and img.shape[2] == 3:
-                # RGB to RGBA
-                alpha = np.ones((img.shape[0], img.shape[1], 1), dtype=np.uint8) * 255
-                img = np.concatenate([img, alpha], axis=2)
-            
-            # Save as PNG
-            pil_image = Image.fromarray(img, 'RGBA')
-            pil_image.save(png_path, 'PNG')
-            logger.info(f"✅ Converted EXR to PNG: {original_width}x{original_height} -> {png_path}")
-            return True, resolution_info
-            
-        except ImportError:
-            logger.info(f"   ℹ️ OpenCV not available")
-        except Exception as e:
-            logger.info(f"   ⚠️ OpenCV conversion failed: {e}")
-        
-        logger.error(f"❌ All EXR conversion methods failed")
-        return False, {}
-            
+        return {
+            "success": True,
+            "assets_indexed": len(sources),
+            "assets_with_thumbnail": with_thumbnail,
+            "missing_only": missing_only,
+            "timestamp": datetime.now().isoformat()
+        }
     except Exception as e:
-        logger.error(f"❌ EXR conversion error: {e}")
-        import traceback
-        traceback.print_exc()
-        return False, {}
+        logger.error(f"❌ Thumbnail reindex failed: {e}")
+        raise HTTPException(status_code=500, detail=f"Thumbnail reindex failed: {str(e)}")
+
+@router.post("/admin/versions/reindex")
+async def reindex_versions(
+        missing_only: bool = Query(True, description="Only index assets without stored version fields"),
+        asset_queries: Optional[AssetQueries] = Depends(get_asset_queries)
+):
+    """Create the version index and store base_uid/variant_id/version on asset documents (backfill)"""
+    if not asset_queries:
+        raise HTTPException(status_code=503, detail="Database not available")
+
+    try:
+        await run_db(asset_queries.ensure_version_index)
+        sources = await run_db(asset_queries.get_version_index_sources, missing_only)
+        updates = [{'_key': asset['_key'], **version_fields(asset)} for asset in sources]
+        updated = 0
+        for start in range(0, len(updates), 500):
+            updated += await run_db(asset_queries.update_assets_bulk, updates[start:start + 500])
+        if updated:
+            await run_db(query_cache.invalidate_all)
+        versioned = sum(1 for update in updates if update['base_uid'])
+        logger.info(f"✅ Version reindex complete: {updated} assets updated, {versioned} with a versioned UID")
+
+        return {
+            "success": True,
+            "assets_indexed": updated,
+            "assets_versioned": versioned,
+            "missing_only": missing_only,
+            "timestamp": datetime.now().isoformat()
+        }
+    except Exception as e:
+        logger.error(f"❌ Version reindex failed: {e}")
+        raise HTTPException(status_code=500, detail=f"Version reindex failed: {str(e)}")
+
+def convert_hdr_to_exact_png(hdr_path, png_path, max_dimension=None):
+    """HDRI EXR/HDR to PNG with tone mapping, in-process (one read, no oiiotool launches)
+    Returns: tuple (success: bool, resolution: dict)
+    """
+    return convert_image(hdr_path, png_path, mode='hdr', max_dimension=max_dimension)
 
 def convert_texture_exr_to_png(exr_path, png_path):
-    """Convert texture EXR to PNG WITHOUT tone mapping (for textures only)
+    """Convert texture EXR to PNG WITHOUT tone mapping (for textures only), max 1024px
     Returns: tuple (success: bool, resolution: dict)
     """
-    try:
-        logger.info(f"🔧 Converting texture EXR to PNG (no tone mapping): {exr_path} -> {png_path}")
-        
-        # Try oiiotool first (without tone mapping for textures)
-        try:
-            import subprocess
-            
-            # Check if oiiotool is available
-            result = subprocess.run(['which', 'oiiotool'], capture_output=True, text=True)
-            if result.returncode != 0:
-                raise Exception("oiiotool not found in PATH")
-            
-            # Get original dimensions first to calculate proper resize without upscaling
-            info_cmd = ['oiiotool', '--info', str(exr_path)]
-            info_result = subprocess.run(info_cmd, capture_output=True, text=True, timeout=10)
-            
-            resize_arg = '1024x1024'  # Default fallback
-            if info_result.returncode == 0:
-                import re
-                match = re.search(r'(\d+)\s*x\s*(\d+)', info_result.stdout)
-                if match:
-                    original_width = int(match.group(1))
-                    original_height = int(match.group(2))
-                    max_dimension = 1024
-                    
-                    # Don't downscale if either dimension is already below 1028
-                    if original_width <= 1028 or original_height <= 1028:
-                        # Keep original size - one dimension is already small enough
-                        new_width = original_width
-                        new_height = original_height
-                        scale_factor = 1.0
-                        resize_arg = f'{new_width}x{new_height}'
-                        logger.info(f"📏 EXR: Keeping original size - one dimension already <= 1028")
-                    else:
-                        # Calculate scale factor to never upscale
-                        scale_factor = min(
-                            max_dimension / original_width,
-                            max_dimension / original_height,
-                            1.0  # Never exceed original size
-                        )
-                        
-                        new_width = int(original_width * scale_factor)
-                        new_height = int(original_height * scale_factor)
-                        resize_arg = f'{new_width}x{new_height}'
-                    
-                    logger.info(f"📏 EXR oiiotool: {original_width}x{original_height} -> {resize_arg} (scale: {scale_factor:.3f})")
-
-            # Use oiiotool WITHOUT color conversion but resize appropriately
-            cmd = [
-                'oiiotool',
-                str(exr_path),
-                '--resize', resize_arg,
-                '-o', str(png_path)
-            ]
-            
-            result = subprocess.run(cmd, capture_output=True, text=True)
-            
-            if result.returncode == 0:
-                logger.info(f"✅ Successfully converted texture EXR without tone mapping using oiiotool")
-                return True, {}
-            else:
-                logger.warning(f"⚠️ oiiotool failed for texture EXR: {result.stderr}")
-                
-        except Exception as e:
-            logger.warning(f"⚠️ oiiotool not available for texture conversion: {e}")
-        
-        # Fallback to PIL/OpenCV for texture EXR conversion
-        try:
-            from PIL import Image
-            import numpy as np
-            
-            # Try OpenCV for EXR reading
-            try:
-                import cv2
-                img_array = cv2.imread(str(exr_path), cv2.IMREAD_UNCHANGED)
-                if img_array is not None:
-                    # Convert to RGB and normalize for PNG
-                    if img_array.dtype == np.float32:
-                        # Clamp values to 0-1 range without tone mapping
-                        img_array = np.clip(img_array, 0, 1)
-                        img_array = (img_array * 255).astype(np.uint8)
-                    
-                    # Convert BGR to RGB
-                    if len(img_array.shape) == 3 and img_array.shape[2] == 3:
-                        img_array = cv2.cvtColor(img_array, cv2.COLOR_BGR2RGB)
-                    
-                    img = Image.fromarray(img_array)
-                    img.save(png_path, 'PNG')
-                    logger.info(f"✅ Successfully converted texture EXR using OpenCV fallback")
-                    return True, {}
-            except ImportError:
-                logger.warning("⚠️ OpenCV not available for texture EXR conversion")
-            
-            # Final fallback - try PIL directly 
-            with Image.open(exr_path) as img:
-                img = img.convert('RGBA')
-                img.save(png_path, 'PNG')
-                logger.info(f"✅ Successfully converted texture EXR using PIL fallback")
-                return True, {}
-                
-        except Exception as fallback_error:
-            logger.error(f"❌ All texture EXR conversion methods failed: {fallback_error}")
-            return False, {}
-            
-    except Exception as e:
-        logger.error(f"❌ Texture EXR conversion error: {e}")
-        return False, {}
+    return convert_image(
+        exr_path,
+        png_path,
+        mode='texture',
+        max_dimension=THUMBNAIL_MAX_DIMENSION,
+        keep_original_below=KEEP_ORIGINAL_BELOW
+    )
 
 # Helper functions for texture processing
 def get_texture_position_and_type_from_slot(texture_slot_key):
@@ -2394,203 +2106,46 @@ def get_texture_position_and_type_from_slot(texture_slot_key):
     return slot_mapping.get(texture_slot_key, ('9', 'Unknown'))
 
 async def generate_texture_thumbnail(source_file, thumbnail_file):
-    """Generate thumbnail for texture files, handling EXR conversion WITHOUT tone mapping"""
+    """Generate thumbnail for texture files in the process pool, within the conversion memory budget"""
+    return await run_within_budget(source_file, render_texture_thumbnail, source_file, thumbnail_file)
+
+def render_texture_thumbnail(source_file, thumbnail_file):
+    """Generate thumbnail for texture files (max 1024px), handling EXR conversion WITHOUT tone mapping"""
     try:
         source_path = Path(source_file)
+        suffix = source_path.suffix.lower()
         
-        if source_path.suffix.lower() in {'.exr'}:
-            # Use NEW texture EXR conversion WITHOUT tone mapping
-            logger.info(f"🔧 Converting texture EXR to PNG (no tone mapping): {source_path}")
-            success, _ = convert_texture_exr_to_png(source_path, thumbnail_file)
-            if success:
-                logger.info(f"✅ Created EXR texture thumbnail: {thumbnail_file}")
-                return True
-            else:
-                logger.warning(f"⚠️ Failed to convert texture EXR: {source_path}")
-                return False
-                
-        elif source_path.suffix.lower() in {'.jpg', '.jpeg', '.png', '.tiff', '.tif'}:
-            # Resize texture images preserving aspect ratio, max dimension 1024
-            logger.info(f"🔧 Resizing texture image (preserving aspect ratio): {source_path} -> {thumbnail_file}")
-            
-            # Check original file size first
-            try:
-                original_size = source_path.stat().st_size / (1024 * 1024)  # MB
-                logger.info(f"📏 Original file size: {original_size:.1f} MB")
-            except:
-                pass
-                
-            try:
-                # First try with oiiotool for better quality
-                import subprocess
-                # Get original dimensions first to calculate proper resize without upscaling
-                info_cmd = ['oiiotool', '--info', str(source_path)]
-                info_result = subprocess.run(info_cmd, capture_output=True, text=True, timeout=10)
-                
-                resize_arg = '1024x1024'  # Default fallback
-                if info_result.returncode == 0:
-                    import re
-                    match = re.search(r'(\d+)\s*x\s*(\d+)', info_result.stdout)
-                    if match:
-                        original_width = int(match.group(1))
-                        original_height = int(match.group(2))
-                        max_dimension = 1024
-                        
-                        # Don't downscale if either dimension is already below 1028
-                        if original_width <= 1028 or original_height <= 1028:
-                            # Keep original size - one dimension is already small enough
-                            new_width = original_width
-                            new_height = original_height
-                            scale_factor = 1.0
-                            logger.info(f"📏 Keeping original size - one dimension already <= 1028")
-                        else:
-                            # Calculate scale factor to never upscale, only downscale large images
-                            scale_factor = min(
-                                max_dimension / original_width,
-                                max_dimension / original_height,
-                                1.0  # Never exceed original size
-                            )
-                            
-                            new_width = int(original_width * scale_factor)
-                            new_height = int(original_height * scale_factor)
-                        resize_arg = f'{new_width}x{new_height}'
-                        
-                        logger.info(f"📏 oiiotool: {original_width}x{original_height} -> {resize_arg} (scale: {scale_factor:.3f})")
-                
-                cmd = [
-                    'oiiotool',
-                    str(source_path),
-                    '--resize', resize_arg,
-                    '--colorconvert', 'sRGB', 'sRGB',
-                    '-o', str(thumbnail_file)
-                ]
-                
-                logger.info(f"🔧 Running oiiotool command: {' '.join(cmd)}")
-                result = subprocess.run(cmd, capture_output=True, text=True, timeout=30)
-                
-                if result.returncode == 0:
-                    # Check resulting file size
-                    try:
-                        final_size = Path(thumbnail_file).stat().st_size / (1024 * 1024)  # MB
-                        logger.info(f"✅ Created resized thumbnail with oiiotool: {thumbnail_file} ({final_size:.1f} MB)")
-                    except:
-                        logger.info(f"✅ Created resized thumbnail with oiiotool: {thumbnail_file}")
-                    return True
-                else:
-                    logger.warning(f"⚠️ oiiotool failed: {result.stderr}")
-                    logger.warning(f"⚠️ oiiotool stdout: {result.stdout}")
-                    
-                    # Fallback to PIL
-                    logger.info("🔄 Falling back to PIL for resizing...")
-                    from PIL import Image
-                    with Image.open(source_path) as img:
-                        logger.info(f"📏 Original PIL image size: {img.size}")
-                        
-                        # Convert to RGB if necessary
-                        if img.mode in ('RGBA', 'LA', 'P'):
-                            img = img.convert('RGB')
-                            logger.info(f"🎨 Converted image mode from {img.mode} to RGB")
-                        
-                        # Calculate new size preserving aspect ratio, max dimension 1024 (never upscale)
-                        original_width, original_height = img.size
-                        max_dimension = 1024
-                        
-                        # Don't downscale if either dimension is already below 1028
-                        if original_width <= 1028 or original_height <= 1028:
-                            # Keep original size - one dimension is already small enough
-                            new_width = original_width
-                            new_height = original_height
-                            scale_factor = 1.0
-                            logger.info(f"📏 PIL: Keeping original size - one dimension already <= 1028")
-                        else:
-                            # Find the scaling factor needed - only downscale, never upscale
-                            scale_factor = min(
-                                max_dimension / original_width,
-                                max_dimension / original_height,
-                                1.0  # Never exceed original size (no upscaling)
-                            )
-                            
-                            new_width = int(original_width * scale_factor)
-                            new_height = int(original_height * scale_factor)
-                        
-                        logger.info(f"📏 Scale factor: {scale_factor:.3f} ({original_width}x{original_height} -> {new_width}x{new_height})")
-                        
-                        # Resize preserving aspect ratio
-                        img = img.resize((new_width, new_height), Image.Resampling.LANCZOS)
-                        logger.info(f"📏 Resized image from {original_width}x{original_height} to: {img.size} (aspect ratio preserved)")
-                        
-                        # Save as PNG for thumbnails
-                        img.save(thumbnail_file, 'PNG', optimize=True)
-                        
-                        # Check resulting file size
-                        try:
-                            final_size = Path(thumbnail_file).stat().st_size / (1024 * 1024)  # MB
-                            logger.info(f"✅ Created resized thumbnail with PIL: {thumbnail_file} ({final_size:.1f} MB)")
-                        except:
-                            logger.info(f"✅ Created resized thumbnail with PIL: {thumbnail_file}")
-                        return True
-                        
-            except Exception as e:
-                logger.error(f"❌ Failed to resize texture image: {e}")
-                logger.error(f"❌ Exception type: {type(e).__name__}")
-                import traceback
-                logger.error(f"❌ Full traceback: {traceback.format_exc()}")
-                
-                # Final fallback - just copy the original
-                logger.warning(f"⚠️ Falling back to copying original file")
-                import shutil
-                shutil.copy2(source_path, thumbnail_file)
-                
-                try:
-                    final_size = Path(thumbnail_file).stat().st_size / (1024 * 1024)  # MB
-                    logger.warning(f"⚠️ Using original size as thumbnail: {thumbnail_file} ({final_size:.1f} MB)")
-                except:
-                    logger.warning(f"⚠️ Using original size as thumbnail: {thumbnail_file}")
-                return True
-            
-        else:
+        if suffix not in {'.exr', '.jpg', '.jpeg', '.png', '.tiff', '.tif'}:
             logger.warning(f"⚠️ Unsupported texture format for thumbnail: {source_path.suffix}")
             return False
+        
+        success, _ = convert_texture_exr_to_png(source_path, thumbnail_file)
+        if success:
+            logger.info(f"✅ Created texture thumbnail: {thumbnail_file}")
+            return True
+        
+        if suffix == '.exr':
+            logger.warning(f"⚠️ Failed to convert texture EXR: {source_path}")
+            return False
+        
+        # Final fallback - just copy the original
+        logger.warning(f"⚠️ Falling back to copying original file")
+        shutil.copy2(source_path, thumbnail_file)
+        return True
                 
     except Exception as e:
         logger.warning(f"⚠️ Failed to generate thumbnail: {e}")
         return False
 
 async def extract_image_info(image_file):
+    """Extract resolution and channel info (header read only, no pixel decode)"""
+    return await run_fs(read_image_info, image_file)
+
+def read_image_info(image_file):
     """Extract resolution and channel info from image files"""
-    try:
-        image_path = Path(image_file)
-        
-        if image_path.suffix.lower() in {'.exr', '.hdr', '.hdri'}:
-            # For EXR files, try to get info using imageio
-            try:
-                import imageio.v3 as iio
-                import numpy as np
-                image_array = iio.imread(str(image_path))
-                if image_array is not None:
-                    height, width = image_array.shape[:2]
-                    channels = image_array.shape[2] if len(image_array.shape) > 2 else 1
-                    return {
-                        "width": int(width),
-                        "height": int(height),
-                        "resolution": f"{width}x{height}",
-                        "channels": int(channels)
-                    }
-            except ImportError:
-                logger.info("ImageIO not available for EXR info extraction")
-        else:
-            # Regular image files
-            from PIL import Image
-            with Image.open(image_path) as img:
-                return {
-                    "width": img.width,
-                    "height": img.height,
-                    "resolution": f"{img.width}x{img.height}",
-                    "channels": len(img.getbands()) if hasattr(img, 'getbands') else 4
-                }
-                
-    except Exception as e:
-        logger.warning(f"⚠️ Failed to extract image info: {e}")
+    info = read_image_header(image_file)
+    if info:
+        return info
     
     return {
         "width": 1024,
@@ -2599,6 +2154,42 @@ async def extract_image_info(image_file):
         "channels": 4
     }
 
+def create_upload_folders(asset_folder: Path, *subfolders: Path):
+    """Create a new asset folder and its subfolders; FileExistsError if the folder is taken"""
+    asset_folder.parent.mkdir(parents=True, exist_ok=True)
+    asset_folder.mkdir()
+    for folder in subfolders:
+        folder.mkdir(exist_ok=True)
+
+def write_json_file(path: Path, data: dict):
+    import json
+    with open(path, 'w') as f:
+        json.dump(data, f, indent=2)
+
+def total_file_size(paths) -> int:
+    """Summed size of the files that exist (a stat each)"""
+    total = 0
+    for path in paths:
+        try:
+            total += os.stat(to_container_path(str(path))).st_size
+        except OSError:
+            pass
+    return total
+
+async def resize_hdri_preview(preview_source: Path, thumbnail_file: Path, width: int, height: int):
+    """Resize an HDRI preview to the HDRI resolution in the process pool, within the memory budget"""
+    # The RGBA output and the resampling copy dominate (a 16K HDRI is ~1 GB)
+    async with memory_budget.reserve(width * height * 4 * 2):
+        await run_cpu(render_hdri_preview, preview_source, thumbnail_file, width, height)
+
+def render_hdri_preview(preview_source: Path, thumbnail_file: Path, width: int, height: int):
+    """Resize a preview to exactly ``width`` x ``height`` and save it as PNG"""
+    from PIL import Image
+    with Image.open(preview_source) as preview_img:
+        logger.info(f"📏 Original preview size: {preview_img.size}")
+        resized_preview = preview_img.resize((width, height), Image.Resampling.LANCZOS)
+    resized_preview.save(thumbnail_file, 'PNG', optimize=True)
+
 # Upload Asset Request Model
 class UploadAssetRequest(BaseModel):
     asset_type: str  # 'Textures' or 'HDRI'
@@ -2618,137 +2209,185 @@ class UploadAssetRequest(BaseModel):
     seamless: Optional[bool] = None  # True if texture is seamless
     uv_tile: Optional[bool] = None  # True if texture uses UV tiles
 
-@router.post("/assets/upload", response_model=AssetResponse)
-async def upload_asset(upload_request: UploadAssetRequest):
-    """Upload a Texture or HDRI asset to the Atlas library"""
-    asset_queries = get_asset_queries()
+def new_upload_asset_id(upload_request: UploadAssetRequest) -> str:
+    """
+    10-character UID for an HDRI or Texture upload (different from Houdini 3D assets)
+    
+    Generated once when the upload is queued so retries of the job reuse it.
+    """
+    timestamp = str(int(time.time() * 1000))  # Millisecond timestamp for uniqueness
+    hash_input = f"{upload_request.name}_{upload_request.asset_type}_{timestamp}".encode()
+    return hashlib.md5(hash_input).hexdigest()[:10].upper()
+
+def validate_upload_request(upload_request: UploadAssetRequest) -> Optional[Path]:
+    """Check an upload request before it is queued; returns the single source file (HDRI / single texture)"""
+    source_file = None
+    
+    # Validate asset type
+    if upload_request.asset_type not in ['Textures', 'HDRI']:
+        raise HTTPException(status_code=400, detail="Asset type must be 'Textures' or 'HDRI'")
+    
+    # Separate validation logic for HDRI vs Textures
+    if upload_request.asset_type == 'HDRI':
+        # HDRI uploads: Always require a file_path
+        if not upload_request.file_path or not upload_request.file_path.strip():
+            raise HTTPException(status_code=400, detail="File path is required for HDRI uploads")
+    
+        source_file = Path(upload_request.file_path)
+        if not source_file.exists():
+            # Provide helpful error with mount information
+            error_msg = f"HDRI source file not found: {upload_request.file_path}\n\n"
+            error_msg += "Available mounted paths in container:\n"
+            error_msg += "- /app/assets (atlas library - output only)\n"
+            error_msg += "- /net/general (general network drive - READ ONLY)\n"
+            error_msg += "- /net/library/library (library drive - READ ONLY)\n"
+            error_msg += "\nMake sure the file path starts with one of these mounted directories."
+            raise HTTPException(status_code=400, detail=error_msg)
+    
+        # Check if file is a supported HDRI format
+        hdri_extensions = {'.exr', '.hdr', '.hdri'}
+        if source_file.suffix.lower() not in hdri_extensions:
+            raise HTTPException(
+                status_code=400, 
+                detail=f"Unsupported HDRI file format: {source_file.suffix}. Supported: {', '.join(hdri_extensions)}"
+            )
+    
+        logger.info(f"📋 HDRI upload validated: {source_file}")
+    
+    elif upload_request.asset_type == 'Textures':
+        # Handle different texture subcategories
+        if upload_request.subcategory == 'Texture Sets' and upload_request.texture_set_paths:
+            # Texture Sets: Validate texture_set_paths
+            if not any(path and path.strip() for path in upload_request.texture_set_paths.values()):
+                raise HTTPException(status_code=400, detail="At least one texture file path must be provided for texture sets")
+    
+            # Validate each provided texture file
+            texture_extensions = {'.exr', '.jpg', '.jpeg', '.png', '.tiff', '.tif'}
+            for key, file_path in upload_request.texture_set_paths.items():
+                if file_path and file_path.strip():
+                    source_file = Path(file_path.strip())
+                    if not source_file.exists():
+                        raise HTTPException(status_code=400, detail=f"{key.title()} texture file not found: {file_path}")
+    
+                    if source_file.suffix.lower() not in texture_extensions:
+                        raise HTTPException(
+                            status_code=400, 
+                            detail=f"Unsupported file format for {key} texture: {source_file.suffix}. Supported: {', '.join(texture_extensions)}"
+                        )
+    
+            logger.info(f"📋 Texture set upload validated: {len([p for p in upload_request.texture_set_paths.values() if p and p.strip()])} texture files provided")
+    
+            # Validate additional textures if provided
+            if upload_request.additional_textures:
+                texture_extensions = {'.exr', '.jpg', '.jpeg', '.png', '.tiff', '.tif'}
+                for i, additional_texture in enumerate(upload_request.additional_textures):
+                    if not isinstance(additional_texture, dict):
+                        raise HTTPException(status_code=400, detail=f"Additional texture {i+1} must be an object with 'name' and 'filePath' properties")
+    
+                    if not additional_texture.get('name') or not additional_texture.get('name').strip():
+                        raise HTTPException(status_code=400, detail=f"Additional texture {i+1} must have a name")
+    
+                    if not additional_texture.get('filePath') or not additional_texture.get('filePath').strip():
+                        raise HTTPException(status_code=400, detail=f"Additional texture {i+1} '{additional_texture.get('name', 'Unknown')}' must have a file path")
+    
+                    source_file = Path(additional_texture['filePath'].strip())
+                    if not source_file.exists():
+                        raise HTTPException(status_code=400, detail=f"Additional texture file not found: {additional_texture['filePath']}")
+    
+                    if source_file.suffix.lower() not in texture_extensions:
+                        raise HTTPException(
+                            status_code=400,
+                            detail=f"Unsupported file format for additional texture '{additional_texture['name']}': {source_file.suffix}. Supported: {', '.join(texture_extensions)}"
+                        )
+    
+                logger.info(f"📋 Additional textures validated: {len(upload_request.additional_textures)} additional texture files provided")
+    
+        else:
+            # Single Textures (Alpha, Base Color, etc.): Require file_path (optional now)
+            if upload_request.file_path and upload_request.file_path.strip():
+                source_file = Path(upload_request.file_path)
+                if not source_file.exists():
+                    error_msg = f"Texture source file not found: {upload_request.file_path}\n\n"
+                    error_msg += "Available mounted paths in container:\n"
+                    error_msg += "- /app/assets (atlas library - output only)\n"
+                    error_msg += "- /net/general (general network drive - READ ONLY)\n"
+                    error_msg += "- /net/library/library (library drive - READ ONLY)\n"
+                    error_msg += "\nMake sure the file path starts with one of these mounted directories."
+                    raise HTTPException(status_code=400, detail=error_msg)
+    
+                # Check if file is a supported texture format
+                texture_extensions = {'.exr', '.jpg', '.jpeg', '.png', '.tiff', '.tif'}
+                if source_file.suffix.lower() not in texture_extensions:
+                    raise HTTPException(
+                        status_code=400, 
+                        detail=f"Unsupported texture file format: {source_file.suffix}. Supported: {', '.join(texture_extensions)}"
+                    )
+    
+                logger.info(f"📋 Single texture upload validated: {source_file}")
+    
+    else:
+        raise HTTPException(status_code=400, detail="Asset type must be 'HDRI' or 'Textures'")
+    
+    # Clean and validate asset name
+    if not upload_request.name.strip():
+        raise HTTPException(status_code=400, detail="Asset name cannot be empty")
+    
+    return source_file
+
+@router.post("/assets/upload", status_code=202)
+async def upload_asset(upload_request: UploadAssetRequest, asset_queries: Optional[AssetQueries] = Depends(get_asset_queries)):
+    """
+    Queue a Texture or HDRI upload and return its job id immediately
+    
+    Copying and EXR/HDR conversion run in the background job queue; poll
+    /api/v1/jobs/{job_id} for progress. The created asset is the job's result.
+    """
     if not asset_queries:
         raise HTTPException(status_code=503, detail="Database not available")
     
+    # Bad paths / formats are rejected up front instead of failing in the job
+    await run_fs(validate_upload_request, upload_request)
+    
+    job = await job_queue.enqueue('asset_upload', {
+        **upload_request.dict(),
+        "asset_id": new_upload_asset_id(upload_request)
+    })
+    return {
+        "job_id": job['id'],
+        "status": job['status'],
+        "status_url": f"/api/v1/jobs/{job['id']}"
+    }
+
+async def process_upload(upload_request: UploadAssetRequest, asset_queries: AssetQueries, progress,
+                         asset_id: str) -> AssetResponse:
+    """
+    Copy, convert and register an uploaded asset (body of the 'asset_upload' job)
+    
+    Idempotent on ``asset_id``: an attempt that finds the asset already
+    registered returns it, so retries and requeued jobs never register twice.
+    """
+    asset_folder = None
+    # Once the document exists the folder belongs to it and is never cleaned up
+    inserted = False
     try:
         import uuid
         import shutil
         from datetime import datetime
         from pathlib import Path
         
-        logger.info(f"🔧 Processing upload request: {upload_request.dict()}")
-        
-        # Validate asset type
-        if upload_request.asset_type not in ['Textures', 'HDRI']:
-            raise HTTPException(status_code=400, detail="Asset type must be 'Textures' or 'HDRI'")
-        
-        # Separate validation logic for HDRI vs Textures
-        if upload_request.asset_type == 'HDRI':
-            # HDRI uploads: Always require a file_path
-            if not upload_request.file_path or not upload_request.file_path.strip():
-                raise HTTPException(status_code=400, detail="File path is required for HDRI uploads")
-            
-            source_file = Path(upload_request.file_path)
-            if not source_file.exists():
-                # Provide helpful error with mount information
-                error_msg = f"HDRI source file not found: {upload_request.file_path}\n\n"
-                error_msg += "Available mounted paths in container:\n"
-                error_msg += "- /app/assets (atlas library - output only)\n"
-                error_msg += "- /net/general (general network drive - READ ONLY)\n"
-                error_msg += "- /net/library/library (library drive - READ ONLY)\n"
-                error_msg += "\nMake sure the file path starts with one of these mounted directories."
-                raise HTTPException(status_code=400, detail=error_msg)
-            
-            # Check if file is a supported HDRI format
-            hdri_extensions = {'.exr', '.hdr', '.hdri'}
-            if source_file.suffix.lower() not in hdri_extensions:
-                raise HTTPException(
-                    status_code=400, 
-                    detail=f"Unsupported HDRI file format: {source_file.suffix}. Supported: {', '.join(hdri_extensions)}"
-                )
-            
-            logger.info(f"📋 HDRI upload validated: {source_file}")
-            
-        elif upload_request.asset_type == 'Textures':
-            # Handle different texture subcategories
-            if upload_request.subcategory == 'Texture Sets' and upload_request.texture_set_paths:
-                # Texture Sets: Validate texture_set_paths
-                if not any(path and path.strip() for path in upload_request.texture_set_paths.values()):
-                    raise HTTPException(status_code=400, detail="At least one texture file path must be provided for texture sets")
-                
-                # Validate each provided texture file
-                texture_extensions = {'.exr', '.jpg', '.jpeg', '.png', '.tiff', '.tif'}
-                for key, file_path in upload_request.texture_set_paths.items():
-                    if file_path and file_path.strip():
-                        source_file = Path(file_path.strip())
-                        if not source_file.exists():
-                            raise HTTPException(status_code=400, detail=f"{key.title()} texture file not found: {file_path}")
-                        
-                        if source_file.suffix.lower() not in texture_extensions:
-                            raise HTTPException(
-                                status_code=400, 
-                                detail=f"Unsupported file format for {key} texture: {source_file.suffix}. Supported: {', '.join(texture_extensions)}"
-                            )
-                
-                logger.info(f"📋 Texture set upload validated: {len([p for p in upload_request.texture_set_paths.values() if p and p.strip()])} texture files provided")
-
-                # Validate additional textures if provided
-                if upload_request.additional_textures:
-                    texture_extensions = {'.exr', '.jpg', '.jpeg', '.png', '.tiff', '.tif'}
-                    for i, additional_texture in enumerate(upload_request.additional_textures):
-                        if not isinstance(additional_texture, dict):
-                            raise HTTPException(status_code=400, detail=f"Additional texture {i+1} must be an object with 'name' and 'filePath' properties")
-
-                        if not additional_texture.get('name') or not additional_texture.get('name').strip():
-                            raise HTTPException(status_code=400, detail=f"Additional texture {i+1} must have a name")
-
-                        if not additional_texture.get('filePath') or not additional_texture.get('filePath').strip():
-                            raise HTTPException(status_code=400, detail=f"Additional texture {i+1} '{additional_texture.get('name', 'Unknown')}' must have a file path")
-
-                        source_file = Path(additional_texture['filePath'].strip())
-                        if not source_file.exists():
-                            raise HTTPException(status_code=400, detail=f"Additional texture file not found: {additional_texture['filePath']}")
-
-                        if source_file.suffix.lower() not in texture_extensions:
-                            raise HTTPException(
-                                status_code=400,
-                                detail=f"Unsupported file format for additional texture '{additional_texture['name']}': {source_file.suffix}. Supported: {', '.join(texture_extensions)}"
-                            )
-
-                    logger.info(f"📋 Additional textures validated: {len(upload_request.additional_textures)} additional texture files provided")
-
-            else:
-                # Single Textures (Alpha, Base Color, etc.): Require file_path (optional now)
-                if upload_request.file_path and upload_request.file_path.strip():
-                    source_file = Path(upload_request.file_path)
-                    if not source_file.exists():
-                        error_msg = f"Texture source file not found: {upload_request.file_path}\n\n"
-                        error_msg += "Available mounted paths in container:\n"
-                        error_msg += "- /app/assets (atlas library - output only)\n"
-                        error_msg += "- /net/general (general network drive - READ ONLY)\n"
-                        error_msg += "- /net/library/library (library drive - READ ONLY)\n"
-                        error_msg += "\nMake sure the file path starts with one of these mounted directories."
-                        raise HTTPException(status_code=400, detail=error_msg)
-                    
-                    # Check if file is a supported texture format
-                    texture_extensions = {'.exr', '.jpg', '.jpeg', '.png', '.tiff', '.tif'}
-                    if source_file.suffix.lower() not in texture_extensions:
-                        raise HTTPException(
-                            status_code=400, 
-                            detail=f"Unsupported texture file format: {source_file.suffix}. Supported: {', '.join(texture_extensions)}"
-                        )
-                    
-                    logger.info(f"📋 Single texture upload validated: {source_file}")
+        logger.info(f"🔧 Processing upload request {asset_id}: {upload_request.dict()}")
         
-        else:
-            raise HTTPException(status_code=400, detail="Asset type must be 'HDRI' or 'Textures'")
+        # An earlier attempt of this job may have registered the asset before failing
+        existing_asset = await run_db(asset_queries.assets.get, asset_id)
+        if existing_asset:
+            logger.info(f"✅ Upload {asset_id} was already registered by an earlier attempt")
+            return convert_asset_to_response(existing_asset)
         
-        # Clean and validate asset name
+        # Re-checked here: files may have moved while the job was queued
+        source_file = await run_fs(validate_upload_request, upload_request)
         clean_asset_name = upload_request.name.strip()
-        if not clean_asset_name:
-            raise HTTPException(status_code=400, detail="Asset name cannot be empty")
-        
-        # Generate unique asset ID for HDRI and Texture uploads
-        # Simple 10-character UID based on time (different from Houdini 3D assets)
-        import time
-        timestamp = str(int(time.time() * 1000))  # Millisecond timestamp for uniqueness
-        hash_input = f"{upload_request.name}_{upload_request.asset_type}_{timestamp}".encode()
-        asset_id = hashlib.md5(hash_input).hexdigest()[:10].upper()  # 10-character UID
+        await progress(5, "Validated source files")
+        
         asset_base_id = asset_id  # Same as asset_id since no variants/versions
         
         # Create folder structure for uploaded asset
@@ -2764,34 +2403,33 @@ async def upload_asset(upload_request: UploadAssetRequest):
         # For HDRI and Texture uploads: folder name is just the UID (no asset name)
         asset_folder = category_path / asset_id
         
-        # Ensure category directory exists
-        category_path.mkdir(parents=True, exist_ok=True)
-        
-        # Create asset folder
-        if asset_folder.exists():
-            raise HTTPException(status_code=400, detail=f"Asset folder already exists: {asset_folder}")
-        
-        asset_folder.mkdir(parents=True, exist_ok=True)
-        logger.info(f"📁 Created asset folder: {asset_folder}")
-        
-        # Create subfolders for Textures/HDRI structure
+        # Subfolders for Textures/HDRI structure
         asset_subfolder = asset_folder / "Asset"  # This holds the ACTUAL asset file
         thumbnail_folder = asset_folder / "Thumbnail"
         preview_folder = asset_folder / "Preview"  # This holds the preview image for texture badge display
-        asset_subfolder.mkdir(exist_ok=True)
-        thumbnail_folder.mkdir(exist_ok=True)
-        preview_folder.mkdir(exist_ok=True)
+        
+        # The ID belongs to this job, so an unregistered folder is a partial copy from a worker that died
+        if await run_fs(asset_folder.exists):
+            logger.warning(f"🧹 Removing partial upload folder from an earlier attempt: {asset_folder}")
+            await run_fs(shutil.rmtree, asset_folder)
+        try:
+            await run_fs(create_upload_folders, asset_folder, asset_subfolder, thumbnail_folder, preview_folder)
+        except FileExistsError:
+            raise HTTPException(status_code=400, detail=f"Asset folder already exists: {asset_folder}")
+        logger.info(f"📁 Created asset folder: {asset_folder}")
+        await progress(10, "Copying files")
         
         # Handle file copying and thumbnail generation based on asset type
         copied_files = []
         thumbnails_created = []
+        pyramid_sources = []  # full-resolution textures that get deep-zoom pyramids
         preview_files_created = []
         resolution_info = None
         
         if upload_request.asset_type == 'HDRI':
             # HDRI Logic: Single file handling
             target_file = asset_subfolder / source_file.name
-            shutil.copy2(source_file, target_file)
+            await run_fs(shutil.copy2, source_file, target_file)
             copied_files.append(convert_to_network_path(str(target_file)))
             logger.info(f"📋 Copied HDRI file to Asset folder: {source_file} -> {target_file}")
             
@@ -2813,26 +2451,27 @@ async def upload_asset(upload_request: UploadAssetRequest):
             if upload_request.preview_path:
                 try:
                     preview_source = Path(upload_request.preview_path)
-                    if preview_source.exists():
+                    if await run_fs(preview_source.exists):
                         # Get EXR dimensions for target resize
                         exr_width = resolution_info.get("width", 4096)
                         exr_height = resolution_info.get("height", 2048)
                         
                         # Resize the preview/thumbnail to match EXR resolution
-                        from PIL import Image
-                        with Image.open(preview_source) as preview_img:
-                            logger.info(f"📏 Original preview size: {preview_img.size}")
-                            
-                            # Resize to match EXR dimensions exactly
-                            resized_preview = preview_img.resize((exr_width, exr_height), Image.Resampling.LANCZOS)
-                            resized_preview.save(thumbnail_file, 'PNG', optimize=True)
-                            
-                            logger.info(f"✅ Resized HDRI preview to match EXR: {preview_source} -> {thumbnail_file} ({exr_width}x{exr_height})")
-                            
+                        await progress(40, "Resizing HDRI preview")
+                        await resize_hdri_preview(preview_source, thumbnail_file, exr_width, exr_height)
+                        logger.info(f"✅ Resized HDRI preview to match EXR: {preview_source} -> {thumbnail_file} ({exr_width}x{exr_height})")
                         thumbnails_created.append(str(thumbnail_file))
                         
                 except Exception as e:
                     logger.warning(f"⚠️ Failed to process HDRI preview: {e}")
+            else:
+                # No preview supplied: tone-map the HDRI itself (one read, downsampled before encoding)
+                await progress(40, "Converting HDRI thumbnail")
+                success, _ = await run_within_budget(
+                    target_file, convert_hdr_to_exact_png, target_file, thumbnail_file, THUMBNAIL_MAX_DIMENSION
+                )
+                if success:
+                    thumbnails_created.append(str(thumbnail_file))
         
         elif upload_request.asset_type == 'Textures':
             # Texture Logic: Handle single files or texture sets
@@ -2850,15 +2489,17 @@ async def upload_asset(upload_request: UploadAssetRequest):
                     ('displacement', 'Displacement')
                 ])
                 
+                # (slot, copied file, thumbnail) - thumbnails are converted together after copying
+                thumbnail_jobs = []
                 for key, display_name in texture_map.items():
                     file_path = texture_paths.get(key)
                     if file_path and file_path.strip():
                         try:
                             source_path = Path(file_path.strip())
-                            if source_path.exists():
+                            if await run_fs(source_path.exists):
                                 # Copy texture file to Asset folder (preserve original filename)
                                 target_file = asset_subfolder / source_path.name
-                                shutil.copy2(source_path, target_file)
+                                await run_fs(shutil.copy2, source_path, target_file)
                                 copied_files.append(convert_to_network_path(str(target_file)))
                                 logger.info(f"📋 Copied {display_name} texture: {source_path} -> {target_file}")
                                 
@@ -2867,31 +2508,41 @@ async def upload_asset(upload_request: UploadAssetRequest):
                                 # Clean asset name - replace spaces with underscores
                                 clean_asset_name_for_thumbnail = clean_asset_name.replace(' ', '_')
                                 thumbnail_file = thumbnail_folder / f"{clean_asset_name_for_thumbnail}_{position}_{texture_type}_thumbnail.png"
-                                if await generate_texture_thumbnail(target_file, thumbnail_file):
-                                    thumbnails_created.append(str(thumbnail_file))
-                                    
-                                    # Use Base Color for resolution info
-                                    if key == 'baseColor' and not resolution_info:
-                                        resolution_info = await extract_image_info(target_file)
+                                thumbnail_jobs.append((key, target_file, thumbnail_file))
                                         
                         except Exception as e:
                             logger.warning(f"⚠️ Failed to process {display_name} texture: {e}")
                             continue
+                
+                # Convert all slots in parallel in the process pool
+                await progress(40, f"Converting {len(thumbnail_jobs)} texture thumbnails")
+                results = await asyncio.gather(*(
+                    generate_texture_thumbnail(target_file, thumbnail_file)
+                    for _, target_file, thumbnail_file in thumbnail_jobs
+                ))
+                pyramid_sources.extend(target_file for _, target_file, _ in thumbnail_jobs)
+                for (key, target_file, thumbnail_file), created in zip(thumbnail_jobs, results):
+                    if created:
+                        thumbnails_created.append(str(thumbnail_file))
+                        
+                        # Use Base Color for resolution info
+                        if key == 'baseColor' and not resolution_info:
+                            resolution_info = await extract_image_info(target_file)
 
                 # Process additional textures if provided - copy to Extras folder
                 if upload_request.additional_textures:
                     # Create Extras subfolder
                     extras_folder = asset_subfolder / "Extras"
-                    extras_folder.mkdir(exist_ok=True)
+                    await run_fs(extras_folder.mkdir, exist_ok=True)
                     logger.info(f"📁 Created Extras folder: {extras_folder}")
 
                     for additional_texture in upload_request.additional_textures:
                         try:
                             source_path = Path(additional_texture['filePath'].strip())
-                            if source_path.exists():
+                            if await run_fs(source_path.exists):
                                 # Copy additional texture file to Extras folder (preserve original filename)
                                 target_file = extras_folder / source_path.name
-                                shutil.copy2(source_path, target_file)
+                                await run_fs(shutil.copy2, source_path, target_file)
                                 copied_files.append(convert_to_network_path(str(target_file)))
                                 logger.info(f"✨ Copied additional texture '{additional_texture['name']}': {source_path} -> {target_file}")
                         except Exception as e:
@@ -2901,7 +2552,7 @@ async def upload_asset(upload_request: UploadAssetRequest):
             else:
                 # Single Texture: One file
                 target_file = asset_subfolder / source_file.name
-                shutil.copy2(source_file, target_file)
+                await run_fs(shutil.copy2, source_file, target_file)
                 copied_files.append(convert_to_network_path(str(target_file)))
                 logger.info(f"📋 Copied texture file to Asset folder: {source_file} -> {target_file}")
                 
@@ -2911,6 +2562,7 @@ async def upload_asset(upload_request: UploadAssetRequest):
                 # Clean asset name - replace spaces with underscores
                 clean_asset_name_for_thumbnail = clean_asset_name.replace(' ', '_')
                 thumbnail_file = thumbnail_folder / f"{clean_asset_name_for_thumbnail}_{position}_{texture_type}_thumbnail.png"
+                pyramid_sources.append(target_file)
                 if await generate_texture_thumbnail(target_file, thumbnail_file):
                     thumbnails_created.append(str(thumbnail_file))
                     resolution_info = await extract_image_info(target_file)
@@ -2919,7 +2571,7 @@ async def upload_asset(upload_request: UploadAssetRequest):
         if upload_request.asset_type == 'Textures' and upload_request.preview_image_path:
             try:
                 preview_source = Path(upload_request.preview_image_path)
-                if preview_source.exists():
+                if await run_fs(preview_source.exists):
                     # Generate resized preview image using same logic as thumbnails
                     preview_file = preview_folder / "Preview.png"
                     
@@ -2932,7 +2584,7 @@ async def upload_asset(upload_request: UploadAssetRequest):
                         logger.warning(f"⚠️ Failed to generate preview thumbnail, trying fallback...")
                         # Fallback to simple copy if thumbnail generation fails
                         import shutil
-                        shutil.copy2(preview_source, preview_file)
+                        await run_fs(shutil.copy2, preview_source, preview_file)
                         preview_files_created.append(str(preview_file))
                         logger.warning(f"⚠️ Used original preview image: {preview_file}")
                 else:
@@ -2940,6 +2592,12 @@ async def upload_asset(upload_request: UploadAssetRequest):
             except Exception as e:
                 logger.warning(f"⚠️ Failed to process preview image: {e}")
         
+        await progress(80, "Writing metadata")
+        
+        single_file = upload_request.asset_type == 'HDRI' or upload_request.subcategory != 'Texture Sets'
+        # Texture sets sum every copied file
+        total_size = await run_fs(total_file_size, [source_file] if single_file else copied_files)
+        
         # Create metadata.json file
         metadata = {
             "id": asset_id,
@@ -2951,10 +2609,10 @@ async def upload_asset(upload_request: UploadAssetRequest):
             "description": upload_request.description,
             "subcategory": upload_request.subcategory,
             "file_info": {
-                "original_path": str(source_file) if upload_request.asset_type == 'HDRI' or upload_request.subcategory != 'Texture Sets' else None,
-                "filename": source_file.name if upload_request.asset_type == 'HDRI' or upload_request.subcategory != 'Texture Sets' else None,
-                "size_bytes": source_file.stat().st_size if upload_request.asset_type == 'HDRI' or upload_request.subcategory != 'Texture Sets' else None,
-                "extension": source_file.suffix if upload_request.asset_type == 'HDRI' or upload_request.subcategory != 'Texture Sets' else None
+                "original_path": str(source_file) if single_file else None,
+                "filename": source_file.name if single_file else None,
+                "size_bytes": total_size if single_file else None,
+                "extension": source_file.suffix if single_file else None
             },
             "paths": {
                 "asset_folder": convert_to_network_path(str(asset_folder)),
@@ -3039,23 +2697,9 @@ async def upload_asset(upload_request: UploadAssetRequest):
             logger.info(f"📏 Added resolution to metadata: {resolution_info['resolution']}")
         
         metadata_file = asset_folder / "metadata.json"
-        import json
-        with open(metadata_file, 'w') as f:
-            json.dump(metadata, f, indent=2)
+        await run_fs(write_json_file, metadata_file, metadata)
         logger.info(f"📄 Created metadata file: {metadata_file}")
         
-        # Calculate total file sizes
-        total_size = 0
-        if upload_request.asset_type == 'HDRI' or upload_request.subcategory != 'Texture Sets':
-            total_size = source_file.stat().st_size
-        else:
-            # For texture sets, sum all file sizes
-            for file_path in copied_files:
-                try:
-                    total_size += Path(file_path).stat().st_size
-                except:
-                    pass
-        
         # Create asset document for database
         asset_doc = {
             "_key": asset_id,
@@ -3132,10 +2776,16 @@ async def upload_asset(upload_request: UploadAssetRequest):
             # Add all texture tags to the asset document
             asset_doc["tags"].extend(texture_tags)
         
+        await progress(90, "Registering asset")
+        
         # Insert into database using the same AssetQueries method as elsewhere
         try:
             # Use the same database connection as other endpoints
-            result = asset_queries.create_asset(asset_doc)
+            asset_doc.update(version_fields(asset_doc))
+            normalize_asset_document(asset_doc)
+            asset_doc[THUMBNAIL_INDEX_FIELD] = await run_fs(thumbnail_index.refresh, asset_doc)
+            result = await run_db(asset_queries.create_asset, asset_doc)
+            inserted = True
             logger.info(f"✅ Inserted asset into database: {result}")
             
         except Exception as db_error:
@@ -3145,7 +2795,7 @@ async def upload_asset(upload_request: UploadAssetRequest):
             import traceback
             logger.error(f"❌ Database traceback: {traceback.format_exc()}")
             try:
-                shutil.rmtree(asset_folder)
+                await run_fs(shutil.rmtree, asset_folder)
                 logger.info(f"🧹 Cleaned up asset folder after database failure: {asset_folder}")
             except Exception as cleanup_error:
                 logger.error(f"❌ Failed to cleanup asset folder: {cleanup_error}")
@@ -3153,6 +2803,20 @@ async def upload_asset(upload_request: UploadAssetRequest):
             raise HTTPException(status_code=500, detail=f"Database insert failed: {str(db_error)}")
         
         logger.info(f"✅ Successfully uploaded {upload_request.asset_type} asset: {clean_asset_name} (ID: {asset_id})")
+        try:
+            await query_cache.ainvalidate_assets([asset_index_key(asset_doc)], [asset_doc.get('category')])
+        except Exception as cache_error:
+            logger.warning(f"⚠️ Query cache invalidation failed after upload {asset_id}: {cache_error}")
+        
+        # Deep-zoom pyramids are built by separate jobs so the upload finishes first
+        for source in pyramid_sources:
+            try:
+                await job_queue.enqueue('texture_pyramid', {
+                    "source": str(source),
+                    "target": str(pyramid_dir(asset_folder, source))
+                }, unique=True)
+            except Exception as queue_error:
+                logger.warning(f"⚠️ Could not queue zoom pyramid for {source}: {queue_error}")
         
         # Return asset response
         return convert_asset_to_response(asset_doc)
@@ -3163,23 +2827,203 @@ async def upload_asset(upload_request: UploadAssetRequest):
         logger.error(f"❌ Upload failed: {str(e)}")
         import traceback
         logger.error(f"❌ Traceback: {traceback.format_exc()}")
+        # Remove the partial folder so a retry starts clean (never once the asset is registered)
+        if not inserted and asset_folder is not None and await run_fs(asset_folder.exists):
+            await run_fs(shutil.rmtree, asset_folder, ignore_errors=True)
         raise HTTPException(status_code=500, detail=f"Upload failed: {str(e)}")
 
+async def run_upload_job(payload: dict, progress) -> dict:
+    """'asset_upload' job handler"""
+    asset_queries = get_asset_queries()
+    if not asset_queries:
+        raise HTTPException(status_code=503, detail="Database not available")
+    payload = dict(payload)
+    # Jobs queued before the ID moved into the payload get one here
+    asset_id = payload.pop('asset_id', None)
+    upload_request = UploadAssetRequest(**payload)
+    asset_response = await process_upload(upload_request, asset_queries, progress,
+                                          asset_id or new_upload_asset_id(upload_request))
+    return asset_response.dict()
+
+# Validation errors (4xx) are final; database / filesystem failures are retried with the same asset ID
+job_queue.register(
+    'asset_upload',
+    run_upload_job,
+    should_retry=lambda error: not isinstance(error, HTTPException) or error.status_code >= 500
+)
+
+async def run_pyramid_job(payload: dict, progress) -> dict:
+    """'texture_pyramid' job handler: deep-zoom tiles for one full-resolution texture"""
+    await progress(5, f"Building zoom pyramid for {Path(payload['source']).name}")
+    manifest = await run_within_budget(payload['source'], build_pyramid, payload['source'], payload['target'])
+    return {"width": manifest['width'], "height": manifest['height'], "levels": len(manifest['levels'])}
+
+job_queue.register('texture_pyramid', run_pyramid_job)
+
+
+def write_uploaded_preview(temp_path: Path, preview_file: Path) -> bool:
+    """Convert an uploaded preview to PNG (runs in the process pool)"""
+    success = False
+    try:
+        # Simple approach: Use PIL for reliable image processing
+        from PIL import Image
+        import shutil
+
+        # For non-image files or if PIL fails, just copy the file
+        if temp_path.suffix.lower() in {'.jpg', '.jpeg', '.png'}:
+            try:
+                # Open, convert to RGB if needed, and save as PNG
+                with Image.open(temp_path) as img:
+                    # Convert to RGB if necessary (handles RGBA, etc.)
+                    if img.mode in ('RGBA', 'LA', 'P'):
+                        # Create white background for transparency
+                        rgb_img = Image.new('RGB', img.size, (255, 255, 255))
+                        if img.mode == 'RGBA':
+                            rgb_img.paste(img, mask=img.split()[-1])  # Use alpha channel as mask
+                        else:
+                            rgb_img.paste(img)
+                        img = rgb_img
+                    elif img.mode != 'RGB':
+                        img = img.convert('RGB')
+
+                    # Resize if too large (max 2048x2048 for preview) - PRESERVE ASPECT RATIO
+                    max_size = 2048
+                    if img.width > max_size or img.height > max_size:
+                        # Calculate new size preserving aspect ratio (no cropping!)
+                        scale_factor = min(max_size / img.width, max_size / img.height)
+                        new_width = int(img.width * scale_factor)
+                        new_height = int(img.height * scale_factor)
+                        img = img.resize((new_width, new_height), Image.Resampling.LANCZOS)
+                        logger.info(f"📏 Resized preview preserving aspect ratio: {img.width}x{img.height} -> {new_width}x{new_height}")
+
+                    # Save as PNG with good quality
+                    img.save(preview_file, 'PNG', optimize=True, quality=95)
+                    success = True
+                    logger.info(f"✅ PIL processing successful: {preview_file}")
+
+            except Exception as pil_error:
+                logger.warning(f"⚠️ PIL processing failed: {pil_error}")
+                # Fallback to direct copy
+                shutil.copy2(temp_path, preview_file)
+                success = True
+                logger.info(f"✅ Used direct copy as fallback: {preview_file}")
+        else:
+            # For TIFF, TIF, EXR - just copy directly (let browser handle)
+            shutil.copy2(temp_path, preview_file)
+            success = True
+            logger.info(f"✅ Direct copy for {temp_path.suffix}: {preview_file}")
+
+    except Exception as process_error:
+        logger.error(f"❌ Preview processing failed: {process_error}")
+        success = False
+    
+    return success
+
+def write_preview_from_path(source_path: Path, preview_file: Path) -> bool:
+    """Convert a library image to the Preview PNG, preserving alpha (runs in the process pool)"""
+    success = False
+    try:
+        # Simple approach: Use PIL for reliable image processing
+        from PIL import Image
+        import shutil
+
+        # Handle different image formats with alpha channel preservation
+        if source_path.suffix.lower() in {'.jpg', '.jpeg', '.png', '.tiff', '.tif', '.exr'}:
+            try:
+                # Load image with PIL (supports most formats including basic EXR)
+                with Image.open(source_path) as img:
+                    logger.info(f"📷 Original image: {img.mode}, size: {img.size}")
+
+                    # Preserve alpha channels for formats that support them
+                    if img.mode in ('RGBA', 'LA'):
+                        # Keep alpha channel - PNG supports transparency
+                        if img.mode == 'LA':
+                            img = img.convert('RGBA')
+                        target_mode = 'RGBA'
+                        logger.info(f"✅ Preserving alpha channel (mode: {img.mode})")
+
+                    elif img.mode == 'P':
+                        # Check if palette has transparency
+                        if 'transparency' in img.info:
+                            img = img.convert('RGBA')
+                            target_mode = 'RGBA'
+                            logger.info(f"✅ Converted palette with transparency to RGBA")
+                        else:
+                            img = img.convert('RGB')
+                            target_mode = 'RGB'
+                            logger.info(f"✅ Converted palette without transparency to RGB")
+
+                    else:
+                        # Convert other modes to RGB
+                        if img.mode != 'RGB':
+                            img = img.convert('RGB')
+                        target_mode = 'RGB'
+                        logger.info(f"✅ Converted to RGB (original mode: {img.mode})")
+
+                    # Resize if too large (max 2048x2048 for preview) - PRESERVE ASPECT RATIO
+                    max_size = 2048
+                    if img.width > max_size or img.height > max_size:
+                        # Calculate new size preserving aspect ratio (no cropping!)
+                        scale_factor = min(max_size / img.width, max_size / img.height)
+                        new_width = int(img.width * scale_factor)
+                        new_height = int(img.height * scale_factor)
+                        img = img.resize((new_width, new_height), Image.Resampling.LANCZOS)
+                        logger.info(f"📏 Resized preview preserving aspect ratio: {img.width}x{img.height} -> {new_width}x{new_height}")
+
+                    # Save as PNG with appropriate settings for alpha preservation
+                    save_kwargs = {}
+                    if target_mode == 'RGBA':
+                        # PNG with alpha channel
+                        save_kwargs = {
+                            'format': 'PNG',
+                            'optimize': True,
+                            'compress_level': 6  # Good balance of size/quality for RGBA
+                        }
+                        logger.info(f"💾 Saving PNG with alpha channel")
+                    else:
+                        # PNG without alpha channel
+                        save_kwargs = {
+                            'format': 'PNG', 
+                            'optimize': True,
+                            'compress_level': 6
+                        }
+                        logger.info(f"💾 Saving PNG without alpha channel")
+
+                    img.save(preview_file, **save_kwargs)
+                    success = True
+                    logger.info(f"✅ Image processing successful: {preview_file} (mode: {target_mode})")
+
+            except Exception as pil_error:
+                logger.warning(f"⚠️ PIL processing failed: {pil_error}")
+                # Fallback to direct copy for unsupported formats
+                shutil.copy2(source_path, preview_file)
+                success = True
+                logger.info(f"✅ Used direct copy as fallback: {preview_file}")
+        else:
+            # For unsupported formats - direct copy
+            shutil.copy2(source_path, preview_file)
+            success = True
+            logger.info(f"✅ Direct copy for {source_path.suffix}: {preview_file}")
+
+    except Exception as process_error:
+        logger.error(f"❌ Preview processing failed: {process_error}")
+        success = False
+    
+    return success
 
 @router.post("/assets/{asset_id}/update-preview")
 async def update_asset_preview_image(
     asset_id: str, 
-    file: UploadFile = File(...)
+    file: UploadFile = File(...),
+    asset_queries: Optional[AssetQueries] = Depends(get_asset_queries)
 ):
     """Update or create preview image for a texture set asset"""
     try:
-        # Get asset queries instance
-        asset_queries = get_asset_queries()
         if not asset_queries:
             raise HTTPException(status_code=503, detail="Database not available")
         
         # Get asset data from database
-        asset_result = asset_queries.get_asset_with_dependencies(asset_id)
+        asset_result = await run_db(asset_queries.get_asset_with_dependencies, asset_id)
         asset_data = asset_result.get('asset') if asset_result else None
         if not asset_data:
             raise HTTPException(status_code=404, detail=f"Asset {asset_id} not found")
@@ -3203,18 +3047,18 @@ async def update_asset_preview_image(
         container_path = asset_folder_path.replace('/net/library/atlaslib', '/app/assets')
         asset_folder = Path(container_path)
         
-        if not asset_folder.exists():
+        if not await run_fs(asset_folder.exists):
             raise HTTPException(status_code=404, detail=f"Asset folder not found: {asset_folder}")
         
         # Create Preview folder if it doesn't exist
         preview_folder = asset_folder / "Preview"
-        preview_folder.mkdir(exist_ok=True)
+        await run_fs(preview_folder.mkdir, exist_ok=True)
         logger.info(f"📁 Preview folder ready: {preview_folder}")
         
         # Create temporary file for processing
         with tempfile.NamedTemporaryFile(suffix=file_extension, delete=False) as temp_file:
             # Save uploaded file to temporary location
-            shutil.copyfileobj(file.file, temp_file)
+            await run_fs(shutil.copyfileobj, file.file, temp_file)
             temp_path = Path(temp_file.name)
             logger.info(f"📄 Saved uploaded file to temp: {temp_path}")
         
@@ -3225,60 +3069,8 @@ async def update_asset_preview_image(
             # Process the uploaded image using simplified robust approach
             logger.info(f"🔧 Processing preview image: {temp_path} -> {preview_file}")
             
-            # Use the same simplified approach we fixed earlier
-            success = False
-            try:
-                # Simple approach: Use PIL for reliable image processing
-                from PIL import Image
-                import shutil
-                
-                # For non-image files or if PIL fails, just copy the file
-                if temp_path.suffix.lower() in {'.jpg', '.jpeg', '.png'}:
-                    try:
-                        # Open, convert to RGB if needed, and save as PNG
-                        with Image.open(temp_path) as img:
-                            # Convert to RGB if necessary (handles RGBA, etc.)
-                            if img.mode in ('RGBA', 'LA', 'P'):
-                                # Create white background for transparency
-                                rgb_img = Image.new('RGB', img.size, (255, 255, 255))
-                                if img.mode == 'RGBA':
-                                    rgb_img.paste(img, mask=img.split()[-1])  # Use alpha channel as mask
-                                else:
-                                    rgb_img.paste(img)
-                                img = rgb_img
-                            elif img.mode != 'RGB':
-                                img = img.convert('RGB')
-                            
-                            # Resize if too large (max 2048x2048 for preview) - PRESERVE ASPECT RATIO
-                            max_size = 2048
-                            if img.width > max_size or img.height > max_size:
-                                # Calculate new size preserving aspect ratio (no cropping!)
-                                scale_factor = min(max_size / img.width, max_size / img.height)
-                                new_width = int(img.width * scale_factor)
-                                new_height = int(img.height * scale_factor)
-                                img = img.resize((new_width, new_height), Image.Resampling.LANCZOS)
-                                logger.info(f"📏 Resized preview preserving aspect ratio: {img.width}x{img.height} -> {new_width}x{new_height}")
-                            
-                            # Save as PNG with good quality
-                            img.save(preview_file, 'PNG', optimize=True, quality=95)
-                            success = True
-                            logger.info(f"✅ PIL processing successful: {preview_file}")
-                            
-                    except Exception as pil_error:
-                        logger.warning(f"⚠️ PIL processing failed: {pil_error}")
-                        # Fallback to direct copy
-                        shutil.copy2(temp_path, preview_file)
-                        success = True
-                        logger.info(f"✅ Used direct copy as fallback: {preview_file}")
-                else:
-                    # For TIFF, TIF, EXR - just copy directly (let browser handle)
-                    shutil.copy2(temp_path, preview_file)
-                    success = True
-                    logger.info(f"✅ Direct copy for {temp_path.suffix}: {preview_file}")
-                    
-            except Exception as process_error:
-                logger.error(f"❌ Preview processing failed: {process_error}")
-                success = False
+            # Use the same simplified approach we fixed earlier (decode/resize in the process pool)
+            success = await run_cpu(write_uploaded_preview, temp_path, preview_file)
             
             if success:
                 logger.info(f"✅ Successfully created preview image: {preview_file}")
@@ -3309,8 +3101,7 @@ async def update_asset_preview_image(
                     """
                     bind_vars = {'asset_id': asset_id, 'updates': update_data}
                     
-                    cursor = asset_queries.db.aql.execute(aql_query, bind_vars=bind_vars)
-                    result_list = list(cursor)
+                    result_list = await run_db(lambda: list(asset_queries.db.aql.execute(aql_query, bind_vars=bind_vars)))
                     
                     if result_list:
                         logger.info(f"✅ Updated database with preview file path: {network_preview_path}")
@@ -3321,6 +3112,8 @@ async def update_asset_preview_image(
                     logger.error(f"❌ Failed to update database: {db_error}")
                     # Don't fail the entire operation if DB update fails, preview file is still created
                 
+                # New preview becomes the served thumbnail
+                await run_fs(refresh_thumbnail_index, asset_queries, asset_data)
                 return {
                     "success": True,
                     "message": "Preview image updated successfully",
@@ -3331,9 +3124,11 @@ async def update_asset_preview_image(
                 # If processing failed, try fallback to simple copy
                 logger.warning(f"⚠️ Preview processing failed, trying fallback copy...")
                 try:
-                    shutil.copy2(temp_path, preview_file)
+                    await run_fs(shutil.copy2, temp_path, preview_file)
                     logger.info(f"✅ Used original preview image as fallback: {preview_file}")
                     
+                    # New preview becomes the served thumbnail
+                    await run_fs(refresh_thumbnail_index, asset_queries, asset_data)
                     return {
                         "success": True,
                         "message": "Preview image updated successfully (original copy)",
@@ -3347,7 +3142,7 @@ async def update_asset_preview_image(
         finally:
             # Clean up temporary file
             try:
-                temp_path.unlink()
+                await run_fs(temp_path.unlink)
                 logger.info(f"🧹 Cleaned up temporary file: {temp_path}")
             except Exception as cleanup_error:
                 logger.warning(f"⚠️ Failed to cleanup temp file: {cleanup_error}")
@@ -3364,17 +3159,16 @@ async def update_asset_preview_image(
 @router.post("/assets/{asset_id}/update-preview-from-path")
 async def update_asset_preview_image_from_path(
     asset_id: str, 
-    request: dict
+    request: dict,
+    asset_queries: Optional[AssetQueries] = Depends(get_asset_queries)
 ):
     """Update or create preview image for a texture set asset from a file path"""
     try:
-        # Get asset queries instance
-        asset_queries = get_asset_queries()
         if not asset_queries:
             raise HTTPException(status_code=503, detail="Database not available")
         
         # Get asset data from database
-        asset_result = asset_queries.get_asset_with_dependencies(asset_id)
+        asset_result = await run_db(asset_queries.get_asset_with_dependencies, asset_id)
         asset_data = asset_result.get('asset') if asset_result else None
         if not asset_data:
             raise HTTPException(status_code=404, detail=f"Asset {asset_id} not found")
@@ -3401,7 +3195,7 @@ async def update_asset_preview_image_from_path(
         
         # Check if source file exists (using container path)
         source_path = Path(container_source_path)
-        if not source_path.exists():
+        if not await run_fs(source_path.exists):
             raise HTTPException(status_code=404, detail=f"Source file not found: {file_path} (searched at {container_source_path})")
         
         # Get asset folder path
@@ -3413,12 +3207,12 @@ async def update_asset_preview_image_from_path(
         container_path = asset_folder_path.replace('/net/library/atlaslib', '/app/assets')
         asset_folder = Path(container_path)
         
-        if not asset_folder.exists():
+        if not await run_fs(asset_folder.exists):
             raise HTTPException(status_code=404, detail=f"Asset folder not found: {asset_folder}")
         
         # Create Preview folder if it doesn't exist
         preview_folder = asset_folder / "Preview"
-        preview_folder.mkdir(exist_ok=True)
+        await run_fs(preview_folder.mkdir, exist_ok=True)
         logger.info(f"📁 Preview folder ready: {preview_folder}")
         
         # Define target preview file path
@@ -3427,95 +3221,10 @@ async def update_asset_preview_image_from_path(
         # Simplified and more robust preview image processing
         logger.info(f"🔧 Processing preview image: {source_path} -> {preview_file}")
         
-        success = False
-        try:
-            # Simple approach: Use PIL for reliable image processing
-            from PIL import Image
-            import shutil
-            
-            # Handle different image formats with alpha channel preservation
-            if source_path.suffix.lower() in {'.jpg', '.jpeg', '.png', '.tiff', '.tif', '.exr'}:
-                try:
-                    # Load image with PIL (supports most formats including basic EXR)
-                    with Image.open(source_path) as img:
-                        logger.info(f"📷 Original image: {img.mode}, size: {img.size}")
-                        
-                        # Preserve alpha channels for formats that support them
-                        if img.mode in ('RGBA', 'LA'):
-                            # Keep alpha channel - PNG supports transparency
-                            if img.mode == 'LA':
-                                img = img.convert('RGBA')
-                            target_mode = 'RGBA'
-                            logger.info(f"✅ Preserving alpha channel (mode: {img.mode})")
-                            
-                        elif img.mode == 'P':
-                            # Check if palette has transparency
-                            if 'transparency' in img.info:
-                                img = img.convert('RGBA')
-                                target_mode = 'RGBA'
-                                logger.info(f"✅ Converted palette with transparency to RGBA")
-                            else:
-                                img = img.convert('RGB')
-                                target_mode = 'RGB'
-                                logger.info(f"✅ Converted palette without transparency to RGB")
-                                
-                        else:
-                            # Convert other modes to RGB
-                            if img.mode != 'RGB':
-                                img = img.convert('RGB')
-                            target_mode = 'RGB'
-                            logger.info(f"✅ Converted to RGB (original mode: {img.mode})")
-                        
-                        # Resize if too large (max 2048x2048 for preview) - PRESERVE ASPECT RATIO
-                        max_size = 2048
-                        if img.width > max_size or img.height > max_size:
-                            # Calculate new size preserving aspect ratio (no cropping!)
-                            scale_factor = min(max_size / img.width, max_size / img.height)
-                            new_width = int(img.width * scale_factor)
-                            new_height = int(img.height * scale_factor)
-                            img = img.resize((new_width, new_height), Image.Resampling.LANCZOS)
-                            logger.info(f"📏 Resized preview preserving aspect ratio: {img.width}x{img.height} -> {new_width}x{new_height}")
-                        
-                        # Save as PNG with appropriate settings for alpha preservation
-                        save_kwargs = {}
-                        if target_mode == 'RGBA':
-                            # PNG with alpha channel
-                            save_kwargs = {
-                                'format': 'PNG',
-                                'optimize': True,
-                                'compress_level': 6  # Good balance of size/quality for RGBA
-                            }
-                            logger.info(f"💾 Saving PNG with alpha channel")
-                        else:
-                            # PNG without alpha channel
-                            save_kwargs = {
-                                'format': 'PNG', 
-                                'optimize': True,
-                                'compress_level': 6
-                            }
-                            logger.info(f"💾 Saving PNG without alpha channel")
-                        
-                        img.save(preview_file, **save_kwargs)
-                        success = True
-                        logger.info(f"✅ Image processing successful: {preview_file} (mode: {target_mode})")
-                        
-                except Exception as pil_error:
-                    logger.warning(f"⚠️ PIL processing failed: {pil_error}")
-                    # Fallback to direct copy for unsupported formats
-                    shutil.copy2(source_path, preview_file)
-                    success = True
-                    logger.info(f"✅ Used direct copy as fallback: {preview_file}")
-            else:
-                # For unsupported formats - direct copy
-                shutil.copy2(source_path, preview_file)
-                success = True
-                logger.info(f"✅ Direct copy for {source_path.suffix}: {preview_file}")
-                
-        except Exception as process_error:
-            logger.error(f"❌ Preview processing failed: {process_error}")
-            success = False
+        # Decode/resize in the process pool
+        success = await run_cpu(write_preview_from_path, source_path, preview_file)
         
-        if success and preview_file.exists():
+        if success and await run_fs(preview_file.exists):
             logger.info(f"✅ Successfully created preview image: {preview_file}")
             
             # Update database with preview file path
@@ -3537,8 +3246,7 @@ async def update_asset_preview_image_from_path(
                 """
                 bind_vars = {'asset_id': asset_id, 'updates': update_data}
                 
-                cursor = asset_queries.db.aql.execute(aql_query, bind_vars=bind_vars)
-                result_list = list(cursor)
+                result_list = await run_db(lambda: list(asset_queries.db.aql.execute(aql_query, bind_vars=bind_vars)))
                 
                 if result_list:
                     logger.info(f"✅ Updated database with preview file path: {network_preview_path}")
@@ -3549,6 +3257,8 @@ async def update_asset_preview_image_from_path(
                 logger.error(f"❌ Failed to update database: {db_error}")
                 # Don't fail the entire operation if DB update fails, preview file is still created
             
+            # New preview becomes the served thumbnail
+            await run_fs(refresh_thumbnail_index, asset_queries, asset_data)
             return {
                 "success": True,
                 "message": "Preview image updated successfully from file path",
@@ -3560,9 +3270,11 @@ async def update_asset_preview_image_from_path(
             # If processing failed, try fallback to simple copy
             logger.warning(f"⚠️ Preview processing failed, trying fallback copy...")
             try:
-                shutil.copy2(source_path, preview_file)
+                await run_fs(shutil.copy2, source_path, preview_file)
                 logger.info(f"✅ Used original preview image as fallback: {preview_file}")
                 
+                # New preview becomes the served thumbnail
+                await run_fs(refresh_thumbnail_index, asset_queries, asset_data)
                 return {
                     "success": True,
                     "message": "Preview image updated successfully (original copy)",
@@ -3583,55 +3295,88 @@ async def update_asset_preview_image_from_path(
         raise HTTPException(status_code=500, detail=f"Preview update from path failed: {str(e)}")
 
 
+BACKUPS_DIR = Path("/app/backups")
+
+def write_database_backup(queries: AssetQueries) -> dict:
+    """Dump Atlas_Library to a timestamped JSON file in BACKUPS_DIR (blocking: AQL dump + file write)"""
+    import json
+    query = "FOR asset IN Atlas_Library RETURN asset"
+    all_assets = list(queries.db.aql.execute(query))
+    
+    # Create backup metadata
+    backup_timestamp = datetime.now().isoformat()
+    backup_data = {
+        "backup_metadata": {
+            "timestamp": backup_timestamp,
+            "database_name": "blacksmith_atlas",
+            "collection_name": "Atlas_Library",
+            "total_assets": len(all_assets),
+            "backup_version": "1.0"
+        },
+        "assets": all_assets
+    }
+    
+    # Ensure backups directory exists
+    BACKUPS_DIR.mkdir(exist_ok=True)
+    
+    # Create filename with timestamp
+    backup_filename = f"atlas_backup_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+    backup_path = BACKUPS_DIR / backup_filename
+    with open(backup_path, 'w', encoding='utf-8') as f:
+        json.dump(backup_data, f, indent=2, ensure_ascii=False, default=str)
+    
+    return {
+        "backup_file": backup_filename,
+        "backup_path": str(backup_path),
+        "total_assets": len(all_assets),
+        "timestamp": backup_timestamp
+    }
+
+def read_backup_status() -> dict:
+    """Latest backup file and backup count (blocking: glob + stat)"""
+    if not BACKUPS_DIR.exists():
+        return {
+            "last_backup": None,
+            "backup_count": 0,
+            "backups_directory_exists": False
+        }
+    
+    # Find the most recent backup file
+    backups = [(path, path.stat()) for path in BACKUPS_DIR.glob("atlas_backup_*.json")]
+    if not backups:
+        return {
+            "last_backup": None,
+            "backup_count": 0,
+            "backups_directory_exists": True
+        }
+    
+    latest_backup, latest_stat = max(backups, key=lambda backup: backup[1].st_mtime)
+    return {
+        "last_backup": {
+            "filename": latest_backup.name,
+            "timestamp": datetime.fromtimestamp(latest_stat.st_mtime).isoformat(),
+            "size_bytes": latest_stat.st_size,
+            "size_mb": round(latest_stat.st_size / (1024 * 1024), 2)
+        },
+        "backup_count": len(backups),
+        "backups_directory_exists": True
+    }
+
 @router.post("/database/backup")
-async def backup_database():
+async def backup_database(queries: Optional[AssetQueries] = Depends(get_asset_queries)):
     """Create a complete backup of the Atlas_Library collection"""
     try:
-        queries = get_asset_queries()
         if not queries:
             raise HTTPException(status_code=500, detail="Failed to connect to database")
         
-        # Get all assets from the collection
         logger.info("🔄 Starting database backup...")
-        query = "FOR asset IN Atlas_Library RETURN asset"
-        cursor = queries.db.aql.execute(query)
-        all_assets = list(cursor)
-        
-        # Create backup metadata
-        backup_timestamp = datetime.now().isoformat()
-        backup_data = {
-            "backup_metadata": {
-                "timestamp": backup_timestamp,
-                "database_name": "blacksmith_atlas",
-                "collection_name": "Atlas_Library",
-                "total_assets": len(all_assets),
-                "backup_version": "1.0"
-            },
-            "assets": all_assets
-        }
-        
-        # Ensure backups directory exists
-        backups_dir = Path("/app/backups")
-        backups_dir.mkdir(exist_ok=True)
-        
-        # Create filename with timestamp
-        backup_filename = f"atlas_backup_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
-        backup_path = backups_dir / backup_filename
-        
-        # Write backup to file
-        import json
-        with open(backup_path, 'w', encoding='utf-8') as f:
-            json.dump(backup_data, f, indent=2, ensure_ascii=False, default=str)
-        
-        logger.info(f"✅ Database backup completed: {backup_path}")
+        backup = await run_db(write_database_backup, queries)
+        logger.info(f"✅ Database backup completed: {backup['backup_path']}")
         
         return {
             "success": True,
             "message": "Database backup completed successfully",
-            "backup_file": backup_filename,
-            "backup_path": str(backup_path),
-            "total_assets": len(all_assets),
-            "timestamp": backup_timestamp
+            **backup
         }
         
     except Exception as e:
@@ -3645,38 +3390,7 @@ async def backup_database():
 async def get_backup_status():
     """Get information about the latest backup"""
     try:
-        backups_dir = Path("/app/backups")
-        
-        if not backups_dir.exists():
-            return {
-                "last_backup": None,
-                "backup_count": 0,
-                "backups_directory_exists": False
-            }
-        
-        # Find the most recent backup file
-        backup_files = list(backups_dir.glob("atlas_backup_*.json"))
-        backup_files.sort(key=lambda x: x.stat().st_mtime, reverse=True)
-        
-        if not backup_files:
-            return {
-                "last_backup": None,
-                "backup_count": 0,
-                "backups_directory_exists": True
-            }
-        
-        latest_backup = backup_files[0]
-        
-        return {
-            "last_backup": {
-                "filename": latest_backup.name,
-                "timestamp": datetime.fromtimestamp(latest_backup.stat().st_mtime).isoformat(),
-                "size_bytes": latest_backup.stat().st_size,
-                "size_mb": round(latest_backup.stat().st_size / (1024 * 1024), 2)
-            },
-            "backup_count": len(backup_files),
-            "backups_directory_exists": True
-        }
+        return await run_fs(read_backup_status)
         
     except Exception as e:
         logger.error(f"❌ Failed to get backup status: {str(e)}")
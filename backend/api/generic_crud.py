@@ -6,7 +6,7 @@ from datetime import datetime
 import uuid
 import logging
 from backend.core.config_manager import config as atlas_config
-from backend.assetlibrary.database.arango_queries import AssetQueries
+from backend.core.database import get_database
 
 logger = logging.getLogger(__name__)
 
@@ -60,29 +60,22 @@ class GenericCRUDHandler(Generic[T, CreateT, UpdateT]):
         self.searchable_fields = searchable_fields or ["name", "description", "category"]
         self.expandable_relations = expandable_relations or []
         self.router = APIRouter(prefix=f"/{collection_name}", tags=[collection_name])
+        self._collection_ready = False
         self._setup_routes()
     
     def get_db(self):
-        """Get database connection"""
+        """Dependency returning the pooled database, ensuring the collection exists"""
+        db = get_database()
+        if db is None:
+            raise HTTPException(status_code=503, detail="Database not available")
+        
         try:
-            environment = os.getenv('ATLAS_ENV', 'development')
-            db_config = atlas_config.get('api.database', {})
-            arango_config = {
-                'hosts': [f"http://{db_config.get('host', 'localhost')}:{db_config.get('port', '8529')}"],
-                'database': db_config.get('name', 'blacksmith_atlas'),
-                'username': db_config.get('username', 'root'),
-                'password': db_config.get('password', 'atlas_password'),
-                'collections': {
-                    'assets': 'Atlas_Library'
-                }
-            }
-            queries = AssetQueries(arango_config)
-            
-            # Ensure collection exists
-            if not queries.db.has_collection(self.collection_name):
-                queries.db.create_collection(self.collection_name)
-            
-            return queries.db
+            # Only check for the collection once per process
+            if not self._collection_ready:
+                if not db.has_collection(self.collection_name):
+                    db.create_collection(self.collection_name)
+                self._collection_ready = True
+            return db
         except Exception as e:
             logger.error(f"Failed to get database connection: {e}")
             raise HTTPException(status_code=503, detail="Database not available")
@@ -93,10 +86,10 @@ class GenericCRUDHandler(Generic[T, CreateT, UpdateT]):
         @self.router.get("", response_model=PaginatedResponse[self.response_model])
         async def list_items(
             search: Optional[str] = Query(None, description="Search term"),
-            pagination: PaginationParams = Depends()
+            pagination: PaginationParams = Depends(),
+            db = Depends(self.get_db)
         ):
             """List all items with pagination and search"""
-            db = self.get_db()
             collection = db.collection(self.collection_name)
             
             try:
@@ -142,9 +135,8 @@ class GenericCRUDHandler(Generic[T, CreateT, UpdateT]):
                 raise HTTPException(status_code=500, detail=f"Error listing items: {str(e)}")
         
         @self.router.post("", response_model=self.response_model)
-        async def create_item(item: self.create_model):
+        async def create_item(item: self.create_model, db = Depends(self.get_db)):
             """Create a new item"""
-            db = self.get_db()
             collection = db.collection(self.collection_name)
             
             try:
@@ -169,9 +161,8 @@ class GenericCRUDHandler(Generic[T, CreateT, UpdateT]):
                 raise HTTPException(status_code=500, detail=f"Error creating item: {str(e)}")
         
         @self.router.get("/{item_id}", response_model=self.response_model)
-        async def get_item(item_id: str):
+        async def get_item(item_id: str, db = Depends(self.get_db)):
             """Get a specific item by ID"""
-            db = self.get_db()
             collection = db.collection(self.collection_name)
             
             try:
@@ -188,9 +179,8 @@ class GenericCRUDHandler(Generic[T, CreateT, UpdateT]):
                 raise HTTPException(status_code=500, detail=f"Error getting item: {str(e)}")
         
         @self.router.put("/{item_id}", response_model=self.response_model)
-        async def update_item(item_id: str, item: self.create_model):
+        async def update_item(item_id: str, item: self.create_model, db = Depends(self.get_db)):
             """Full update of an item"""
-            db = self.get_db()
             collection = db.collection(self.collection_name)
             
             try:
@@ -220,9 +210,8 @@ class GenericCRUDHandler(Generic[T, CreateT, UpdateT]):
                 raise HTTPException(status_code=500, detail=f"Error updating item: {str(e)}")
         
         @self.router.patch("/{item_id}", response_model=self.response_model)
-        async def patch_item(item_id: str, updates: Dict[str, Any]):
+        async def patch_item(item_id: str, updates: Dict[str, Any], db = Depends(self.get_db)):
             """Partial update of an item"""
-            db = self.get_db()
             collection = db.collection(self.collection_name)
             
             try:
@@ -248,9 +237,8 @@ class GenericCRUDHandler(Generic[T, CreateT, UpdateT]):
                 raise HTTPException(status_code=500, detail=f"Error patching item: {str(e)}")
         
         @self.router.delete("/{item_id}")
-        async def delete_item(item_id: str):
+        async def delete_item(item_id: str, db = Depends(self.get_db)):
             """Delete an item"""
-            db = self.get_db()
             collection = db.collection(self.collection_name)
             
             try:
@@ -277,7 +265,8 @@ class GenericCRUDHandler(Generic[T, CreateT, UpdateT]):
         @self.router.get("/{item_id}/expand")
         async def expand_item(
             item_id: str,
-            relations: Optional[List[str]] = Query(None, description="Relations to expand")
+            relations: Optional[List[str]] = Query(None, description="Relations to expand"),
+            db = Depends(self.get_db)
         ):
             """Get item with expanded relationships"""
             if not self.expandable_relations:
@@ -286,7 +275,6 @@ class GenericCRUDHandler(Generic[T, CreateT, UpdateT]):
                     detail="Expansion not implemented for this collection"
                 )
             
-            db = self.get_db()
             collection = db.collection(self.collection_name)
             
             try:
@@ -0,0 +1,33 @@
+# backend/api/jobs.py - Status endpoints for background jobs
+from fastapi import APIRouter, HTTPException, Query
+from typing import Optional
+import logging
+
+from backend.core.executors import run_fs
+from backend.core.jobs import job_queue, JOB_STATUSES
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/api/v1", tags=["jobs"])
+
+@router.get("/jobs/{job_id}")
+async def get_job(job_id: str):
+    """Status, progress and (once finished) result or error of a background job"""
+    job = await run_fs(job_queue.get, job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
+    return job
+
+@router.get("/jobs")
+async def list_jobs(
+        status: Optional[str] = Query(None, description="queued, running, succeeded or failed"),
+        kind: Optional[str] = Query(None, description="Job kind, e.g. asset_upload"),
+        limit: int = Query(50, ge=1, le=500)
+):
+    """Most recent jobs, newest first"""
+    if status and status not in JOB_STATUSES:
+        raise HTTPException(status_code=400, detail=f"Unknown status '{status}'. Allowed: {', '.join(JOB_STATUSES)}")
+    return {
+        "jobs": await run_fs(job_queue.list_jobs, status=status, kind=kind, limit=limit),
+        "counts": await run_fs(job_queue.counts)
+    }
@@ -600,6 +600,29 @@ def call_atlas_api_ingestion(metadata_file_path):
         traceback.print_exc()
         return False
 
+def fetch_asset_versions(base_id):
+    """
+    GET /api/v1/assets/{base_id}/versions - versions of a base UID (11 chars) or
+    base UID + variant (13 chars), resolved server-side with one indexed query
+    """
+    api_url = f"http://localhost:8000/api/v1/assets/{base_id.upper()}/versions"
+    print(f"   🌐 Making API request to: {api_url}")
+    
+    try:
+        response = requests.get(api_url, timeout=30)
+    except Exception as req_error:
+        print(f"❌ Request failed: {req_error}")
+        return None
+    
+    print(f"   📡 Response status: {response.status_code}")
+    
+    if response.status_code != 200:
+        print(f"❌ API request failed: {response.status_code}")
+        print(f"   Response text: {response.text}")
+        return None
+    
+    return response.json()
+
 def lookup_asset_versions(base_uid):
     """
     Look up all versions of an asset by base UID and return version info
@@ -607,89 +630,14 @@ def lookup_asset_versions(base_uid):
     try:
         print(f"🔍 Looking up versions for base UID: {base_uid}")
         
-        # Query the Atlas API to get all assets
-        api_url = "http://localhost:8000/api/v1/assets"
-        print(f"   🌐 Making API request to: {api_url}")
-        
-        try:
-            response = requests.get(api_url, params={"limit": 1000}, timeout=30)
-        except Exception as req_error:
-            print(f"❌ Request failed: {req_error}")
+        result = fetch_asset_versions(base_uid)
+        if result is None:
             return None
         
-        print(f"   📡 Response status: {response.status_code}")
-        
-        if response.status_code != 200:
-            print(f"❌ API request failed: {response.status_code}")
-            print(f"   Response text: {response.text}")
-            return None
-        
-        assets_data = response.json()
-        all_assets = assets_data.get('items', [])
-        
-        # Filter assets that match the base UID (first 11 characters)
-        matching_assets = []
-        print(f"   🔍 Checking {len(all_assets)} total assets in database...")
-        
-        for asset in all_assets:
-            asset_id = asset.get('id', '')
-            print(f"   🔍 Checking asset: {asset_id}")
-            
-            if len(asset_id) >= 11 and asset_id[:11].upper() == base_uid.upper():
-                matching_assets.append(asset)
-                print(f"   ✅ Found matching asset: {asset_id}")
-            else:
-                if len(asset_id) >= 11:
-                    print(f"   ❌ No match: {asset_id[:11]} != {base_uid.upper()}")
-                else:
-                    print(f"   ❌ Too short: {asset_id}")
-        
-        print(f"   📊 Total matching assets: {len(matching_assets)}")
-        
-        if not matching_assets:
-            print(f"   ❌ No assets found with base UID: {base_uid}")
-            return {
-                'base_uid': base_uid,
-                'existing_versions': [],
-                'next_version': 1,
-                'latest_asset': None
-            }
-        
-        # Sort by version number (last 3 characters)
-        version_info = []
-        print(f"   🔍 Processing {len(matching_assets)} matching assets...")
-        
-        for asset in matching_assets:
-            asset_id = asset.get('id', '')
-            print(f"   🔍 Processing asset ID: {asset_id}")
-            
-            if len(asset_id) == 14:  # Legacy 14-character UIDs (9+2+3)
-                try:
-                    version_str = asset_id[-3:]
-                    version_num = int(version_str)
-                    version_info.append({
-                        'version': version_num,
-                        'asset_id': asset_id,
-                        'asset_data': asset
-                    })
-                    print(f"   ✅ Parsed version {version_num:03d} from {asset_id}")
-                except ValueError:
-                    print(f"   ⚠️ Invalid version format in asset ID: {asset_id} (last 3: '{asset_id[-3:]}')")
-            else:
-                print(f"   ⚠️ Asset ID wrong length: {asset_id} (length: {len(asset_id)})")
-        
-        # Sort by version number
-        version_info.sort(key=lambda x: x['version'])
-        print(f"   🔍 Sorted version info: {[(v['asset_id'], v['version']) for v in version_info]}")
-        
-        # Find next version number
-        existing_versions = [v['version'] for v in version_info]
+        version_info = result.get('versions', [])
+        existing_versions = result.get('existing_versions', [])
         next_version = max(existing_versions) + 1 if existing_versions else 1
-        print(f"   📊 Existing versions: {existing_versions}")
-        print(f"   🔢 Next version calculated: {next_version}")
-        
-        # Get latest asset for metadata inheritance
-        latest_asset = version_info[-1]['asset_data'] if version_info else None
+        latest_asset = result.get('latest')
         
         print(f"   📊 Found {len(existing_versions)} existing versions: {existing_versions}")
         print(f"   🔢 Next version will be: {next_version:03d}")
@@ -715,106 +663,31 @@ def lookup_asset_versions_v2(asset_base_id):
     try:
         print(f"🔍 Looking up versions for asset base ID: {asset_base_id}")
         
-        # Query the Atlas API to get all assets
-        api_url = "http://localhost:8000/api/v1/assets"
-        print(f"   🌐 Making API request to: {api_url}")
-        
-        try:
-            response = requests.get(api_url, params={"limit": 1000}, timeout=30)
-        except Exception as req_error:
-            print(f"❌ Request failed: {req_error}")
+        result = fetch_asset_versions(asset_base_id)
+        if result is None:
             return None
         
-        print(f"   📡 Response status: {response.status_code}")
-        
-        if response.status_code != 200:
-            print(f"❌ API request failed: {response.status_code}")
-            print(f"   Response text: {response.text}")
-            return None
-        
-        assets_data = response.json()
-        all_assets = assets_data.get('items', [])
-        
-        # Filter assets that match the asset base ID (first 13 characters: 11 base + 2 variant)
-        matching_assets = []
-        print(f"   🔍 Checking {len(all_assets)} total assets in database...")
-        
-        for asset in all_assets:
-            asset_id = asset.get('id', '')
-            print(f"   🔍 Checking asset: {asset_id}")
-            
-            if len(asset_id) >= 13 and asset_id[:13].upper() == asset_base_id.upper():
-                matching_assets.append(asset)
-                print(f"   ✅ Found matching asset: {asset_id}")
-            else:
-                if len(asset_id) >= 13:
-                    print(f"   ❌ No match: {asset_id[:13]} != {asset_base_id.upper()}")
-                else:
-                    print(f"   ❌ Too short: {asset_id} (length: {len(asset_id)})")
-        
-        print(f"   📊 Total matching assets: {len(matching_assets)}")
-        
-        if not matching_assets:
+        existing_versions = result.get('existing_versions', [])
+        if not existing_versions:
             print(f"   ❌ No assets found with asset base ID: {asset_base_id}")
             return None  # Return None to trigger "No Asset Found" error
         
-        # Sort by version number (last 3 characters)
-        version_info = []
-        print(f"   🔍 Processing {len(matching_assets)} matching assets...")
-        
-        for asset in matching_assets:
-            asset_id = asset.get('id', '')
-            print(f"   🔍 Processing asset ID: {asset_id}")
-            
-            if len(asset_id) == 16:  # 16-character UIDs now
-                try:
-                    version_str = asset_id[-3:]  # Last 3 characters are version
-                    version_num = int(version_str)
-                    version_info.append({
-                        'version': version_num,
-                        'asset_id': asset_id,
-                        'asset_data': asset
-                    })
-                    print(f"   ✅ Parsed version {version_num:03d} from {asset_id}")
-                except ValueError:
-                    print(f"   ⚠️ Invalid version format in asset ID: {asset_id} (last 3: '{asset_id[-3:]}')")
-            elif len(asset_id) == 14:  # Legacy 14-character UIDs
-                try:
-                    version_str = asset_id[-3:]  # Last 3 characters are version
-                    version_num = int(version_str)
-                    version_info.append({
-                        'version': version_num,
-                        'asset_id': asset_id,
-                        'asset_data': asset
-                    })
-                    print(f"   ✅ Parsed legacy version {version_num:03d} from {asset_id}")
-                except ValueError:
-                    print(f"   ⚠️ Invalid version format in legacy asset ID: {asset_id} (last 3: '{asset_id[-3:]}')")
-            else:
-                print(f"   ⚠️ Asset ID wrong length: {asset_id} (expected 14 or 12, got {len(asset_id)})")
-        
-        # Sort by version number
-        version_info.sort(key=lambda x: x['version'])
-        print(f"   🔍 Sorted version info: {[(v['asset_id'], v['version']) for v in version_info]}")
-        
-        # Find next version number
-        existing_versions = [v['version'] for v in version_info]
-        next_version = max(existing_versions) + 1 if existing_versions else 1
-        print(f"   📊 Existing versions: {existing_versions}")
-        print(f"   🔢 Next version calculated: {next_version}")
-        
-        # Get latest asset for metadata inheritance
-        latest_asset = version_info[-1]['asset_data'] if version_info else None
+        # null once the variant has used version 999
+        next_version = result.get('next_version')
+        latest_asset = result.get('latest')
         
         print(f"   📊 Found {len(existing_versions)} existing versions: {existing_versions}")
-        print(f"   🔢 Next version will be: {next_version:03d}")
+        if next_version is None:
+            print(f"   ❌ No free version left for asset base ID: {asset_base_id}")
+        else:
+            print(f"   🔢 Next version will be: {next_version:03d}")
         
         return {
             'asset_base_id': asset_base_id,
             'existing_versions': existing_versions,
             'next_version': next_version,
             'latest_asset': latest_asset,
-            'version_info': version_info
+            'version_info': result.get('versions', [])
         }
         
     except Exception as e:
@@ -876,6 +749,11 @@ try:
         raise Exception("No Asset Found")
     
     next_version = version_info['next_version']
+    if next_version is None:
+        subnet.parm("export_status").set("❌ Version limit reached")
+        hou.ui.displayMessage(f"❌ Version limit reached: {asset_base_id} already has version 999", severity=hou.severityType.Error)
+        raise Exception("Version limit reached")
+    
     latest_asset = version_info['latest_asset']
     existing_versions = version_info['existing_versions']
     new_asset_id = f"{base_uid}{variant_id}{next_version:03d}"  # 16-character: 11 base + 2 variant + 3 version
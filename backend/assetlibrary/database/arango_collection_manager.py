@@ -45,6 +45,69 @@ except ImportError:
     CONFIG_AVAILABLE = False
 
 
+def build_asset_document(asset_data: Dict) -> Dict:
+    """
+    Atlas_Library document for an asset folder found on disk
+
+    ``asset_data`` holds asset_id, name, asset_type, category, path,
+    metadata_file and the parsed metadata (as built by the filesystem scans).
+    """
+    from backend.core.asset_versions import version_fields
+    from backend.core.asset_schema import normalize_asset_document
+
+    asset_doc = {
+        "_key": asset_data["asset_id"],
+        "id": asset_data["asset_id"],
+        "name": asset_data["name"],
+        "asset_type": asset_data["asset_type"],
+        "category": asset_data["category"],
+        "render_engine": asset_data["metadata"].get("render_engine", "Redshift"),
+        "metadata": asset_data["metadata"],
+        "tags": asset_data["metadata"].get("tags", []),
+        "description": asset_data["metadata"].get("description", f"{asset_data['asset_type']} asset: {asset_data['name']}"),
+        "created_by": asset_data["metadata"].get("created_by", "unknown"),
+        "created_at": asset_data["metadata"].get("created_at", datetime.now().isoformat()),
+        "updated_at": datetime.now().isoformat(),
+        "status": "active",
+
+        # Frontend filtering hierarchy
+        "dimension": "3D",
+        "hierarchy": {
+            "dimension": "3D",
+            "asset_type": asset_data["asset_type"],
+            "subcategory": asset_data["category"],
+            "render_engine": asset_data["metadata"].get("render_engine", "Redshift")
+        },
+
+        # File paths
+        "paths": {
+            "asset_folder": asset_data["path"],
+            "metadata": asset_data["metadata_file"],
+            "textures": str(Path(asset_data["path"]) / "Textures") if (Path(asset_data["path"]) / "Textures").exists() else None,
+            "geometry": str(Path(asset_data["path"]) / "Geometry") if (Path(asset_data["path"]) / "Geometry").exists() else None,
+            "template": None
+        },
+
+        # File information
+        "file_sizes": asset_data["metadata"].get("file_sizes", {}),
+        "last_filesystem_sync": datetime.now().isoformat()
+    }
+
+    # Stored for the indexed version/variant lookups
+    asset_doc.update(version_fields(asset_doc))
+
+    # Look for template file
+    asset_path = Path(asset_data["path"])
+    clipboard_folder = asset_path / "Clipboard"
+    if clipboard_folder.exists():
+        for template_file in clipboard_folder.glob("*_template.hip"):
+            asset_doc["paths"]["template"] = str(template_file)
+            break
+
+    # Canonical response fields, so API responses are a plain projection
+    return normalize_asset_document(asset_doc)
+
+
 class ArangoAssetCollectionManager:
     """
     Advanced ArangoDB collection manager for asset lifecycle management
@@ -83,7 +146,8 @@ class ArangoAssetCollectionManager:
                     {'type': 'fulltext', 'fields': ['name', 'description']},
                     {'type': 'skiplist', 'fields': ['created_at']},
                     {'type': 'skiplist', 'fields': ['updated_at']},
-                    {'type': 'skiplist', 'fields': ['last_filesystem_sync']}
+                    {'type': 'skiplist', 'fields': ['last_filesystem_sync']},
+                    {'type': 'persistent', 'fields': ['base_uid', 'variant_id', 'version']}
                 ]
             }
         }
@@ -153,7 +217,7 @@ class ArangoAssetCollectionManager:
     def _create_collection_indexes(self, collection: StandardCollection, indexes: List[Dict]) -> None:
         """Create optimized indexes for collection"""
         try:
-            existing_indexes = {idx['fields']: idx for idx in collection.indexes()}
+            existing_indexes = {tuple(idx['fields']): idx for idx in collection.indexes()}
             
             for index_def in indexes:
                 index_fields = tuple(index_def['fields'])
@@ -167,6 +231,8 @@ class ArangoAssetCollectionManager:
                     collection.add_hash_index(fields=index_def['fields'])
                 elif index_def['type'] == 'skiplist':
                     collection.add_skiplist_index(fields=index_def['fields'])
+                elif index_def['type'] == 'persistent':
+                    collection.add_persistent_index(fields=index_def['fields'])
                 elif index_def['type'] == 'fulltext':
                     for field in index_def['fields']:
                         collection.add_fulltext_index(fields=[field])
@@ -298,51 +364,7 @@ class ArangoAssetCollectionManager:
                 return False
             
             # Prepare asset document for ArangoDB
-            asset_doc = {
-                "_key": asset_data["asset_id"],
-                "id": asset_data["asset_id"],
-                "name": asset_data["name"],
-                "asset_type": asset_data["asset_type"],
-                "category": asset_data["category"],
-                "render_engine": asset_data["metadata"].get("render_engine", "Redshift"),
-                "metadata": asset_data["metadata"],
-                "tags": asset_data["metadata"].get("tags", []),
-                "description": asset_data["metadata"].get("description", f"{asset_data['asset_type']} asset: {asset_data['name']}"),
-                "created_by": asset_data["metadata"].get("created_by", "unknown"),
-                "created_at": asset_data["metadata"].get("created_at", datetime.now().isoformat()),
-                "updated_at": datetime.now().isoformat(),
-                "status": "active",
-                
-                # Frontend filtering hierarchy
-                "dimension": "3D",
-                "hierarchy": {
-                    "dimension": "3D",
-                    "asset_type": asset_data["asset_type"],
-                    "subcategory": asset_data["category"],
-                    "render_engine": asset_data["metadata"].get("render_engine", "Redshift")
-                },
-                
-                # File paths
-                "paths": {
-                    "asset_folder": asset_data["path"],
-                    "metadata": asset_data["metadata_file"],
-                    "textures": str(Path(asset_data["path"]) / "Textures") if (Path(asset_data["path"]) / "Textures").exists() else None,
-                    "geometry": str(Path(asset_data["path"]) / "Geometry") if (Path(asset_data["path"]) / "Geometry").exists() else None,
-                    "template": None
-                },
-                
-                # File information
-                "file_sizes": asset_data["metadata"].get("file_sizes", {}),
-                "last_filesystem_sync": datetime.now().isoformat()
-            }
-            
-            # Look for template file
-            asset_path = Path(asset_data["path"])
-            clipboard_folder = asset_path / "Clipboard"
-            if clipboard_folder.exists():
-                for template_file in clipboard_folder.glob("*_template.hip"):
-                    asset_doc["paths"]["template"] = str(template_file)
-                    break
+            asset_doc = build_asset_document(asset_data)
             
             # Insert into database
             result = assets_collection.insert(asset_doc)
@@ -409,34 +431,35 @@ class ArangoAssetCollectionManager:
             logger.error(f"   ❌ Failed to remove asset {asset_id}: {e}")
             return False
     
-    def full_bidirectional_sync(self, library_path: str = "/app/assets/3D") -> dict:
-        """Simple database-only sync - just refresh frontend display"""
-        logger.info("🔄 Starting simple database refresh...")
-        
-        stats = {
-            'assets_added': 0,
-            'assets_updated': 0,
-            'assets_removed': 0,
-            'assets_unchanged': 0,
-            'errors': 0
-        }
-        
+    def reconcile_plan(self):
+        """Dry run: what full_bidirectional_sync would add, update, move and remove"""
+        from backend.core.library_reconcile import library_reconciler
+        from backend.assetlibrary.database.arango_queries import AssetQueries
+
+        return library_reconciler.plan(AssetQueries({}, db=self.db))
+
+    def full_bidirectional_sync(self, plan=None, actions=None) -> dict:
+        """
+        Reconcile Atlas_Library with the library folders
+
+        Adds new asset folders, rewrites changed or moved ones and removes
+        documents whose folder is gone (see backend/core/library_reconcile.py).
+        ``plan`` reuses a plan from ``reconcile_plan``; ``actions`` limits which
+        of its sections are applied.
+        """
+        if not self.is_connected():
+            return {'error': 'Database not connected'}
+
+        from backend.core.library_reconcile import library_reconciler, UPSERT_ACTIONS, DELETE_ACTION
+        from backend.assetlibrary.database.arango_queries import AssetQueries
+
+        asset_queries = AssetQueries({}, db=self.db)
         try:
-            # Just get all assets from database and count them
-            database_assets = self.get_all_assets()
-            stats['assets_unchanged'] = len(database_assets)
-            
-            logger.info(f"📋 Database refresh complete - found {len(database_assets)} assets")
-            
+            plan = plan or library_reconciler.plan(asset_queries)
+            return library_reconciler.apply(asset_queries, plan, actions or UPSERT_ACTIONS + (DELETE_ACTION,))
         except Exception as e:
-            logger.error(f"❌ Database refresh error: {e}")
-            stats['errors'] += 1
-        
-        logger.info("🏁 Simple database refresh complete!")
-        logger.info(f"   ➡️ Assets in database: {stats['assets_unchanged']}")
-        logger.info(f"   ❌ Errors: {stats['errors']}")
-        
-        return stats
+            logger.error(f"❌ Bidirectional sync error: {e}")
+            return {'error': str(e)}
 
 
 def get_collection_manager(environment: str = 'development') -> ArangoAssetCollectionManager:
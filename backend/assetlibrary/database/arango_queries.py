@@ -1,38 +1,234 @@
 # backend/assetlibrary/database/arango_queries.py
 from arango import ArangoClient
-from typing import List, Dict, Optional
+from arango.database import StandardDatabase
+from typing import List, Dict, Iterator, Optional, Tuple
+import base64
+import json
+import re
+import unicodedata
+
+# ArangoSearch view and analyzer created by setup_arango_database.py
+ASSET_SEARCH_VIEW = 'Atlas_Library_Search'
+ASSET_SEARCH_ANALYZER = 'atlas_text'
+
+# Attributes matched by ranked search, with their BM25 boost
+ASSET_SEARCH_FIELDS = [
+    ('name', 4.0),
+    ('tags', 3.0),
+    ('search_keywords', 2.0),
+    ('metadata.search_keywords', 2.0),
+    ('description', 1.0),
+    ('metadata.description', 1.0),
+    ('hierarchy.asset_type', 1.0),
+    ('hierarchy.subcategory', 1.0),
+    ('hierarchy.render_engine', 1.0),
+    ('metadata.hierarchy.asset_type', 1.0),
+    ('metadata.hierarchy.subcategory', 1.0),
+    ('metadata.hierarchy.render_engine', 1.0)
+]
+
+# Tokens shorter than this are only prefix-matched (no edit-distance matching)
+FUZZY_MIN_TOKEN_LENGTH = 4
+MAX_SEARCH_TOKENS = 8
+
+
+def tokenize_search(search_term: str) -> List[str]:
+    """Split a search string the same way the atlas_text analyzer does (lowercase, no accents)"""
+    normalized = unicodedata.normalize('NFKD', (search_term or "").lower())
+    stripped = ''.join(c for c in normalized if not unicodedata.combining(c))
+    return re.findall(r'\w+', stripped)[:MAX_SEARCH_TOKENS]
+
+
+def encode_page_cursor(asset: Dict) -> str:
+    """Build an opaque keyset cursor from the last asset of a page"""
+    raw = json.dumps([asset.get('created_at'), asset.get('_key')], separators=(',', ':'))
+    return base64.urlsafe_b64encode(raw.encode('utf-8')).decode('ascii')
+
+
+def decode_page_cursor(cursor: str) -> Tuple[Optional[str], str]:
+    """Decode a keyset cursor into (created_at, _key); raises ValueError if malformed"""
+    try:
+        created_at, key = json.loads(base64.urlsafe_b64decode(cursor.encode('ascii')))
+    except Exception:
+        raise ValueError(f"Invalid page cursor: {cursor}")
+    if not isinstance(key, str):
+        raise ValueError(f"Invalid page cursor: {cursor}")
+    return created_at, key
 
 
 class AssetQueries:
-    def __init__(self, db_config: dict):
-        client = ArangoClient(hosts=db_config['hosts'])
-        self.db = client.db(
-            db_config['database'],
-            username=db_config['username'],
-            password=db_config['password']
-        )
+    def __init__(self, db_config: dict, db: Optional[StandardDatabase] = None):
+        # Reuse an existing (pooled) database handle when one is provided
+        if db is None:
+            client = ArangoClient(hosts=db_config['hosts'])
+            db = client.db(
+                db_config['database'],
+                username=db_config['username'],
+                password=db_config['password']
+            )
+        self.db = db
         self.assets = self.db.collection('Atlas_Library')
+        self._search_view_available = None
+
+    def has_search_view(self) -> bool:
+        """Whether the ArangoSearch view exists (checked once per connection)"""
+        if self._search_view_available is None:
+            try:
+                self._search_view_available = any(
+                    view['name'] == ASSET_SEARCH_VIEW for view in self.db.views()
+                )
+            except Exception:
+                self._search_view_available = False
+        return self._search_view_available
+
+    @staticmethod
+    def _build_search_expression(tokens: List[str], bind_vars: Dict) -> str:
+        """Every token must match some field, exactly, by prefix, or within one edit"""
+        clauses = []
+        for i, token in enumerate(tokens):
+            var = f"token{i}"
+            bind_vars[var] = token
+            matches = []
+            for field, boost in ASSET_SEARCH_FIELDS:
+                matches.append(f"BOOST(asset.{field} == @{var}, {boost * 2})")
+                matches.append(f"BOOST(STARTS_WITH(asset.{field}, @{var}), {boost})")
+                if len(token) >= FUZZY_MIN_TOKEN_LENGTH:
+                    matches.append(f"BOOST(LEVENSHTEIN_MATCH(asset.{field}, @{var}, 1, true), {boost / 2})")
+            clauses.append("(" + " OR ".join(matches) + ")")
+        return " AND ".join(clauses)
+
+    @staticmethod
+    def _metadata_projection(metadata_fields: List[str], bind_vars: Dict) -> str:
+        """AQL expression keeping only ``metadata_fields`` of asset.metadata"""
+        nested = {}
+        for field in metadata_fields:
+            if '.' in field:
+                parent, child = field.split('.', 1)
+                if not re.fullmatch(r'[A-Za-z_][A-Za-z0-9_]*', parent):
+                    raise ValueError(f"Invalid metadata field: {field}")
+                nested.setdefault(parent, []).append(child)
+        bind_vars['metadata_fields'] = sorted(field for field in metadata_fields if '.' not in field)
+        parts = ["KEEP(IS_OBJECT(asset.metadata) ? asset.metadata : {}, @metadata_fields)"]
+        for i, (parent, children) in enumerate(sorted(nested.items())):
+            bind_vars[f'metadata_nested{i}'] = children
+            parts.append(f"{{{parent}: KEEP(IS_OBJECT(asset.metadata.{parent}) ? asset.metadata.{parent} : {{}}, @metadata_nested{i})}}")
+        # Nested picks are merged over the kept attribute of the same name
+        return f"MERGE({', '.join(parts)})" if len(parts) > 1 else parts[0]
 
     def search_assets(self, search_term: str = "", category: str = None, tags: List[str] = None) -> List[Dict]:
-        """Search assets with filters"""
-        query = """
-        FOR asset IN Atlas_Library
-            FILTER (@search == "" OR CONTAINS(LOWER(asset.name), LOWER(@search)) OR 
-                   CONTAINS(LOWER(asset.description || ""), LOWER(@search)))
-            FILTER (@category == null OR @category == "" OR asset.category == @category)
-            FILTER (@tags == null OR LENGTH(@tags) == 0 OR LENGTH(INTERSECTION(asset.tags, @tags)) == LENGTH(@tags))
-            SORT asset.created_at DESC
-            RETURN asset
+        """Search assets with filters (returns every match - use search_assets_page for listings)"""
+        return self.search_assets_page(search_term, category, tags, limit=None)['items']
+
+    def search_assets_page(
+        self,
+        search_term: str = "",
+        category: str = None,
+        tags: List[str] = None,
+        limit: Optional[int] = 100,
+        offset: int = 0,
+        cursor: Optional[str] = None,
+        fields: Optional[List[str]] = None,
+        metadata_fields: Optional[List[str]] = None
+    ) -> Dict:
         """
+        Search assets with filters, paginated inside AQL
 
-        bind_vars = {
-            'search': search_term,
-            'category': category if category else None,
-            'tags': tags if tags else None
-        }
+        Args:
+            limit: Page size (None returns every match)
+            offset: Number of matches to skip (ignored when a cursor is given)
+            cursor: Keyset cursor from a previous page's ``next_cursor``
+            fields: Top-level attributes to return (None returns whole documents)
+            metadata_fields: Attributes of ``metadata`` to return with ``fields``
+                (``parent.child`` keeps one nested attribute; None returns all of it)
 
-        cursor = self.db.aql.execute(query, bind_vars=bind_vars)
-        return list(cursor)
+        Returns:
+            {'items': [...], 'total': int, 'next_cursor': str or None}
+            ``total`` counts all matches (from the cursor position onward in cursor mode).
+
+        Text searches use the ArangoSearch view (tokenised prefix/fuzzy matching ranked by
+        BM25) when it exists; cursors are only available for unranked listings.
+        """
+        tokens = tokenize_search(search_term) if search_term and self.has_search_view() else []
+
+        if tokens:
+            if cursor:
+                raise ValueError("Cursor pagination is not available for ranked search; use offset")
+
+            bind_vars = {
+                'category': category if category else None,
+                'tags': tags if tags else None
+            }
+            query = f"""
+            FOR asset IN {ASSET_SEARCH_VIEW}
+                SEARCH ANALYZER({self._build_search_expression(tokens, bind_vars)}, "{ASSET_SEARCH_ANALYZER}")
+                FILTER (@category == null OR @category == "" OR asset.category == @category)
+                FILTER (@tags == null OR LENGTH(@tags) == 0 OR LENGTH(INTERSECTION(asset.tags, @tags)) == LENGTH(@tags))
+                SORT BM25(asset) DESC, asset.created_at DESC, asset._key DESC
+            """
+        else:
+            cursor_created_at, cursor_key = decode_page_cursor(cursor) if cursor else (None, None)
+
+            # Substring scan - fallback when the search view has not been created
+            query = """
+            FOR asset IN Atlas_Library
+                FILTER (@search == "" OR CONTAINS(LOWER(asset.name), LOWER(@search)) OR 
+                       CONTAINS(LOWER(asset.description || ""), LOWER(@search)))
+                FILTER (@category == null OR @category == "" OR asset.category == @category)
+                FILTER (@tags == null OR LENGTH(@tags) == 0 OR LENGTH(INTERSECTION(asset.tags, @tags)) == LENGTH(@tags))
+                FILTER (NOT @use_cursor OR asset.created_at < @cursor_created_at OR
+                       (asset.created_at == @cursor_created_at AND asset._key < @cursor_key))
+                SORT asset.created_at DESC, asset._key DESC
+            """
+            bind_vars = {
+                'search': search_term or "",
+                'category': category if category else None,
+                'tags': tags if tags else None,
+                'use_cursor': cursor is not None,
+                'cursor_created_at': cursor_created_at,
+                'cursor_key': cursor_key
+            }
+
+        if limit is not None:
+            query += """
+            LIMIT @offset, @limit
+            """
+            bind_vars['offset'] = 0 if cursor else offset
+            bind_vars['limit'] = limit
+
+        if fields and metadata_fields is not None:
+            query += f"""
+            RETURN MERGE(KEEP(asset, @fields), {{metadata: {self._metadata_projection(metadata_fields, bind_vars)}}})
+            """
+            bind_vars['fields'] = sorted(set(fields) | {'_key', 'created_at'})
+        elif fields:
+            # Sort keys are always needed to build the next cursor
+            query += """
+            RETURN KEEP(asset, @fields)
+            """
+            bind_vars['fields'] = sorted(set(fields) | {'_key', 'created_at'})
+        else:
+            query += """
+            RETURN asset
+            """
+
+        result_cursor = self.db.aql.execute(query, bind_vars=bind_vars, full_count=limit is not None)
+        items = list(result_cursor)
+
+        if limit is None:
+            total = len(items)
+        else:
+            stats = result_cursor.statistics() or {}
+            total = stats.get('fullCount', stats.get('full_count', len(items)))
+
+        next_cursor = None
+        if not tokens and limit is not None and items and len(items) == limit and total > bind_vars['offset'] + limit:
+            next_cursor = encode_page_cursor(items[-1])
+
+        return {
+            'items': items,
+            'total': total,
+            'next_cursor': next_cursor
+        }
 
     def get_asset_with_dependencies(self, asset_id: str) -> Dict:
         """Get asset with all its dependencies"""
@@ -153,6 +349,220 @@ class AssetQueries:
             print(f"Failed to update tags: {e}")
             return False
 
+    def update_thumbnail_index(self, asset_id: str, entry: Dict) -> bool:
+        """Store the resolved thumbnail entry on an asset document"""
+        try:
+            self.assets.update({'_key': asset_id, 'thumbnail_resolved': entry})
+            return True
+        except Exception as e:
+            print(f"Failed to update thumbnail index: {e}")
+            return False
+
+    def get_thumbnail_index_sources(self, missing_only: bool = False) -> List[Dict]:
+        """Attributes needed to resolve thumbnails, for every (or every unindexed) asset"""
+        query = """
+        FOR asset IN Atlas_Library
+            FILTER NOT @missing_only OR asset.thumbnail_resolved == null
+            RETURN KEEP(asset, '_key', 'id', 'name', 'category', 'asset_type', 'folder_path',
+                        'paths', 'thumbnail_path')
+        """
+        cursor = self.db.aql.execute(query, bind_vars={'missing_only': missing_only})
+        return list(cursor)
+
+    def ensure_version_index(self) -> Dict:
+        """Persistent index backing the version/variant lookups (idempotent)"""
+        return self.assets.add_persistent_index(fields=['base_uid', 'variant_id', 'version'])
+
+    def get_asset_versions(self, base_uid: str, variant_id: Optional[str] = None) -> Dict:
+        """
+        Every version of a base UID (or of one of its variants) plus the latest document
+
+        One AQL query; both subqueries are served by the base_uid/variant_id/version index.
+        """
+        variant_filter = "FILTER asset.variant_id == @variant_id" if variant_id else ""
+        query = f"""
+        LET versions = (
+            FOR asset IN Atlas_Library
+                FILTER asset.base_uid == @base_uid
+                {variant_filter}
+                SORT asset.base_uid, asset.variant_id, asset.version
+                RETURN {{
+                    id: NOT_NULL(asset.id, asset._key),
+                    name: asset.name,
+                    variant_id: asset.variant_id,
+                    variant_name: NOT_NULL(asset.variant_name, asset.metadata.variant_name,
+                                           asset.metadata.export_metadata.variant_name),
+                    version: asset.version,
+                    created_at: asset.created_at,
+                    created_by: asset.created_by
+                }}
+        )
+        LET latest = FIRST(
+            FOR asset IN Atlas_Library
+                FILTER asset.base_uid == @base_uid
+                {variant_filter}
+                SORT asset.base_uid DESC, asset.variant_id DESC, asset.version DESC
+                LIMIT 1
+                RETURN asset
+        )
+        RETURN {{versions: versions, latest: latest}}
+        """
+        bind_vars = {'base_uid': base_uid}
+        if variant_id:
+            bind_vars['variant_id'] = variant_id
+        return next(iter(self.db.aql.execute(query, bind_vars=bind_vars)))
+
+    def get_asset_variants(self, base_uid: str) -> List[Dict]:
+        """Variants of a base UID with their version count and latest version (one indexed AQL query)"""
+        query = """
+        FOR asset IN Atlas_Library
+            FILTER asset.base_uid == @base_uid AND asset.variant_id != null
+            COLLECT variant_id = asset.variant_id INTO group = {
+                version: asset.version,
+                name: asset.name,
+                variant_name: NOT_NULL(asset.variant_name, asset.metadata.variant_name,
+                                       asset.metadata.export_metadata.variant_name)
+            }
+            LET newest = LAST(FOR entry IN group SORT entry.version RETURN entry)
+            RETURN {
+                variant_id: variant_id,
+                variant_name: newest.variant_name,
+                name: newest.name,
+                versions: LENGTH(group),
+                latest_version: newest.version
+            }
+        """
+        return list(self.db.aql.execute(query, bind_vars={'base_uid': base_uid}))
+
+    def get_version_index_sources(self, missing_only: bool = True) -> List[Dict]:
+        """_key/id of every (or every not yet indexed) asset, for the version field backfill"""
+        query = """
+        FOR asset IN Atlas_Library
+            FILTER NOT @missing_only OR NOT HAS(asset, 'base_uid')
+            RETURN {_key: asset._key, id: asset.id}
+        """
+        return list(self.db.aql.execute(query, bind_vars={'missing_only': missing_only}))
+
+    def update_assets_bulk(self, updates: List[Dict]) -> int:
+        """Partially update many documents (each dict carries its _key); returns the number updated"""
+        if not updates:
+            return 0
+        results = self.assets.update_many(updates, merge=False)
+        return sum(1 for result in results if isinstance(result, dict))
+
+    def upsert_assets_bulk(self, documents: List[Dict]) -> Dict:
+        """
+        Insert or update many asset documents in one request
+
+        Existing documents are updated (attributes not in the new document are
+        kept). Returns counts plus the ``_key`` and error of every document
+        that failed (``failed_positions`` maps list positions to messages).
+        """
+        result = self.assets.import_bulk(documents, on_duplicate='update', halt_on_error=False, details=True)
+        failed_keys = []
+        failed_positions = {}
+        for detail in result.get('details', []):
+            match = re.match(r'at position (\d+): (.*)', detail)
+            if match and int(match.group(1)) < len(documents):
+                failed_keys.append(documents[int(match.group(1))].get('_key'))
+                failed_positions[int(match.group(1))] = match.group(2)
+        return {
+            'created': result.get('created', 0),
+            'updated': result.get('updated', 0),
+            'errors': result.get('errors', 0),
+            'failed_keys': failed_keys,
+            'failed_positions': failed_positions,
+            'details': result.get('details', [])
+        }
+
+    def existing_asset_keys(self, keys: List[str]) -> set:
+        """The subset of ``keys`` that already have a document (primary index lookups only)"""
+        if not keys:
+            return set()
+        query = """
+        FOR key IN @keys
+            FILTER DOCUMENT('Atlas_Library', key) != null
+            RETURN key
+        """
+        return set(self.db.aql.execute(query, bind_vars={'keys': list(keys)}))
+
+    def delete_assets_bulk(self, keys: List[str]) -> List[str]:
+        """Delete many asset documents in one request; returns the keys actually deleted"""
+        if not keys:
+            return []
+        results = self.assets.delete_many([{'_key': key} for key in keys])
+        return [key for key, result in zip(keys, results) if isinstance(result, dict)]
+
+    def iter_sync_state(self, batch_size: int = 1000) -> Iterator[Dict]:
+        """
+        Stream key, name, folder and metadata hash of every asset
+
+        Uses a streaming cursor, so only one batch is held in memory however
+        large the collection is.
+        """
+        query = """
+        FOR asset IN Atlas_Library
+            RETURN {
+                key: asset._key,
+                name: asset.name,
+                path: NOT_NULL(asset.paths.asset_folder, asset.folder_path),
+                metadata_hash: asset.metadata_hash
+            }
+        """
+        cursor = self.db.aql.execute(query, batch_size=batch_size, stream=True, ttl=600)
+        try:
+            yield from cursor
+        finally:
+            cursor.close(ignore_missing=True)
+
+    def iter_assets_outdated(self, schema_version: int, batch_size: int = 500) -> Iterator[Dict]:
+        """Stream whole documents whose ``schema_version`` is not ``schema_version`` (streaming cursor)"""
+        query = """
+        FOR asset IN Atlas_Library
+            FILTER asset.schema_version != @schema_version
+            RETURN asset
+        """
+        cursor = self.db.aql.execute(query, bind_vars={'schema_version': schema_version},
+                                     batch_size=batch_size, stream=True, ttl=600)
+        try:
+            yield from cursor
+        finally:
+            cursor.close(ignore_missing=True)
+
+    def count_assets_outdated(self, schema_version: int) -> int:
+        query = """
+        RETURN COUNT(FOR asset IN Atlas_Library FILTER asset.schema_version != @schema_version RETURN 1)
+        """
+        return next(iter(self.db.aql.execute(query, bind_vars={'schema_version': schema_version})), 0)
+
+    def apply_assets_transaction(self, documents: List[Dict], delete_keys: List[str]) -> Dict:
+        """
+        Upsert and delete a batch of assets atomically in one stream transaction
+
+        Upserts replace every attribute present in the new document (objects
+        are not merged) and keep the others. Already missing documents count
+        as deleted. Any other failure aborts the whole batch and is raised.
+        """
+        transaction = self.db.begin_transaction(write='Atlas_Library')
+        try:
+            collection = transaction.collection('Atlas_Library')
+            errors = []
+            if documents:
+                results = collection.insert_many(documents, overwrite_mode='update', merge=False)
+                errors.extend(result for result in results if isinstance(result, Exception))
+            if delete_keys:
+                results = collection.delete_many([{'_key': key} for key in delete_keys])
+                # 1202: document not found
+                errors.extend(result for result in results
+                              if isinstance(result, Exception) and getattr(result, 'error_code', None) != 1202)
+            if errors:
+                raise RuntimeError(f"{len(errors)} operations failed, first: {errors[0]}")
+            transaction.commit_transaction()
+        except Exception:
+            transaction.abort_transaction()
+            raise
+        return {'upserted': len(documents), 'deleted': len(delete_keys)}
+
     def create_asset(self, asset_data: Dict) -> Dict:
         """Create a new asset in the database"""
         try:
@@ -12,6 +12,57 @@ sys.path.insert(0, str(assetlibrary_dir))
 
 from config import BlacksmithAtlasConfig
 
+# Must match ASSET_SEARCH_VIEW / ASSET_SEARCH_ANALYZER in arango_queries.py
+SEARCH_VIEW_NAME = 'Atlas_Library_Search'
+SEARCH_ANALYZER_NAME = 'atlas_text'
+
+
+def setup_search_view(db):
+    """Create (or refresh) the ArangoSearch view used for asset text search"""
+
+    # Tokenised, lower-cased, accent-folded text without stemming so prefixes stay intact
+    existing_analyzers = {a['name'].split('::')[-1] for a in db.analyzers()}
+    if SEARCH_ANALYZER_NAME not in existing_analyzers:
+        db.create_analyzer(
+            SEARCH_ANALYZER_NAME,
+            'text',
+            {'locale': 'en', 'case': 'lower', 'accent': False, 'stemming': False, 'stopwords': []},
+            ['frequency', 'norm', 'position']
+        )
+        print(f"✅ Created analyzer: {SEARCH_ANALYZER_NAME}")
+    else:
+        print(f"ℹ️ Analyzer '{SEARCH_ANALYZER_NAME}' already exists")
+
+    view_properties = {
+        'links': {
+            'Atlas_Library': {
+                'analyzers': [SEARCH_ANALYZER_NAME],
+                'includeAllFields': False,
+                'fields': {
+                    'name': {},
+                    'description': {},
+                    'tags': {},
+                    'search_keywords': {},
+                    'hierarchy': {'includeAllFields': True},
+                    'metadata': {
+                        'fields': {
+                            'description': {},
+                            'search_keywords': {},
+                            'hierarchy': {'includeAllFields': True}
+                        }
+                    }
+                }
+            }
+        }
+    }
+
+    if any(view['name'] == SEARCH_VIEW_NAME for view in db.views()):
+        db.update_arangosearch_view(SEARCH_VIEW_NAME, view_properties)
+        print(f"ℹ️ Search view '{SEARCH_VIEW_NAME}' already exists - links updated")
+    else:
+        db.create_arangosearch_view(SEARCH_VIEW_NAME, view_properties)
+        print(f"✅ Created search view: {SEARCH_VIEW_NAME}")
+
 
 def setup_database(environment: str = 'development'):
     """Set up ArangoDB with all required collections and initial data"""
@@ -84,7 +135,9 @@ def setup_database(environment: str = 'development'):
         {'fields': ['category'], 'type': 'persistent'},
         {'fields': ['created_at'], 'type': 'persistent'},
         {'fields': ['tags[*]'], 'type': 'persistent'},
-        {'fields': ['metadata.houdini_version'], 'type': 'persistent', 'sparse': True}
+        {'fields': ['metadata.houdini_version'], 'type': 'persistent', 'sparse': True},
+        # Version/variant lookups by UID prefix (GET /assets/{base_id}/versions and /variants)
+        {'fields': ['base_uid', 'variant_id', 'version'], 'type': 'persistent'}
     ]
 
     for index in indexes:
@@ -95,6 +148,12 @@ def setup_database(environment: str = 'development'):
             if 'duplicate' not in str(e).lower():
                 print(f"⚠️ Failed to create index on {index['fields']}: {e}")
 
+    # Full-text / prefix / fuzzy search over names, descriptions, tags and hierarchy
+    try:
+        setup_search_view(db)
+    except Exception as e:
+        print(f"⚠️ Failed to create search view {SEARCH_VIEW_NAME}: {e}")
+
     # No additional collections needed - using Atlas_Library only
 
     print("\n✅ Database setup complete!")
@@ -0,0 +1,366 @@
+# backend/core/asset_paths.py - Asset folder resolution and thumbnail index
+import os
+import re
+import time
+import logging
+import threading
+from collections import OrderedDict
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from backend.core.config_manager import config as atlas_config
+
+logger = logging.getLogger(__name__)
+
+NETWORK_LIBRARY_ROOT = '/net/library/atlaslib/'
+CONTAINER_LIBRARY_ROOT = '/app/assets/'
+
+# Image types served as thumbnails, in order of preference
+THUMBNAIL_EXTENSIONS = ['.png', '.jpg', '.jpeg', '.exr', '.tiff', '.tif']
+
+# Image types making up a hover-scrub thumbnail sequence, in order of preference
+SEQUENCE_PATTERNS = ["*.png", "*.jpg", "*.jpeg", "*.exr"]
+
+# Document attribute holding the resolved thumbnail ({'path', 'mtime', 'version', 'indexed_at'})
+THUMBNAIL_INDEX_FIELD = 'thumbnail_resolved'
+
+
+def to_container_path(path: str) -> str:
+    """Convert a network library path to the container mount path"""
+    path = str(path)
+    if path.startswith(NETWORK_LIBRARY_ROOT):
+        return path.replace(NETWORK_LIBRARY_ROOT, CONTAINER_LIBRARY_ROOT, 1)
+    return path
+
+
+def to_network_path(path: str) -> str:
+    """Convert a container mount path to the network library path"""
+    path = str(path)
+    if path.startswith(CONTAINER_LIBRARY_ROOT):
+        return path.replace(CONTAINER_LIBRARY_ROOT, NETWORK_LIBRARY_ROOT, 1)
+    return path
+
+
+def asset_index_key(asset_data: dict) -> str:
+    """Key used for per-asset caches (document _key, falling back to id)"""
+    return asset_data.get('_key') or asset_data.get('id', '')
+
+
+def candidate_asset_folders(asset_data: dict) -> List[Path]:
+    """Possible asset folders in priority order (existence is not checked)"""
+    asset_id = asset_data.get('id', asset_data.get('_key', ''))
+    asset_name = asset_data.get('name', '')
+    paths = asset_data.get('paths') or {}
+
+    folders = []
+    for folder in (asset_data.get('folder_path'), paths.get('folder_path'), paths.get('asset_folder')):
+        if folder:
+            folder = Path(to_container_path(folder))
+            if folder not in folders:
+                folders.append(folder)
+
+    # Fallback patterns for assets written before folder paths were stored
+    if asset_id:
+        library_3d = Path(os.getenv('ASSET_LIBRARY_PATH', '/app/assets')) / "3D"
+        fallbacks = [
+            library_3d / "Assets" / "BlacksmithAssets" / asset_id,
+            library_3d / "Assets" / "Blacksmith Asset" / asset_id,
+            library_3d / f"{asset_id}_{asset_name}",
+            library_3d / asset_id
+        ]
+        if asset_name:
+            fallbacks.append(library_3d / asset_name)
+        folders.extend(folder for folder in fallbacks if folder not in folders)
+
+    return folders
+
+
+def is_texture_set(asset_data: dict) -> bool:
+    return asset_data.get('category') == 'Texture Sets' or asset_data.get('asset_type') == 'Textures'
+
+
+def find_sequence_frames(asset_data: dict) -> Tuple[List[Path], Optional[Path]]:
+    """Sorted thumbnail sequence frames and the Thumbnail folder they came from"""
+    for folder in candidate_asset_folders(asset_data):
+        thumbnail_folder = folder / "Thumbnail"
+        if not thumbnail_folder.is_dir():
+            continue
+        for pattern in SEQUENCE_PATTERNS:
+            frames = sorted(thumbnail_folder.glob(pattern))
+            if frames:
+                return frames, thumbnail_folder
+    return [], None
+
+
+def extract_frame_number(filename: str) -> Optional[int]:
+    """Extract frame number from filename like 'asset_1001.png' or 'asset.1001.png'"""
+    # Common patterns: asset_1001.png, asset.1001.png, 1001.png
+    patterns = [
+        r'_(\d{4})\.',  # asset_1001.png
+        r'\.(\d{4})\.',  # asset.1001.png
+        r'^(\d{4})\.',   # 1001.png
+        r'(\d{4})$'      # 1001 (without extension)
+    ]
+
+    for pattern in patterns:
+        match = re.search(pattern, filename)
+        if match:
+            return int(match.group(1))
+
+    # Fallback to filename sorting order if no frame number found
+    return None
+
+
+def file_version(stat_result: os.stat_result) -> str:
+    """Short version string that changes whenever the file is rewritten"""
+    return f"{stat_result.st_mtime_ns:x}-{stat_result.st_size:x}"
+
+
+def stat_version(path) -> Optional[str]:
+    """``file_version`` of a file, or None when it cannot be stat'ed (one stat; blocking)"""
+    try:
+        return file_version(os.stat(path))
+    except OSError:
+        return None
+
+
+def _first_image(folder: Path) -> Optional[Path]:
+    if not folder.is_dir():
+        return None
+    for ext in THUMBNAIL_EXTENSIONS:
+        matches = sorted(folder.glob(f"*{ext}"))
+        if matches:
+            return matches[0]
+    return None
+
+
+def _index_entry(path: Optional[Path]) -> Dict:
+    mtime = None
+    version = None
+    if path is not None:
+        try:
+            stat_result = path.stat()
+            mtime = stat_result.st_mtime
+            version = file_version(stat_result)
+        except OSError:
+            path = None
+    return {
+        'path': str(path) if path is not None else None,
+        'mtime': mtime,
+        'version': version,
+        'indexed_at': datetime.now().isoformat()
+    }
+
+
+def resolve_thumbnail(asset_data: dict) -> Dict:
+    """
+    Probe the filesystem for the image /thumbnails/{asset_id} serves
+
+    Texture sets prefer their Preview folder. Explicit thumbnail paths on the
+    document come next, then each candidate folder's Thumbnail directory.
+    """
+    folders = candidate_asset_folders(asset_data)
+    paths = asset_data.get('paths') or {}
+
+    if is_texture_set(asset_data):
+        for folder in folders:
+            image = _first_image(folder / "Preview")
+            if image:
+                return _index_entry(image)
+
+    for explicit in (paths.get('thumbnail'), asset_data.get('thumbnail_path')):
+        if explicit and Path(to_container_path(explicit)).is_file():
+            return _index_entry(Path(to_container_path(explicit)))
+
+    for folder in folders:
+        image = _first_image(folder / "Thumbnail")
+        if image:
+            return _index_entry(image)
+
+    thumbnail_list = paths.get('thumbnails')
+    if isinstance(thumbnail_list, list):
+        for explicit in thumbnail_list:
+            if explicit and Path(to_container_path(explicit)).is_file():
+                return _index_entry(Path(to_container_path(explicit)))
+
+    return _index_entry(None)
+
+
+class ThumbnailIndex:
+    """
+    asset_id -> resolved thumbnail file (path + mtime)
+
+    Entries are written onto the asset document at ingest/sync time, so list
+    responses read them from the query result without touching the library
+    mount. Documents written before the index existed are resolved off the
+    event loop (``resolve_missing``) and remembered here, in a bounded LRU
+    whose entries expire after ``ttl`` seconds, until a sync or reindex
+    persists them.
+    """
+
+    def __init__(self, max_entries: int = 4096, ttl: float = 600):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, Tuple[Dict, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _cached(self, key: str) -> Optional[Dict]:
+        with self._lock:
+            cached = self._entries.get(key)
+            if cached is None:
+                return None
+            if cached[1] <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return cached[0]
+
+    def lookup(self, asset_data: dict) -> Dict:
+        """Resolved entry for an asset, probing the filesystem only for unindexed documents"""
+        stored = asset_data.get(THUMBNAIL_INDEX_FIELD)
+        if isinstance(stored, dict) and 'path' in stored:
+            return stored
+        entry = self._cached(asset_index_key(asset_data))
+        if entry is None:
+            entry = self.refresh(asset_data)
+        return entry
+
+    def resolve_missing(self, documents: List[dict]) -> int:
+        """
+        Attach an entry to every unindexed document of a page (blocking; run through run_fs)
+
+        Afterwards ``lookup`` answers the page without filesystem access.
+        Returns the number of documents that had no stored entry.
+        """
+        missing = 0
+        for document in documents:
+            stored = document.get(THUMBNAIL_INDEX_FIELD)
+            if not (isinstance(stored, dict) and 'path' in stored):
+                document[THUMBNAIL_INDEX_FIELD] = self.lookup(document)
+                missing += 1
+        return missing
+
+    def refresh(self, asset_data: dict) -> Dict:
+        """Re-resolve an asset's thumbnail; the caller persists the returned entry"""
+        entry = resolve_thumbnail(asset_data)
+        with self._lock:
+            self._entries[asset_index_key(asset_data)] = (entry, time.monotonic() + self.ttl)
+            self._entries.move_to_end(asset_index_key(asset_data))
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return entry
+
+    def invalidate(self, asset_id: str):
+        with self._lock:
+            self._entries.pop(asset_id, None)
+
+    def get_stats(self) -> dict:
+        with self._lock:
+            return {"local_entries": len(self._entries), "max_entries": self.max_entries, "ttl": self.ttl}
+
+
+_thumbnail_index_config = atlas_config.get('api.thumbnail_index', {}) or {}
+
+# Global thumbnail index (one per worker process)
+thumbnail_index = ThumbnailIndex(
+    max_entries=int(_thumbnail_index_config.get('max_entries', 4096)),
+    ttl=float(_thumbnail_index_config.get('ttl', 600))
+)
+
+
+def _path_mtime(path: Path) -> Optional[float]:
+    try:
+        return path.stat().st_mtime
+    except OSError:
+        return None
+
+
+class AssetFileCache:
+    """
+    In-process LRU of per-asset lookups shared by the image endpoints
+
+    Each asset holds named slots (the database document, resolved thumbnail,
+    sequence frames, texture image list). A slot records the mtimes of the
+    paths it was derived from; a hit re-stats only those paths and recomputes
+    if any changed. Every slot also expires after ``ttl`` seconds so changes
+    made by other workers are picked up.
+    """
+
+    def __init__(self, max_entries: int = 2048, ttl: float = 120):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, Dict[str, Tuple[Any, Dict[str, Optional[float]], float]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, asset_id: str, slot: str, compute: Callable[[], Tuple[Any, List[Path]]],
+            cache_none: bool = True) -> Any:
+        """
+        Cached value for (asset_id, slot)
+
+        ``compute`` returns ``(value, watched_paths)``; the value is reused until
+        the TTL lapses or the mtime of a watched path changes.
+        """
+        now = time.monotonic()
+        with self._lock:
+            slots = self._entries.get(asset_id)
+            cached = slots.get(slot) if slots else None
+            if slots is not None:
+                self._entries.move_to_end(asset_id)
+
+        if cached is not None:
+            value, watched, expires_at = cached
+            if now < expires_at and all(_path_mtime(Path(p)) == m for p, m in watched.items()):
+                self.hits += 1
+                return value
+
+        self.misses += 1
+        value, watched_paths = compute()
+        if value is None and not cache_none:
+            return None
+        watched = {str(p): _path_mtime(Path(p)) for p in watched_paths}
+
+        with self._lock:
+            slots = self._entries.setdefault(asset_id, {})
+            slots[slot] = (value, watched, now + self.ttl)
+            self._entries.move_to_end(asset_id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return value
+
+    def get_asset(self, asset_id: str, asset_queries) -> Optional[dict]:
+        """Asset document, fetched through AssetQueries on a miss (missing assets are not cached)"""
+        def load():
+            return asset_queries.get_asset_with_dependencies(asset_id).get('asset'), []
+        return self.get(asset_id, 'asset', load, cache_none=False)
+
+    def invalidate(self, asset_id: str):
+        """Drop every cached slot for an asset (after updates, preview changes or deletes)"""
+        with self._lock:
+            self._entries.pop(asset_id, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def get_stats(self) -> dict:
+        with self._lock:
+            entries = len(self._entries)
+        return {
+            "entries": entries,
+            "max_entries": self.max_entries,
+            "ttl": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses
+        }
+
+
+_file_cache_config = atlas_config.get('api.file_cache', {})
+
+# Global per-asset file lookup cache (one per worker process)
+asset_file_cache = AssetFileCache(
+    max_entries=int(_file_cache_config.get('max_entries', 2048)),
+    ttl=float(_file_cache_config.get('ttl', 120))
+)
@@ -0,0 +1,99 @@
+# backend/core/asset_schema.py - Canonical Atlas_Library document schema (response fields resolved at ingest)
+from typing import Dict
+
+from backend.core.asset_versions import version_fields
+
+# Bump when canonical_fields changes; scripts/database/migrate_asset_schema.py rewrites older documents
+SCHEMA_VERSION = 1
+SCHEMA_VERSION_FIELD = 'schema_version'
+
+# Legacy top-level path attributes folded into ``paths`` when a document has none
+LEGACY_PATH_FIELDS = {'usd': 'usd_path', 'thumbnail': 'thumbnail_path', 'textures': 'textures_path', 'fbx': 'fbx_path'}
+
+
+# Top-level fields canonical_fields takes from ``metadata`` first; edits are written to both
+METADATA_FIELDS = ('description',)
+
+
+def _as_dict(value) -> Dict:
+    return value if isinstance(value, dict) else {}
+
+
+def canonical_fields(asset_data: Dict) -> Dict:
+    """
+    Response attributes derived from an asset document (no I/O)
+
+    Resolves the fallbacks API responses used to recompute per request:
+    variant from the UID, variant name from the export metadata, artist,
+    description, ``paths`` rebuilt from legacy attributes, and the filter
+    attributes merged into ``metadata``. Storing the result makes the
+    response a plain projection of the document.
+    """
+    metadata = dict(_as_dict(asset_data.get('metadata')))
+    hierarchy = _as_dict(asset_data.get('hierarchy'))
+    export_metadata = _as_dict(metadata.get('export_metadata'))
+
+    paths = _as_dict(asset_data.get('paths'))
+    if not paths or all(value is None for value in paths.values()):
+        paths = {name: asset_data.get(field) for name, field in LEGACY_PATH_FIELDS.items()}
+
+    # Filter attributes the frontend reads from metadata; values already exported are kept
+    filters = {
+        'dimension': asset_data.get('dimension', '3D'),
+        'asset_type': asset_data.get('asset_type', metadata.get('asset_type')),
+        'subcategory': hierarchy.get('subcategory') or asset_data.get('category'),
+        'render_engine': asset_data.get('render_engine')
+    }
+    metadata.update({name: value for name, value in filters.items() if value is not None})
+
+    return {
+        'variant_id': version_fields(asset_data)['variant_id'],
+        'variant_name': (asset_data.get('variant_name') or metadata.get('variant_name') or
+                         export_metadata.get('variant_name')),
+        'artist': asset_data.get('created_by') or metadata.get('created_by') or 'Unknown',
+        'description': (metadata.get('description') or asset_data.get('description') or
+                        f"{asset_data.get('category', 'General')} asset created in Houdini"),
+        'paths': paths,
+        'folder_path': asset_data.get('folder_path') or paths.get('folder_path'),
+        'metadata': metadata,
+        SCHEMA_VERSION_FIELD: SCHEMA_VERSION
+    }
+
+
+def patch_updates(updates: Dict) -> Dict:
+    """
+    A partial update with its canonical fields that are read from ``metadata`` mirrored there
+
+    ``canonical_fields`` prefers ``metadata.description`` (set by Houdini
+    exports), so an edited description is also written to metadata or the
+    next normalization would restore the exported one. The update is merged
+    into the document, so only the mirrored keys of ``metadata`` change.
+    """
+    updates = dict(updates)
+    mirrored = {name: updates[name] for name in METADATA_FIELDS if name in updates}
+    if mirrored:
+        metadata = updates.get('metadata')
+        updates['metadata'] = {**(metadata if isinstance(metadata, dict) else {}), **mirrored}
+    return updates
+
+
+def derived_after_patch(updated: Dict, updates: Dict) -> Dict:
+    """Canonical fields that changed after a partial update, leaving the fields it set explicitly as given"""
+    explicit = set(updates) - {'metadata'}
+    return {name: value for name, value in canonical_fields(updated).items()
+            if name not in explicit and updated.get(name) != value}
+
+
+def is_canonical(asset_data: Dict) -> bool:
+    return asset_data.get(SCHEMA_VERSION_FIELD) == SCHEMA_VERSION
+
+
+def normalize_asset_document(asset_data: Dict) -> Dict:
+    """Stamp the canonical fields onto a document about to be written (in place)"""
+    asset_data.update(canonical_fields(asset_data))
+    return asset_data
+
+
+def canonical_view(asset_data: Dict) -> Dict:
+    """The document as canonical, normalizing a copy of documents written before the current schema"""
+    return asset_data if is_canonical(asset_data) else {**asset_data, **canonical_fields(asset_data)}
@@ -0,0 +1,76 @@
+# backend/core/asset_versions.py - Asset UID parsing (base UID / variant / version) and next-free lookups
+import re
+from typing import Dict, Iterable, Optional
+
+# Base UID: 11 characters today, 12 and 9 for older exports
+BASE_UID = r'[0-9A-Z]{9}|[0-9A-Z]{11,12}'
+BASE_UID_PATTERN = re.compile(rf'^(?:{BASE_UID})$')
+BASE_VARIANT_PATTERN = re.compile(rf'^({BASE_UID})([A-Z]{{2}})$')
+
+# <base UID><2-letter variant><3-digit version>
+VARIANT_UID_PATTERN = re.compile(rf'^({BASE_UID})([A-Z]{{2}})(\d{{3}})$')
+
+# Legacy 9-character base + 3-digit version, from before variants existed
+LEGACY_UID_PATTERN = re.compile(r'^([0-9A-Z]{9})(\d{3})$')
+
+# Document attributes stored at ingest and covered by the persistent version index
+VERSION_FIELDS = ('base_uid', 'variant_id', 'version')
+
+DEFAULT_VARIANT_ID = "AA"
+MAX_VERSION = 999
+
+
+def parse_asset_uid(asset_id: str) -> Optional[Dict]:
+    """{'base_uid', 'variant_id', 'version'} for a versioned asset ID, or None for other IDs"""
+    asset_id = (asset_id or "").upper()
+    match = VARIANT_UID_PATTERN.match(asset_id)
+    if match:
+        return {'base_uid': match.group(1), 'variant_id': match.group(2), 'version': int(match.group(3))}
+    match = LEGACY_UID_PATTERN.match(asset_id)
+    if match:
+        return {'base_uid': match.group(1), 'variant_id': None, 'version': int(match.group(2))}
+    return None
+
+
+def version_fields(asset_data: Dict) -> Dict:
+    """Version attributes to store on an asset document (all None for unversioned IDs)"""
+    parsed = parse_asset_uid(asset_data.get('id') or asset_data.get('_key'))
+    return parsed or dict.fromkeys(VERSION_FIELDS)
+
+
+def split_base_id(base_id: str) -> Dict:
+    """
+    Split a lookup ID into base UID and optional variant
+
+    Accepts any base UID ``parse_asset_uid`` stores (9, 11 or 12 characters),
+    optionally followed by a 2-letter variant. An ID that reads both ways
+    (an 11-character base, or a 9-character base + variant) is a base UID.
+    Raises ValueError for anything else.
+    """
+    base_id = (base_id or "").upper()
+    if BASE_UID_PATTERN.match(base_id):
+        return {'base_uid': base_id, 'variant_id': None}
+    match = BASE_VARIANT_PATTERN.match(base_id)
+    if match:
+        return {'base_uid': match.group(1), 'variant_id': match.group(2)}
+    raise ValueError(f"Expected a base UID optionally followed by a 2-letter variant, got '{base_id}'")
+
+
+def variant_number(variant_id: str) -> int:
+    """AA -> 0, AB -> 1, ... AZ -> 25, BA -> 26"""
+    return (ord(variant_id[0]) - ord('A')) * 26 + ord(variant_id[1]) - ord('A')
+
+
+def next_variant_id(existing: Iterable[str]) -> Optional[str]:
+    """First free variant ID in AA, AB, ... ZZ order (None when all 676 are taken)"""
+    taken = {variant_number(variant) for variant in existing if variant and len(variant) == 2}
+    number = next((n for n in range(26 * 26) if n not in taken), None)
+    if number is None:
+        return None
+    return chr(ord('A') + number // 26) + chr(ord('A') + number % 26)
+
+
+def next_version(existing: Iterable[int]) -> Optional[int]:
+    """One past the highest existing version (1 when there is none, None past 999)"""
+    version = max(existing, default=0) + 1
+    return version if version <= MAX_VERSION else None
@@ -0,0 +1,169 @@
+# backend/core/cache_codec.py - Cache value codec: orjson/msgpack serialization, compression above a size, 1-byte header
+import json
+import zlib
+import logging
+from datetime import date, datetime
+from typing import Any, Dict
+
+from backend.core.config_manager import config as atlas_config
+
+logger = logging.getLogger(__name__)
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+try:
+    import lz4.frame as lz4_frame
+except ImportError:
+    lz4_frame = None
+
+# Header byte: 0b110SSSCC - serializer id in SSS, compression id in CC. The 0b110 mark never
+# starts JSON text (ASCII) or a pickle (0x80), so values written before the codec are misses.
+HEADER_MARK = 0xC0
+HEADER_MASK = 0xE0
+
+SERIALIZER_IDS = {'raw': 0, 'json': 1, 'msgpack': 2}
+COMPRESSION_IDS = {'none': 0, 'zlib': 1, 'lz4': 2, 'zstd': 3}
+
+
+class CacheCodecError(ValueError):
+    """A cached value cannot be decoded (unknown header, missing library, corrupt payload)"""
+
+
+def _default(value: Any) -> Any:
+    """Types the serializers do not handle natively; anything else is refused rather than pickled"""
+    if hasattr(value, 'model_dump'):
+        return value.model_dump(mode='json')
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, (set, frozenset, tuple)):
+        return list(value)
+    raise TypeError(f"{type(value).__name__} is not cacheable")
+
+
+def dumps_json(value: Any) -> bytes:
+    """Compact UTF-8 JSON (orjson when installed)"""
+    if orjson is not None:
+        return orjson.dumps(value, default=_default, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(value, default=_default, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+def loads_json(data: bytes) -> Any:
+    return orjson.loads(data) if orjson is not None else json.loads(data)
+
+
+def _compressor(name: str):
+    if name == 'zstd' and zstandard is not None:
+        return zstandard.ZstdCompressor(level=3).compress
+    if name == 'lz4' and lz4_frame is not None:
+        return lz4_frame.compress
+    if name == 'zlib':
+        return lambda data: zlib.compress(data, 1)
+    return None
+
+
+def _decompress(compression: int, payload: bytes) -> bytes:
+    if compression == COMPRESSION_IDS['zlib']:
+        return zlib.decompress(payload)
+    if compression == COMPRESSION_IDS['zstd'] and zstandard is not None:
+        return zstandard.ZstdDecompressor().decompress(payload)
+    if compression == COMPRESSION_IDS['lz4'] and lz4_frame is not None:
+        return lz4_frame.decompress(payload)
+    raise CacheCodecError(f"Compression {compression} is not available")
+
+
+class CacheCodec:
+    """
+    Encodes cache values as ``<header><payload>``
+
+    Structured values are serialized with msgpack or JSON (orjson when
+    installed); payloads of at least ``compress_above`` bytes are compressed
+    with zstd, lz4 or zlib. The header records both choices, so values
+    written under another configuration still decode, and nothing is ever
+    unpickled.
+    """
+
+    def __init__(self, serializer: str = 'auto', compression: str = 'auto', compress_above: int = 16384):
+        if serializer == 'auto':
+            serializer = 'json' if orjson is not None or msgpack is None else 'msgpack'
+        if serializer == 'msgpack' and msgpack is None:
+            logger.warning("⚠️ msgpack not installed - cache values use JSON")
+            serializer = 'json'
+        if serializer not in ('json', 'msgpack'):
+            raise ValueError(f"Unknown cache serializer: {serializer}")
+
+        if compression == 'auto':
+            compression = next(name for name in ('zstd', 'lz4', 'zlib') if _compressor(name))
+        self._compress = _compressor(compression)
+        if self._compress is None and compression != 'none':
+            logger.warning(f"⚠️ {compression} not available - large cache values use zlib")
+            compression = 'zlib'
+            self._compress = _compressor(compression)
+
+        self.serializer = serializer
+        self.compression = compression
+        self.compress_above = compress_above
+
+    def _frame(self, serializer: str, payload: bytes) -> bytes:
+        compression = 'none'
+        if self._compress is not None and len(payload) >= self.compress_above:
+            compressed = self._compress(payload)
+            if len(compressed) < len(payload):
+                payload, compression = compressed, self.compression
+        header = HEADER_MARK | (SERIALIZER_IDS[serializer] << 2) | COMPRESSION_IDS[compression]
+        return bytes((header,)) + payload
+
+    def encode(self, value: Any) -> bytes:
+        """Serialize a JSON-like value (dicts, lists, scalars, pydantic models, datetimes)"""
+        if self.serializer == 'msgpack':
+            return self._frame('msgpack', msgpack.packb(value, default=_default, use_bin_type=True))
+        return self._frame('json', dumps_json(value))
+
+    def encode_bytes(self, data: bytes) -> bytes:
+        """Frame already-encoded bytes (e.g. a JSON response body), compressing large ones"""
+        return self._frame('raw', data)
+
+    def decode(self, data: bytes) -> Any:
+        """Value from ``encode`` (``encode_bytes`` values come back as bytes)"""
+        if not data or data[0] & HEADER_MASK != HEADER_MARK:
+            raise CacheCodecError("Value was not written by the cache codec")
+        serializer, compression = (data[0] >> 2) & 0x07, data[0] & 0x03
+        try:
+            payload = _decompress(compression, data[1:]) if compression else data[1:]
+            if serializer == SERIALIZER_IDS['raw']:
+                return payload
+            if serializer == SERIALIZER_IDS['json']:
+                return loads_json(payload)
+            if serializer == SERIALIZER_IDS['msgpack'] and msgpack is not None:
+                return msgpack.unpackb(payload, raw=False)
+        except CacheCodecError:
+            raise
+        except Exception as e:
+            raise CacheCodecError(f"Corrupt cache value: {e}") from e
+        raise CacheCodecError(f"Serializer {serializer} is not available")
+
+    def get_stats(self) -> Dict:
+        return {"serializer": self.serializer, "json": "orjson" if orjson is not None else "json",
+                "compression": self.compression, "compress_above": self.compress_above}
+
+
+_codec_config = atlas_config.get('api.cache_codec', {}) or {}
+
+# Global codec shared by RedisCache and the query cache
+cache_codec = CacheCodec(
+    serializer=_codec_config.get('serializer', 'auto'),
+    compression=_codec_config.get('compression', 'auto'),
+    compress_above=int(_codec_config.get('compress_above', 16384))
+)
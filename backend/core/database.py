@@ -0,0 +1,201 @@
+# backend/core/database.py - Shared ArangoDB connection pool
+import os
+import time
+import logging
+import threading
+from typing import Optional
+
+from arango import ArangoClient
+from arango.http import DefaultHTTPClient
+from requests import Session
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from backend.core.config_manager import config as atlas_config
+from backend.assetlibrary.database.arango_queries import AssetQueries
+
+logger = logging.getLogger(__name__)
+
+
+class PooledHTTPClient(DefaultHTTPClient):
+    """python-arango HTTP client with a sized keep-alive connection pool"""
+
+    def __init__(self, pool_size: int = 10, retry_attempts: int = 3, backoff_factor: float = 0.5,
+                 request_timeout: float = 60):
+        super().__init__()
+        # ArangoClient only applies its request_timeout to the default client;
+        # send_request reads this attribute
+        self.REQUEST_TIMEOUT = request_timeout
+        self.atlas_pool_size = pool_size
+        self.atlas_retry_attempts = retry_attempts
+        self.atlas_backoff_factor = backoff_factor
+
+    def create_session(self, host: str) -> Session:
+        retry_strategy = Retry(
+            total=self.atlas_retry_attempts,
+            backoff_factor=self.atlas_backoff_factor,
+            status_forcelist=[429, 500, 502, 503, 504],
+            allowed_methods=["HEAD", "GET", "OPTIONS"]
+        )
+        adapter = HTTPAdapter(
+            pool_connections=1,
+            pool_maxsize=self.atlas_pool_size,
+            max_retries=retry_strategy
+        )
+        session = Session()
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        return session
+
+
+class ArangoConnectionPool:
+    """
+    Process-wide ArangoDB connection for Blacksmith Atlas
+
+    One ArangoClient (and therefore one HTTP session with a keep-alive pool)
+    is shared by every request handled by this worker. The connection is
+    health-checked at most once per ``health_check_interval`` seconds and
+    rebuilt after a failed check or after a handler reports a failure.
+    """
+
+    def __init__(self):
+        db_config = atlas_config.get('api.database', {})
+
+        # In Docker the container name is passed through ARANGO_HOST
+        host = os.getenv('ARANGO_HOST') or db_config.get('host', 'localhost')
+        port = os.getenv('ARANGO_PORT') or db_config.get('port', 8529)
+
+        self.arango_config = {
+            'hosts': [f"http://{host}:{port}"],
+            'database': db_config.get('name', 'blacksmith_atlas'),
+            'username': db_config.get('username', 'root'),
+            'password': db_config.get('password', 'atlas_password'),
+            'collections': {
+                'assets': 'Atlas_Library'
+            }
+        }
+        self.pool_size = int(db_config.get('pool_size', 10))
+        self.retry_attempts = int(db_config.get('retry_attempts', 3))
+        self.request_timeout = float(db_config.get('request_timeout', 60))
+        self.health_check_interval = float(db_config.get('health_check_interval', 30))
+
+        self.client: Optional[ArangoClient] = None
+        self.queries: Optional[AssetQueries] = None
+        self.connected = False
+        self.last_health_check = 0.0
+        self.reconnect_count = 0
+        self._lock = threading.Lock()
+
+    def _connect(self) -> bool:
+        """Create the shared client, database handle and query helper"""
+        self._close_client()
+        try:
+            self.client = ArangoClient(
+                hosts=self.arango_config['hosts'],
+                http_client=PooledHTTPClient(
+                    pool_size=self.pool_size,
+                    retry_attempts=self.retry_attempts,
+                    request_timeout=self.request_timeout
+                )
+            )
+            db = self.client.db(
+                self.arango_config['database'],
+                username=self.arango_config['username'],
+                password=self.arango_config['password']
+            )
+            # Verify credentials once per connection rather than once per request
+            db.properties()
+
+            self.queries = AssetQueries(self.arango_config, db=db)
+            self.connected = True
+            self.last_health_check = time.monotonic()
+            logger.info(
+                f"✅ ArangoDB pool connected: host={self.arango_config['hosts'][0]}, "
+                f"database={self.arango_config['database']}, pool_size={self.pool_size}"
+            )
+            return True
+        except Exception as e:
+            logger.error(f"❌ ArangoDB pool connection failed: {e}")
+            self.queries = None
+            self.connected = False
+            return False
+
+    def _close_client(self):
+        if self.client is not None:
+            try:
+                self.client.close()
+            except Exception as e:
+                logger.warning(f"⚠️ Error closing ArangoDB client: {e}")
+        self.client = None
+
+    def _is_healthy(self) -> bool:
+        try:
+            self.queries.db.version()
+            return True
+        except Exception as e:
+            logger.warning(f"⚠️ ArangoDB health check failed: {e}")
+            return False
+
+    def startup(self) -> bool:
+        """Open the pool (called from the application startup event)"""
+        with self._lock:
+            return self._connect()
+
+    def shutdown(self):
+        """Release pooled connections (called from the application shutdown event)"""
+        with self._lock:
+            self._close_client()
+            self.queries = None
+            self.connected = False
+            logger.info("🛑 ArangoDB pool closed")
+
+    def get_queries(self) -> Optional[AssetQueries]:
+        """Return the shared AssetQueries, reconnecting if the connection went bad"""
+        now = time.monotonic()
+        if self.connected and now - self.last_health_check < self.health_check_interval:
+            return self.queries
+
+        with self._lock:
+            if self.connected and now - self.last_health_check < self.health_check_interval:
+                return self.queries
+            if self.connected and self._is_healthy():
+                self.last_health_check = now
+                return self.queries
+
+            if self.client is not None:
+                self.reconnect_count += 1
+                logger.info(f"🔄 Reconnecting to ArangoDB (attempt {self.reconnect_count})")
+            self._connect()
+            return self.queries
+
+    def mark_failed(self):
+        """Force a health check on the next request (e.g. after a connection error)"""
+        self.last_health_check = 0.0
+
+    def get_stats(self) -> dict:
+        """Pool information for status endpoints"""
+        return {
+            "connected": self.connected,
+            "host": self.arango_config['hosts'][0],
+            "database": self.arango_config['database'],
+            "pool_size": self.pool_size,
+            "retry_attempts": self.retry_attempts,
+            "health_check_interval": self.health_check_interval,
+            "reconnect_count": self.reconnect_count
+        }
+
+
+# Global pool instance (one per worker process)
+db_pool = ArangoConnectionPool()
+
+
+# FastAPI dependencies
+def get_asset_queries() -> Optional[AssetQueries]:
+    """Dependency returning the pooled AssetQueries, or None if the database is unavailable"""
+    return db_pool.get_queries()
+
+
+def get_database():
+    """Dependency returning the pooled ArangoDB database handle, or None if unavailable"""
+    queries = db_pool.get_queries()
+    return queries.db if queries else None
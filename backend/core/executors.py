@@ -0,0 +1,176 @@
+# backend/core/executors.py - Bounded executors for blocking work in async handlers
+import os
+import time
+import asyncio
+import logging
+import threading
+import multiprocessing
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from functools import partial
+from typing import Any, Callable, Dict, Optional
+
+from backend.core.config_manager import config as atlas_config
+from backend.core.structured_logging import record_time
+
+logger = logging.getLogger(__name__)
+
+# Work categories and their default concurrency limits
+#   db         - python-arango calls
+#   fs         - library filesystem access (stat/glob/copy/move) over NFS
+#   subprocess - external tools such as oiiotool
+#   cpu        - image decoding/encoding, run in a process pool
+DEFAULT_LIMITS = {
+    'db': 16,
+    'fs': 16,
+    'subprocess': max(2, (os.cpu_count() or 2) // 2),
+    'cpu': os.cpu_count() or 2
+}
+
+
+class CategoryStats:
+    """Counters for one work category"""
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self.in_flight = 0
+        self.waiting = 0
+        self.total_seconds = 0.0
+        self.max_seconds = 0.0
+        self.total_wait_seconds = 0.0
+
+    def as_dict(self) -> dict:
+        finished = self.completed + self.failed
+        return {
+            "limit": self.limit,
+            "submitted": self.submitted,
+            "completed": self.completed,
+            "failed": self.failed,
+            "in_flight": self.in_flight,
+            "waiting": self.waiting,
+            "avg_ms": round(self.total_seconds / finished * 1000, 2) if finished else 0.0,
+            "max_ms": round(self.max_seconds * 1000, 2),
+            "avg_wait_ms": round(self.total_wait_seconds / self.submitted * 1000, 2) if self.submitted else 0.0
+        }
+
+
+class BlockingExecutor:
+    """
+    Runs blocking calls outside the event loop
+
+    I/O-bound work (database, filesystem, subprocesses) goes to one bounded
+    thread pool; CPU-bound image work goes to a process pool. Each category
+    has its own concurrency limit so, for example, a burst of EXR conversions
+    cannot starve database lookups.
+    """
+
+    def __init__(self):
+        executor_config = atlas_config.get('api.executors', {}) or {}
+        limits = executor_config.get('limits', {}) or {}
+        self.limits = {name: int(limits.get(name) or default) for name, default in DEFAULT_LIMITS.items()}
+        self.io_workers = int(executor_config.get('io_workers') or
+                              self.limits['db'] + self.limits['fs'] + self.limits['subprocess'])
+        self.cpu_workers = int(executor_config.get('cpu_workers') or self.limits['cpu'])
+
+        self.stats: Dict[str, CategoryStats] = {name: CategoryStats(limit) for name, limit in self.limits.items()}
+        self._semaphores: Dict[str, asyncio.Semaphore] = {}
+        self._thread_pool: Optional[ThreadPoolExecutor] = None
+        self._process_pool: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def _get_thread_pool(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._thread_pool is None:
+                self._thread_pool = ThreadPoolExecutor(max_workers=self.io_workers, thread_name_prefix="atlas-io")
+            return self._thread_pool
+
+    def _get_process_pool(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._process_pool is None:
+                # spawn: forking a threaded server process can deadlock children
+                self._process_pool = ProcessPoolExecutor(
+                    max_workers=self.cpu_workers,
+                    mp_context=multiprocessing.get_context('spawn')
+                )
+            return self._process_pool
+
+    def _semaphore(self, category: str) -> asyncio.Semaphore:
+        if category not in self._semaphores:
+            self._semaphores[category] = asyncio.Semaphore(self.limits[category])
+        return self._semaphores[category]
+
+    async def run(self, category: str, func: Callable, *args, **kwargs) -> Any:
+        """Run ``func`` in the pool for ``category`` once a slot is free"""
+        if category not in self.limits:
+            raise ValueError(f"Unknown executor category: {category}")
+
+        stats = self.stats[category]
+        stats.submitted += 1
+        stats.waiting += 1
+        queued_at = time.perf_counter()
+
+        async with self._semaphore(category):
+            stats.waiting -= 1
+            stats.in_flight += 1
+            started_at = time.perf_counter()
+            stats.total_wait_seconds += started_at - queued_at
+
+            pool = self._get_process_pool() if category == 'cpu' else self._get_thread_pool()
+            try:
+                result = await asyncio.get_running_loop().run_in_executor(pool, partial(func, *args, **kwargs))
+                stats.completed += 1
+                return result
+            except Exception:
+                stats.failed += 1
+                raise
+            finally:
+                elapsed = time.perf_counter() - started_at
+                stats.in_flight -= 1
+                stats.total_seconds += elapsed
+                stats.max_seconds = max(stats.max_seconds, elapsed)
+                # Shows up as <category>_ms on the request summary line
+                record_time(category, elapsed)
+
+    def get_stats(self) -> dict:
+        return {
+            "io_workers": self.io_workers,
+            "cpu_workers": self.cpu_workers,
+            "categories": {name: stats.as_dict() for name, stats in self.stats.items()}
+        }
+
+    def shutdown(self):
+        """Stop worker pools (called from the application shutdown event)"""
+        with self._lock:
+            if self._thread_pool is not None:
+                self._thread_pool.shutdown(wait=False, cancel_futures=True)
+                self._thread_pool = None
+            if self._process_pool is not None:
+                self._process_pool.shutdown(wait=False, cancel_futures=True)
+                self._process_pool = None
+        logger.info("🛑 Blocking executors stopped")
+
+
+# Global executor (one per worker process)
+executor = BlockingExecutor()
+
+
+async def run_db(func: Callable, *args, **kwargs) -> Any:
+    """Run a blocking python-arango call off the event loop"""
+    return await executor.run('db', func, *args, **kwargs)
+
+
+async def run_fs(func: Callable, *args, **kwargs) -> Any:
+    """Run blocking filesystem work (stat/glob/copy/move) off the event loop"""
+    return await executor.run('fs', func, *args, **kwargs)
+
+
+async def run_subprocess(func: Callable, *args, **kwargs) -> Any:
+    """Run work that waits on an external process (oiiotool etc.) off the event loop"""
+    return await executor.run('subprocess', func, *args, **kwargs)
+
+
+async def run_cpu(func: Callable, *args, **kwargs) -> Any:
+    """Run CPU-bound work in the process pool; ``func`` and its arguments must be picklable"""
+    return await executor.run('cpu', func, *args, **kwargs)
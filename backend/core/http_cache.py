@@ -0,0 +1,77 @@
+# backend/core/http_cache.py - Conditional GET (ETag / Last-Modified / 304) for served files
+import os
+from email.utils import formatdate, parsedate_to_datetime
+from typing import Optional
+
+from fastapi import Request
+from fastapi.responses import FileResponse, Response
+
+from backend.core.asset_paths import file_version
+from backend.core.executors import run_fs
+
+# Used when the URL carries the file's current version (?v=...)
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    if if_none_match.strip() == "*":
+        return True
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    # Weak comparison, as required for If-None-Match
+    return any(tag.removeprefix("W/") == etag for tag in candidates)
+
+
+def is_not_modified(request: Request, etag: str, mtime: float) -> bool:
+    """True when the client's cached copy (If-None-Match / If-Modified-Since) is still current"""
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        return _etag_matches(if_none_match, etag)
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since:
+        try:
+            return int(mtime) <= int(parsedate_to_datetime(if_modified_since).timestamp())
+        except (TypeError, ValueError):
+            return False
+    return False
+
+
+async def conditional_file_response(
+    request: Request,
+    path,
+    media_type: str,
+    cache_control: str,
+    headers: Optional[dict] = None,
+    filename: Optional[str] = None,
+    version: Optional[str] = None
+) -> Response:
+    """
+    FileResponse with ETag/Last-Modified validators, answering 304 when unchanged
+
+    ``version`` identifies the content the URL refers to (defaults to the
+    served file's own version). When the request's ``v`` query parameter equals
+    it, the URL is content-addressed and the response is cached as immutable.
+    The file is stat'ed through the fs executor, never on the event loop.
+    """
+    stat_result = await run_fs(os.stat, path)
+    current_version = version or file_version(stat_result)
+    if request.query_params.get("v") == current_version:
+        cache_control = IMMUTABLE_CACHE_CONTROL
+
+    response_headers = dict(headers or {})
+    response_headers.update({
+        "ETag": f'"{file_version(stat_result)}"',
+        "Last-Modified": formatdate(stat_result.st_mtime, usegmt=True),
+        "Cache-Control": cache_control
+    })
+
+    if is_not_modified(request, response_headers["ETag"], stat_result.st_mtime):
+        return Response(status_code=304, headers=response_headers)
+
+    return FileResponse(
+        path=str(path),
+        media_type=media_type,
+        headers=response_headers,
+        filename=filename,
+        stat_result=stat_result
+    )
@@ -0,0 +1,151 @@
+# backend/core/image_derivatives.py - Resized, browser-friendly thumbnail derivatives
+import os
+import hashlib
+import logging
+import tempfile
+from pathlib import Path
+from typing import Optional, Tuple
+
+from backend.core.config_manager import config as atlas_config
+
+logger = logging.getLogger(__name__)
+
+# Requested widths are rounded up to one of these so the cache stays small
+SIZE_BUCKETS = [64, 128, 256, 512, 1024, 2048]
+
+DERIVATIVE_FORMATS = {
+    'avif': {'pil_format': 'AVIF', 'media_type': 'image/avif', 'extension': '.avif', 'save': {'quality': 60}},
+    'webp': {'pil_format': 'WEBP', 'media_type': 'image/webp', 'extension': '.webp', 'save': {'quality': 82, 'method': 4}},
+    'jpeg': {'pil_format': 'JPEG', 'media_type': 'image/jpeg', 'extension': '.jpg', 'save': {'quality': 85, 'optimize': True}},
+    'png': {'pil_format': 'PNG', 'media_type': 'image/png', 'extension': '.png', 'save': {'optimize': True}}
+}
+
+# Negotiation order when the client does not name a format
+ACCEPT_PREFERENCE = ['avif', 'webp']
+
+# Source types browsers can display as-is
+BROWSER_SAFE_EXTENSIONS = {'.png', '.jpg', '.jpeg', '.webp', '.gif'}
+
+
+def _cache_root() -> Path:
+    configured = atlas_config.get('api.image_derivatives.cache_dir')
+    return Path(configured) if configured else Path(tempfile.gettempdir()) / "atlas_derivatives"
+
+
+def supported_formats() -> set:
+    """Derivative formats the installed Pillow can encode"""
+    try:
+        from PIL import Image
+        Image.init()
+        encoders = set(Image.SAVE.keys())
+    except ImportError:
+        return set()
+    return {name for name, spec in DERIVATIVE_FORMATS.items() if spec['pil_format'] in encoders}
+
+
+def size_bucket(width: int) -> int:
+    for bucket in SIZE_BUCKETS:
+        if width <= bucket:
+            return bucket
+    return SIZE_BUCKETS[-1]
+
+
+def negotiate_format(requested: Optional[str], accept_header: str, source_path: Path) -> Optional[str]:
+    """
+    Output format for a thumbnail request, or None to serve the source unchanged
+
+    An explicit ``format`` wins; otherwise the best format listed in the Accept
+    header is used. Sources browsers cannot display (EXR, TIFF) are always converted.
+    """
+    available = supported_formats()
+    if requested:
+        requested = requested.lower().replace('jpg', 'jpeg')
+        if requested not in DERIVATIVE_FORMATS:
+            raise ValueError(f"Unsupported format '{requested}'. Allowed: {', '.join(DERIVATIVE_FORMATS)}")
+        if requested in available:
+            return requested
+        logger.warning(f"⚠️ Pillow cannot encode {requested}; negotiating from Accept header instead")
+
+    accept = (accept_header or "").lower()
+    for name in ACCEPT_PREFERENCE:
+        if name in available and DERIVATIVE_FORMATS[name]['media_type'] in accept:
+            return name
+
+    if source_path.suffix.lower() not in BROWSER_SAFE_EXTENSIONS:
+        return 'png' if 'png' in available else None
+    return None
+
+
+def _derivative_path(source_path: Path, width: Optional[int], image_format: str) -> Path:
+    """Content-addressed cache location keyed by source path, mtime, size and output parameters"""
+    stat = source_path.stat()
+    key = f"{source_path}:{stat.st_mtime_ns}:{stat.st_size}:{width or 'full'}:{image_format}"
+    digest = hashlib.sha256(key.encode('utf-8')).hexdigest()
+    return _cache_root() / digest[:2] / f"{digest}{DERIVATIVE_FORMATS[image_format]['extension']}"
+
+
+def _open_source(source_path: Path, width: Optional[int]):
+    """
+    Open a source image with Pillow; EXR/HDR go through the image pipeline
+
+    Float sources are streamed and box-reduced towards ``width`` before tone
+    mapping, so a 16K EXR never has to be decoded whole.
+    """
+    from PIL import Image
+    from backend.core.image_pipeline import FLOAT_EXTENSIONS, read_image_header, load_reduced, to_display, _to_pil
+
+    info = read_image_header(source_path) if source_path.suffix.lower() in FLOAT_EXTENSIONS else None
+    if info:
+        out_width = min(width or info['width'], info['width'])
+        out_height = max(1, round(out_width * info['height'] / info['width']))
+        return _to_pil(to_display(load_reduced(source_path, out_width, out_height), 'hdr'))
+
+    try:
+        image = Image.open(source_path)
+        image.load()
+        return image
+    except Exception as e:
+        raise ValueError(f"Cannot decode {source_path.name}: {e}")
+
+
+def cached_derivative(source_path: Path, width: Optional[int], image_format: str) -> Optional[Tuple[Path, str]]:
+    """Path and media type of an already generated derivative, or None (stat only; blocking)"""
+    bucket = size_bucket(width) if width else None
+    target = _derivative_path(source_path, bucket, image_format)
+    return (target, DERIVATIVE_FORMATS[image_format]['media_type']) if target.exists() else None
+
+
+def get_derivative(source_path: Path, width: Optional[int], image_format: str) -> Tuple[Path, str]:
+    """
+    Path and media type of a resized/transcoded copy of ``source_path``
+
+    Derivatives are generated once and reused until the source file changes.
+    """
+    from PIL import Image
+
+    spec = DERIVATIVE_FORMATS[image_format]
+    bucket = size_bucket(width) if width else None
+    target = _derivative_path(source_path, bucket, image_format)
+    if target.exists():
+        return target, spec['media_type']
+
+    image = _open_source(source_path, bucket)
+    try:
+        if bucket and image.width > bucket:
+            image.thumbnail((bucket, max(1, round(bucket * image.height / image.width))), Image.LANCZOS)
+
+        has_alpha = image.mode in ('RGBA', 'LA') or (image.mode == 'P' and 'transparency' in image.info)
+        if image_format == 'jpeg' or not has_alpha:
+            image = image.convert('RGB')
+        elif image.mode != 'RGBA':
+            image = image.convert('RGBA')
+
+        target.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = target.with_name(f".{target.name}.{os.getpid()}.tmp")
+        image.save(temp_path, spec['pil_format'], **spec['save'])
+        os.replace(temp_path, target)
+    finally:
+        image.close()
+
+    logger.info(f"🖼️ Created {image_format} derivative ({bucket or 'full'}px) of {source_path.name}")
+    return target, spec['media_type']
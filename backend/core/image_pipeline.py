@@ -0,0 +1,574 @@
+# backend/core/image_pipeline.py - In-process EXR/HDR/texture conversion (header reads, downsampling, tone mapping)
+import os
+import struct
+import asyncio
+import logging
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import asynccontextmanager
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from backend.core.config_manager import config as atlas_config
+
+logger = logging.getLogger(__name__)
+
+_pipeline_config = atlas_config.get('api.image_pipeline', {}) or {}
+
+MB = 1024 * 1024
+
+# Working-set target for one conversion; decoded row bands are sized to fit it
+CONVERSION_BUDGET_BYTES = int(_pipeline_config.get('conversion_budget_mb') or 256) * MB
+
+# Total estimated memory of conversions running at once in one API process
+MEMORY_BUDGET_BYTES = int(_pipeline_config.get('memory_budget_mb') or 2048) * MB
+
+# Sources decoded as linear float data
+FLOAT_EXTENSIONS = {'.exr', '.hdr', '.hdri'}
+
+THUMBNAIL_MAX_DIMENSION = 1024
+
+# Texture thumbnails keep the original size when either side is already this small
+KEEP_ORIGINAL_BELOW = 1028
+
+# Decoded at reduced scale by Pillow (draft mode), so never streamed
+DRAFT_EXTENSIONS = {'.jpg', '.jpeg'}
+
+# Rows processed per step when tone mapping / reducing, bounding temporaries
+TILE_ROWS = 256
+
+# Pixels sampled to estimate exposure for HDR tone mapping
+EXPOSURE_SAMPLE_PIXELS = 1_000_000
+
+EXR_MAGIC = b'\x76\x2f\x31\x01'
+RADIANCE_MAGIC = b'#?'
+
+
+def _read_cstring(f, limit: int = 256) -> bytes:
+    data = bytearray()
+    while len(data) < limit:
+        byte = f.read(1)
+        if not byte or byte == b'\x00':
+            break
+        data += byte
+    return bytes(data)
+
+
+def _parse_exr_channels(data: bytes) -> List[str]:
+    channels = []
+    pos = 0
+    while pos < len(data):
+        end = data.index(b'\x00', pos)
+        if end == pos:
+            break
+        channels.append(data[pos:end].decode('ascii', 'replace'))
+        # pixel type (int), pLinear (uchar), reserved (3), xSampling (int), ySampling (int)
+        pos = end + 1 + 16
+    return channels
+
+
+def _read_exr_header(path: Path) -> Optional[dict]:
+    """Size and channels from the OpenEXR header (first part) without reading pixels"""
+    with open(path, 'rb') as f:
+        if f.read(4) != EXR_MAGIC:
+            return None
+        f.read(4)  # version + flags
+        width = height = None
+        channels: List[str] = []
+        while True:
+            name = _read_cstring(f)
+            if not name:
+                break
+            attribute_type = _read_cstring(f)
+            size = struct.unpack('<i', f.read(4))[0]
+            data = f.read(size)
+            if name == b'dataWindow' and attribute_type == b'box2i':
+                x_min, y_min, x_max, y_max = struct.unpack('<4i', data[:16])
+                width, height = x_max - x_min + 1, y_max - y_min + 1
+            elif name == b'channels' and attribute_type == b'chlist':
+                channels = _parse_exr_channels(data)
+    if width is None:
+        return None
+    return {"width": width, "height": height, "channels": len(channels) or 4}
+
+
+def _read_radiance_header(path: Path) -> Optional[dict]:
+    """Size from a Radiance .hdr header ("-Y <height> +X <width>")"""
+    with open(path, 'rb') as f:
+        if not f.readline().startswith(RADIANCE_MAGIC):
+            return None
+        for _ in range(256):
+            line = f.readline()
+            if not line:
+                return None
+            if not line.strip():
+                break
+        parts = f.readline().split()
+    if len(parts) != 4:
+        return None
+    sizes = {parts[0][1:2]: int(parts[1]), parts[2][1:2]: int(parts[3])}
+    return {"width": sizes[b'X'], "height": sizes[b'Y'], "channels": 3}
+
+
+def read_image_header(path) -> Optional[Dict]:
+    """
+    Resolution info for an image, read from its header only
+
+    Returns ``{"width", "height", "resolution", "channels"}`` or None when the
+    header cannot be parsed.
+    """
+    path = Path(path)
+    info = None
+    try:
+        if path.suffix.lower() in FLOAT_EXTENSIONS:
+            info = _read_exr_header(path) or _read_radiance_header(path)
+        if info is None:
+            from PIL import Image
+            # Image.open only parses the header; pixels are decoded lazily
+            with Image.open(path) as image:
+                info = {"width": image.width, "height": image.height, "channels": len(image.getbands())}
+    except Exception as e:
+        logger.warning(f"⚠️ Could not read image header of {path.name}: {e}")
+        return None
+    info["resolution"] = f"{info['width']}x{info['height']}"
+    return info
+
+
+def thumbnail_size(width: int, height: int, max_dimension: int = THUMBNAIL_MAX_DIMENSION,
+                   keep_original_below: Optional[int] = None) -> Tuple[int, int]:
+    """Output size preserving aspect ratio; never upscales"""
+    if keep_original_below and (width <= keep_original_below or height <= keep_original_below):
+        return width, height
+    scale = min(max_dimension / width, max_dimension / height, 1.0)
+    return max(1, int(width * scale)), max(1, int(height * scale))
+
+
+def streaming_available() -> bool:
+    """True when the OpenImageIO Python bindings are installed (scanline/tile reads)"""
+    try:
+        import OpenImageIO  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+def _open_streaming(path: Path):
+    """OpenImageIO ImageInput for ``path``, or None when the bindings are missing or cannot read it"""
+    try:
+        import OpenImageIO as oiio
+    except ImportError:
+        return None
+    image_input = oiio.ImageInput.open(str(path))
+    if not image_input:
+        logger.warning(f"⚠️ OpenImageIO cannot open {path.name}: {oiio.geterror()}")
+        return None
+    return image_input
+
+
+def _select_mip_level(image_input, out_width: int, out_height: int):
+    """Seek to the smallest MIP level still at least the output size (tiled/.tx files)"""
+    level = 0
+    while image_input.seek_subimage(0, level + 1):
+        spec = image_input.spec()
+        if spec.width < out_width or spec.height < out_height:
+            break
+        level += 1
+    image_input.seek_subimage(0, level)
+    return level
+
+
+def _read_rows(image_input, spec, level: int, start: int, stop: int, channels: int):
+    """Rows ``start``..``stop`` (relative to the data window) as float32 (rows, width, channels)"""
+    import numpy as np
+
+    if spec.tile_width:
+        # Tiled files are read in whole tile rows; start is tile aligned by the caller
+        end = min(-(-stop // spec.tile_height) * spec.tile_height, spec.height)
+        pixels = image_input.read_tiles(0, level, spec.x, spec.x + spec.width, spec.y + start, spec.y + end,
+                                        spec.z, spec.z + max(1, spec.depth), 0, channels, 'float')
+    else:
+        end = stop
+        pixels = image_input.read_scanlines(0, level, spec.y + start, spec.y + end, spec.z, 0, channels, 'float')
+    if pixels is None:
+        raise ValueError(image_input.geterror())
+    return np.asarray(pixels, dtype=np.float32).reshape(end - start, spec.width, channels)[:stop - start]
+
+
+def _stream_reduce(image_input, out_width: int, out_height: int, budget_bytes: int):
+    """
+    Box-reduce an image towards the output size reading one band of rows at a time
+
+    Only one band (sized to ``budget_bytes``, at least ``factor`` rows or one
+    tile row) and the reduced result are held in memory, never the
+    full-resolution image.
+    """
+    import math
+    import numpy as np
+
+    level = _select_mip_level(image_input, out_width, out_height)
+    spec = image_input.spec()
+    width, height = spec.width, spec.height
+    channels = min(spec.nchannels, 4)
+    factor = max(1, min(width // out_width, height // out_height))
+
+    # Bands start on a tile row (tiled files) and cover whole factor x factor blocks
+    step = math.lcm(factor, spec.tile_height) if spec.tile_width else factor
+    # A band is held up to ~3 times: native buffer, float copy and the reshape in box_reduce
+    band_rows = max(step, band_rows_for(width, channels, budget_bytes) // step * step)
+    rows_per_band = band_rows // factor
+
+    out_rows, out_cols = height // factor, width // factor
+    reduced = np.empty((out_rows, out_cols, channels), dtype=np.float32)
+    for out_row in range(0, out_rows, rows_per_band):
+        rows = min(rows_per_band, out_rows - out_row)
+        band = _read_rows(image_input, spec, level, out_row * factor, (out_row + rows) * factor, channels)
+        reduced[out_row:out_row + rows] = box_reduce(band, factor)
+    return reduced
+
+
+def band_rows_for(width: int, channels: int, budget_bytes: int = CONVERSION_BUDGET_BYTES) -> int:
+    """Rows per decoded float band that keep a band (held up to ~3 times) within ``budget_bytes``"""
+    return max(1, budget_bytes // 3 // (width * min(channels, 4) * 4))
+
+
+def _load_pillow(path: Path):
+    """Decode a non-float image with Pillow to (H, W, C) float32 in 0-1"""
+    import numpy as np
+    from PIL import Image
+
+    with Image.open(path) as image:
+        if image.mode not in ('RGB', 'RGBA', 'L', 'LA'):
+            image = image.convert('RGBA' if 'A' in image.getbands() or 'transparency' in image.info else 'RGB')
+        pixels = np.asarray(image, dtype=np.float32) / 255.0
+    return pixels[:, :, np.newaxis] if pixels.ndim == 2 else pixels
+
+
+def iter_row_bands(source, budget_bytes: int = CONVERSION_BUDGET_BYTES) -> Iterator:
+    """
+    Full-resolution float32 (rows, width, channels) bands, top to bottom
+
+    Streamed through OpenImageIO when available (whole tile rows for tiled
+    files); otherwise the image is decoded once and sliced.
+    """
+    source = Path(source)
+    image_input = _open_streaming(source)
+    if image_input is not None:
+        try:
+            spec = image_input.spec()
+            channels = min(spec.nchannels, 4)
+            rows = band_rows_for(spec.width, channels, budget_bytes)
+            if spec.tile_width:
+                rows = max(spec.tile_height, rows // spec.tile_height * spec.tile_height)
+            for start in range(0, spec.height, rows):
+                yield _read_rows(image_input, spec, 0, start, min(start + rows, spec.height), channels)
+        finally:
+            image_input.close()
+        return
+
+    pixels = _load_linear(source) if source.suffix.lower() in FLOAT_EXTENSIONS else _load_pillow(source)
+    pixels = pixels[:, :, :4]
+    rows = band_rows_for(pixels.shape[1], pixels.shape[2], budget_bytes)
+    for start in range(0, pixels.shape[0], rows):
+        yield pixels[start:start + rows]
+
+
+def _load_linear(path: Path):
+    """Decode a whole float image to an (H, W, C) float32 array: imageio, then OpenCV"""
+    import numpy as np
+
+    errors = []
+    try:
+        import imageio.v3 as iio
+        pixels = np.asarray(iio.imread(str(path)), dtype=np.float32)
+        return pixels[:, :, np.newaxis] if pixels.ndim == 2 else pixels
+    except Exception as e:
+        errors.append(f"imageio: {e}")
+
+    try:
+        os.environ.setdefault('OPENCV_IO_ENABLE_OPENEXR', '1')
+        import cv2
+        pixels = cv2.imread(str(path), cv2.IMREAD_UNCHANGED)
+        if pixels is None:
+            raise ValueError("cv2.imread returned None")
+        pixels = np.asarray(pixels, dtype=np.float32)
+        if pixels.ndim == 2:
+            return pixels[:, :, np.newaxis]
+        # BGR(A) -> RGB(A)
+        order = [2, 1, 0, 3][:pixels.shape[2]] if pixels.shape[2] in (3, 4) else list(range(pixels.shape[2]))
+        return pixels[:, :, order]
+    except Exception as e:
+        errors.append(f"OpenCV: {e}")
+
+    raise ValueError(f"Cannot decode {path.name} ({'; '.join(errors)})")
+
+
+def box_reduce(pixels, factor: int):
+    """Average ``factor`` x ``factor`` blocks, one band of rows at a time"""
+    import numpy as np
+
+    if factor <= 1:
+        return pixels
+    height, width, channels = pixels.shape
+    out_height, out_width = height // factor, width // factor
+    reduced = np.empty((out_height, out_width, channels), dtype=np.float32)
+    band = max(1, TILE_ROWS // factor)
+    for row in range(0, out_height, band):
+        rows = min(band, out_height - row)
+        block = pixels[row * factor:(row + rows) * factor, :out_width * factor]
+        reduced[row:row + rows] = block.reshape(rows, factor, out_width, factor, channels).mean(axis=(1, 3))
+    return reduced
+
+
+def _exposure_scale(pixels) -> float:
+    """Scale mapping the 95th percentile of positive colour values to ~0.8"""
+    import numpy as np
+
+    height, width = pixels.shape[:2]
+    step = max(1, int((height * width / EXPOSURE_SAMPLE_PIXELS) ** 0.5))
+    sample = pixels[::step, ::step, :3]
+    sample = sample[np.isfinite(sample) & (sample > 0)]
+    if sample.size == 0 or sample.max() <= 1.0:
+        return 1.0
+    p95 = float(np.percentile(sample, 95))
+    return 0.8 / p95 if p95 > 1.0 else 1.0
+
+
+def to_display(pixels, mode: str = 'hdr'):
+    """
+    Float (H, W, C) -> uint8 in place, in bands of TILE_ROWS rows
+
+    ``hdr``: auto exposure, Reinhard compression and sRGB encoding of the colour
+    channels. ``texture``: values are clamped to 0-1 unchanged (no tone mapping).
+    """
+    import numpy as np
+
+    exposure = _exposure_scale(pixels) if mode == 'hdr' else 1.0
+    # L / LA images have one colour channel; alpha is never tone mapped
+    colour_channels = 1 if pixels.shape[2] <= 2 else 3
+    out = np.empty(pixels.shape, dtype=np.uint8)
+    for row in range(0, pixels.shape[0], TILE_ROWS):
+        band = pixels[row:row + TILE_ROWS]
+        np.nan_to_num(band, copy=False, nan=0.0, posinf=1.0, neginf=0.0)
+        if mode == 'hdr':
+            colour = band[:, :, :colour_channels]
+            np.maximum(colour, 0.0, out=colour)
+            if exposure != 1.0:
+                colour *= exposure
+            colour /= colour + 1.0
+            # sRGB transfer function
+            low = colour <= 0.0031308
+            colour[:] = np.where(low, colour * 12.92, 1.055 * np.power(colour, 1 / 2.4) - 0.055)
+        np.clip(band, 0.0, 1.0, out=band)
+        out[row:row + TILE_ROWS] = (band * 255.0 + 0.5).astype(np.uint8)
+    return out
+
+
+def _to_pil(pixels):
+    from PIL import Image
+
+    channels = pixels.shape[2]
+    if channels == 1:
+        return Image.fromarray(pixels[:, :, 0], 'L')
+    if channels == 2:
+        # Luminance + alpha
+        return Image.fromarray(pixels, 'LA')
+    if channels == 3:
+        return Image.fromarray(pixels, 'RGB')
+    return Image.fromarray(pixels[:, :, :4], 'RGBA')
+
+
+def _save_png(image, target: Path):
+    """Write atomically so readers never see a partial file"""
+    target.parent.mkdir(parents=True, exist_ok=True)
+    temp_path = target.with_name(f".{target.name}.{os.getpid()}.tmp")
+    image.save(temp_path, 'PNG', optimize=True)
+    os.replace(temp_path, target)
+
+
+def load_reduced(source, out_width: int, out_height: int, budget_bytes: int = CONVERSION_BUDGET_BYTES):
+    """
+    Linear float pixels box-reduced to between 1x and 2x the output size
+
+    Streams scanlines through OpenImageIO when available so peak memory stays
+    near ``budget_bytes``; otherwise the whole image is decoded first.
+    """
+    source = Path(source)
+    image_input = _open_streaming(source)
+    if image_input is not None:
+        try:
+            return _stream_reduce(image_input, out_width, out_height, budget_bytes)
+        finally:
+            image_input.close()
+
+    pixels = _load_linear(source)
+    height, width = pixels.shape[:2]
+    if width * height * pixels.shape[2] * 4 > budget_bytes:
+        logger.warning(f"⚠️ Decoding all of {source.name} ({width}x{height}): install OpenImageIO to stream large images")
+    factor = max(1, min(width // out_width, height // out_height))
+    return box_reduce(pixels, factor)
+
+
+def _should_stream(source: Path, info: Dict) -> bool:
+    """Float sources always go through the reducer; other formats only when a full decode exceeds the budget"""
+    suffix = source.suffix.lower()
+    if suffix in FLOAT_EXTENSIONS:
+        return True
+    if suffix in DRAFT_EXTENSIONS or not info:
+        return False
+    return info['width'] * info['height'] * info.get('channels', 4) * 4 > CONVERSION_BUDGET_BYTES and streaming_available()
+
+
+def estimate_peak_bytes(source, info: Optional[Dict], max_dimension: Optional[int] = THUMBNAIL_MAX_DIMENSION) -> int:
+    """Rough peak memory of converting ``source``, used to reserve the shared memory budget"""
+    if not info:
+        return CONVERSION_BUDGET_BYTES
+    source = Path(source)
+    width, height, channels = info['width'], info['height'], min(info.get('channels', 4), 4)
+    if max_dimension:
+        out_width, out_height = thumbnail_size(width, height, max_dimension)
+    else:
+        out_width, out_height = width, height
+    # Reduced float image (up to 2x the output) plus its uint8 and Pillow copies
+    reduced = min(width, out_width * 2) * min(height, out_height * 2) * channels * 6
+    full_decode = width * height * channels * 4
+    if _should_stream(source, info) and streaming_available():
+        return min(full_decode, CONVERSION_BUDGET_BYTES) + reduced
+    return full_decode + reduced
+
+
+class MemoryBudget:
+    """
+    Weighted async semaphore over bytes of estimated conversion memory
+
+    Small conversions run side by side; a conversion larger than the whole
+    budget still runs, but alone.
+    """
+
+    def __init__(self, total_bytes: int):
+        self.total_bytes = total_bytes
+        self.in_use = 0
+        self.waiting = 0
+        self.peak_in_use = 0
+        self._condition: Optional[asyncio.Condition] = None
+
+    @asynccontextmanager
+    async def reserve(self, amount: int):
+        amount = max(0, min(amount, self.total_bytes))
+        if self._condition is None:
+            self._condition = asyncio.Condition()
+        async with self._condition:
+            self.waiting += 1
+            try:
+                await self._condition.wait_for(lambda: self.in_use + amount <= self.total_bytes)
+            finally:
+                self.waiting -= 1
+            self.in_use += amount
+            self.peak_in_use = max(self.peak_in_use, self.in_use)
+        try:
+            yield amount
+        finally:
+            async with self._condition:
+                self.in_use -= amount
+                self._condition.notify_all()
+
+    def get_stats(self) -> dict:
+        return {
+            "budget_mb": round(self.total_bytes / MB, 1),
+            "in_use_mb": round(self.in_use / MB, 1),
+            "peak_in_use_mb": round(self.peak_in_use / MB, 1),
+            "waiting": self.waiting,
+            "conversion_budget_mb": round(CONVERSION_BUDGET_BYTES / MB, 1),
+            "streaming": streaming_available()
+        }
+
+
+# Global budget shared by conversions started from this process
+memory_budget = MemoryBudget(MEMORY_BUDGET_BYTES)
+
+
+async def run_within_budget(source, func: Callable, *args,
+                            max_dimension: Optional[int] = THUMBNAIL_MAX_DIMENSION) -> Any:
+    """Run ``func(*args)`` in the process pool once the memory budget has room for converting ``source``"""
+    from backend.core.executors import run_fs, run_cpu
+    info = await run_fs(read_image_header, source)
+    async with memory_budget.reserve(estimate_peak_bytes(source, info, max_dimension)):
+        return await run_cpu(func, *args)
+
+
+def convert_image(source, target, mode: str = 'hdr', max_dimension: Optional[int] = THUMBNAIL_MAX_DIMENSION,
+                  keep_original_below: Optional[int] = None) -> Tuple[bool, Dict]:
+    """
+    Convert an EXR/HDR/texture image to a display PNG in one read
+
+    Float sources (and other formats too large to decode within the conversion
+    budget) are box-reduced band by band in linear light before tone mapping
+    (``mode`` 'hdr') or clamping ('texture'), then finished with a Lanczos
+    resize. Other formats are decoded with Pillow using draft mode where available.
+    Returns ``(success, resolution_info)`` with the source resolution.
+    """
+    from PIL import Image
+
+    source, target = Path(source), Path(target)
+    resolution_info = read_image_header(source) or {}
+    try:
+        if _should_stream(source, resolution_info):
+            if resolution_info:
+                width, height = resolution_info['width'], resolution_info['height']
+                out_width, out_height = (thumbnail_size(width, height, max_dimension, keep_original_below)
+                                         if max_dimension else (width, height))
+                # Cheap integer reduction first; Lanczos only covers the last < 2x
+                pixels = load_reduced(source, out_width, out_height)
+            else:
+                # No usable header: decode fully to learn the size
+                pixels = _load_linear(source)
+                height, width = pixels.shape[:2]
+                resolution_info = {"width": width, "height": height, "resolution": f"{width}x{height}",
+                                   "channels": pixels.shape[2]}
+                out_width, out_height = (thumbnail_size(width, height, max_dimension, keep_original_below)
+                                         if max_dimension else (width, height))
+                pixels = box_reduce(pixels, max(1, min(width // out_width, height // out_height)))
+            image = _to_pil(to_display(pixels, mode))
+            del pixels
+        else:
+            image = Image.open(source)
+            width, height = image.size
+            out_width, out_height = (thumbnail_size(width, height, max_dimension, keep_original_below)
+                                     if max_dimension else (width, height))
+            # JPEG decodes at 1/2, 1/4 or 1/8 scale directly
+            image.draft('RGB', (out_width, out_height))
+            if image.mode == 'P':
+                image = image.convert('RGBA' if 'transparency' in image.info else 'RGB')
+            elif image.mode not in ('RGB', 'RGBA', 'L', 'LA'):
+                image = image.convert('RGBA' if 'A' in image.getbands() else 'RGB')
+
+        if image.size != (out_width, out_height):
+            image = image.resize((out_width, out_height), Image.Resampling.LANCZOS)
+        _save_png(image, target)
+        logger.info(f"✅ Converted {source.name} ({width}x{height}) -> {target.name} ({out_width}x{out_height}, {mode})")
+        return True, resolution_info
+    except Exception as e:
+        logger.error(f"❌ Conversion of {source.name} failed: {e}")
+        return False, resolution_info
+
+
+def _convert_item(item: dict) -> Tuple[bool, Dict]:
+    return convert_image(**item)
+
+
+async def convert_images(items: List[dict]) -> List[Tuple[bool, Dict]]:
+    """
+    Convert many images concurrently in the shared process pool, within the memory budget
+
+    Each item holds ``convert_image`` keyword arguments (``source``, ``target``,
+    ``mode``, ``max_dimension``, ``keep_original_below``). Results keep input order.
+    """
+    return list(await asyncio.gather(*(
+        run_within_budget(item['source'], _convert_item, item,
+                          max_dimension=item.get('max_dimension', THUMBNAIL_MAX_DIMENSION))
+        for item in items
+    )))
+
+
+def convert_batch(items: List[dict], workers: Optional[int] = None) -> List[Tuple[bool, Dict]]:
+    """Synchronous batch conversion with a private process pool (for scripts)"""
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(_convert_item, items))
@@ -0,0 +1,370 @@
+# backend/core/jobs.py - Persistent background job queue (uploads, conversions)
+import os
+import json
+import time
+import uuid
+import socket
+import asyncio
+import logging
+import sqlite3
+import traceback
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, Iterator, List, Optional
+
+from backend.core.config_manager import config as atlas_config
+from backend.core.executors import run_fs
+
+logger = logging.getLogger(__name__)
+
+JOB_STATUSES = ('queued', 'running', 'succeeded', 'failed')
+
+# async handler(payload, progress) -> JSON-serialisable result
+JobHandler = Callable[[dict, Callable[..., Awaitable[None]]], Awaitable[Any]]
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    status TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    result TEXT,
+    error TEXT,
+    progress REAL NOT NULL DEFAULT 0,
+    message TEXT,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    max_attempts INTEGER NOT NULL,
+    run_after REAL NOT NULL,
+    heartbeat_at REAL,
+    worker TEXT,
+    created_at TEXT NOT NULL,
+    started_at TEXT,
+    finished_at TEXT
+);
+CREATE INDEX IF NOT EXISTS jobs_claim ON jobs (status, run_after);
+"""
+
+
+class JobQueue:
+    """
+    SQLite-backed job queue with an asyncio worker pool
+
+    Jobs survive restarts and are shared between uvicorn worker processes
+    (each process runs its own workers and claims jobs atomically). A job
+    that fails is retried with exponential backoff up to ``max_attempts``;
+    running jobs whose worker stops heartbeating are put back in the queue.
+    """
+
+    def __init__(self, db_path: Path, workers: int, max_attempts: int = 3, retry_delay: float = 5.0,
+                 poll_interval: float = 1.0, stale_after: float = 300.0, retention_days: int = 7):
+        self.db_path = Path(db_path)
+        self.workers = workers
+        self.max_attempts = max_attempts
+        self.retry_delay = retry_delay
+        self.poll_interval = poll_interval
+        self.stale_after = stale_after
+        self.retention_days = retention_days
+
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}"
+        self._handlers: Dict[str, dict] = {}
+        self._tasks: List[asyncio.Task] = []
+        self._wakeup: Optional[asyncio.Event] = None
+        self._running = False
+        self._initialized = False
+        self.processed = 0
+        self.retried = 0
+        self.failed = 0
+
+    # ---- storage -------------------------------------------------------------
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        # Autocommit connection per call: sqlite3 connections must not be shared across pool threads
+        connection = sqlite3.connect(str(self.db_path), timeout=30, isolation_level=None)
+        connection.row_factory = sqlite3.Row
+        try:
+            yield connection
+        finally:
+            connection.close()
+
+    def _ensure_schema(self):
+        if self._initialized:
+            return
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as connection:
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.executescript(_SCHEMA)
+        self._initialized = True
+
+    @staticmethod
+    def _row_to_job(row: sqlite3.Row) -> dict:
+        job = dict(row)
+        job['payload'] = json.loads(job['payload'])
+        job['result'] = json.loads(job['result']) if job['result'] else None
+        job.pop('run_after', None)
+        job.pop('heartbeat_at', None)
+        return job
+
+    def _update(self, job_id: str, **fields):
+        self._ensure_schema()
+        columns = ", ".join(f"{name} = ?" for name in fields)
+        with self._connect() as connection:
+            connection.execute(f"UPDATE jobs SET {columns} WHERE id = ?", (*fields.values(), job_id))
+
+    # ---- public API ------------------------------------------------------------
+
+    def register(self, kind: str, handler: JobHandler, max_attempts: Optional[int] = None,
+                 should_retry: Optional[Callable[[Exception], bool]] = None):
+        """Register the coroutine that processes jobs of ``kind``"""
+        self._handlers[kind] = {
+            'handler': handler,
+            'max_attempts': max_attempts or self.max_attempts,
+            'should_retry': should_retry
+        }
+
+    def submit(self, kind: str, payload: dict, max_attempts: Optional[int] = None, unique: bool = False) -> dict:
+        """
+        Queue a job and return its record (blocking; async callers use enqueue)
+
+        With ``unique`` a queued or running job of the same kind and payload is
+        returned instead of adding another; the check and insert are one
+        transaction, so concurrent callers in any process get the same job.
+        """
+        if kind not in self._handlers:
+            raise ValueError(f"No handler registered for job kind: {kind}")
+        self._ensure_schema()
+
+        job_id = uuid.uuid4().hex
+        attempts = max_attempts or self._handlers[kind]['max_attempts']
+        payload_json = json.dumps(payload, default=str, sort_keys=True)
+        with self._connect() as connection:
+            connection.execute("BEGIN IMMEDIATE")
+            try:
+                existing = connection.execute(
+                    "SELECT id FROM jobs WHERE kind = ? AND payload = ? AND status IN ('queued', 'running') "
+                    "ORDER BY created_at LIMIT 1",
+                    (kind, payload_json)
+                ).fetchone() if unique else None
+                if existing is None:
+                    connection.execute(
+                        "INSERT INTO jobs (id, kind, status, payload, max_attempts, run_after, created_at) "
+                        "VALUES (?, ?, 'queued', ?, ?, ?, ?)",
+                        (job_id, kind, payload_json, attempts, time.time(), datetime.now().isoformat())
+                    )
+                connection.execute("COMMIT")
+            except Exception:
+                connection.execute("ROLLBACK")
+                raise
+        if existing is not None:
+            return self.get(existing['id'])
+        logger.info(f"📥 Queued {kind} job {job_id}")
+        return self.get(job_id)
+
+    async def enqueue(self, kind: str, payload: dict, max_attempts: Optional[int] = None,
+                      unique: bool = False) -> dict:
+        """Queue a job from async code and wake an idle local worker"""
+        job = await run_fs(self.submit, kind, payload, max_attempts, unique)
+        if self._wakeup is not None:
+            self._wakeup.set()
+        return job
+
+    def get(self, job_id: str) -> Optional[dict]:
+        self._ensure_schema()
+        with self._connect() as connection:
+            row = connection.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return self._row_to_job(row) if row else None
+
+    def list_jobs(self, status: Optional[str] = None, kind: Optional[str] = None, limit: int = 50) -> List[dict]:
+        self._ensure_schema()
+        clauses, params = [], []
+        if status:
+            clauses.append("status = ?")
+            params.append(status)
+        if kind:
+            clauses.append("kind = ?")
+            params.append(kind)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        with self._connect() as connection:
+            rows = connection.execute(
+                f"SELECT * FROM jobs {where} ORDER BY created_at DESC LIMIT ?", (*params, limit)
+            ).fetchall()
+        return [self._row_to_job(row) for row in rows]
+
+    def counts(self) -> Dict[str, int]:
+        self._ensure_schema()
+        with self._connect() as connection:
+            rows = connection.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall()
+        counts = {status: 0 for status in JOB_STATUSES}
+        counts.update({status: count for status, count in rows})
+        return counts
+
+    def get_stats(self) -> dict:
+        return {
+            "workers": self.workers if self._running else 0,
+            "worker_id": self.worker_id,
+            "processed": self.processed,
+            "retried": self.retried,
+            "failed": self.failed,
+            "db_path": str(self.db_path)
+        }
+
+    # ---- workers ----------------------------------------------------------------
+
+    def _recover_and_purge(self):
+        """Requeue jobs whose worker died and drop finished jobs past retention"""
+        self._ensure_schema()
+        now = time.time()
+        cutoff = datetime.fromtimestamp(now - self.retention_days * 86400).isoformat()
+        with self._connect() as connection:
+            stale = connection.execute(
+                "UPDATE jobs SET status = 'queued', worker = NULL, run_after = ?, "
+                "message = 'Requeued after worker stopped responding' "
+                "WHERE status = 'running' AND heartbeat_at < ?",
+                (now, now - self.stale_after)
+            ).rowcount
+            connection.execute(
+                "DELETE FROM jobs WHERE status IN ('succeeded', 'failed') AND finished_at < ?", (cutoff,)
+            )
+        if stale:
+            logger.warning(f"⚠️ Requeued {stale} stale job(s)")
+
+    def _claim(self) -> Optional[dict]:
+        """Atomically move the oldest runnable job to 'running' for this worker"""
+        self._ensure_schema()
+        kinds = list(self._handlers)
+        if not kinds:
+            return None
+        now = time.time()
+        with self._connect() as connection:
+            connection.execute("BEGIN IMMEDIATE")
+            try:
+                row = connection.execute(
+                    f"SELECT * FROM jobs WHERE status = 'queued' AND run_after <= ? "
+                    f"AND kind IN ({', '.join('?' for _ in kinds)}) ORDER BY created_at LIMIT 1",
+                    (now, *kinds)
+                ).fetchone()
+                if row is None:
+                    connection.execute("COMMIT")
+                    return None
+                connection.execute(
+                    "UPDATE jobs SET status = 'running', attempts = attempts + 1, worker = ?, "
+                    "heartbeat_at = ?, started_at = ?, error = NULL WHERE id = ?",
+                    (self.worker_id, now, datetime.now().isoformat(), row['id'])
+                )
+                connection.execute("COMMIT")
+            except Exception:
+                connection.execute("ROLLBACK")
+                raise
+        job = self._row_to_job(row)
+        job['attempts'] += 1
+        return job
+
+    async def _heartbeat(self, job_id: str):
+        interval = max(1.0, self.stale_after / 5)
+        while True:
+            await asyncio.sleep(interval)
+            await run_fs(self._update, job_id, heartbeat_at=time.time())
+
+    async def _run_job(self, job: dict):
+        spec = self._handlers[job['kind']]
+        job_id = job['id']
+
+        async def progress(percent: float, message: Optional[str] = None):
+            fields = {'progress': max(0.0, min(100.0, float(percent))), 'heartbeat_at': time.time()}
+            if message is not None:
+                fields['message'] = message
+            await run_fs(self._update, job_id, **fields)
+
+        logger.info(f"⚙️ Running {job['kind']} job {job_id} (attempt {job['attempts']}/{job['max_attempts']})")
+        heartbeat = asyncio.create_task(self._heartbeat(job_id))
+        try:
+            result = await spec['handler'](job['payload'], progress)
+        except asyncio.CancelledError:
+            # Shutdown: leave the job for another worker or the next start
+            await run_fs(self._update, job_id, status='queued', worker=None, run_after=time.time(),
+                         message='Requeued on shutdown')
+            raise
+        except Exception as e:
+            retryable = spec['should_retry'](e) if spec['should_retry'] else True
+            error = f"{type(e).__name__}: {getattr(e, 'detail', None) or e}"
+            if retryable and job['attempts'] < job['max_attempts']:
+                delay = self.retry_delay * (2 ** (job['attempts'] - 1))
+                self.retried += 1
+                logger.warning(f"⚠️ Job {job_id} failed ({error}); retrying in {delay:.0f}s")
+                await run_fs(self._update, job_id, status='queued', worker=None, error=error,
+                             run_after=time.time() + delay, message=f"Retrying in {delay:.0f}s")
+            else:
+                self.failed += 1
+                logger.error(f"❌ Job {job_id} failed: {error}\n{traceback.format_exc()}")
+                await run_fs(self._update, job_id, status='failed', error=error,
+                             finished_at=datetime.now().isoformat())
+        else:
+            self.processed += 1
+            logger.info(f"✅ Job {job_id} succeeded")
+            await run_fs(self._update, job_id, status='succeeded', progress=100.0, message='Done',
+                         result=json.dumps(result, default=str), finished_at=datetime.now().isoformat())
+        finally:
+            heartbeat.cancel()
+
+    async def _worker(self, number: int):
+        while self._running:
+            try:
+                job = await run_fs(self._claim)
+            except Exception as e:
+                logger.error(f"❌ Job worker {number} could not claim a job: {e}")
+                job = None
+
+            if job is None:
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            await self._run_job(job)
+
+    async def _maintain(self):
+        """Requeue stale jobs (e.g. from a dead worker process) every ``stale_after`` seconds"""
+        while self._running:
+            await asyncio.sleep(max(1.0, self.stale_after))
+            try:
+                await run_fs(self._recover_and_purge)
+            except Exception as e:
+                logger.error(f"❌ Job queue maintenance failed: {e}")
+            self._wakeup.set()
+
+    async def start(self):
+        """Start the worker pool (called from the application startup event)"""
+        if self._running:
+            return
+        await run_fs(self._recover_and_purge)
+        self._running = True
+        self._wakeup = asyncio.Event()
+        self._tasks = [asyncio.create_task(self._worker(n)) for n in range(self.workers)]
+        self._tasks.append(asyncio.create_task(self._maintain()))
+        logger.info(f"✅ Job queue started with {self.workers} workers ({self.db_path})")
+
+    async def stop(self):
+        """Stop workers; jobs they were running are requeued"""
+        self._running = False
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        logger.info("🛑 Job queue stopped")
+
+
+_jobs_config = atlas_config.get('api.jobs', {}) or {}
+
+# Global job queue (workers run in every API process)
+job_queue = JobQueue(
+    db_path=Path(_jobs_config.get('db_path') or Path(os.getenv('ATLAS_STATE_DIR', '/app/state')) / "atlas_jobs.sqlite3"),
+    workers=int(_jobs_config.get('workers') or os.cpu_count() or 2),
+    max_attempts=int(_jobs_config.get('max_attempts', 3)),
+    retry_delay=float(_jobs_config.get('retry_delay', 5)),
+    poll_interval=float(_jobs_config.get('poll_interval', 1.0)),
+    stale_after=float(_jobs_config.get('stale_after', 300)),
+    retention_days=int(_jobs_config.get('retention_days', 7))
+)
@@ -0,0 +1,208 @@
+# backend/core/json_stream.py - Incremental parsing of NDJSON / JSON array request bodies
+import json
+import codecs
+import re
+from typing import Any, AsyncIterator, Optional, Tuple
+
+# Largest single item accepted while waiting for the rest of it to arrive
+MAX_ITEM_BYTES = 16 * 1024 * 1024
+
+# Whitespace allowed between JSON tokens
+JSON_WHITESPACE = ' \t\r\n'
+
+_NON_WHITESPACE = re.compile(r'[^ \t\r\n]')
+_STRUCTURAL = re.compile(r'["{}\[\]]')
+_STRING_SPECIAL = re.compile(r'["\\]')
+_SCALAR_END = re.compile(r'[ \t\r\n,\]]')
+
+
+class JSONStreamError(ValueError):
+    """The body cannot be parsed any further (items before it were already yielded)"""
+
+
+class _ItemScanner:
+    """
+    Finds where the JSON value starting at some index of a buffer ends
+
+    Scanning resumes where the previous call stopped, so an item arriving over
+    many chunks is scanned once and decoded once it is complete. Only string
+    and bracket boundaries are tracked; the decoder validates the rest.
+    """
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self) -> None:
+        # offset is relative to the start of the item, which moves when the buffer is trimmed
+        self.offset = 0
+        self.depth = 0
+        self.in_string = False
+        self.scalar = False
+
+    def scan(self, buffer: str, start: int) -> Optional[int]:
+        """Index just past the value starting at ``start``, or None if it is not complete yet"""
+        position = start + self.offset
+        if self.scalar or (not self.offset and buffer[start] not in '{["'):
+            # Number, true, false, null (or garbage): ends at the next delimiter
+            match = _SCALAR_END.search(buffer, position)
+            if match:
+                return self._done(match.start())
+            self.scalar = True
+            self.offset = len(buffer) - start
+            return None
+        while True:
+            if self.in_string:
+                match = _STRING_SPECIAL.search(buffer, position)
+                if not match:
+                    self.offset = len(buffer) - start
+                    return None
+                if match.group() == '\\':
+                    if match.end() >= len(buffer):
+                        # The escaped character has not arrived yet
+                        self.offset = match.start() - start
+                        return None
+                    position = match.end() + 1
+                    continue
+                self.in_string = False
+                position = match.end()
+                if self.depth == 0:
+                    return self._done(position)
+                continue
+            match = _STRUCTURAL.search(buffer, position)
+            if not match:
+                self.offset = len(buffer) - start
+                return None
+            position = match.end()
+            token = match.group()
+            if token == '"':
+                self.in_string = True
+            elif token in '{[':
+                self.depth += 1
+            else:
+                self.depth -= 1
+                if self.depth == 0:
+                    return self._done(position)
+
+    def _done(self, end: int) -> int:
+        self.reset()
+        return end
+
+
+async def iter_json_items(chunks: AsyncIterator[bytes], max_item_bytes: int = MAX_ITEM_BYTES
+                          ) -> AsyncIterator[Tuple[int, Any, Optional[str]]]:
+    """
+    Yield ``(index, item, error)`` for each item of a streamed body
+
+    A body starting with ``[`` is read as a JSON array, anything else as
+    NDJSON (one JSON document per line). Only the current item is buffered.
+    A malformed NDJSON line is reported through ``error`` and parsing goes
+    on; a malformed array (including a missing or doubled comma between
+    items) cannot be resynchronised and raises JSONStreamError.
+    """
+    text_decoder = codecs.getincrementaldecoder('utf-8')()
+    decoder = json.JSONDecoder()
+    source = chunks.__aiter__()
+    buffer = ''
+    ended = False
+
+    async def fill(at_least: int = 1) -> None:
+        # Waiting on an incomplete item reads as much again as is buffered before
+        # appending, so a large item is copied a constant number of times
+        nonlocal buffer, ended
+        parts = []
+        received = 0
+        try:
+            while received < max(at_least, 1):
+                try:
+                    chunk = await source.__anext__()
+                except StopAsyncIteration:
+                    ended = True
+                    parts.append(text_decoder.decode(b'', final=True))
+                    return
+                parts.append(text_decoder.decode(chunk))
+                received += len(chunk)
+        except UnicodeDecodeError as e:
+            raise JSONStreamError(f"Body is not valid UTF-8: {e}")
+        finally:
+            buffer += ''.join(parts)
+
+    # A byte order mark may arrive in a chunk of its own
+    while not buffer.lstrip('\ufeff' + JSON_WHITESPACE) and not ended:
+        await fill()
+    buffer = buffer.lstrip('\ufeff' + JSON_WHITESPACE)
+    index = 0
+    # Items are read in place from ``start``; the buffer is only trimmed before it grows
+    start = 0
+
+    if not buffer.startswith('['):
+        # NDJSON
+        searched = 0
+        while True:
+            newline = buffer.find('\n', searched)
+            if newline < 0 and not ended:
+                if len(buffer) - start > max_item_bytes:
+                    raise JSONStreamError(f"Line {index + 1} is larger than {max_item_bytes} bytes")
+                buffer, start = buffer[start:], 0
+                searched = len(buffer)
+                await fill(len(buffer))
+                continue
+            if newline < 0:
+                line, start = buffer[start:], len(buffer)
+            else:
+                line, start = buffer[start:newline], newline + 1
+            searched = start
+            if line.strip():
+                try:
+                    yield index, json.loads(line), None
+                except json.JSONDecodeError as e:
+                    yield index, None, f"Invalid JSON: {e}"
+                index += 1
+            if ended and start >= len(buffer):
+                return
+
+    # JSON array
+    scanner = _ItemScanner()
+    start = 1
+    expect_item = None  # None: first item or ']', True: item after a comma, False: ',' or ']'
+    while True:
+        if not scanner.offset:
+            match = _NON_WHITESPACE.search(buffer, start)
+            start = match.start() if match else len(buffer)
+        if start >= len(buffer):
+            if ended:
+                raise JSONStreamError("Unterminated JSON array")
+            buffer, start = '', 0
+            await fill()
+            continue
+        if not expect_item and buffer[start] == ']':
+            while not ended:
+                await fill()
+            if buffer[start + 1:].strip(JSON_WHITESPACE):
+                raise JSONStreamError("Unexpected data after the JSON array")
+            return
+        if expect_item is False:
+            if buffer[start] != ',':
+                raise JSONStreamError(f"Expected ',' or ']' after item {index - 1}")
+            start += 1
+            expect_item = True
+            continue
+
+        end = scanner.scan(buffer, start)
+        if end is None:
+            if ended:
+                raise JSONStreamError(f"Item {index} is truncated: unterminated JSON array")
+            if len(buffer) - start > max_item_bytes:
+                raise JSONStreamError(f"Item {index} is larger than {max_item_bytes} bytes")
+            buffer, start = buffer[start:], 0
+            await fill(len(buffer))
+            continue
+        try:
+            item, decoded = decoder.raw_decode(buffer, start)
+        except json.JSONDecodeError as e:
+            raise JSONStreamError(f"Invalid JSON in item {index}: {e}")
+        if decoded != end:
+            raise JSONStreamError(f"Invalid JSON in item {index}: unexpected data at char {decoded - start}")
+        start = end
+        expect_item = False
+        yield index, item, None
+        index += 1
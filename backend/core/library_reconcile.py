@@ -0,0 +1,279 @@
+# backend/core/library_reconcile.py - Filesystem <-> database reconciliation: diff, plan, apply
+import os
+import time
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+from backend.core.asset_paths import thumbnail_index, asset_file_cache
+from backend.core.query_cache import query_cache
+from backend.core.library_sync import LibrarySync, library_sync, METADATA_FILENAME
+
+logger = logging.getLogger(__name__)
+
+# Plan sections that write documents, and the one that deletes them
+UPSERT_ACTIONS = ('added', 'changed', 'moved')
+DELETE_ACTION = 'orphaned'
+
+
+class ReconcilePlan:
+    """
+    Differences between the library folders and Atlas_Library
+
+    - ``added``: asset folders without a document
+    - ``changed``: the metadata.json content differs from the synced one
+    - ``moved``: the document's asset id now lives in another folder
+    - ``orphaned``: documents whose folder is gone (deleted on apply)
+    - ``untracked``: documents outside the synced folders (left alone)
+    - ``conflicts``: several folders claiming the same asset id (skipped)
+
+    Entries are small dicts (key, name, path), never full documents.
+    """
+
+    def __init__(self):
+        self.added: List[Dict] = []
+        self.changed: List[Dict] = []
+        self.moved: List[Dict] = []
+        self.orphaned: List[Dict] = []
+        self.untracked: List[Dict] = []
+        self.conflicts: List[Dict] = []
+        self.unchanged = 0
+        self.filesystem_assets = 0
+        self.database_assets = 0
+        self.deletes_allowed = True
+        # Folders the scan could not list; documents under them are never orphaned
+        self.unreadable: List[str] = []
+        self.timings: Dict[str, float] = {}
+
+    def counts(self) -> Dict[str, int]:
+        return {
+            "filesystem_assets": self.filesystem_assets,
+            "database_assets": self.database_assets,
+            "added": len(self.added),
+            "changed": len(self.changed),
+            "moved": len(self.moved),
+            "orphaned": len(self.orphaned),
+            "untracked": len(self.untracked),
+            "conflicts": len(self.conflicts),
+            "unchanged": self.unchanged
+        }
+
+    def to_dict(self, sample_size: int = 20) -> Dict:
+        """Counts, per-phase timings and the first ``sample_size`` entries of each section"""
+        return {
+            "counts": self.counts(),
+            "deletes_allowed": self.deletes_allowed,
+            "unreadable": self.unreadable[:sample_size],
+            "timings": self.timings,
+            "samples": {
+                section: getattr(self, section)[:sample_size]
+                for section in ('added', 'changed', 'moved', 'orphaned', 'untracked', 'conflicts')
+            }
+        }
+
+
+class LibraryReconciler:
+    """
+    Reconciles Atlas_Library with the library folders in three phases
+
+    1. scan: list asset folders and fingerprint each metadata.json (asset key
+       + content hash, taken from the sync manifest when the file is unchanged)
+       into a compact in-memory index keyed by asset id.
+    2. diff: stream the documents (key, folder, metadata hash only) through a
+       database cursor and hash-join them against the index - O(n), with one
+       cursor batch in memory on the database side.
+    3. apply: parse the affected folders and write upserts and deletes in
+       batches, each batch in one stream transaction.
+
+    ``plan`` alone is a dry run.
+
+    Only the database side is streamed; the folder side is held in memory
+    rather than merged as a second sorted stream. Asset ids live inside each
+    metadata.json, so the folder walk cannot yield them in key order - a merge
+    join would first need the whole scan (or an external sort) anyway. The
+    index keeps key, folder path and hash per asset (roughly 200 bytes, so
+    about 20 MB at 100k assets), the same order as the candidate list the
+    scan already returns, and the hash join saves sorting it.
+    """
+
+    def __init__(self, sync: LibrarySync, cursor_batch_size: int = 1000):
+        self.sync = sync
+        self.cursor_batch_size = cursor_batch_size
+
+    # ---- diff -----------------------------------------------------------------------
+
+    def _scan_index(self, plan: ReconcilePlan) -> Dict[str, Dict]:
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=self.sync.workers, thread_name_prefix="atlas-reconcile") as pool:
+            candidates, plan.unreadable = self.sync.scan(pool)
+            plan.timings['scan'] = round(time.perf_counter() - started, 3)
+
+            started = time.perf_counter()
+
+            def fingerprint(candidate):
+                try:
+                    return candidate, self.sync.fingerprint(candidate)
+                except Exception as e:
+                    logger.warning(f"⚠️ Cannot read {candidate['metadata_path']}: {e}")
+                    return candidate, None
+
+            index = {}
+            for candidate, result in pool.map(fingerprint, candidates):
+                if result is None:
+                    continue
+                key, content_hash = result
+                entry = {"key": key, "path": candidate['asset_path'], "hash": content_hash}
+                if key in index:
+                    plan.conflicts.append({"key": key, "paths": sorted([index[key]['path'], entry['path']])})
+                    # Keep the first folder in path order so repeated runs agree
+                    if entry['path'] > index[key]['path']:
+                        continue
+                index[key] = entry
+        plan.timings['fingerprint'] = round(time.perf_counter() - started, 3)
+        plan.filesystem_assets = len(index)
+        return index
+
+    def _deletable(self, path: Optional[str], plan: ReconcilePlan, mounted: Dict[str, bool]) -> bool:
+        """Whether a document's folder is one the scan covers and could read, on a library that is mounted"""
+        located = self.sync.locate(path) if path else None
+        if located is None:
+            return False
+        metadata_path = os.path.join(located[3], METADATA_FILENAME)
+        return bool(self.sync.removable([metadata_path], plan.unreadable, mounted))
+
+    def plan(self, asset_queries) -> ReconcilePlan:
+        """Diff the library folders against the database (blocking, read-only)"""
+        with self.sync._lock:
+            self.sync.manifest.load()
+            return self._plan(asset_queries)
+
+    def _plan(self, asset_queries) -> ReconcilePlan:
+        plan = ReconcilePlan()
+        mounted = self.sync.mounted_roots()
+        index = self._scan_index(plan)
+
+        started = time.perf_counter()
+        conflicted = {conflict['key'] for conflict in plan.conflicts}
+        for document in asset_queries.iter_sync_state(self.cursor_batch_size):
+            plan.database_assets += 1
+            key, path = document['key'], document.get('path')
+            entry = index.pop(key, None)
+            summary = {"key": key, "name": document.get('name'), "path": path}
+            if entry is None:
+                (plan.orphaned if self._deletable(path, plan, mounted) else plan.untracked).append(summary)
+            elif key in conflicted:
+                continue
+            elif path is None or entry['path'] != self.sync.canonical_path(path):
+                plan.moved.append({**summary, "path": entry['path'], "previous_path": path})
+            elif entry['hash'] != document.get('metadata_hash'):
+                plan.changed.append(summary)
+            else:
+                plan.unchanged += 1
+        # Whatever the database did not claim is new
+        plan.added = [{"key": entry['key'], "name": Path(entry['path']).name, "path": entry['path']}
+                      for entry in index.values() if entry['key'] not in conflicted]
+        plan.timings['diff'] = round(time.perf_counter() - started, 3)
+
+        if plan.orphaned and plan.filesystem_assets == 0:
+            # An empty scan almost always means an unmounted share, not an empty library
+            logger.warning("⚠️ No asset folders found; orphaned documents will not be deleted")
+            plan.deletes_allowed = False
+
+        counts = plan.counts()
+        logger.info(f"🔍 Reconcile plan: {counts['added']} added, {counts['changed']} changed, "
+                    f"{counts['moved']} moved, {counts['orphaned']} orphaned, {counts['conflicts']} conflicts, "
+                    f"{counts['unchanged']} unchanged ({plan.timings})")
+        return plan
+
+    # ---- apply ----------------------------------------------------------------------
+
+    def _parse_folder(self, path: str, build_asset_document) -> Optional[dict]:
+        located = self.sync.locate(path)
+        try:
+            candidate = self.sync._candidate(*located[:3], path) if located else None
+        except OSError as e:
+            return {'asset_path': path, 'error': str(e)}
+        if candidate is None:
+            return None
+        return self.sync._parse(candidate, True, build_asset_document)
+
+    def apply(self, asset_queries, plan: ReconcilePlan,
+              actions: Iterable[str] = UPSERT_ACTIONS + (DELETE_ACTION,)) -> Dict:
+        """
+        Apply the ``actions`` sections of a plan (blocking)
+
+        Each batch of upserts and deletes commits atomically; a failed batch is
+        counted in ``errors`` and left for the next run.
+        """
+        from backend.assetlibrary.database.arango_collection_manager import build_asset_document
+
+        actions = set(actions)
+        upserts = [entry for action in UPSERT_ACTIONS if action in actions for entry in getattr(plan, action)]
+        deletes = plan.orphaned if DELETE_ACTION in actions and plan.deletes_allowed else []
+        stats = {
+            "assets_added": 0,
+            "assets_updated": 0,
+            "assets_moved": 0,
+            "assets_removed": 0,
+            "assets_unchanged": plan.unchanged,
+            "conflicts": len(plan.conflicts),
+            "errors": 0
+        }
+        written = {}
+        deleted = []
+
+        with self.sync._lock:
+            started = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=self.sync.workers, thread_name_prefix="atlas-reconcile") as pool:
+                for start in range(0, max(len(upserts), len(deletes)), self.sync.batch_size):
+                    batch = upserts[start:start + self.sync.batch_size]
+                    delete_keys = [entry['key'] for entry in deletes[start:start + self.sync.batch_size]]
+                    parsed = [item for item in pool.map(
+                        lambda entry: self._parse_folder(entry['path'], build_asset_document), batch) if item]
+                    for item in parsed:
+                        if 'error' in item:
+                            logger.error(f"      ❌ Error processing {item['asset_path']}: {item['error']}")
+                    parsed = [item for item in parsed if 'error' not in item]
+                    stats['errors'] += len(batch) - len(parsed)
+                    try:
+                        asset_queries.apply_assets_transaction([item['document'] for item in parsed], delete_keys)
+                    except Exception as e:
+                        logger.error(f"      ❌ Reconcile batch failed: {e}")
+                        stats['errors'] += len(parsed) + len(delete_keys)
+                        continue
+                    written.update((item['key'], item) for item in parsed)
+                    deleted.extend(delete_keys)
+
+            for action, stat in (('added', 'assets_added'), ('changed', 'assets_updated'), ('moved', 'assets_moved')):
+                if action in actions:
+                    stats[stat] = sum(1 for entry in getattr(plan, action) if entry['key'] in written)
+            stats['assets_removed'] = len(deleted)
+
+            for item in written.values():
+                self.sync.manifest.record(item['metadata_path'], item['stat'], item['hash'], item['key'],
+                                          item['thumbnails'])
+            self.sync.manifest.save()
+            for key in list(written) + deleted:
+                asset_file_cache.invalidate(key)
+                thumbnail_index.invalidate(key)
+            if written or deleted:
+                query_cache.invalidate_all()
+            plan.timings['apply'] = round(time.perf_counter() - started, 3)
+
+        stats['timings'] = plan.timings
+        logger.info(f"🏁 Reconcile applied: {stats['assets_added']} added, {stats['assets_updated']} updated, "
+                    f"{stats['assets_moved']} moved, {stats['assets_removed']} removed, {stats['errors']} errors "
+                    f"({plan.timings})")
+        return stats
+
+    def reconcile(self, asset_queries, dry_run: bool = False) -> Dict:
+        """Plan and (unless ``dry_run``) apply in one call"""
+        plan = self.plan(asset_queries)
+        if dry_run:
+            return plan.to_dict()
+        return {**self.apply(asset_queries, plan), "plan": plan.counts()}
+
+
+# Global instance
+library_reconciler = LibraryReconciler(library_sync)
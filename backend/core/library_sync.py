@@ -0,0 +1,520 @@
+# backend/core/library_sync.py - Incremental filesystem -> database sync with a change manifest
+import os
+import json
+import errno
+import time
+import hashlib
+import logging
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from backend.core.config_manager import config as atlas_config
+from backend.core.asset_paths import thumbnail_index, asset_file_cache, THUMBNAIL_INDEX_FIELD, to_container_path, to_network_path
+from backend.core.query_cache import query_cache
+
+logger = logging.getLogger(__name__)
+
+# Top-level folders of each library that hold <subcategory>/<asset folder>/metadata.json.
+# 3D/Textures and 3D/HDRI are written by the upload endpoint and are not synced from disk.
+LIBRARY_ASSET_TYPES = {
+    "3D": ["Assets", "FX", "Materials", "HDAs"],
+    "2D": ["Textures", "References", "UI"]
+}
+
+METADATA_FILENAME = "metadata.json"
+
+# configured library root -> the path it is reachable at in this process (see resolve_library_root)
+_resolved_roots: Dict[str, Path] = {}
+
+
+def resolve_library_root(configured: str) -> Path:
+    """
+    Where a configured (network) library root is reachable from here
+
+    The containers mount the share at /app/assets rather than at its network
+    path, so a configured root that does not exist is mapped with
+    ``to_container_path`` like the rest of the API. Remembered once found.
+    """
+    resolved = _resolved_roots.get(configured)
+    if resolved is not None:
+        return resolved
+    for candidate in (Path(configured), Path(to_container_path(configured))):
+        if candidate.is_dir():
+            _resolved_roots[configured] = candidate
+            return candidate
+    return Path(configured)
+
+
+# Sub-folders whose changes only affect the thumbnail index
+THUMBNAIL_FOLDERS = ("Thumbnail", "Preview")
+
+
+class SyncManifest:
+    """
+    Last synced state of every metadata.json: mtime, size, content hash, asset
+    key, plus the mtimes of the Thumbnail/Preview folders next to it
+
+    Kept as a JSON file so unchanged asset folders can be skipped without
+    opening their metadata on the next sync.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.entries: Dict[str, dict] = {}
+
+    def load(self):
+        try:
+            with open(self.path) as f:
+                self.entries = json.load(f).get('entries', {})
+        except FileNotFoundError:
+            self.entries = {}
+        except (OSError, ValueError) as e:
+            logger.warning(f"⚠️ Ignoring unreadable sync manifest {self.path}: {e}")
+            self.entries = {}
+
+    def save(self):
+        """Write atomically so a crash mid-write leaves the previous manifest"""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # Unique per writer: the API and watcher containers share this folder and may both be PID 1
+        temp_path = self.path.with_name(f".{self.path.name}.{os.getpid()}.{uuid.uuid4().hex[:8]}.tmp")
+        with open(temp_path, 'w') as f:
+            json.dump({'updated_at': time.time(), 'entries': self.entries}, f)
+        os.replace(temp_path, self.path)
+
+    def is_unchanged(self, metadata_path: str, stat_result: os.stat_result) -> bool:
+        entry = self.entries.get(metadata_path)
+        return bool(entry) and entry['mtime_ns'] == stat_result.st_mtime_ns and entry['size'] == stat_result.st_size
+
+    def thumbnails_changed(self, metadata_path: str, thumbnail_mtimes: List[Optional[int]]) -> bool:
+        entry = self.entries.get(metadata_path)
+        return bool(entry) and entry.get('thumbnails') != thumbnail_mtimes
+
+    def record(self, metadata_path: str, stat_result: os.stat_result, content_hash: str, asset_key: str,
+               thumbnail_mtimes: List[Optional[int]]):
+        self.entries[metadata_path] = {
+            'mtime_ns': stat_result.st_mtime_ns,
+            'size': stat_result.st_size,
+            'hash': content_hash,
+            'key': asset_key,
+            'thumbnails': thumbnail_mtimes
+        }
+
+
+class LibrarySync:
+    """
+    Sync asset folders on the library mount into Atlas_Library
+
+    Folders are listed and metadata files parsed in a thread pool (the
+    library is on NFS, so the work is latency bound). Only metadata whose
+    mtime/size - and then content hash - changed since the last run is
+    parsed and written, in ``import_bulk`` batches. ``sync_folders`` applies
+    the same logic to a handful of folders reported by the library watcher.
+    """
+
+    def __init__(self, manifest_path: Path, workers: int = 16, batch_size: int = 500):
+        self.manifest = SyncManifest(manifest_path)
+        self.workers = workers
+        self.batch_size = batch_size
+        self._lock = threading.Lock()
+        self.last_result: Optional[dict] = None
+
+    @staticmethod
+    def library_roots() -> Dict[str, Path]:
+        """dimension -> library root, from the Atlas config (mapped to the container mount when needed)"""
+        return {"3D": resolve_library_root(atlas_config.asset_library_3d),
+                "2D": resolve_library_root(atlas_config.asset_library_2d)}
+
+    def mounted_roots(self) -> Dict[str, bool]:
+        """
+        dimension -> whether its library looks mounted
+
+        An unmounted share usually leaves an empty mount point behind, so the
+        root must be a directory holding at least one asset type folder.
+        """
+        mounted = {}
+        for dimension, library_root in self.library_roots().items():
+            try:
+                mounted[dimension] = any((library_root / asset_type).is_dir()
+                                         for asset_type in LIBRARY_ASSET_TYPES[dimension])
+            except OSError:
+                mounted[dimension] = False
+        return mounted
+
+    # ---- scanning ----------------------------------------------------------------
+
+    @staticmethod
+    def _candidate(dimension: str, asset_type: str, subcategory: str, asset_path: str) -> Optional[dict]:
+        """
+        Scan entry for an asset folder; None only when its metadata.json does not exist
+
+        Any other error (stale NFS handle, permissions, timeouts) is raised so
+        callers never mistake an unreadable folder for a removed asset.
+        """
+        metadata_path = os.path.join(asset_path, METADATA_FILENAME)
+        try:
+            stat_result = os.stat(metadata_path)
+        except OSError as e:
+            if e.errno == errno.ENOENT:
+                return None
+            raise
+        thumbnail_mtimes = []
+        for folder in THUMBNAIL_FOLDERS:
+            try:
+                thumbnail_mtimes.append(os.stat(os.path.join(asset_path, folder)).st_mtime_ns)
+            except OSError:
+                thumbnail_mtimes.append(None)
+        return {
+            'metadata_path': metadata_path,
+            'asset_path': asset_path,
+            'dimension': dimension,
+            'asset_type': asset_type,
+            'subcategory': subcategory,
+            'stat': stat_result,
+            'thumbnails': thumbnail_mtimes
+        }
+
+    def _needs_sync(self, candidate: dict) -> Tuple[bool, bool]:
+        """(needs parsing, must rewrite even if the metadata content is unchanged)"""
+        metadata_path = candidate['metadata_path']
+        thumbnails_changed = self.manifest.thumbnails_changed(metadata_path, candidate['thumbnails'])
+        return not self.manifest.is_unchanged(metadata_path, candidate['stat']) or thumbnails_changed, thumbnails_changed
+
+    def _scan_subcategory(self, dimension: str, asset_type: str, subcategory_path: Path) -> Tuple[List[dict], List[str]]:
+        """
+        Asset folders with a metadata.json in one subcategory (one listing + one stat each)
+
+        Returns (candidates, unreadable folders). A subcategory that vanished
+        while scanning is simply empty.
+        """
+        try:
+            entries = list(os.scandir(subcategory_path))
+        except OSError as e:
+            if e.errno == errno.ENOENT:
+                return [], []
+            logger.warning(f"⚠️ Cannot list {subcategory_path}: {e}")
+            return [], [str(subcategory_path)]
+        candidates, unreadable = [], []
+        for entry in entries:
+            try:
+                if not entry.is_dir():
+                    continue
+                candidate = self._candidate(dimension, asset_type, subcategory_path.name, entry.path)
+            except OSError as e:
+                logger.warning(f"⚠️ Cannot read {entry.path}: {e}")
+                unreadable.append(entry.path)
+                continue
+            if candidate:
+                candidates.append(candidate)
+        return candidates, unreadable
+
+    def scan(self, pool: ThreadPoolExecutor) -> Tuple[List[dict], List[str]]:
+        """
+        Every asset folder with a metadata.json, plus the folders that could not be read
+
+        Nothing under an unreadable folder (or an unmounted library) may be
+        treated as removed; see ``removable``.
+        """
+        subcategories, unreadable = [], []
+        mounted = self.mounted_roots()
+        for dimension, library_root in self.library_roots().items():
+            if not mounted[dimension]:
+                continue
+            for asset_type in LIBRARY_ASSET_TYPES[dimension]:
+                asset_type_path = library_root / asset_type
+                try:
+                    subcategories.extend((dimension, asset_type, Path(entry.path))
+                                         for entry in os.scandir(asset_type_path) if entry.is_dir())
+                except OSError as e:
+                    if e.errno != errno.ENOENT:
+                        logger.warning(f"⚠️ Cannot list {asset_type_path}: {e}")
+                        unreadable.append(str(asset_type_path))
+        candidates = []
+        for found, failed in pool.map(lambda item: self._scan_subcategory(*item), subcategories):
+            candidates.extend(found)
+            unreadable.extend(failed)
+        return candidates, unreadable
+
+    def removable(self, metadata_paths: Iterable[str], unreadable: Iterable[str],
+                  mounted: Optional[Dict[str, bool]] = None) -> List[str]:
+        """
+        The vanished metadata paths that may be treated as removed
+
+        Paths on an unmounted library or under a folder that could not be read
+        are held back (kept in the manifest) and re-checked on the next pass.
+        """
+        mounted = mounted if mounted is not None else self.mounted_roots()
+        blocked = tuple(str(folder).rstrip(os.sep) + os.sep for folder in unreadable)
+        removable = []
+        for path in metadata_paths:
+            located = self.locate(path)
+            if located is not None and not mounted[located[0]]:
+                continue
+            if path.startswith(blocked):
+                continue
+            removable.append(path)
+        return removable
+
+    def locate(self, path) -> Optional[Tuple[str, str, str, str]]:
+        """
+        (dimension, asset_type, subcategory, asset folder) for any path inside a synced asset folder
+
+        Accepts the network and the container form of a path (documents hold
+        either); the asset folder is returned in the form the scan reports.
+        """
+        path = os.path.normpath(str(path))
+        roots = self.library_roots()
+        for form in dict.fromkeys((path, to_container_path(path), to_network_path(path))):
+            for dimension, library_root in roots.items():
+                try:
+                    parts = Path(form).relative_to(library_root).parts
+                except ValueError:
+                    continue
+                if len(parts) >= 3 and parts[0] in LIBRARY_ASSET_TYPES[dimension]:
+                    return dimension, parts[0], parts[1], str(library_root.joinpath(*parts[:3]))
+        return None
+
+    def canonical_path(self, path) -> str:
+        """A stored asset folder path in the form the scan reports, so folders compare by value"""
+        located = self.locate(path)
+        return located[3] if located else os.path.normpath(str(path))
+
+    # ---- parsing -------------------------------------------------------------------
+
+    @staticmethod
+    def asset_key(metadata: dict, asset_path: Path) -> str:
+        """Database key of an asset folder: its metadata asset_id, else the folder name prefix"""
+        return metadata.get("asset_id", asset_path.name.split("_")[0])
+
+    def fingerprint(self, candidate: dict) -> Tuple[str, str]:
+        """(asset key, metadata content hash), from the manifest when the file is unchanged"""
+        entry = self.manifest.entries.get(candidate['metadata_path'])
+        if entry and self.manifest.is_unchanged(candidate['metadata_path'], candidate['stat']):
+            return entry['key'], entry['hash']
+        with open(candidate['metadata_path'], 'rb') as f:
+            raw = f.read()
+        return self.asset_key(json.loads(raw), Path(candidate['asset_path'])), hashlib.sha256(raw).hexdigest()
+
+    def _parse(self, candidate: dict, force: bool, build_asset_document) -> dict:
+        """Read, hash and (if the content changed) build the document for one metadata.json"""
+        metadata_path = candidate['metadata_path']
+        try:
+            with open(metadata_path, 'rb') as f:
+                raw = f.read()
+            content_hash = hashlib.sha256(raw).hexdigest()
+            previous = self.manifest.entries.get(metadata_path)
+            if not force and previous and previous['hash'] == content_hash:
+                # Touched but identical: only the manifest needs the new mtime
+                return {**candidate, 'hash': content_hash, 'key': previous['key'], 'document': None}
+
+            metadata = json.loads(raw)
+            asset_path = Path(candidate['asset_path'])
+            asset_id = self.asset_key(metadata, asset_path)
+            document = build_asset_document({
+                "asset_id": asset_id,
+                "name": metadata.get("name", asset_path.name),
+                "asset_type": candidate['asset_type'],
+                "category": candidate['subcategory'],
+                "path": str(asset_path),
+                "metadata_file": metadata_path,
+                "metadata": metadata,
+                "last_modified": candidate['stat'].st_mtime
+            })
+            document["dimension"] = document["hierarchy"]["dimension"] = candidate['dimension']
+            document["metadata_hash"] = content_hash
+            document[THUMBNAIL_INDEX_FIELD] = thumbnail_index.refresh(document)
+            return {**candidate, 'hash': content_hash, 'key': asset_id, 'document': document}
+        except Exception as e:
+            return {**candidate, 'error': str(e)}
+
+    # ---- writing --------------------------------------------------------------------
+
+    def _apply(self, asset_queries, parsed: List[dict], removed_paths: List[str], delete_removed: bool) -> dict:
+        """
+        Bulk-write parsed documents, drop vanished metadata and update the manifest
+
+        Only successfully handled files advance the manifest, so failures are
+        retried on the next run.
+        """
+        failed = [item for item in parsed if 'error' in item]
+        touched = [item for item in parsed if 'error' not in item and item['document'] is None]
+        to_write = [item for item in parsed if 'error' not in item and item['document'] is not None]
+        for item in failed:
+            logger.error(f"      ❌ Error processing {item['asset_path']}: {item['error']}")
+
+        written_keys = set()
+        write_errors = 0
+        for start in range(0, len(to_write), self.batch_size):
+            batch = to_write[start:start + self.batch_size]
+            result = asset_queries.upsert_assets_bulk([item['document'] for item in batch])
+            failed_keys = set(result['failed_keys'])
+            write_errors += result['errors']
+            for detail in result['details'][:5]:
+                logger.error(f"      ❌ Bulk write error: {detail}")
+            written_keys.update(item['key'] for item in batch if item['key'] not in failed_keys)
+
+        for item in touched + [item for item in to_write if item['key'] in written_keys]:
+            self.manifest.record(item['metadata_path'], item['stat'], item['hash'], item['key'], item['thumbnails'])
+
+        deleted_keys = []
+        if delete_removed and removed_paths:
+            keys = [self.manifest.entries[path]['key'] for path in removed_paths]
+            deleted_keys = asset_queries.delete_assets_bulk(keys)
+            logger.info(f"🗑️ Removed {len(deleted_keys)} assets whose metadata.json disappeared")
+        for path in removed_paths:
+            self.manifest.entries.pop(path, None)
+        self.manifest.save()
+
+        for key in written_keys | set(deleted_keys):
+            asset_file_cache.invalidate(key)
+            thumbnail_index.invalidate(key)
+        if written_keys or deleted_keys:
+            # Rewritten documents may have moved between categories - drop every cached query
+            query_cache.invalidate_all()
+
+        return {
+            "touched": touched,
+            "to_write": to_write,
+            "written_keys": written_keys,
+            "deleted_keys": deleted_keys,
+            "failed": len(failed) + write_errors
+        }
+
+    @staticmethod
+    def _asset_summaries(applied: dict) -> List[dict]:
+        return [
+            {
+                "name": item['document']['name'],
+                "path": item['asset_path'],
+                "asset_type": item['asset_type'],
+                "subcategory": item['subcategory'],
+                "synced": item['key'] in applied['written_keys']
+            }
+            for item in applied['to_write']
+        ]
+
+    # ---- sync -----------------------------------------------------------------------
+
+    def sync(self, asset_queries, full: bool = False, delete_removed: bool = False) -> dict:
+        """
+        Run one sync pass over the whole library (blocking; called through the fs executor)
+
+        ``full`` re-parses and rewrites every asset regardless of the manifest.
+        ``delete_removed`` also deletes assets whose metadata.json disappeared
+        since the last pass (otherwise they are only forgotten by the manifest).
+        """
+        from backend.assetlibrary.database.arango_collection_manager import build_asset_document
+
+        with self._lock:
+            started = time.perf_counter()
+            library_root = self.library_roots()["3D"]
+            if not library_root.exists():
+                raise FileNotFoundError(f"Asset library not found: {library_root}")
+            logger.info(f"🔄 Starting {'full' if full else 'incremental'} sync from: {library_root}")
+
+            self.manifest.load()
+            with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="atlas-sync") as pool:
+                candidates, unreadable = self.scan(pool)
+                scanned_at = time.perf_counter()
+                changed = []
+                for candidate in candidates:
+                    needs_parse, force = self._needs_sync(candidate)
+                    if full or needs_parse:
+                        changed.append((candidate, full or force))
+                parsed = list(pool.map(lambda item: self._parse(item[0], item[1], build_asset_document), changed))
+
+            seen = {c['metadata_path'] for c in candidates}
+            vanished = [path for path in self.manifest.entries if path not in seen]
+            removed = self.removable(vanished, unreadable)
+            if removed and not candidates:
+                # An empty scan almost always means an unmounted share, not an empty library
+                logger.warning(f"⚠️ No asset folders found; {len(removed)} vanished assets are kept")
+                removed = []
+            elif len(removed) < len(vanished):
+                logger.warning(f"⚠️ {len(vanished) - len(removed)} vanished assets are under unreadable "
+                               f"folders and are kept until they can be read")
+            applied = self._apply(asset_queries, parsed, removed, delete_removed)
+
+            elapsed = time.perf_counter() - started
+            stats = {
+                "assets_found": len(candidates),
+                "assets_unchanged": len(candidates) - len(changed) + len(applied['touched']),
+                "assets_changed": len(applied['to_write']),
+                "assets_synced": len(applied['written_keys']),
+                "assets_failed": applied['failed'],
+                "metadata_removed": len(removed),
+                "unreadable_folders": len(unreadable),
+                "assets_deleted": len(applied['deleted_keys']),
+                "scan_seconds": round(scanned_at - started, 3),
+                "total_seconds": round(elapsed, 3)
+            }
+            logger.info(f"🏁 Sync complete in {elapsed:.2f}s: {stats['assets_synced']} synced, "
+                        f"{stats['assets_unchanged']} unchanged, {stats['assets_failed']} failed, "
+                        f"{stats['assets_found']} total")
+
+            self.last_result = {"finished_at": time.time(), "full": full, **stats}
+            return {
+                "success": True,
+                "message": f"Sync complete: {stats['assets_synced']} assets synced, "
+                           f"{stats['assets_unchanged']} unchanged, {stats['assets_failed']} failed",
+                "stats": stats,
+                "assets": self._asset_summaries(applied)
+            }
+
+    def sync_folders(self, asset_queries, folders: Iterable[str], refresh: Iterable[str] = ()) -> dict:
+        """
+        Sync specific asset folders (blocking)
+
+        Changed metadata is upserted and assets whose metadata.json is gone are
+        deleted. Folders in ``refresh`` are rewritten even when their metadata
+        is unchanged (e.g. a new thumbnail), which re-resolves the thumbnail index.
+        """
+        from backend.assetlibrary.database.arango_collection_manager import build_asset_document
+
+        refresh = set(refresh)
+        with self._lock:
+            self.manifest.load()
+            mounted = self.mounted_roots()
+            parsed, removed = [], []
+            for folder in sorted(set(folders) | refresh):
+                located = self.locate(folder)
+                if located is None:
+                    continue
+                try:
+                    candidate = self._candidate(*located)
+                except OSError as e:
+                    # Not a removal - the folder is retried with its next change or poll
+                    logger.warning(f"⚠️ Cannot read {located[3]}: {e}")
+                    continue
+                if candidate is None:
+                    if not mounted[located[0]]:
+                        continue
+                    metadata_path = os.path.join(located[3], METADATA_FILENAME)
+                    if metadata_path in self.manifest.entries:
+                        removed.append(metadata_path)
+                    continue
+                needs_parse, force = self._needs_sync(candidate)
+                if folder not in refresh and not needs_parse:
+                    continue
+                parsed.append(self._parse(candidate, force or folder in refresh, build_asset_document))
+
+            applied = self._apply(asset_queries, parsed, removed, delete_removed=True)
+            return {
+                "synced": sorted(applied['written_keys']),
+                "deleted": sorted(applied['deleted_keys']),
+                "failed": applied['failed'],
+                "assets": self._asset_summaries(applied)
+            }
+
+
+_sync_config = atlas_config.get('api.sync', {}) or {}
+
+# Global sync runner; the manifest lives in the state folder the API and watcher containers share
+library_sync = LibrarySync(
+    manifest_path=Path(_sync_config.get('manifest_path') or
+                       Path(os.getenv('ATLAS_STATE_DIR', '/app/state')) / "atlas_sync_manifest.json"),
+    workers=int(_sync_config.get('workers') or 16),
+    batch_size=int(_sync_config.get('batch_size') or 500)
+)
@@ -0,0 +1,270 @@
+# backend/core/library_watcher.py - Live library watcher keeping ArangoDB in sync with the asset folders
+import sys
+import time
+import signal
+import logging
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional, Set
+
+from backend.core.config_manager import config as atlas_config
+from backend.core.structured_logging import configure_logging
+from backend.core.library_sync import LibrarySync, library_sync, METADATA_FILENAME, THUMBNAIL_FOLDERS
+
+logger = logging.getLogger(__name__)
+
+# Filesystems where inotify does not see changes made by other hosts
+POLLING_FILESYSTEMS = ('nfs', 'nfs4', 'cifs', 'smb3', 'smbfs', 'fuse.sshfs', 'ceph', 'glusterfs')
+
+
+def filesystem_type(path: Path) -> Optional[str]:
+    """Type of the filesystem mounted at (or above) ``path``, from /proc/mounts"""
+    try:
+        with open('/proc/mounts') as f:
+            mounts = [line.split()[1:3] for line in f if len(line.split()) >= 3]
+    except OSError:
+        return None
+    path = str(path.resolve())
+    best = max((mount for mount in mounts if path == mount[0] or path.startswith(mount[0].rstrip('/') + '/')),
+               key=lambda mount: len(mount[0]), default=None)
+    return best[1] if best else None
+
+
+class ChangeBatch:
+    """
+    Asset folders touched since the last flush, debounced
+
+    A batch is ready once no event arrived for ``debounce`` seconds, or
+    ``max_delay`` seconds after its first event during a long copy.
+    """
+
+    def __init__(self, debounce: float, max_delay: float):
+        self.debounce = debounce
+        self.max_delay = max_delay
+        self.folders: Set[str] = set()
+        self.refresh: Set[str] = set()
+        self._first_event = None
+        self._last_event = None
+        self._lock = threading.Lock()
+        self._event = threading.Event()
+
+    def add(self, folder: str, thumbnail_only: bool = False):
+        with self._lock:
+            (self.refresh if thumbnail_only else self.folders).add(folder)
+            now = time.monotonic()
+            self._first_event = self._first_event or now
+            self._last_event = now
+        self._event.set()
+
+    def wait_ready(self, stop: threading.Event) -> Optional[tuple]:
+        """Block until a batch is ready (returns (folders, refresh)) or ``stop`` is set"""
+        timeout = 1.0
+        while not stop.is_set():
+            self._event.wait(timeout=timeout)
+            with self._lock:
+                # Cleared under the lock so an add() after this point wakes the next wait
+                self._event.clear()
+                timeout = 1.0
+                if self._first_event is None:
+                    continue
+                now = time.monotonic()
+                remaining = min(self.debounce - (now - self._last_event),
+                                self.max_delay - (now - self._first_event))
+                if remaining > 0:
+                    timeout = min(remaining, 1.0)
+                    continue
+                folders, refresh = self.folders, self.refresh - self.folders
+                self.folders, self.refresh = set(), set()
+                self._first_event = self._last_event = None
+                self._event.clear()
+                return folders, refresh
+        return None
+
+
+class LibraryWatcher:
+    """
+    Watches the 3D/2D libraries and applies changes to the database
+
+    ``inotify`` mode uses watchdog's native observer and syncs only the asset
+    folders events point at (new/changed/removed metadata.json, Thumbnail or
+    Preview changes). ``polling`` mode - used automatically for NFS mounts,
+    where inotify misses other hosts' writes - runs the incremental sync every
+    ``poll_interval`` seconds instead.
+    """
+
+    def __init__(self, sync: LibrarySync, mode: str = 'auto', debounce: float = 2.0,
+                 max_delay: float = 30.0, poll_interval: float = 60.0):
+        self.sync = sync
+        self.requested_mode = mode
+        self.mode = None
+        self.poll_interval = poll_interval
+        self.batch = ChangeBatch(debounce, max_delay)
+        self._stop = threading.Event()
+        self._observer = None
+        self.batches_applied = 0
+        self.assets_synced = 0
+        self.assets_deleted = 0
+
+    def _roots(self) -> List[Path]:
+        return [root for root in self.sync.library_roots().values() if root.is_dir()]
+
+    def _choose_mode(self, roots: List[Path]) -> str:
+        if self.requested_mode in ('inotify', 'polling'):
+            return self.requested_mode
+        try:
+            import watchdog  # noqa: F401
+        except ImportError:
+            logger.warning("⚠️ watchdog is not installed; watching the library by polling")
+            return 'polling'
+        network = [root for root in roots if (filesystem_type(root) or '').startswith(POLLING_FILESYSTEMS)]
+        if network:
+            logger.info(f"📡 {', '.join(map(str, network))} on a network filesystem; watching by polling")
+            return 'polling'
+        return 'inotify'
+
+    # ---- events -----------------------------------------------------------------
+
+    def handle_path(self, path: str, is_directory: bool = False):
+        """Queue the asset folder an event path belongs to, if the change matters"""
+        located = self.sync.locate(path)
+        if located is None:
+            return
+        folder = located[3]
+        relative = Path(path).relative_to(folder).parts if path != folder else ()
+        if not relative:
+            # The asset folder itself was created, removed or renamed
+            if is_directory:
+                self.batch.add(folder)
+        elif relative == (METADATA_FILENAME,):
+            self.batch.add(folder)
+        elif relative[0] in THUMBNAIL_FOLDERS:
+            self.batch.add(folder, thumbnail_only=True)
+
+    def _event_handler(self):
+        from watchdog.events import FileSystemEventHandler
+
+        watcher = self
+
+        class Handler(FileSystemEventHandler):
+            def on_any_event(self, event):
+                if event.event_type in ('opened', 'closed_no_write'):
+                    return
+                watcher.handle_path(event.src_path, event.is_directory)
+                if getattr(event, 'dest_path', None):
+                    watcher.handle_path(event.dest_path, event.is_directory)
+
+        return Handler()
+
+    # ---- loops --------------------------------------------------------------------
+
+    def _apply_batches(self, asset_queries):
+        while True:
+            ready = self.batch.wait_ready(self._stop)
+            if ready is None:
+                return
+            folders, refresh = ready
+            try:
+                result = self.sync.sync_folders(asset_queries, folders, refresh)
+                self.batches_applied += 1
+                self.assets_synced += len(result['synced'])
+                self.assets_deleted += len(result['deleted'])
+                logger.info(f"👀 Applied {len(folders) + len(refresh)} changed folders: "
+                            f"{len(result['synced'])} synced, {len(result['deleted'])} deleted, {result['failed']} failed")
+            except Exception as e:
+                logger.error(f"❌ Applying library changes failed: {e}")
+                # Retry the same folders with the next batch
+                for folder in folders:
+                    self.batch.add(folder)
+                for folder in refresh:
+                    self.batch.add(folder, thumbnail_only=True)
+                self._stop.wait(self.batch.debounce)
+
+    def _poll(self, asset_queries):
+        while not self._stop.is_set():
+            try:
+                result = self.sync.sync(asset_queries, delete_removed=True)
+                self.batches_applied += 1
+                self.assets_synced += result['stats']['assets_synced']
+                self.assets_deleted += result['stats']['assets_deleted']
+            except Exception as e:
+                logger.error(f"❌ Polling sync failed: {e}")
+            self._stop.wait(self.poll_interval)
+
+    def run(self, asset_queries):
+        """Watch until stop() is called (blocking)"""
+        roots = self._roots()
+        if not roots:
+            raise FileNotFoundError("No asset library folder found to watch")
+        self.mode = self._choose_mode(roots)
+        logger.info(f"👀 Watching {', '.join(map(str, roots))} ({self.mode})")
+
+        if self.mode == 'polling':
+            self._poll(asset_queries)
+            return
+
+        from watchdog.observers import Observer
+        self._observer = Observer()
+        handler = self._event_handler()
+        for root in roots:
+            self._observer.schedule(handler, str(root), recursive=True)
+        self._observer.start()
+        try:
+            # Catch up on anything that changed while the watcher was down
+            try:
+                self.sync.sync(asset_queries, delete_removed=True)
+            except Exception as e:
+                logger.error(f"❌ Catch-up sync failed; applying live changes only: {e}")
+            self._apply_batches(asset_queries)
+        finally:
+            self._observer.stop()
+            self._observer.join()
+
+    def stop(self):
+        self._stop.set()
+
+    def get_stats(self) -> Dict:
+        return {
+            "mode": self.mode,
+            "batches_applied": self.batches_applied,
+            "assets_synced": self.assets_synced,
+            "assets_deleted": self.assets_deleted
+        }
+
+
+def build_watcher() -> LibraryWatcher:
+    watcher_config = atlas_config.get('api.watcher', {}) or {}
+    return LibraryWatcher(
+        library_sync,
+        mode=watcher_config.get('mode', 'auto'),
+        debounce=float(watcher_config.get('debounce', 2.0)),
+        max_delay=float(watcher_config.get('max_delay', 30.0)),
+        poll_interval=float(watcher_config.get('poll_interval', 60.0))
+    )
+
+
+def main():
+    """Entry point of the watcher service: python -m backend.core.library_watcher"""
+    configure_logging()
+    from backend.core.database import db_pool, get_asset_queries
+    from backend.core.query_cache import query_cache
+
+    asset_queries = get_asset_queries()
+    if not asset_queries:
+        logger.error("❌ Database not available")
+        return 1
+    # Shares the API's Redis so cached listings are invalidated by the watcher's writes
+    query_cache.startup()
+
+    watcher = build_watcher()
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        signal.signal(signum, lambda *_: watcher.stop())
+    try:
+        watcher.run(asset_queries)
+    finally:
+        db_pool.shutdown()
+    logger.info(f"🛑 Library watcher stopped: {watcher.get_stats()}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
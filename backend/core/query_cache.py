@@ -0,0 +1,372 @@
+# backend/core/query_cache.py - Query result cache (Redis, or in-process fallback) with tag-based invalidation
+import os
+import json
+import time
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Tuple
+
+from backend.core.config_manager import config as atlas_config
+from backend.core.cache_codec import cache_codec, dumps_json, CacheCodecError
+from backend.core.structured_logging import record_count
+
+logger = logging.getLogger(__name__)
+
+# Tag of entries derived from collection-wide aggregates
+STATS_TAG = 'stats'
+
+
+def asset_tag(asset_key: str) -> str:
+    """Tag of entries that contain an asset (invalidated when the asset changes)"""
+    return f"asset:{asset_key}"
+
+
+def scope_tag(category: Optional[str] = None) -> str:
+    """
+    Tag of list entries whose membership depends on a category (``scope:*`` for unfiltered lists)
+
+    Creating or deleting an asset, or changing its filtered fields, can add
+    it to or drop it from these lists even when the cached page did not hold it.
+    """
+    return f"scope:{category}" if category else "scope:*"
+
+
+def normalize_params(params: Dict) -> str:
+    """Canonical form of a parameter set: None/empty dropped, lists de-duplicated and sorted"""
+    normalized = {}
+    for name, value in params.items():
+        if value is None or value == "" or value == []:
+            continue
+        if isinstance(value, (list, tuple, set)):
+            value = sorted({str(item) for item in value})
+        normalized[name] = value
+    return json.dumps(normalized, sort_keys=True, separators=(',', ':'), default=str)
+
+
+def encode_json(content: Any) -> bytes:
+    """Serialise a response body (compact UTF-8 JSON, like starlette's JSONResponse; orjson when installed)"""
+    return dumps_json(content)
+
+
+class LocalQueryStore:
+    """
+    In-process LRU used when Redis is not reachable
+
+    Only sees invalidations made in this process; writers elsewhere (other
+    workers, the library watcher) are picked up when the TTL lapses.
+    """
+
+    remote = False
+
+    def __init__(self, max_entries: int, ttl: float):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, Tuple[bytes, float, Tuple[str, ...]]]" = OrderedDict()
+        self._tags: Dict[str, set] = {}
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    def lookup(self, key: str) -> Tuple[Optional[bytes], int]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[1] <= time.monotonic():
+                self._drop(key)
+                entry = None
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return (entry[0] if entry else None), self._generation
+
+    def store(self, key: str, value: bytes, tags: List[str], generation: int) -> bool:
+        with self._lock:
+            if generation != self._generation:
+                return False
+            self._drop(key)
+            self._entries[key] = (value, time.monotonic() + self.ttl, tuple(tags))
+            for tag in tags:
+                self._tags.setdefault(tag, set()).add(key)
+            while len(self._entries) > self.max_entries:
+                self._drop(next(iter(self._entries)))
+            return True
+
+    def invalidate(self, tags: List[str]) -> int:
+        with self._lock:
+            self._generation += 1
+            keys = set()
+            for tag in tags:
+                keys.update(self._tags.pop(tag, ()))
+            for key in keys:
+                self._drop(key)
+            return len(keys)
+
+    def invalidate_all(self) -> int:
+        with self._lock:
+            self._generation += 1
+            dropped = len(self._entries)
+            self._entries.clear()
+            self._tags.clear()
+            return dropped
+
+    def _drop(self, key: str):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            for tag in entry[2]:
+                members = self._tags.get(tag)
+                if members is not None:
+                    members.discard(key)
+                    if not members:
+                        del self._tags[tag]
+
+    def get_stats(self) -> dict:
+        with self._lock:
+            return {"entries": len(self._entries), "tags": len(self._tags), "max_entries": self.max_entries}
+
+
+# KEYS: generation, epoch  ARGV: key prefix, entry key (the entry key embeds the epoch, so it is built here)
+_LOOKUP_SCRIPT = """
+local epoch = redis.call('GET', KEYS[2]) or '0'
+local value = redis.call('GET', ARGV[1] .. epoch .. ':e:' .. ARGV[2]) or false
+return {value, redis.call('GET', KEYS[1]) or '0', epoch}
+"""
+
+# KEYS: generation, entry, tag sets...  ARGV: generation read before computing, value, ttl
+_STORE_SCRIPT = """
+if (redis.call('GET', KEYS[1]) or '0') ~= ARGV[1] then return 0 end
+redis.call('SET', KEYS[2], ARGV[2], 'EX', ARGV[3])
+for i = 3, #KEYS do
+  redis.call('SADD', KEYS[i], KEYS[2])
+  redis.call('EXPIRE', KEYS[i], ARGV[3])
+end
+return 1
+"""
+
+# KEYS: generation, epoch  ARGV: key prefix, tags...
+_INVALIDATE_SCRIPT = """
+local prefix = ARGV[1] .. (redis.call('GET', KEYS[2]) or '0') .. ':t:'
+local dropped = 0
+for i = 2, #ARGV do
+  local members = redis.call('SMEMBERS', prefix .. ARGV[i])
+  for j = 1, #members, 1000 do
+    redis.call('UNLINK', unpack(members, j, math.min(j + 999, #members)))
+  end
+  dropped = dropped + #members
+  redis.call('UNLINK', prefix .. ARGV[i])
+end
+redis.call('INCR', KEYS[1])
+return dropped
+"""
+
+
+class RedisQueryStore:
+    """
+    Entries as plain keys with a TTL; each tag is a Redis set of entry keys
+
+    Values are response bodies framed by the cache codec (large ones
+    compressed). Keys live under an epoch (``<prefix>:<epoch>:e:<entry>``, ``...:t:<tag>``).
+    Tag invalidation deletes the members of the given tag sets; dropping
+    everything only increments the epoch (O(1), the old keys expire with
+    their TTL). Both bump a generation counter, and an entry is only stored
+    if the generation is unchanged since the lookup that missed, so a
+    result computed before a concurrent write is never cached after it.
+    """
+
+    remote = True
+
+    def __init__(self, client, prefix: str, ttl: float):
+        self.client = client
+        self.prefix = prefix
+        self.ttl = max(1, int(ttl))
+        self.generation_key = f"{prefix}:gen"
+        self.epoch_key = f"{prefix}:epoch"
+        self._lookup = client.register_script(_LOOKUP_SCRIPT)
+        self._store = client.register_script(_STORE_SCRIPT)
+        self._invalidate = client.register_script(_INVALIDATE_SCRIPT)
+
+    def lookup(self, key: str) -> Tuple[Optional[bytes], Tuple[bytes, bytes]]:
+        value, generation, epoch = self._lookup(keys=[self.generation_key, self.epoch_key],
+                                                args=[f"{self.prefix}:", key])
+        if value is not None:
+            try:
+                value = cache_codec.decode(value)
+            except CacheCodecError as e:
+                logger.debug(f"Undecodable query cache entry {key}: {e}")
+                value = None
+        return value, (generation, epoch)
+
+    def store(self, key: str, value: bytes, tags: List[str], generation: Tuple[bytes, bytes]) -> bool:
+        generation, epoch = generation
+        base = f"{self.prefix}:{epoch.decode()}"
+        keys = [self.generation_key, f"{base}:e:{key}"] + [f"{base}:t:{tag}" for tag in tags]
+        return bool(self._store(keys=keys, args=[generation, cache_codec.encode_bytes(value), self.ttl]))
+
+    def invalidate(self, tags: List[str]) -> int:
+        return int(self._invalidate(keys=[self.generation_key, self.epoch_key], args=[f"{self.prefix}:", *tags]))
+
+    def invalidate_all(self) -> int:
+        pipeline = self.client.pipeline(transaction=True)
+        pipeline.incr(self.epoch_key)
+        pipeline.incr(self.generation_key)
+        pipeline.execute()
+        return 0
+
+    def get_stats(self) -> dict:
+        return {"host": self.client.connection_pool.connection_kwargs.get('host'), "codec": cache_codec.get_stats()}
+
+
+class QueryCache:
+    """
+    Cache of list/search/stats response bodies keyed by normalized query parameters
+
+    Entries are tagged with what they depend on (the assets they contain,
+    the category scope of the list, collection statistics) and write paths
+    invalidate exactly those tags. The TTL is only a backstop for writes
+    that bypass the API. Uses Redis when reachable at startup, otherwise an
+    in-process LRU.
+    """
+
+    def __init__(self, enabled: bool = True, ttl: float = 300, local_max_entries: int = 256,
+                 prefix: str = 'atlas:qc'):
+        self.enabled = enabled
+        self.ttl = ttl
+        self.local_max_entries = local_max_entries
+        self.prefix = prefix
+        self.store = None
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+        # Set when an invalidation could not reach Redis; everything is dropped once it is back
+        self._flush_pending = False
+
+    def startup(self):
+        """Pick the backing store (connects to Redis; blocking)"""
+        if not self.enabled:
+            logger.info("⚠️ Query cache disabled")
+            return
+        redis_config = atlas_config.get('api.redis', {}) or {}
+        host = os.getenv('REDIS_HOST', redis_config.get('host', 'localhost'))
+        port = int(os.getenv('REDIS_PORT', redis_config.get('port', 6379)))
+        try:
+            import redis
+            client = redis.Redis(host=host, port=port, socket_connect_timeout=2, socket_timeout=2)
+            client.ping()
+            self.store = RedisQueryStore(client, self.prefix, self.ttl)
+            logger.info(f"✅ Query cache using Redis at {host}:{port}")
+        except Exception as e:
+            self.store = LocalQueryStore(self.local_max_entries, self.ttl)
+            logger.warning(f"⚠️ Redis not available ({e}) - query cache is in-process only")
+
+    @staticmethod
+    def entry_key(namespace: str, params: Dict) -> str:
+        digest = hashlib.sha1(normalize_params(params).encode('utf-8')).hexdigest()
+        return f"{namespace}:{digest}"
+
+    async def _call(self, func: Callable, *args):
+        if self.store.remote:
+            from backend.core.executors import run_db
+            return await run_db(func, *args)
+        return func(*args)
+
+    async def cached_json(self, namespace: str, params: Dict,
+                          compute: Callable[[], Awaitable[Tuple[Any, Iterable[str]]]]) -> Tuple[bytes, bool]:
+        """
+        Encoded JSON body for (namespace, params) and whether it was a cache hit
+
+        ``compute`` returns ``(content, tags)``. Cache failures never fail the
+        request - the body is computed directly.
+        """
+        if self.store is None:
+            content, _ = await compute()
+            return encode_json(content), False
+
+        key = self.entry_key(namespace, params)
+        cached, generation = None, None
+        try:
+            if self._flush_pending:
+                await self._call(self.store.invalidate_all)
+                self._flush_pending = False
+            cached, generation = await self._call(self.store.lookup, key)
+        except Exception as e:
+            self._failed("lookup", e)
+
+        if cached is not None:
+            self.hits += 1
+            record_count('cache_hit')
+            return cached, True
+
+        self.misses += 1
+        content, tags = await compute()
+        body = encode_json(content)
+        if generation is not None:
+            try:
+                await self._call(self.store.store, key, body, sorted(set(tags)), generation)
+            except Exception as e:
+                self._failed("store", e)
+        return body, False
+
+    def invalidate(self, tags: Iterable[str]) -> int:
+        """Drop every entry carrying one of ``tags`` (blocking; use ainvalidate from async code)"""
+        tags = sorted(set(tags))
+        if self.store is None or not tags:
+            return 0
+        try:
+            return self.store.invalidate(tags)
+        except Exception as e:
+            self._failed("invalidate", e)
+            self._flush_pending = True
+            return 0
+
+    def invalidate_assets(self, asset_keys: Iterable[str] = (), categories: Iterable[Optional[str]] = (),
+                          membership: bool = True) -> int:
+        """
+        Drop entries affected by changes to assets
+
+        ``membership`` (creates, deletes, edits of filtered fields) also drops
+        the unfiltered lists, the lists of ``categories`` (old and new) and
+        statistics; without it only entries that contain the assets are dropped.
+        """
+        tags = [asset_tag(key) for key in asset_keys if key]
+        if membership:
+            tags += [scope_tag(), STATS_TAG] + [scope_tag(category) for category in categories if category]
+        return self.invalidate(tags)
+
+    def invalidate_all(self) -> int:
+        """Drop every entry (after syncs and other writes whose affected categories are not known)"""
+        if self.store is None:
+            return 0
+        try:
+            return self.store.invalidate_all()
+        except Exception as e:
+            self._failed("invalidate", e)
+            self._flush_pending = True
+            return 0
+
+    async def ainvalidate_assets(self, asset_keys: Iterable[str] = (), categories: Iterable[Optional[str]] = (),
+                                 membership: bool = True) -> int:
+        if self.store is None:
+            return 0
+        return await self._call(self.invalidate_assets, list(asset_keys), list(categories), membership)
+
+    def _failed(self, operation: str, error: Exception):
+        self.errors += 1
+        logger.warning(f"⚠️ Query cache {operation} failed: {error}")
+
+    def get_stats(self) -> dict:
+        backend = "redis" if self.store is not None and self.store.remote else ("local" if self.store else "disabled")
+        stats = {"backend": backend, "ttl": self.ttl, "hits": self.hits, "misses": self.misses, "errors": self.errors}
+        if self.store is not None:
+            try:
+                stats.update(self.store.get_stats())
+            except Exception:
+                pass
+        return stats
+
+
+_query_cache_config = atlas_config.get('api.query_cache', {}) or {}
+
+# Global query result cache (backing store chosen by startup())
+query_cache = QueryCache(
+    enabled=bool(_query_cache_config.get('enabled', True)),
+    ttl=float(_query_cache_config.get('ttl', 300)),
+    local_max_entries=int(_query_cache_config.get('local_max_entries', 256))
+)
@@ -1,13 +1,13 @@
 # backend/core/redis_cache.py - Redis caching utility
 import redis
-import json
-import pickle
 import logging
 from typing import Any, Optional, Union
 from datetime import timedelta
 import os
 from functools import wraps
 
+from backend.core.cache_codec import cache_codec, CacheCodecError
+
 logger = logging.getLogger(__name__)
 
 class RedisCache:
@@ -59,20 +59,14 @@ class RedisCache:
         ex: Optional[Union[int, timedelta]] = None,
         serialize: bool = True
     ) -> bool:
-        """Set a value in cache"""
+        """Set a value in cache (JSON-like values; large ones are compressed by the codec)"""
         if not self.is_connected():
             logger.warning("Redis not connected, skipping cache set")
             return False
         
         try:
             # Serialize value
-            if serialize:
-                if isinstance(value, (dict, list)):
-                    cache_value = json.dumps(value)
-                else:
-                    cache_value = pickle.dumps(value)
-            else:
-                cache_value = value
+            cache_value = cache_codec.encode(value) if serialize else value
             
             # Set with expiration
             result = self.client.set(key, cache_value, ex=ex)
@@ -91,18 +85,14 @@ class RedisCache:
             if value is None:
                 return None
             
-            # Deserialize value
+            # Deserialize value - the header names the format, so there is exactly one decode
             if deserialize:
                 try:
-                    # Try JSON first
-                    return json.loads(value)
-                except (json.JSONDecodeError, TypeError):
-                    try:
-                        # Fall back to pickle
-                        return pickle.loads(value)
-                    except:
-                        # Return as string if all else fails
-                        return value.decode('utf-8') if isinstance(value, bytes) else value
+                    return cache_codec.decode(value)
+                except CacheCodecError as e:
+                    # Written before the codec or by another client: treat as a miss
+                    logger.debug(f"Undecodable cache key '{key}': {e}")
+                    return None
             else:
                 return value.decode('utf-8') if isinstance(value, bytes) else value
                 
@@ -154,20 +144,63 @@ class RedisCache:
             logger.error(f"Error getting TTL for key '{key}': {e}")
             return -2
     
-    def clear_pattern(self, pattern: str) -> int:
-        """Clear all keys matching a pattern"""
+    def clear_pattern(self, pattern: str, batch_size: int = 500) -> int:
+        """
+        Clear all keys matching a pattern
+        
+        Walks the keyspace with incremental SCAN and unlinks each batch in one
+        pipeline, so Redis is never blocked for long; keys written during the
+        walk may survive. For invalidation on hot paths use versioned
+        namespaces (namespace_key / bump_namespace) instead.
+        """
         if not self.is_connected():
             return 0
         
         try:
-            keys = self.client.keys(pattern)
-            if keys:
-                return self.client.delete(*keys)
-            return 0
+            removed = 0
+            batch = []
+            pipeline = self.client.pipeline(transaction=False)
+            for key in self.client.scan_iter(match=pattern, count=batch_size):
+                batch.append(key)
+                if len(batch) >= batch_size:
+                    pipeline.unlink(*batch)
+                    removed += sum(pipeline.execute())
+                    batch = []
+            if batch:
+                pipeline.unlink(*batch)
+                removed += sum(pipeline.execute())
+            return removed
         except Exception as e:
             logger.error(f"Error clearing pattern '{pattern}': {e}")
             return 0
     
+    def namespace_key(self, namespace: str, key: str) -> str:
+        """
+        Key inside a versioned namespace: ``<namespace>:v<version>:<key>``
+        
+        The version lives in ``<namespace>:v``; bump_namespace makes every
+        key of the previous version unreachable at once and the orphans
+        expire with their TTL, so set namespaced keys with an expiry.
+        """
+        version = None
+        if self.is_connected():
+            try:
+                version = self.client.get(f"{namespace}:v")
+            except Exception as e:
+                logger.error(f"Error reading version of namespace '{namespace}': {e}")
+        return f"{namespace}:v{int(version or 0)}:{key}"
+    
+    def bump_namespace(self, namespace: str) -> int:
+        """Invalidate every key of a versioned namespace (one INCR, O(1))"""
+        if not self.is_connected():
+            return 0
+        
+        try:
+            return self.client.incr(f"{namespace}:v")
+        except Exception as e:
+            logger.error(f"Error bumping namespace '{namespace}': {e}")
+            return 0
+    
     def get_info(self) -> dict:
         """Get Redis server info"""
         if not self.is_connected():
@@ -219,7 +252,9 @@ def cached(key_prefix: str, expire_time: Union[int, timedelta] = 3600):
 
 # Cache utilities for specific use cases
 class AssetCache:
-    """Specialized cache for assets"""
+    """Specialized cache for assets (search results live in the versioned ``assets:search`` namespace)"""
+    
+    SEARCH_NAMESPACE = "assets:search"
     
     @staticmethod
     def get_asset(asset_id: str) -> Optional[dict]:
@@ -236,20 +271,22 @@ class AssetCache:
         """Remove asset from cache"""
         cache.delete(f"asset:{asset_id}")
         # Also clear related searches
-        cache.clear_pattern(f"assets:search:*")
+        cache.bump_namespace(AssetCache.SEARCH_NAMESPACE)
     
     @staticmethod
     def get_asset_list(search_key: str) -> Optional[list]:
         """Get cached asset search results"""
-        return cache.get(f"assets:search:{search_key}")
+        return cache.get(cache.namespace_key(AssetCache.SEARCH_NAMESPACE, search_key))
     
     @staticmethod
     def set_asset_list(search_key: str, assets: list, expire_time: int = 600):
         """Cache asset search results"""
-        return cache.set(f"assets:search:{search_key}", assets, ex=expire_time)
+        return cache.set(cache.namespace_key(AssetCache.SEARCH_NAMESPACE, search_key), assets, ex=expire_time)
 
 class UserCache:
-    """Specialized cache for users"""
+    """Specialized cache for users (user listings live in the versioned ``users`` namespace)"""
+    
+    LIST_NAMESPACE = "users"
     
     @staticmethod
     def get_user(user_id: str) -> Optional[dict]:
@@ -265,4 +302,4 @@ class UserCache:
     def invalidate_user(user_id: str):
         """Remove user from cache"""
         cache.delete(f"user:{user_id}")
-        cache.clear_pattern(f"users:*")
\ No newline at end of file
+        cache.bump_namespace(UserCache.LIST_NAMESPACE)
\ No newline at end of file
@@ -0,0 +1,54 @@
+# backend/core/request_encoding.py - Transparent decompression of gzip request bodies
+import zlib
+import logging
+
+from fastapi import HTTPException
+
+logger = logging.getLogger(__name__)
+
+
+class GzipRequestMiddleware:
+    """
+    ASGI middleware accepting ``Content-Encoding: gzip`` request bodies
+
+    Bodies are inflated chunk by chunk as the endpoint reads them, so large
+    (streamed) uploads are never buffered whole. The decompressed size is
+    capped at ``max_size`` bytes to refuse decompression bombs (413).
+    """
+
+    def __init__(self, app, max_size: int = 512 * 1024 * 1024):
+        self.app = app
+        self.max_size = max_size
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        headers = dict(scope.get("headers") or [])
+        if headers.get(b"content-encoding", b"").strip().lower() != b"gzip":
+            return await self.app(scope, receive, send)
+
+        # Downstream sees a plain body of unknown length
+        scope = dict(scope)
+        scope["headers"] = [(name, value) for name, value in scope["headers"]
+                            if name not in (b"content-encoding", b"content-length")]
+        decompressor = zlib.decompressobj(wbits=31)
+        inflated = 0
+
+        async def inflating_receive():
+            nonlocal inflated
+            message = await receive()
+            if message["type"] != "http.request":
+                return message
+            try:
+                body = decompressor.decompress(message.get("body", b""), self.max_size - inflated + 1)
+                if not message.get("more_body", False):
+                    body += decompressor.flush()
+            except zlib.error as e:
+                raise HTTPException(status_code=400, detail=f"Invalid gzip request body: {e}")
+            inflated += len(body)
+            if inflated > self.max_size or decompressor.unconsumed_tail:
+                raise HTTPException(status_code=413, detail="Decompressed request body too large")
+            return {**message, "body": body}
+
+        await self.app(scope, inflating_receive, send)
@@ -0,0 +1,243 @@
+# backend/core/sprite_sheets.py - Packed sprite sheets for thumbnail sequences
+import os
+import json
+import math
+import asyncio
+import hashlib
+import logging
+import tempfile
+from contextlib import asynccontextmanager
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from backend.core.asset_paths import extract_frame_number
+from backend.core.image_pipeline import read_image_header
+
+logger = logging.getLogger(__name__)
+
+# Sibling of the asset's Thumbnail folder holding generated sheets + manifests
+SPRITE_FOLDER_NAME = "ThumbnailSprite"
+
+# Used when the library folder is read-only for the backend
+FALLBACK_SPRITE_ROOT = Path(tempfile.gettempdir()) / "atlas_sprites"
+
+# max_dimension: largest sheet side the encoder accepts (WebP stops at 16383 px)
+SPRITE_FORMATS = {
+    'webp': {'pil_format': 'WEBP', 'media_type': 'image/webp', 'mode': 'RGBA', 'max_dimension': 16383,
+             'save': {'quality': 82, 'method': 4}},
+    'jpeg': {'pil_format': 'JPEG', 'media_type': 'image/jpeg', 'mode': 'RGB', 'max_dimension': 65500,
+             'save': {'quality': 85, 'optimize': True}}
+}
+
+# Serialises generation per sheet so concurrent hovers build it once: key -> [lock, holders + waiters]
+_build_locks: Dict[str, list] = {}
+
+
+@asynccontextmanager
+async def _build_lock(key: str):
+    """Hold the sheet's build lock; the entry is dropped once nobody holds or waits for it"""
+    entry = _build_locks.get(key)
+    if entry is None:
+        entry = _build_locks[key] = [asyncio.Lock(), 0]
+    entry[1] += 1
+    try:
+        async with entry[0]:
+            yield
+    finally:
+        entry[1] -= 1
+        if entry[1] == 0:
+            del _build_locks[key]
+
+
+def sprite_source_key(frames: List[Path], tile_size: int, image_format: str) -> str:
+    """Hash of the frame files (name, size, mtime) and sheet parameters"""
+    digest = hashlib.sha1(f"{tile_size}:{image_format}".encode('utf-8'))
+    for frame in frames:
+        stat = frame.stat()
+        digest.update(f"|{frame.name}:{stat.st_size}:{stat.st_mtime_ns}".encode('utf-8'))
+    return digest.hexdigest()[:16]
+
+
+def sprite_cache_folder(asset_id: str, thumbnail_folder: Path) -> Path:
+    """Folder next to Thumbnail when writable, otherwise a per-asset temp folder"""
+    sprite_folder = thumbnail_folder.parent / SPRITE_FOLDER_NAME
+    try:
+        sprite_folder.mkdir(exist_ok=True)
+        if os.access(sprite_folder, os.W_OK):
+            return sprite_folder
+    except OSError:
+        pass
+    fallback = FALLBACK_SPRITE_ROOT / asset_id
+    fallback.mkdir(parents=True, exist_ok=True)
+    return fallback
+
+
+def sprite_layout(frame_count: int, tile_width: int, tile_height: int, max_dimension: int) -> Tuple[int, int, int, int]:
+    """
+    ``(columns, rows, tile_width, tile_height)`` of a near-square grid
+
+    Tiles are shrunk (keeping their aspect) when the sheet would be wider or
+    taller than ``max_dimension``, so long sequences still encode.
+    """
+    columns = max(1, math.ceil(math.sqrt(frame_count)))
+    rows = max(1, math.ceil(frame_count / columns))
+    scale = min(1.0, max_dimension / (columns * tile_width), max_dimension / (rows * tile_height))
+    if scale < 1:
+        tile_width = max(1, math.floor(tile_width * scale))
+        tile_height = max(1, math.floor(tile_height * scale))
+    return columns, rows, tile_width, tile_height
+
+
+def _paths(asset_id: str, thumbnail_folder: Path, tile_size: int, image_format: str) -> Tuple[Path, str]:
+    base_name = f"sprite_{tile_size}_{image_format}"
+    sprite_file = f"{base_name}.{'jpg' if image_format == 'jpeg' else image_format}"
+    return sprite_cache_folder(asset_id, thumbnail_folder) / f"{base_name}.json", sprite_file
+
+
+def _load_manifest(manifest_path: Path, source_key: str) -> Optional[dict]:
+    try:
+        with open(manifest_path, 'r') as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if manifest.get('source_key') != source_key:
+        return None
+    if not (manifest_path.parent / manifest.get('sprite_file', '')).exists():
+        return None
+    return manifest
+
+
+def _with_sprite_path(manifest: dict, manifest_path: Path) -> dict:
+    manifest = dict(manifest)
+    manifest["sprite_path"] = str(manifest_path.parent / manifest["sprite_file"])
+    return manifest
+
+
+def cached_sprite_sheet(asset_id: str, frames: List[Path], thumbnail_folder: Path,
+                        tile_size: int = 256, image_format: str = 'webp') -> Optional[dict]:
+    """
+    Manifest of the sheet on disk when it still matches the frames, else None
+
+    Only stats the frames and reads the manifest. The returned manifest
+    includes ``sprite_path`` (absolute path of the sheet image).
+    """
+    if image_format not in SPRITE_FORMATS:
+        raise ValueError(f"Unsupported sprite format: {image_format}")
+    manifest_path, _ = _paths(asset_id, thumbnail_folder, tile_size, image_format)
+    manifest = _load_manifest(manifest_path, sprite_source_key(frames, tile_size, image_format))
+    return _with_sprite_path(manifest, manifest_path) if manifest else None
+
+
+def plan_sprite_sheet(asset_id: str, frames: List[Path], thumbnail_folder: Path,
+                      tile_size: int = 256, image_format: str = 'webp') -> dict:
+    """Layout, output paths and estimated peak memory of building a sheet (header reads only)"""
+    spec = SPRITE_FORMATS[image_format]
+    manifest_path, sprite_file = _paths(asset_id, thumbnail_folder, tile_size, image_format)
+
+    # Tile aspect follows the first readable frame
+    frame_width, frame_height = tile_size, tile_size
+    for frame in frames:
+        info = read_image_header(frame)
+        if info:
+            frame_width, frame_height = info['width'], info['height']
+            break
+    tile_height = max(1, round(tile_size * frame_height / frame_width))
+    columns, rows, tile_width, tile_height = sprite_layout(len(frames), tile_size, tile_height,
+                                                           spec['max_dimension'])
+    return {
+        "asset_id": asset_id,
+        "image_format": image_format,
+        "source_key": sprite_source_key(frames, tile_size, image_format),
+        "manifest_path": str(manifest_path),
+        "sprite_file": sprite_file,
+        "columns": columns,
+        "rows": rows,
+        "tile_width": tile_width,
+        "tile_height": tile_height,
+        # The sheet, plus one decoded frame and its converted copy
+        "memory_bytes": columns * tile_width * rows * tile_height * 4 + frame_width * frame_height * 4 * 2
+    }
+
+
+def render_sprite_sheet(plan: dict, frames: List[Path]) -> dict:
+    """Decode, resize and pack the frames, then write the sheet and its manifest (runs in the process pool)"""
+    from PIL import Image
+
+    spec = SPRITE_FORMATS[plan['image_format']]
+    columns, rows = plan['columns'], plan['rows']
+    tile_width, tile_height = plan['tile_width'], plan['tile_height']
+    manifest_path = Path(plan['manifest_path'])
+    sprite_path = manifest_path.parent / plan['sprite_file']
+
+    background = (0, 0, 0, 0) if spec['mode'] == 'RGBA' else (0, 0, 0)
+    sheet = Image.new(spec['mode'], (columns * tile_width, rows * tile_height), background)
+
+    frame_entries = []
+    for index, frame in enumerate(frames):
+        x = (index % columns) * tile_width
+        y = (index // columns) * tile_height
+        try:
+            with Image.open(frame) as image:
+                image = image.convert(spec['mode'])
+                image.thumbnail((tile_width, tile_height), Image.LANCZOS)
+                sheet.paste(image, (x + (tile_width - image.width) // 2, y + (tile_height - image.height) // 2))
+        except Exception as e:
+            # EXR and other formats Pillow cannot decode become empty tiles
+            logger.warning(f"⚠️ Could not add frame {frame.name} to sprite sheet: {e}")
+        frame_entries.append({
+            "index": index,
+            "frame_number": extract_frame_number(frame.name),
+            "filename": frame.name,
+            "x": x,
+            "y": y
+        })
+
+    # Write atomically so readers never see a partial sheet; the pid keeps
+    # builds in other API processes from sharing a temp file
+    temp_path = sprite_path.with_name(f".{sprite_path.name}.{os.getpid()}.tmp")
+    sheet.save(temp_path, spec['pil_format'], **spec['save'])
+    os.replace(temp_path, sprite_path)
+
+    manifest = {
+        "frame_count": len(frames),
+        "columns": columns,
+        "rows": rows,
+        "tile_width": tile_width,
+        "tile_height": tile_height,
+        "sheet_width": sheet.width,
+        "sheet_height": sheet.height,
+        "format": plan['image_format'],
+        "media_type": spec['media_type'],
+        "frames": frame_entries,
+        "asset_id": plan['asset_id'],
+        "source_key": plan['source_key'],
+        "sprite_file": plan['sprite_file']
+    }
+    temp_manifest = manifest_path.with_name(f".{manifest_path.name}.{os.getpid()}.tmp")
+    with open(temp_manifest, 'w') as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(temp_manifest, manifest_path)
+    return _with_sprite_path(manifest, manifest_path)
+
+
+async def get_sprite_sheet(asset_id: str, frames: List[Path], thumbnail_folder: Path,
+                           tile_size: int = 256, image_format: str = 'webp') -> dict:
+    """
+    Manifest for the packed sprite sheet of a thumbnail sequence, building it if needed
+
+    The sheet and its manifest are cached on disk and rebuilt only when a frame
+    is added, removed or modified. Frames are decoded and resized in the
+    process pool, within the shared memory budget. The returned manifest
+    includes ``sprite_path`` (absolute path of the sheet image).
+    """
+    from backend.core.executors import run_fs, run_cpu
+    from backend.core.image_pipeline import memory_budget
+
+    async with _build_lock(f"{asset_id}:{tile_size}:{image_format}"):
+        manifest = await run_fs(cached_sprite_sheet, asset_id, frames, thumbnail_folder, tile_size, image_format)
+        if manifest is not None:
+            return manifest
+        plan = await run_fs(plan_sprite_sheet, asset_id, frames, thumbnail_folder, tile_size, image_format)
+        logger.info(f"🎞️ Building {plan['tile_width']}px sprite sheet for {asset_id} ({len(frames)} frames)")
+        async with memory_budget.reserve(plan['memory_bytes']):
+            return await run_cpu(render_sprite_sheet, plan, frames)
@@ -0,0 +1,219 @@
+# backend/core/structured_logging.py - Structured logging: per-module levels, sampling and request summary lines
+import json
+import time
+import logging
+import itertools
+import contextvars
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Dict, Optional
+
+from backend.core.config_manager import config as atlas_config
+
+logger = logging.getLogger(__name__)
+
+# Standard LogRecord attributes - everything else passed through ``extra`` is a structured field
+_RECORD_ATTRIBUTES = set(vars(logging.LogRecord('', 0, '', 0, '', (), None))) | {'message', 'asctime'}
+
+
+def record_fields(record: logging.LogRecord) -> Dict:
+    return {name: value for name, value in vars(record).items() if name not in _RECORD_ATTRIBUTES}
+
+
+class JSONFormatter(logging.Formatter):
+    """One JSON object per line: time, level, logger, message and any ``extra`` fields"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec='milliseconds'),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            **record_fields(record)
+        }
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+class KeyValueFormatter(logging.Formatter):
+    """Plain text with ``extra`` fields appended as key=value pairs"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        line = super().format(record)
+        fields = record_fields(record)
+        if fields:
+            line += " " + " ".join(f"{name}={value}" for name, value in fields.items())
+        return line
+
+
+def configure_logging(logging_config: Optional[Dict] = None):
+    """
+    Install the root handler from ``api.logging``
+
+    ``level`` is the default level, ``modules`` overrides it per logger name
+    (e.g. ``{"backend.api.assets": "WARNING"}``) and ``format`` is ``text``
+    or ``json``.
+    """
+    if logging_config is None:
+        logging_config = atlas_config.get('api.logging', {}) or {}
+    handler = logging.StreamHandler()
+    if logging_config.get('format', 'text') == 'json':
+        handler.setFormatter(JSONFormatter())
+    else:
+        handler.setFormatter(KeyValueFormatter('%(asctime)s %(levelname)s %(name)s: %(message)s'))
+
+    root = logging.getLogger()
+    for existing in list(root.handlers):
+        root.removeHandler(existing)
+    root.addHandler(handler)
+    root.setLevel(str(logging_config.get('level', 'INFO')).upper())
+    for name, level in (logging_config.get('modules') or {}).items():
+        logging.getLogger(name).setLevel(str(level).upper())
+
+
+class SampledLogger:
+    """
+    Logs the first and then every ``every``-th call, for hot paths
+
+    Arguments are formatted lazily (``%``-style), and nothing is formatted
+    when the level is disabled or the call is sampled out. Sampled records
+    carry ``sampled=every``.
+    """
+
+    def __init__(self, target: logging.Logger, every: int):
+        self.logger = target
+        self.every = max(1, int(every))
+        self._calls = itertools.count()
+
+    def log(self, level: int, msg: str, *args, **kwargs):
+        if not self.logger.isEnabledFor(level):
+            return
+        if next(self._calls) % self.every:
+            return
+        if self.every > 1:
+            kwargs['extra'] = {**(kwargs.get('extra') or {}), 'sampled': self.every}
+        self.logger.log(level, msg, *args, stacklevel=3, **kwargs)
+
+    def debug(self, msg: str, *args, **kwargs):
+        self.log(logging.DEBUG, msg, *args, **kwargs)
+
+    def info(self, msg: str, *args, **kwargs):
+        self.log(logging.INFO, msg, *args, **kwargs)
+
+    def warning(self, msg: str, *args, **kwargs):
+        self.log(logging.WARNING, msg, *args, **kwargs)
+
+
+def sampled_logger(name: str, every: int = 100) -> SampledLogger:
+    """Sampled logger for ``name``; ``api.logging.sampling`` overrides the rate per logger name"""
+    sampling = atlas_config.get('api.logging.sampling', {}) or {}
+    return SampledLogger(logging.getLogger(name), sampling.get(name, every))
+
+
+# ---- request-scoped metrics -------------------------------------------------------
+
+class RequestMetrics:
+    """Timings (ms) and counters accumulated while one request is handled"""
+
+    def __init__(self):
+        self.timings: Dict[str, float] = {}
+        self.counts: Dict[str, int] = {}
+
+    def add_time(self, name: str, seconds: float):
+        self.timings[name] = self.timings.get(name, 0.0) + seconds * 1000
+
+    def add_count(self, name: str, value: int = 1):
+        self.counts[name] = self.counts.get(name, 0) + value
+
+
+_request_metrics: contextvars.ContextVar[Optional[RequestMetrics]] = contextvars.ContextVar(
+    'atlas_request_metrics', default=None)
+
+
+def record_time(name: str, seconds: float):
+    """Add to the current request's ``<name>_ms`` (no-op outside a request)"""
+    metrics = _request_metrics.get()
+    if metrics is not None:
+        metrics.add_time(name, seconds)
+
+
+def record_count(name: str, value: int = 1):
+    """Add to a counter of the current request (no-op outside a request)"""
+    metrics = _request_metrics.get()
+    if metrics is not None:
+        metrics.add_count(name, value)
+
+
+@contextmanager
+def timed(name: str):
+    """Time a block into the current request's ``<name>_ms``"""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        record_time(name, time.perf_counter() - started)
+
+
+class RequestSummaryMiddleware:
+    """
+    ASGI middleware writing one summary line per request
+
+    The line carries method, path, status, total ms and whatever the handler
+    recorded (``db_ms``/``fs_ms``/``cpu_ms`` from the executors,
+    ``serialize_ms``, ``count`` ...). Fast successful requests are sampled
+    (1 in ``sample_every``); slow ones and server errors are always logged.
+    """
+
+    def __init__(self, app, sample_every: int = 1, slow_ms: float = 1000.0, exclude=("/health",)):
+        self.app = app
+        self.sample_every = max(1, int(sample_every))
+        self.slow_ms = slow_ms
+        self.exclude = tuple(exclude)
+        self._requests = itertools.count()
+        self.logger = logging.getLogger('atlas.requests')
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope.get("path", "").startswith(self.exclude):
+            return await self.app(scope, receive, send)
+
+        metrics = RequestMetrics()
+        token = _request_metrics.set(metrics)
+        status = 500
+        started = time.perf_counter()
+
+        async def capture_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, capture_status)
+        finally:
+            _request_metrics.reset(token)
+            total_ms = (time.perf_counter() - started) * 1000
+            sampled_in = next(self._requests) % self.sample_every == 0
+            if sampled_in or status >= 500 or total_ms >= self.slow_ms:
+                level = logging.ERROR if status >= 500 else (
+                    logging.WARNING if total_ms >= self.slow_ms else logging.INFO)
+                fields = {
+                    "method": scope.get("method"),
+                    "path": scope.get("path"),
+                    "status": status,
+                    "total_ms": round(total_ms, 1),
+                    **{f"{name}_ms": round(value, 1) for name, value in metrics.timings.items()},
+                    **metrics.counts
+                }
+                self.logger.log(level, "%s %s %s %.1fms", fields["method"], fields["path"], status, total_ms,
+                                extra=fields)
+
+
+def request_summary_options() -> Dict:
+    """RequestSummaryMiddleware options from ``api.logging.request_summary``"""
+    summary_config = atlas_config.get('api.logging.request_summary', {}) or {}
+    return {
+        "sample_every": summary_config.get('sample_every', 1),
+        "slow_ms": float(summary_config.get('slow_ms', 1000.0)),
+        "exclude": summary_config.get('exclude', ["/health"])
+    }
@@ -0,0 +1,215 @@
+# backend/core/texture_pyramid.py - Tiled mip pyramids for deep-zooming large textures
+import os
+import json
+import shutil
+import logging
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from backend.core.asset_paths import file_version
+from backend.core.image_pipeline import CONVERSION_BUDGET_BYTES, iter_row_bands, read_image_header, to_display, _to_pil
+
+logger = logging.getLogger(__name__)
+
+# Pyramids live next to Thumbnail/ and Preview/ in the asset folder: Pyramid/<texture stem>/
+PYRAMID_FOLDER = "Pyramid"
+MANIFEST_NAME = "manifest.json"
+
+TILE_SIZE = 512
+
+# Halving stops once the whole level fits in this many pixels on its longest side
+MIN_LEVEL_SIZE = 256
+
+TILE_FORMATS = {
+    'webp': {'pil_format': 'WEBP', 'media_type': 'image/webp', 'extension': '.webp', 'save': {'quality': 85, 'method': 4}},
+    'jpeg': {'pil_format': 'JPEG', 'media_type': 'image/jpeg', 'extension': '.jpg', 'save': {'quality': 88}}
+}
+
+
+def pyramid_dir(asset_folder, source) -> Path:
+    return Path(asset_folder) / PYRAMID_FOLDER / Path(source).stem
+
+
+def level_sizes(width: int, height: int) -> List[Tuple[int, int]]:
+    """Level 0 is full resolution; each further level halves both sides"""
+    sizes = [(width, height)]
+    while max(width, height) > MIN_LEVEL_SIZE and min(width, height) >= 2:
+        width, height = width // 2, height // 2
+        sizes.append((width, height))
+    return sizes
+
+
+def tile_format() -> str:
+    from backend.core.image_derivatives import supported_formats
+    return 'webp' if 'webp' in supported_formats() else 'jpeg'
+
+
+class _LevelWriter:
+    """
+    Receives the rows of one level top to bottom, writes them out as tiles and
+    feeds 2x box-reduced rows to the next (smaller) level
+    """
+
+    def __init__(self, directory: Path, level: int, width: int, height: int, tile_size: int,
+                 image_format: str, next_level: Optional['_LevelWriter']):
+        self.directory = directory / str(level)
+        self.width = width
+        self.height = height
+        self.tile_size = tile_size
+        self.spec = TILE_FORMATS[image_format]
+        self.next_level = next_level
+        self.received = 0
+        self.tile_row = 0
+        self._pending = []
+        self._pending_rows = 0
+        self._carry = None
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    def push(self, rows):
+        rows = rows[:self.height - self.received, :self.width]
+        if not len(rows):
+            return
+        self.received += len(rows)
+        self._pending.append(rows)
+        self._pending_rows += len(rows)
+        while self._pending_rows >= self.tile_size:
+            self._write_tile_row(self._take(self.tile_size))
+        if self.next_level is not None:
+            self._reduce(rows)
+
+    def finish(self):
+        if self._pending_rows:
+            self._write_tile_row(self._take(self._pending_rows))
+        if self.next_level is not None:
+            self.next_level.finish()
+
+    def _take(self, count: int):
+        import numpy as np
+
+        rows = np.concatenate(self._pending) if len(self._pending) > 1 else self._pending[0]
+        taken, rest = rows[:count], rows[count:]
+        self._pending = [rest] if len(rest) else []
+        self._pending_rows = len(rest)
+        return taken
+
+    def _write_tile_row(self, rows):
+        has_alpha = rows.shape[2] in (2, 4) and self.spec['pil_format'] != 'JPEG'
+        for column, left in enumerate(range(0, self.width, self.tile_size)):
+            image = _to_pil(rows[:, left:left + self.tile_size])
+            image = image.convert('RGBA' if has_alpha else 'RGB')
+            image.save(self.directory / f"{column}_{self.tile_row}{self.spec['extension']}",
+                       self.spec['pil_format'], **self.spec['save'])
+        self.tile_row += 1
+
+    def _reduce(self, rows):
+        import numpy as np
+
+        if self._carry is not None:
+            rows = np.concatenate([self._carry, rows])
+            self._carry = None
+        if len(rows) % 2:
+            self._carry, rows = rows[-1:], rows[:-1]
+        if not len(rows):
+            return
+        width, channels = self.next_level.width, rows.shape[2]
+        reduced = np.empty((len(rows) // 2, width, channels), dtype=np.uint8)
+        # Row pairs in small chunks keep the float temporaries small
+        for start in range(0, len(rows), 64):
+            block = rows[start:start + 64, :width * 2].astype(np.float32)
+            block = block.reshape(len(block) // 2, 2, width, 2, channels).mean(axis=(1, 3))
+            reduced[start // 2:start // 2 + len(block)] = block + 0.5
+        self.next_level.push(reduced)
+
+
+def build_pyramid(source, target_dir, tile_size: int = TILE_SIZE,
+                  budget_bytes: int = CONVERSION_BUDGET_BYTES) -> Dict:
+    """
+    Build every level of the pyramid for ``source`` in a single streaming pass
+
+    Rows are decoded a band at a time and cascade down through the levels, so
+    memory stays near ``budget_bytes`` plus a couple of tile rows per level. The result
+    is written to a temporary folder and swapped in, then the manifest is returned.
+    """
+    source, target_dir = Path(source), Path(target_dir)
+    stat_result = source.stat()
+    info = read_image_header(source)
+    if not info:
+        raise ValueError(f"Cannot read the size of {source.name}")
+    width, height = info['width'], info['height']
+    sizes = level_sizes(width, height)
+    image_format = tile_format()
+    staging = target_dir.with_name(f".{target_dir.name}.{os.getpid()}.tmp")
+    shutil.rmtree(staging, ignore_errors=True)
+
+    try:
+        # Smallest level first so each writer can hand rows to the next
+        top = None
+        for level in reversed(range(len(sizes))):
+            level_width, level_height = sizes[level]
+            top = _LevelWriter(staging, level, level_width, level_height, tile_size, image_format, top)
+        for band in iter_row_bands(source, budget_bytes):
+            # Textures are shown as stored: clamp, no tone mapping
+            top.push(to_display(band, 'texture'))
+        top.finish()
+
+        manifest = {
+            "source": source.name,
+            "version": file_version(stat_result),
+            "width": width,
+            "height": height,
+            "tile_size": tile_size,
+            "format": image_format,
+            "media_type": TILE_FORMATS[image_format]['media_type'],
+            "levels": [
+                {
+                    "level": level,
+                    "width": level_width,
+                    "height": level_height,
+                    "columns": -(-level_width // tile_size),
+                    "rows": -(-level_height // tile_size)
+                }
+                for level, (level_width, level_height) in enumerate(sizes)
+            ]
+        }
+        with open(staging / MANIFEST_NAME, 'w') as f:
+            json.dump(manifest, f, indent=2)
+
+        if target_dir.exists():
+            shutil.rmtree(target_dir)
+        os.replace(staging, target_dir)
+    except Exception:
+        shutil.rmtree(staging, ignore_errors=True)
+        raise
+
+    logger.info(f"🗺️ Built {len(sizes)}-level pyramid for {source.name} ({width}x{height}, {image_format} tiles)")
+    return manifest
+
+
+def load_manifest(target_dir, source) -> Tuple[Optional[Dict], List[Path]]:
+    """
+    Manifest of an up-to-date pyramid for ``source``, or None when missing or stale
+
+    Returns ``(manifest, watched_paths)`` for ``AssetFileCache.get``.
+    """
+    target_dir, source = Path(target_dir), Path(source)
+    manifest_path = target_dir / MANIFEST_NAME
+    watched = [target_dir.parent, target_dir, manifest_path, source]
+    try:
+        with open(manifest_path) as f:
+            manifest = json.load(f)
+        if manifest.get('version') != file_version(source.stat()):
+            logger.info(f"🔄 Pyramid for {source.name} is out of date")
+            return None, watched
+        return manifest, watched
+    except (OSError, ValueError):
+        return None, watched
+
+
+def tile_path(target_dir, manifest: Dict, level: int, column: int, row: int) -> Optional[Path]:
+    """Path of one tile, or None when the level/tile is outside the pyramid"""
+    if not 0 <= level < len(manifest['levels']):
+        return None
+    info = manifest['levels'][level]
+    if not (0 <= column < info['columns'] and 0 <= row < info['rows']):
+        return None
+    return Path(target_dir) / str(level) / f"{column}_{row}{TILE_FORMATS[manifest['format']]['extension']}"
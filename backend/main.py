@@ -1,6 +1,6 @@
 # backend/main.py - Enhanced FastAPI application with all TODO features
 #v.0.1.0
-from fastapi import FastAPI, HTTPException, Request
+from fastapi import FastAPI, HTTPException, Request, Depends, Query
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import FileResponse
 from fastapi.exceptions import RequestValidationError
@@ -10,6 +10,7 @@ from fastapi.exceptions import RequestValidationError
 # Import only working routers for now
 from backend.api.assets import router as assets_router
 from backend.api.config import router as config_router
+from backend.api.jobs import router as jobs_router
 # Disabled problematic routers until Pydantic compatibility is fixed
 # from backend.api.asset_sync import router as sync_router
 # from backend.api.products import router as products_router
@@ -43,9 +44,24 @@ import os
 import logging
 from datetime import datetime
 from backend.core.config_manager import config as atlas_config
+from backend.core.database import db_pool, get_asset_queries
+from backend.core.asset_paths import (
+    asset_file_cache, resolve_thumbnail, find_sequence_frames, extract_frame_number, stat_version
+)
+from backend.core.sprite_sheets import cached_sprite_sheet, get_sprite_sheet, SPRITE_FORMATS
+from backend.core.image_derivatives import negotiate_format, get_derivative, cached_derivative, size_bucket
+from backend.core.image_pipeline import memory_budget, run_within_budget
+from backend.core.http_cache import conditional_file_response
+from backend.core.executors import executor, run_db, run_fs
+from backend.core.jobs import job_queue
+from backend.core.query_cache import query_cache
+from backend.core.request_encoding import GzipRequestMiddleware
+from backend.core.structured_logging import configure_logging, RequestSummaryMiddleware, request_summary_options
+from backend.assetlibrary.database.arango_queries import AssetQueries
+from typing import List, Optional
 
-# Setup logging
-logging.basicConfig(level=logging.INFO)
+# Setup logging (levels, format and sampling from api.logging)
+configure_logging()
 logger = logging.getLogger(__name__)
 
 app = FastAPI(
@@ -79,6 +95,12 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Accept gzip-compressed request bodies (the Houdini/API clients compress large payloads)
+app.add_middleware(GzipRequestMiddleware)
+
+# One summary line per request (status, total/db/serialize ms, item count)
+app.add_middleware(RequestSummaryMiddleware, **request_summary_options())
+
 # Temporarily disable custom exception handlers
 # app.add_exception_handler(HTTPException, http_exception_handler)
 # app.add_exception_handler(RequestValidationError, validation_exception_handler)
@@ -89,52 +111,30 @@ app.add_middleware(
 # app.add_exception_handler(ExternalServiceError, external_service_exception_handler)
 # app.add_exception_handler(Exception, general_exception_handler)
 
-# Initialize ArangoDB handler
-try:
-    from backend.assetlibrary.database.arango_queries import AssetQueries
-    # Get the correct environment configuration from Atlas config
-    # Check if we're in Docker by looking for ARANGO_HOST env variable
-    is_docker = os.getenv('ARANGO_HOST') is not None
-    
-    # Use config file settings, but override host if in Docker
-    db_config = atlas_config.get('api.database', {})
-    
-    # In Docker, use container name; otherwise use config
-    db_host = os.getenv('ARANGO_HOST') if is_docker else db_config.get('host', 'localhost')
-    
-    arango_config = {
-        'hosts': [f"http://{db_host}:{db_config.get('port', '8529')}"],
-        'database': db_config.get('name', 'blacksmith_atlas'),
-        'username': db_config.get('username', 'root'),
-        'password': db_config.get('password', 'atlas_password'),
-        'collections': {
-            'assets': 'Atlas_Library'
-        }
-    }
-    logger.info(f"🔧 Database configuration: host={db_host}, is_docker={is_docker}")
-    asset_queries = AssetQueries(arango_config)
-    database_available = True
-    logger.info("✅ ArangoDB connection initialized")
-except Exception as e:
-    logger.error(f"❌ ArangoDB connection failed: {e}")
-    raise Exception(f"Failed to connect to ArangoDB: {e}")
-
 @app.on_event("startup")
 async def startup_event():
     logger.info("🚀 Starting Enhanced Blacksmith Atlas API v2.0...")
     
-    # Test database connection - temporarily disabled to debug
-    logger.warning("⚠️  Database startup check temporarily disabled for debugging")
+    # Open the shared ArangoDB connection pool for this worker
+    if db_pool.startup():
+        logger.info("✅ ArangoDB connection pool initialized")
+    else:
+        logger.error("❌ ArangoDB connection failed - will retry on first request")
+    
+    # Query result cache: Redis when reachable, in-process otherwise
+    query_cache.startup()
     
-    # Redis temporarily disabled
-    logger.info("⚠️ Redis disabled temporarily for testing")
+    # Background workers for uploads / conversions
+    await job_queue.start()
     
     logger.info("🎉 All systems ready!")
 
 @app.on_event("shutdown")
 async def shutdown_event():
     logger.info("🛑 Shutting down Blacksmith Atlas API...")
-    # Add any cleanup code here if needed
+    await job_queue.stop()
+    db_pool.shutdown()
+    executor.shutdown()
 
 @app.get("/test-thumbnail")
 async def test_thumbnail():
@@ -147,81 +147,100 @@ async def test_thumbnail():
     else:
         return {"error": "File not found", "path": path, "exists": file.exists()}
 
+def get_image_media_type(image_path: Path) -> str:
+    """Media type for a served thumbnail/frame based on its extension"""
+    file_ext = image_path.suffix.lower()
+    if file_ext in ['.png']:
+        return "image/png"
+    elif file_ext in ['.jpg', '.jpeg']:
+        return "image/jpeg"
+    elif file_ext in ['.exr']:
+        return "image/exr"  # EXR files
+    elif file_ext in ['.tiff', '.tif']:
+        return "image/tiff"
+    return "application/octet-stream"  # Default fallback
+
+def get_cached_thumbnail(asset_id: str, asset: dict) -> Optional[Path]:
+    """Resolved thumbnail file for an asset, re-probed only when its folder changes"""
+    def compute():
+        entry = resolve_thumbnail(asset)
+        if not entry.get('path'):
+            return None, []
+        thumbnail_path = Path(entry['path'])
+        return thumbnail_path, [thumbnail_path.parent, thumbnail_path]
+    return asset_file_cache.get(asset_id, 'thumbnail', compute)
+
+def get_cached_sequence_frames(asset_id: str, asset: dict) -> List[Path]:
+    """Sorted thumbnail sequence frames, re-globbed only when the Thumbnail folder changes"""
+    def compute():
+        frames, thumbnail_folder = find_sequence_frames(asset)
+        return frames, [thumbnail_folder] if thumbnail_folder else []
+    return asset_file_cache.get(asset_id, 'sequence_frames', compute)
+
 @app.get("/thumbnails/{asset_id}")
-async def get_thumbnail(asset_id: str, _t: str = None):
-    logger.info(f"[THUMBNAIL] Requested for asset: {asset_id}, cache-bust param: {_t}")
+async def get_thumbnail(
+    asset_id: str,
+    request: Request,
+    _t: str = None,
+    w: Optional[int] = Query(None, ge=16, le=4096, description="Target width (rounded up to a size bucket)"),
+    image_format: Optional[str] = Query(None, alias="format", description="webp, avif, jpeg or png (default: negotiated from Accept)"),
+    asset_queries: Optional[AssetQueries] = Depends(get_asset_queries)
+):
+    logger.info(f"[THUMBNAIL] Requested for asset: {asset_id}, w={w}, format={image_format}, cache-bust param: {_t}")
     try:
-        asset = asset_queries.get_asset_with_dependencies(asset_id).get('asset')
+        if not asset_queries:
+            raise HTTPException(status_code=503, detail="Database not available")
+        asset = await run_db(asset_file_cache.get_asset, asset_id, asset_queries)
         if not asset:
             logger.error(f"[ERROR] Asset not found: {asset_id}")
             raise HTTPException(status_code=404, detail=f"Asset not found: {asset_id}")
         
-        # For texture sets, prioritize Preview folder over Thumbnail folder
-        thumbnail_paths = []
-        
-        # Try to get the folder path from the asset data
-        folder_path = asset.get('folder_path') or asset.get('paths', {}).get('folder_path')
-        if folder_path:
-            # For texture sets, check Preview folder first
-            if asset.get('category') == 'Texture Sets' or asset.get('asset_type') == 'Textures':
-                preview_folder = Path(folder_path) / "Preview"
-                if preview_folder.exists() and preview_folder.is_dir():
-                    for ext in ['.png', '.jpg', '.jpeg', '.exr', '.tiff', '.tif']:
-                        for img_file in preview_folder.glob(f"*{ext}"):
-                            thumbnail_paths.append(str(img_file))
-            
-            # Fallback to thumbnail folder
-            thumbnail_folder = Path(folder_path) / "Thumbnail"
-            if thumbnail_folder.exists() and thumbnail_folder.is_dir():
-                for ext in ['.png', '.jpg', '.jpeg', '.exr', '.tiff', '.tif']:
-                    for img_file in thumbnail_folder.glob(f"*{ext}"):
-                        thumbnail_paths.append(str(img_file))
-        
-        # Check asset metadata for thumbnail paths
-        if 'paths' in asset and asset['paths'].get('thumbnails'):
-            thumbnail_list = asset['paths']['thumbnails']
-            if isinstance(thumbnail_list, list):
-                for thumb_path in thumbnail_list:
-                    # Convert container path to network path if needed
-                    if thumb_path.startswith('/app/assets/'):
-                        network_path = thumb_path.replace('/app/assets/', '/net/library/atlaslib/')
-                        thumbnail_paths.append(network_path)
-                    else:
-                        thumbnail_paths.append(thumb_path)
-        
-        for thumbnail_path in thumbnail_paths:
-            if thumbnail_path and Path(thumbnail_path).exists():
-                logger.info(f"[OK] Serving thumbnail: {thumbnail_path}")
-                
-                # Determine media type based on file extension
-                file_ext = Path(thumbnail_path).suffix.lower()
-                media_type = "application/octet-stream"  # Default fallback
-                if file_ext in ['.png']:
-                    media_type = "image/png"
-                elif file_ext in ['.jpg', '.jpeg']:
-                    media_type = "image/jpeg"
-                elif file_ext in ['.exr']:
-                    media_type = "image/exr"  # EXR files
-                elif file_ext in ['.tiff', '.tif']:
-                    media_type = "image/tiff"
-                
-                # Simple cache control - no complex cache busting for now
-                cache_control = "public, max-age=300"  # 5 minutes cache
-                
-                return FileResponse(
-                    path=str(thumbnail_path),
-                    media_type=media_type,
-                    headers={
-                        "Cache-Control": cache_control,
-                        "Access-Control-Allow-Origin": "*",
-                        "Access-Control-Allow-Methods": "GET",
-                        "Access-Control-Allow-Headers": "*"
-                    }
-                )
-        
-        logger.error(f"[ERROR] No thumbnail found for asset: {asset_id}")
-        logger.debug(f"[DEBUG] Tried paths: {thumbnail_paths}")
-        raise HTTPException(status_code=404, detail=f"No thumbnail found for asset: {asset_id}")
+        # Texture sets prefer their Preview folder, then Thumbnail folder, then stored paths
+        thumbnail_path = await run_fs(get_cached_thumbnail, asset_id, asset)
+        # One stat off the event loop answers both "does it exist" and the source version
+        source_version = await run_fs(stat_version, thumbnail_path) if thumbnail_path is not None else None
+        if source_version is None:
+            logger.error(f"[ERROR] No thumbnail found for asset: {asset_id}")
+            raise HTTPException(status_code=404, detail=f"No thumbnail found for asset: {asset_id}")
+        
+        serve_path = thumbnail_path
+        media_type = get_image_media_type(thumbnail_path)
+        
+        # Resize / transcode into a browser-friendly derivative when asked for (or when the source is EXR/TIFF)
+        try:
+            output_format = negotiate_format(image_format, request.headers.get("accept", ""), thumbnail_path)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        if w and not output_format:
+            output_format = 'jpeg' if thumbnail_path.suffix.lower() in ['.jpg', '.jpeg'] else 'png'
+        if output_format:
+            try:
+                # Decoding/resizing runs in the process pool, within the shared memory budget
+                # (a full-size EXR/TIFF decode can take gigabytes); existing derivatives skip both
+                derivative = await run_fs(cached_derivative, thumbnail_path, w, output_format)
+                if derivative is None:
+                    derivative = await run_within_budget(thumbnail_path, get_derivative, thumbnail_path, w,
+                                                         output_format, max_dimension=size_bucket(w) if w else None)
+                serve_path, media_type = derivative
+            except Exception as e:
+                logger.warning(f"[THUMBNAIL] Derivative failed for {thumbnail_path.name}, serving original: {e}")
+        
+        logger.info(f"[OK] Serving thumbnail: {serve_path}")
+        
+        # Short max-age with validators; ?v=<source version> URLs are cached as immutable
+        return await conditional_file_response(
+            request,
+            serve_path,
+            media_type=media_type,
+            cache_control="public, max-age=300",
+            version=source_version,
+            headers={
+                "Vary": "Accept",
+                "Access-Control-Allow-Origin": "*",
+                "Access-Control-Allow-Methods": "GET",
+                "Access-Control-Allow-Headers": "*"
+            }
+        )
     except HTTPException:
         raise
     except Exception as e:
@@ -231,92 +250,23 @@ async def get_thumbnail(asset_id: str, _t: str = None):
         raise HTTPException(status_code=500, detail=f"Error serving thumbnail: {str(e)}")
 
 @app.get("/api/v1/assets/{asset_id}/thumbnail-sequence")
-async def get_thumbnail_sequence(asset_id: str):
+async def get_thumbnail_sequence(asset_id: str, asset_queries: Optional[AssetQueries] = Depends(get_asset_queries)):
     """Get list of thumbnail sequence frames for an asset"""
     logger.info(f"[THUMBNAIL-SEQUENCE] Requested for asset: {asset_id}")
     try:
-        asset = asset_queries.get_asset_with_dependencies(asset_id).get('asset')
+        if not asset_queries:
+            raise HTTPException(status_code=503, detail="Database not available")
+        asset = await run_db(asset_file_cache.get_asset, asset_id, asset_queries)
         if not asset:
             raise HTTPException(status_code=404, detail=f"Asset not found: {asset_id}")
         
-        # Build thumbnail folder path
-        asset_name = asset.get('name', '')
-        asset_path = os.getenv('ASSET_LIBRARY_PATH', '/app/assets')
-        
-        # Try multiple possible folder structures
-        thumbnail_folders = []
-        
-        # Check folder_path from metadata (most accurate path)
-        folder_path = asset.get('folder_path')
-        if folder_path:
-            # Convert network path to container path if needed
-            if folder_path.startswith('/net/library/atlaslib/'):
-                container_folder = folder_path.replace('/net/library/atlaslib/', '/app/assets/')
-                thumbnail_folders.append(Path(container_folder) / "Thumbnail")
-            else:
-                thumbnail_folders.append(Path(folder_path) / "Thumbnail")
-        
-        # Check paths.folder_path as well
-        paths_folder_path = asset.get('paths', {}).get('folder_path')
-        if paths_folder_path and paths_folder_path != folder_path:
-            if paths_folder_path.startswith('/net/library/atlaslib/'):
-                container_folder = paths_folder_path.replace('/net/library/atlaslib/', '/app/assets/')
-                thumbnail_folders.append(Path(container_folder) / "Thumbnail")
-            else:
-                thumbnail_folders.append(Path(paths_folder_path) / "Thumbnail")
-        
-        # Legacy field name
-        if asset.get('paths', {}).get('asset_folder'):
-            asset_folder = Path(asset['paths']['asset_folder'])
-            thumbnail_folders.append(asset_folder / "Thumbnail")
-        
-        # Fallback search patterns
-        thumbnail_folders.extend([
-            Path(asset_path) / "3D" / "Assets" / "BlacksmithAssets" / asset_id / "Thumbnail",
-            Path(asset_path) / "3D" / "Assets" / "Blacksmith Asset" / asset_id / "Thumbnail",
-            Path(asset_path) / "3D" / f"{asset_id}_{asset_name}" / "Thumbnail",
-            Path(asset_path) / "3D" / asset_id / "Thumbnail"
-        ])
-        
-        # Find thumbnail sequence files
-        sequence_files = []
-        for thumbnail_folder in thumbnail_folders:
-            if thumbnail_folder.exists():
-                logger.info(f"[SEQUENCE] Checking folder: {thumbnail_folder}")
-                # Look for PNG sequence files (common naming patterns)
-                for pattern in ["*.png", "*.jpg", "*.jpeg", "*.exr"]:
-                    files = sorted(list(thumbnail_folder.glob(pattern)))
-                    if files:
-                        logger.info(f"[SEQUENCE] Found {len(files)} files with pattern {pattern}")
-                        sequence_files = files
-                        break
-                if sequence_files:
-                    break
+        # Find thumbnail sequence files (folder_path, paths.folder_path, paths.asset_folder, then fallbacks)
+        sequence_files = await run_fs(get_cached_sequence_frames, asset_id, asset)
         
         if not sequence_files:
             logger.error(f"[SEQUENCE] No thumbnail sequence found for asset: {asset_id}")
             raise HTTPException(status_code=404, detail=f"No thumbnail sequence found for asset: {asset_id}")
         
-        # Extract actual frame numbers from filenames
-        def extract_frame_number(filename):
-            """Extract frame number from filename like 'asset_1001.png' or 'asset.1001.png'"""
-            import re
-            # Common patterns: asset_1001.png, asset.1001.png, 1001.png
-            patterns = [
-                r'_(\d{4})\.',  # asset_1001.png
-                r'\.(\d{4})\.',  # asset.1001.png  
-                r'^(\d{4})\.',   # 1001.png
-                r'(\d{4})$'      # 1001 (without extension)
-            ]
-            
-            for pattern in patterns:
-                match = re.search(pattern, filename)
-                if match:
-                    return int(match.group(1))
-            
-            # Fallback to filename sorting order if no frame number found
-            return None
-
         # Build frames with actual frame numbers
         frames_with_numbers = []
         for i, file in enumerate(sequence_files):
@@ -354,63 +304,18 @@ async def get_thumbnail_sequence(asset_id: str):
         raise HTTPException(status_code=500, detail=f"Error getting thumbnail sequence: {str(e)}")
 
 @app.get("/api/v1/assets/{asset_id}/thumbnail-sequence/frame/{frame_number}")
-async def get_thumbnail_sequence_frame(asset_id: str, frame_number: int):
+async def get_thumbnail_sequence_frame(asset_id: str, frame_number: int, request: Request, asset_queries: Optional[AssetQueries] = Depends(get_asset_queries)):
     """Get a specific frame from the thumbnail sequence"""
     logger.info(f"[THUMBNAIL-FRAME] Requested frame {frame_number} for asset: {asset_id}")
     try:
-        asset = asset_queries.get_asset_with_dependencies(asset_id).get('asset')
+        if not asset_queries:
+            raise HTTPException(status_code=503, detail="Database not available")
+        asset = await run_db(asset_file_cache.get_asset, asset_id, asset_queries)
         if not asset:
             raise HTTPException(status_code=404, detail=f"Asset not found: {asset_id}")
         
-        # Build thumbnail folder path (same logic as above)
-        asset_name = asset.get('name', '')
-        asset_path = os.getenv('ASSET_LIBRARY_PATH', '/app/assets')
-        
-        # Try multiple possible folder structures
-        thumbnail_folders = []
-        
-        # Check folder_path from metadata (most accurate path)
-        folder_path = asset.get('folder_path')
-        if folder_path:
-            # Convert network path to container path if needed
-            if folder_path.startswith('/net/library/atlaslib/'):
-                container_folder = folder_path.replace('/net/library/atlaslib/', '/app/assets/')
-                thumbnail_folders.append(Path(container_folder) / "Thumbnail")
-            else:
-                thumbnail_folders.append(Path(folder_path) / "Thumbnail")
-        
-        # Check paths.folder_path as well
-        paths_folder_path = asset.get('paths', {}).get('folder_path')
-        if paths_folder_path and paths_folder_path != folder_path:
-            if paths_folder_path.startswith('/net/library/atlaslib/'):
-                container_folder = paths_folder_path.replace('/net/library/atlaslib/', '/app/assets/')
-                thumbnail_folders.append(Path(container_folder) / "Thumbnail")
-            else:
-                thumbnail_folders.append(Path(paths_folder_path) / "Thumbnail")
-        
-        # Legacy field name
-        if asset.get('paths', {}).get('asset_folder'):
-            asset_folder = Path(asset['paths']['asset_folder'])
-            thumbnail_folders.append(asset_folder / "Thumbnail")
-        
-        thumbnail_folders.extend([
-            Path(asset_path) / "3D" / "Assets" / "BlacksmithAssets" / asset_id / "Thumbnail",
-            Path(asset_path) / "3D" / "Assets" / "Blacksmith Asset" / asset_id / "Thumbnail",
-            Path(asset_path) / "3D" / f"{asset_id}_{asset_name}" / "Thumbnail",
-            Path(asset_path) / "3D" / asset_id / "Thumbnail"
-        ])
-        
-        # Find thumbnail sequence files
-        sequence_files = []
-        for thumbnail_folder in thumbnail_folders:
-            if thumbnail_folder.exists():
-                for pattern in ["*.png", "*.jpg", "*.jpeg", "*.exr"]:
-                    files = sorted(list(thumbnail_folder.glob(pattern)))
-                    if files:
-                        sequence_files = files
-                        break
-                if sequence_files:
-                    break
+        # Same cached frame list as the sequence endpoint - no DB lookup or glob per frame
+        sequence_files = await run_fs(get_cached_sequence_frames, asset_id, asset)
         
         if not sequence_files:
             raise HTTPException(status_code=404, detail=f"No thumbnail sequence found for asset: {asset_id}")
@@ -423,25 +328,14 @@ async def get_thumbnail_sequence_frame(asset_id: str, frame_number: int):
         frame_path = sequence_files[frame_number]
         logger.info(f"[FRAME] Serving frame {frame_number}: {frame_path.name}")
         
-        # Determine media type based on file extension
-        file_ext = frame_path.suffix.lower()
-        media_type = "application/octet-stream"  # Default fallback
-        if file_ext in ['.png']:
-            media_type = "image/png"
-        elif file_ext in ['.jpg', '.jpeg']:
-            media_type = "image/jpeg"
-        elif file_ext in ['.exr']:
-            media_type = "image/exr"  # EXR files
-        elif file_ext in ['.tiff', '.tif']:
-            media_type = "image/tiff"
-        
         # Use shorter cache time for preview images to allow updates
         cache_control = "public, max-age=60" if "Preview" in str(frame_path) else "public, max-age=3600"
         
-        return FileResponse(
-            path=str(frame_path),
-            media_type=media_type,
-            headers={"Cache-Control": cache_control}
+        return await conditional_file_response(
+            request,
+            frame_path,
+            media_type=get_image_media_type(frame_path),
+            cache_control=cache_control
         )
         
     except HTTPException:
@@ -450,20 +344,100 @@ async def get_thumbnail_sequence_frame(asset_id: str, frame_number: int):
         logger.error(f"[ERROR] Error serving thumbnail frame: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Error serving thumbnail frame: {str(e)}")
 
+async def build_sequence_sprite(asset_id: str, tile: int, image_format: str, asset_queries: Optional[AssetQueries]) -> dict:
+    """Sprite sheet manifest for an asset's thumbnail sequence (generated off the event loop)"""
+    if not asset_queries:
+        raise HTTPException(status_code=503, detail="Database not available")
+    if image_format not in SPRITE_FORMATS:
+        raise HTTPException(status_code=400, detail=f"Unsupported format '{image_format}'. Allowed: {', '.join(SPRITE_FORMATS)}")
+    asset = await run_db(asset_file_cache.get_asset, asset_id, asset_queries)
+    if not asset:
+        raise HTTPException(status_code=404, detail=f"Asset not found: {asset_id}")
+    
+    sequence_files = await run_fs(get_cached_sequence_frames, asset_id, asset)
+    if not sequence_files:
+        raise HTTPException(status_code=404, detail=f"No thumbnail sequence found for asset: {asset_id}")
+    
+    thumbnail_folder = sequence_files[0].parent
+    
+    def lookup():
+        manifest = cached_sprite_sheet(asset_id, sequence_files, thumbnail_folder, tile, image_format)
+        # Frames are watched too: one rewritten in place leaves the folder mtime unchanged
+        watched = [thumbnail_folder, *sequence_files]
+        if manifest:
+            watched.append(Path(manifest["sprite_path"]))
+        return manifest, watched
+    
+    # Manifest is cached per asset/tile/format; the on-disk sheet is only rebuilt when frames change
+    manifest = await run_fs(asset_file_cache.get, asset_id, f"sprite_{tile}_{image_format}", lookup, False)
+    if manifest is None:
+        manifest = await get_sprite_sheet(asset_id, sequence_files, thumbnail_folder, tile, image_format)
+    return dict(manifest)
+
+@app.get("/api/v1/assets/{asset_id}/thumbnail-sequence/sprite")
+async def get_thumbnail_sequence_sprite(
+    asset_id: str,
+    request: Request,
+    tile: int = Query(256, ge=32, le=1024, description="Tile width in pixels"),
+    image_format: str = Query("webp", alias="format", description="webp or jpeg"),
+    asset_queries: Optional[AssetQueries] = Depends(get_asset_queries)
+):
+    """Whole thumbnail sequence packed into one sprite sheet (see /sprite/manifest for offsets)"""
+    logger.info(f"[SPRITE] Requested {tile}px {image_format} sprite for asset: {asset_id}")
+    try:
+        manifest = await build_sequence_sprite(asset_id, tile, image_format, asset_queries)
+        # sprite_url from the manifest carries v=<source_key>, making it immutable
+        return await conditional_file_response(
+            request,
+            manifest["sprite_path"],
+            media_type=manifest["media_type"],
+            cache_control="public, max-age=3600",
+            version=manifest["source_key"]
+        )
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"[ERROR] Error serving sprite sheet: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Error serving sprite sheet: {str(e)}")
+
+@app.get("/api/v1/assets/{asset_id}/thumbnail-sequence/sprite/manifest")
+async def get_thumbnail_sequence_sprite_manifest(
+    asset_id: str,
+    tile: int = Query(256, ge=32, le=1024, description="Tile width in pixels"),
+    image_format: str = Query("webp", alias="format", description="webp or jpeg"),
+    asset_queries: Optional[AssetQueries] = Depends(get_asset_queries)
+):
+    """Frame offsets inside the sequence sprite sheet"""
+    try:
+        manifest = await build_sequence_sprite(asset_id, tile, image_format, asset_queries)
+        manifest.pop("sprite_path", None)
+        # source_key changes whenever a frame changes, so the URL doubles as a cache-buster
+        manifest["sprite_url"] = (
+            f"/api/v1/assets/{asset_id}/thumbnail-sequence/sprite"
+            f"?tile={tile}&format={image_format}&v={manifest['source_key']}"
+        )
+        return manifest
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"[ERROR] Error building sprite manifest: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Error building sprite manifest: {str(e)}")
+
 # Include only working routers for now
 app.include_router(assets_router)
 app.include_router(config_router)
+app.include_router(jobs_router)
 # Disabled problematic routers until Pydantic compatibility is fixed
 # app.include_router(sync_router)
 # app.include_router(products_router, prefix="/api/v1")
 # app.include_router(users_router, prefix="/api/v1")
 
 @app.get("/test-assets")
-async def test_assets():
+async def test_assets(asset_queries: Optional[AssetQueries] = Depends(get_asset_queries)):
     """Simple test endpoint to verify database connection and assets"""
     try:
         logger.info("🔍 Testing asset query from main.py")
-        assets = asset_queries.search_assets()
+        assets = await run_db(asset_queries.search_assets)
         logger.info(f"📊 Found {len(assets)} assets directly")
         
         # Convert to simple format  
@@ -505,11 +479,11 @@ async def list_routes():
     return {"routes": routes}
 
 @app.get("/")
-async def root():
+async def root(asset_queries: Optional[AssetQueries] = Depends(get_asset_queries)):
     """API root endpoint with system information"""
     try:
-        stats = asset_queries.get_asset_statistics()
-        redis_connected = False  # Temporarily disabled
+        stats = await run_db(asset_queries.get_asset_statistics)
+        redis_connected = query_cache.get_stats()['backend'] == 'redis'
         
         return {
             "message": "Enhanced Blacksmith Atlas API",
@@ -550,7 +524,7 @@ async def root():
         }
 
 @app.get("/health")
-async def health_check():
+async def health_check(asset_queries: Optional[AssetQueries] = Depends(get_asset_queries)):
     """Enhanced health check endpoint"""
     health_status = {
         "status": "healthy",
@@ -562,27 +536,70 @@ async def health_check():
     
     # Check ArangoDB
     try:
-        stats = asset_queries.get_asset_statistics()
+        if not asset_queries:
+            raise Exception("Database not available")
+        stats = await run_db(asset_queries.get_asset_statistics)
         health_status["components"]["database"] = {
             "status": "healthy",
             "type": "ArangoDB Community Edition",
-            "assets_count": stats.get('total_assets', 0)
+            "assets_count": stats.get('total_assets', 0),
+            "pool": db_pool.get_stats()
         }
     except Exception as e:
+        # Force a reconnect attempt on the next request
+        db_pool.mark_failed()
         health_status["status"] = "unhealthy"
         health_status["components"]["database"] = {
             "status": "unhealthy", 
             "type": "ArangoDB Community Edition",
-            "error": str(e)
+            "error": str(e),
+            "pool": db_pool.get_stats()
         }
     
-    # Redis temporarily disabled
+    # Query result cache (list/search/stats responses)
+    cache_stats = query_cache.get_stats()
     health_status["components"]["cache"] = {
-        "status": "disabled",
-        "type": "Redis", 
-        "message": "Cache temporarily disabled for testing"
+        "status": "disabled" if cache_stats['backend'] == 'disabled' else "healthy",
+        "type": "Redis" if cache_stats['backend'] == 'redis' else "In-process LRU",
+        **cache_stats
     }
     
+    # In-process asset file lookup cache (image endpoints)
+    health_status["components"]["file_cache"] = {
+        "status": "healthy",
+        "type": "In-process LRU",
+        **asset_file_cache.get_stats()
+    }
+    
+    # Bounded pools used for blocking DB / filesystem / image work
+    health_status["components"]["executors"] = {
+        "status": "healthy",
+        "type": "Thread + process pools",
+        **executor.get_stats()
+    }
+    
+    # Memory budget shared by image conversions
+    health_status["components"]["image_pipeline"] = {
+        "status": "healthy",
+        "type": "Streaming image reducer",
+        **memory_budget.get_stats()
+    }
+    
+    # Background job queue (uploads / conversions)
+    try:
+        health_status["components"]["jobs"] = {
+            "status": "healthy",
+            "type": "SQLite job queue",
+            "counts": await run_fs(job_queue.counts),
+            **job_queue.get_stats()
+        }
+    except Exception as e:
+        health_status["components"]["jobs"] = {
+            "status": "unhealthy",
+            "type": "SQLite job queue",
+            "error": str(e)
+        }
+    
     return health_status
 
 @app.post("/admin/save-config")
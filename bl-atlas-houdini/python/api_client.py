@@ -6,16 +6,25 @@ Blacksmith Atlas - API Client (Standalone)
 Handles communication with the Atlas API and database ingestion.
 Embedded version of the ingestion functionality for standalone use.
 
+All requests go through a shared keep-alive connection pool
+(``get_http_client``) - no curl subprocesses.
+
 Author: Blacksmith VFX
-Version: 3.0 (Standalone)
+Version: 4.0 (Standalone)
 """
 
+import gzip
 import json
-import subprocess
+import ssl
 import sys
 import os
+import time
+import queue
+import threading
+import http.client
+import urllib.parse
 from pathlib import Path
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, Iterable, List, Optional, Tuple
 from datetime import datetime
 
 try:
@@ -48,6 +57,195 @@ except ImportError:
     def get_network_config():
         return FallbackConfig()
 
+class AtlasAPIError(Exception):
+    """HTTP error response from the Atlas API"""
+
+    def __init__(self, status: int, body: str):
+        super().__init__(f"HTTP {status}: {body[:500]}")
+        self.status = status
+        self.body = body
+
+
+class AtlasResponse:
+    """Status, headers and (fully read) body of one API response"""
+
+    def __init__(self, status: int, headers: Dict[str, str], data: bytes):
+        self.status = status
+        self.headers = headers
+        self.data = data
+
+    @property
+    def ok(self) -> bool:
+        return 200 <= self.status < 300
+
+    def json(self):
+        return json.loads(self.data.decode('utf-8')) if self.data else None
+
+    def raise_for_status(self):
+        if not self.ok:
+            raise AtlasAPIError(self.status, self.data.decode('utf-8', 'replace'))
+
+
+class AtlasHTTPClient:
+    """
+    Keep-alive HTTP client for the Atlas API (standard library only, so it
+    runs in Houdini's Python and in the command line scripts alike)
+
+    Idle connections are pooled and reused, connection failures and
+    502/503/504 responses are retried with exponential backoff, and request
+    bodies above ``gzip_min_bytes`` are sent gzip-compressed.
+
+    Requests that may have reached the server (read timeouts, 5xx) are only
+    repeated for idempotent methods unless the caller passes ``retry=True``;
+    a failed connect or a pooled connection the server had already closed is
+    retried for every method, as the request never got through.
+    """
+
+    RETRY_STATUSES = (502, 503, 504)
+    IDEMPOTENT_METHODS = frozenset(('GET', 'HEAD', 'OPTIONS', 'PUT', 'DELETE'))
+    # Raised on first use of a keep-alive connection the server closed while idle
+    STALE_CONNECTION_ERRORS = (http.client.RemoteDisconnected, BrokenPipeError, ConnectionResetError)
+
+    def __init__(self, base_url: str, timeout: float = 30, retries: int = 3, backoff: float = 0.5,
+                 pool_size: int = 4, verify_ssl: bool = True, gzip_min_bytes: int = 1024,
+                 user_agent: str = "Atlas-API-Client/4.0"):
+        parsed = urllib.parse.urlsplit(base_url.rstrip('/'))
+        self.base_url = base_url.rstrip('/')
+        self.scheme = parsed.scheme or 'http'
+        self.host = parsed.hostname
+        self.port = parsed.port
+        self.base_path = parsed.path
+        self.timeout = timeout
+        self.retries = max(0, retries)
+        self.backoff = backoff
+        self.gzip_min_bytes = gzip_min_bytes
+        self.user_agent = user_agent
+        self._ssl_context = None
+        if self.scheme == 'https':
+            self._ssl_context = ssl.create_default_context()
+            if not verify_ssl:
+                self._ssl_context.check_hostname = False
+                self._ssl_context.verify_mode = ssl.CERT_NONE
+        self._idle = queue.LifoQueue(maxsize=pool_size)
+
+    def _new_connection(self) -> http.client.HTTPConnection:
+        if self.scheme == 'https':
+            return http.client.HTTPSConnection(self.host, self.port, timeout=self.timeout, context=self._ssl_context)
+        return http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+
+    def _acquire(self) -> Tuple[http.client.HTTPConnection, bool]:
+        """A connection, and whether it was reused from the pool"""
+        try:
+            return self._idle.get_nowait(), True
+        except queue.Empty:
+            return self._new_connection(), False
+
+    def _release(self, connection: http.client.HTTPConnection, reusable: bool):
+        if reusable:
+            try:
+                self._idle.put_nowait(connection)
+                return
+            except queue.Full:
+                pass
+        connection.close()
+
+    def close(self):
+        """Close every idle connection"""
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                return
+
+    def request(self, method: str, path: str, body=None, params: Optional[Dict] = None,
+                headers: Optional[Dict[str, str]] = None, content_type: str = 'application/json',
+                retry: Optional[bool] = None) -> AtlasResponse:
+        """
+        Send one request; ``body`` may be bytes, str or a JSON-serialisable object
+
+        ``retry`` says whether the request is safe to send twice; by default
+        only idempotent methods are. Raises the last connection error once the
+        retries are used up; HTTP error statuses are returned (see
+        ``AtlasResponse.raise_for_status``).
+        """
+        url = self.base_path + path
+        if params:
+            url += ('&' if '?' in url else '?') + urllib.parse.urlencode(params, doseq=True)
+
+        request_headers = {'User-Agent': self.user_agent, 'Accept': 'application/json',
+                           'Accept-Encoding': 'gzip'}
+        payload = None
+        if body is not None:
+            payload = body if isinstance(body, bytes) else (
+                body.encode('utf-8') if isinstance(body, str) else json.dumps(body).encode('utf-8'))
+            request_headers['Content-Type'] = content_type
+            if len(payload) >= self.gzip_min_bytes:
+                payload = gzip.compress(payload, compresslevel=5)
+                request_headers['Content-Encoding'] = 'gzip'
+        request_headers.update(headers or {})
+
+        if retry is None:
+            retry = method.upper() in self.IDEMPOTENT_METHODS
+
+        for attempt in range(self.retries + 1):
+            connection, reused = self._acquire()
+            connected = reused
+            try:
+                if not reused:
+                    connection.connect()
+                    connected = True
+                connection.request(method, url, body=payload, headers=request_headers)
+                response = connection.getresponse()
+                data = response.read()
+            except (http.client.HTTPException, OSError) as e:
+                connection.close()
+                # A pooled connection the server already closed fails on first use: retry at once
+                never_sent = not connected or (reused and isinstance(e, self.STALE_CONNECTION_ERRORS))
+                if attempt >= self.retries or not (retry or never_sent):
+                    raise
+                time.sleep(0 if attempt == 0 else self.backoff * (2 ** (attempt - 1)))
+                continue
+
+            self._release(connection, not response.will_close)
+            if response.getheader('Content-Encoding', '').lower() == 'gzip':
+                data = gzip.decompress(data)
+            result = AtlasResponse(response.status, dict(response.getheaders()), data)
+            if result.status in self.RETRY_STATUSES and retry and attempt < self.retries:
+                time.sleep(self.backoff * (2 ** attempt))
+                continue
+            return result
+
+    def get_json(self, path: str, params: Optional[Dict] = None):
+        response = self.request('GET', path, params=params)
+        response.raise_for_status()
+        return response.json()
+
+    def post_json(self, path: str, payload, retry: Optional[bool] = None) -> AtlasResponse:
+        return self.request('POST', path, body=payload, retry=retry)
+
+
+_http_clients: Dict[str, AtlasHTTPClient] = {}
+_http_clients_lock = threading.Lock()
+
+
+def get_http_client(base_url: str = None, use_network: bool = True, **options) -> AtlasHTTPClient:
+    """
+    Shared keep-alive client per API base URL (one pool for every tool in the session)
+
+    Timeout, retries and SSL verification default to the local/network Atlas config.
+    """
+    config = get_network_config() if use_network else get_local_config()
+    base_url = (base_url or config.api_base_url).rstrip('/')
+    with _http_clients_lock:
+        client = _http_clients.get(base_url)
+        if client is None:
+            options.setdefault('timeout', config.api_timeout)
+            options.setdefault('retries', config.retry_attempts)
+            options.setdefault('verify_ssl', config.verify_ssl)
+            client = _http_clients[base_url] = AtlasHTTPClient(base_url, **options)
+        return client
+
+
 class AtlasAPIClient:
     """Handles all Atlas API communication"""
 
@@ -61,6 +259,7 @@ class AtlasAPIClient:
             self.config = get_local_config()
 
         self.api_base_url = (api_base_url or self.config.api_base_url).rstrip('/')
+        self.http = get_http_client(self.api_base_url, use_network=use_network)
 
         print(f"🌐 Atlas API Client - {'Network' if use_network else 'Local'} Mode")
         print(f"📡 API URL: {self.api_base_url}")
@@ -68,35 +267,13 @@ class AtlasAPIClient:
         self._test_connection()
 
     def _test_connection(self):
-        """Test connection to the Atlas API using curl"""
+        """Test connection to the Atlas API"""
         try:
-            curl_cmd = [
-                'curl', '-s', '-f',  # silent, fail on HTTP errors
-                '--connect-timeout', str(self.config.api_timeout),
-                '--max-time', str(self.config.api_timeout * 2)
-            ]
-
-            # Add SSL options for network mode
-            if self.use_network and self.config.use_ssl:
-                if not self.config.verify_ssl:
-                    curl_cmd.extend(['-k'])  # --insecure flag
-                curl_cmd.extend(['--ssl-reqd'])
-
             # Test with assets endpoint since /health is not routed through Traefik
-            curl_cmd.append(f"{self.api_base_url}/api/v1/assets?limit=1")
-
-            result = subprocess.run(curl_cmd, capture_output=True, text=True, timeout=self.config.api_timeout)
-
-            if result.returncode == 0:
-                assets_data = json.loads(result.stdout)
-                total_assets = assets_data.get('total', 0)
-                print(f"✅ Connected to Atlas API")
-                print(f"📊 Database has {total_assets} assets")
-            else:
-                raise Exception(f"API connection test failed: {result.stderr}")
-        except subprocess.TimeoutExpired:
-            print(f"❌ Timeout connecting to Atlas API at {self.api_base_url}")
-            raise
+            assets_data = self.http.get_json("/api/v1/assets", params={"limit": 1})
+            total_assets = assets_data.get('total', 0)
+            print(f"✅ Connected to Atlas API")
+            print(f"📊 Database has {total_assets} assets")
         except json.JSONDecodeError as e:
             print(f"❌ Invalid JSON response from API: {e}")
             raise
@@ -234,58 +411,22 @@ class AtlasAPIClient:
         return list(tags)
 
     def create_asset(self, asset_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
-        """Create asset using curl via subprocess"""
+        """Create one asset (POST /api/v1/assets over the shared keep-alive connection)"""
         try:
-            # Convert asset_data to JSON
-            json_data = json.dumps(asset_data)
-
-            # Use curl via subprocess
-            curl_cmd = [
-                'curl', '-X', 'POST',
-                f"{self.api_base_url}/api/v1/assets",
-                '-H', 'Content-Type: application/json',
-                '-H', f'User-Agent: Atlas-Standalone-Client/3.0-{"Network" if self.use_network else "Local"}',
-                '-d', json_data,
-                '--silent',  # Suppress progress output
-                '--show-error',  # Show errors
-                '--fail',  # Fail silently on HTTP errors
-                '--connect-timeout', str(self.config.api_timeout),
-                '--max-time', str(self.config.api_timeout * 2)
-            ]
-
-            # Add SSL options for network mode
-            if self.use_network and self.config.use_ssl:
-                if not self.config.verify_ssl:
-                    curl_cmd.extend(['-k'])  # --insecure flag
-                curl_cmd.extend(['--ssl-reqd'])
-
-            result = subprocess.run(curl_cmd, capture_output=True, text=True, timeout=self.config.api_timeout)
-
-            if result.returncode == 0:
-                response_data = json.loads(result.stdout)
+            response = self.http.post_json("/api/v1/assets", asset_data)
+
+            if response.ok:
+                response_data = response.json()
                 print(f"✅ Created asset: {response_data.get('name')} (ID: {response_data.get('id')})")
                 return response_data
 
-            elif result.returncode == 22:  # HTTP error (409, etc.)
-                # Try to parse error response
-                try:
-                    error_data = json.loads(result.stderr) if result.stderr else "HTTP error"
-                    if "already exists" in str(error_data):
-                        print(f"⚠️ Asset already exists: {asset_data['name']}")
-                        return None
-                    else:
-                        print(f"❌ HTTP error creating asset {asset_data['name']}: {error_data}")
-                        return None
-                except json.JSONDecodeError:
-                    print(f"❌ HTTP error creating asset {asset_data['name']}: {result.stderr}")
-                    return None
+            error_text = response.data.decode('utf-8', 'replace')
+            if "already exists" in error_text:
+                print(f"⚠️ Asset already exists: {asset_data['name']}")
             else:
-                print(f"❌ Curl failed creating asset {asset_data['name']}: {result.stderr}")
-                return None
-
-        except subprocess.TimeoutExpired:
-            print(f"❌ Timeout creating asset {asset_data['name']}")
+                print(f"❌ HTTP {response.status} creating asset {asset_data['name']}: {error_text}")
             return None
+
         except json.JSONDecodeError as e:
             print(f"❌ Invalid JSON response creating asset {asset_data['name']}: {e}")
             return None
@@ -293,8 +434,8 @@ class AtlasAPIClient:
             print(f"❌ Unexpected error creating asset {asset_data['name']}: {e}")
             return None
 
-    def ingest_metadata_file(self, metadata_file_path: str) -> Optional[Dict[str, Any]]:
-        """Ingest a single metadata.json file"""
+    def _load_asset_data(self, metadata_file_path: str) -> Optional[Dict[str, Any]]:
+        """Read a metadata file and transform it into an asset payload (None if unusable)"""
         metadata_path = Path(metadata_file_path)
 
         if not metadata_path.exists():
@@ -305,36 +446,106 @@ class AtlasAPIClient:
             print(f"⚠️ File doesn't appear to be a metadata file: {metadata_file_path}")
 
         try:
-            print(f"📄 Processing metadata file: {metadata_file_path}")
-
-            # Load metadata
             with open(metadata_path, 'r', encoding='utf-8') as f:
                 metadata = json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            print(f"❌ Invalid JSON in {metadata_file_path}: {e}")
+            return None
 
-            # Validate required fields
-            if not metadata.get('name'):
-                print(f"❌ Missing required 'name' field in {metadata_file_path}")
-                return None
-
-            # Transform to asset format
-            asset_data = self.transform_metadata_to_asset(metadata, str(metadata_path))
+        # Validate required fields
+        if not metadata.get('name'):
+            print(f"❌ Missing required 'name' field in {metadata_file_path}")
+            return None
 
-            # Create asset
-            result = self.create_asset(asset_data)
+        return self.transform_metadata_to_asset(metadata, str(metadata_path))
 
-            if result:
-                print(f"🎉 Successfully ingested asset: {result['name']}")
-                return result
-            else:
-                return None
+    def create_assets_bulk(self, asset_payloads: List[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        """
+        Create or update many assets in one request (POST /api/v1/assets:bulk)
 
-        except json.JSONDecodeError as e:
-            print(f"❌ Invalid JSON in {metadata_file_path}: {e}")
+        Returns the server's counts and per-item results, or None when the
+        server has no bulk endpoint (older backends).
+        """
+        body = "\n".join(json.dumps(payload, default=str) for payload in asset_payloads)
+        # An upsert by asset id: sending a batch twice is harmless, so it may be retried
+        response = self.http.request("POST", "/api/v1/assets:bulk", body=body,
+                                     content_type="application/x-ndjson", retry=True)
+        if response.status in (404, 405):
             return None
-        except Exception as e:
-            print(f"❌ Error processing {metadata_file_path}: {e}")
+        response.raise_for_status()
+        return response.json()
+
+    def ingest_metadata_files(self, metadata_file_paths: Iterable[str], batch_size: int = 500) -> Dict[str, Any]:
+        """
+        Ingest many metadata files in one session
+
+        Assets are sent ``batch_size`` at a time to the bulk endpoint (one
+        request and one bulk import per batch); against a backend without it,
+        each file is posted on its own over the keep-alive connection.
+        """
+        stats = {"success": 0, "failed": 0, "skipped": 0, "results": []}
+        started = time.perf_counter()
+        bulk_available = True
+        batch = []
+
+        def flush():
+            nonlocal bulk_available
+            response = None
+            if bulk_available:
+                try:
+                    response = self.create_assets_bulk([asset_data for _, asset_data in batch])
+                except Exception as e:
+                    print(f"❌ Bulk request for {len(batch)} assets failed: {e}")
+                    stats["failed"] += len(batch)
+                    stats["results"].extend({"file": path, "status": "error", "error": str(e)} for path, _ in batch)
+                    return
+                bulk_available = response is not None
+            if response is None:
+                for path, asset_data in batch:
+                    result = self.create_asset(asset_data)
+                    stats["success" if result else "failed"] += 1
+                    stats["results"].append({"file": path, "id": (result or {}).get("id"),
+                                             "status": "created" if result else "error"})
+                return
+            for item in response.get("results", []):
+                path = batch[item["index"]][0]
+                stats["success" if item["status"] != "error" else "failed"] += 1
+                stats["results"].append({"file": path, **item})
+                if item["status"] == "error":
+                    print(f"❌ {path}: {item.get('error')}")
+            print(f"📦 Batch: {response.get('created', 0)} created, {response.get('updated', 0)} updated, "
+                  f"{response.get('failed', 0)} failed")
+
+        for metadata_file_path in metadata_file_paths:
+            asset_data = self._load_asset_data(metadata_file_path)
+            if asset_data is None:
+                stats["skipped"] += 1
+                continue
+            batch.append((str(metadata_file_path), asset_data))
+            if len(batch) >= batch_size:
+                flush()
+                batch = []
+        if batch:
+            flush()
+
+        elapsed = time.perf_counter() - started
+        print(f"📊 Batch ingestion complete in {elapsed:.1f}s: {stats['success']} successful, "
+              f"{stats['failed']} failed, {stats['skipped']} skipped")
+        return stats
+
+    def ingest_metadata_file(self, metadata_file_path: str) -> Optional[Dict[str, Any]]:
+        """Ingest a single metadata.json file"""
+        print(f"📄 Processing metadata file: {metadata_file_path}")
+
+        asset_data = self._load_asset_data(metadata_file_path)
+        if asset_data is None:
             return None
 
+        result = self.create_asset(asset_data)
+        if result:
+            print(f"🎉 Successfully ingested asset: {result['name']}")
+        return result
+
 
 def call_atlas_api_ingestion(metadata_file_path: str, use_network: bool = False) -> bool:
     """
@@ -15,7 +15,6 @@ import sys
 import json
 import uuid
 import re
-import urllib.request
 import subprocess
 import traceback
 import copy
@@ -62,6 +61,9 @@ except (ImportError, ValueError) as e:
             return "https://library.blacksmith.tv"
     atlas_config = FallbackConfig()
 
+# Shared keep-alive HTTP client for Atlas API calls (api_client.py sits next to this module)
+from api_client import get_http_client, AtlasAPIError
+
 class TemplateAssetExporter:
     """Export assets using Houdini's template system"""
     
@@ -220,58 +222,31 @@ class TemplateAssetExporter:
         except:
             return 'unknown'
     
+    def _api_get(self, path):
+        """GET a JSON document from the Atlas API (shared keep-alive connection)"""
+        print(f"   🌐 Making API request to: {atlas_config.api_base_url}{path}")
+        return get_http_client(atlas_config.api_base_url).get_json(path)
+
     def _get_next_version(self, asset_base_id, action):
         """Get the next version number for version up or variant actions"""
         try:
             if action == "version_up":
-                # Query the Atlas API to find existing versions for this asset (14-char base + variant)
+                # Existing versions of this base UID + variant (13 chars), from the indexed versions endpoint
                 print(f"   🔍 Looking up existing versions for asset base ID: {asset_base_id}")
                 
                 try:
+                    version_info = self._api_get(f"/api/v1/assets/{asset_base_id.upper()}/versions")
+                    existing_versions = version_info.get('existing_versions', [])
                     
-                    # Query the Atlas API to get all assets
-                    api_url = f"{atlas_config.api_base_url}/api/v1/assets?limit=1000"
-                    print(f"   🌐 Making API request to: {api_url}")
-                    
-                    response = urllib.request.urlopen(api_url, timeout=30)
-                    assets_data = json.loads(response.read().decode())
-                    all_assets = assets_data.get('items', [])
-                    
-                    print(f"   📊 Found {len(all_assets)} total assets in database")
-                    
-                    # Filter assets that match the asset base ID (first 13 characters: 11 base + 2 variant)
-                    matching_assets = []
-                    for asset in all_assets:
-                        asset_id = asset.get('id', '')
-                        if len(asset_id) >= 13 and asset_id[:13].upper() == asset_base_id.upper():
-                            matching_assets.append(asset)
-                            print(f"   ✅ Found matching asset: {asset_id}")
-                    
-                    print(f"   📊 Total matching assets: {len(matching_assets)}")
-                    
-                    if not matching_assets:
+                    if not existing_versions:
                         print(f"   ❌ No existing versions found for asset base ID: {asset_base_id}")
                         print(f"   ⚠️ Asset not found in database - cannot version up")
                         # This will trigger an error in Houdini
                         raise ValueError(f"No Asset Found: {asset_base_id} not found in database")
                     
-                    # Parse version numbers from matching assets
-                    existing_versions = []
-                    for asset in matching_assets:
-                        asset_id = asset.get('id', '')
-                        if len(asset_id) == 16:  # 16-character UIDs now
-                            try:
-                                version_str = asset_id[-3:]  # Last 3 characters are version
-                                version_num = int(version_str)
-                                existing_versions.append(version_num)
-                                print(f"   ✅ Parsed version {version_num:03d} from {asset_id}")
-                            except ValueError:
-                                print(f"   ⚠️ Invalid version format in asset ID: {asset_id} (last 3: '{asset_id[-3:]}')")
-                        else:
-                            print(f"   ⚠️ Asset ID wrong length: {asset_id} (expected 14, got {len(asset_id)})")
-                    
-                    # Calculate next version number
-                    next_version = max(existing_versions) + 1 if existing_versions else 1
+                    next_version = version_info.get('next_version')
+                    if not next_version:
+                        raise ValueError(f"No free version left for {asset_base_id} (999 versions exist)")
                     print(f"   📊 Existing versions: {existing_versions}")
                     print(f"   🔢 Next version calculated: {next_version}")
                     
@@ -303,41 +278,14 @@ class TemplateAssetExporter:
         try:
             print(f"   🔍 Getting next variant ID for base: {base_uid}")
             
-            # Query the Atlas API to find all existing variants for this base UID
+            # Existing variants and the next free ID come from the indexed variants endpoint
             try:
-                
-                # Query the Atlas API to get all assets
-                api_url = f"{atlas_config.api_base_url}/api/v1/assets?limit=1000"
-                print(f"   🌐 Making API request to: {api_url}")
-                
-                response = urllib.request.urlopen(api_url, timeout=30)
-                assets_data = json.loads(response.read().decode())
-                all_assets = assets_data.get('items', [])
-                
-                print(f"   📊 Found {len(all_assets)} total assets in database")
-                
-                # Filter assets that match the base UID (first 11 characters)
-                matching_variants = set()
-                print(f"   🔍 Searching for base UID: '{base_uid.upper()}'")
-                
-                for asset in all_assets:
-                    asset_id = asset.get('id', '')
-                    if len(asset_id) >= 13:
-                        asset_base = asset_id[:11].upper()
-                        if asset_base == base_uid.upper():
-                            variant_id = asset_id[11:13].upper()
-                            matching_variants.add(variant_id)
-                            print(f"   ✅ Found variant: {variant_id} in asset {asset_id}")
-                        else:
-                            # Debug: show first few non-matching assets
-                            if len(matching_variants) == 0:
-                                print(f"   ❌ Asset {asset_id[:20]}... doesn't match base '{base_uid.upper()}' (got '{asset_base}')")
+                variant_info = self._api_get(f"/api/v1/assets/{base_uid.upper()}/variants")
+                matching_variants = {variant['variant_id'] for variant in variant_info.get('variants', [])}
                 
                 print(f"   📊 All existing variants for {base_uid}: {sorted(matching_variants)}")
-                print(f"   🔢 Total matching variants found: {len(matching_variants)}")
                 
-                # Generate next variant ID using letter logic
-                next_variant = self._increment_variant_id(matching_variants)
+                next_variant = variant_info.get('next_variant_id') or self._increment_variant_id(matching_variants)
                 print(f"   🔢 Next variant calculated: {next_variant}")
                 
                 return next_variant
@@ -412,26 +360,13 @@ class TemplateAssetExporter:
         try:
             print(f"   🔍 Looking up variant_name for parent asset: {parent_asset_id}")
             
+            # Versions of the 13-character base UID + variant (they should all have the same variant_name)
+            version_info = self._api_get(f"/api/v1/assets/{parent_asset_id.upper()}/versions")
+            versions = version_info.get('versions', [])
             
-            # Query the Atlas API to get all assets and find ones matching the 14-char pattern
-            api_url = f"{atlas_config.api_base_url}/api/v1/assets?limit=1000"
-            print(f"   🌐 Making API request to: {api_url}")
-            
-            response = urllib.request.urlopen(api_url, timeout=30)
-            assets_data = json.loads(response.read().decode())
-            all_assets = assets_data.get('items', [])
-            
-            # Find assets that match the 13-character pattern (ignore version)
-            matching_assets = []
-            for asset in all_assets:
-                asset_id = asset.get('id', '')
-                if len(asset_id) >= 13 and asset_id[:13].upper() == parent_asset_id.upper():
-                    matching_assets.append(asset)
-            
-            if matching_assets:
-                # Use the first matching asset (they should all have the same variant_name)
-                variant_name = matching_assets[0].get('variant_name', 'default')
-                print(f"   ✅ Found variant_name: {variant_name} from asset {matching_assets[0].get('id')}")
+            if versions:
+                variant_name = versions[-1].get('variant_name') or 'default'
+                print(f"   ✅ Found variant_name: {variant_name} from asset {versions[-1].get('id')}")
                 return variant_name
             else:
                 print(f"   ⚠️ No matching assets found for pattern: {parent_asset_id}")
@@ -446,28 +381,13 @@ class TemplateAssetExporter:
         try:
             print(f"   🔍 Looking up original asset name for base UID: {base_uid}")
             
-            # Query the Atlas API to get all assets and find the original (AA variant)
-            api_url = f"{atlas_config.api_base_url}/api/v1/assets?limit=1000"
-            print(f"   🌐 Making API request to: {api_url}")
-            
-            response = urllib.request.urlopen(api_url, timeout=30)
-            assets_data = json.loads(response.read().decode())
-            all_assets = assets_data.get('items', [])
-            
-            # Find assets that match the base UID (first 11 characters) and are original (variant AA)
-            original_asset = None
-            for asset in all_assets:
-                asset_id = asset.get('id', '')
-                if len(asset_id) >= 13:
-                    asset_base_uid = asset_id[:11].upper()
-                    asset_variant_id = asset_id[11:13].upper()
-                    if asset_base_uid == base_uid.upper() and asset_variant_id == "AA":
-                        original_asset = asset
-                        print(f"   ✅ Found original asset (AA variant): {asset_id}")
-                        break
+            # The original asset is the AA variant
+            variant_info = self._api_get(f"/api/v1/assets/{base_uid.upper()}/variants")
+            original_asset = next((variant for variant in variant_info.get('variants', [])
+                                   if variant.get('variant_id') == "AA"), None)
             
             if original_asset:
-                original_name = original_asset.get('name', f'Asset_{base_uid}')
+                original_name = original_asset.get('name') or f'Asset_{base_uid}'
                 print(f"   ✅ Original asset name: {original_name}")
                 return original_name
             else:
@@ -511,22 +431,14 @@ class TemplateAssetExporter:
                 target_asset_id = self.parent_asset_id
                 print(f"   🔍 Default inheritance: Looking for parent asset {target_asset_id}")
             
-            # Query the Atlas API to get all assets and find the target
-            api_url = f"{atlas_config.api_base_url}/api/v1/assets?limit=1000"
-            print(f"   🌐 Making API request to: {api_url}")
-            
-            response = urllib.request.urlopen(api_url, timeout=30)
-            assets_data = json.loads(response.read().decode())
-            all_assets = assets_data.get('items', [])
-            
-            # Find the target asset
-            target_asset = None
-            for asset in all_assets:
-                asset_id = asset.get('id', '')
-                if asset_id == target_asset_id:
-                    target_asset = asset
-                    print(f"   ✅ Found target asset: {asset_id}")
-                    break
+            # Fetch the target asset directly
+            try:
+                target_asset = self._api_get(f"/api/v1/assets/{target_asset_id}")
+                print(f"   ✅ Found target asset: {target_asset.get('id')}")
+            except AtlasAPIError as http_error:
+                if http_error.status != 404:
+                    raise
+                target_asset = None
             
             if target_asset:
                 # Check for branded status in multiple locations
@@ -4074,11 +3986,6 @@ class TemplateAssetImporter:
         try:
             print(f"   🔄 Starting auto-ingestion process...")
             
-            # Use subprocess for curl commands (no external dependencies needed)
-            
-            # Define API endpoint
-            api_url = f"{atlas_config.api_base_url}/api/v1/assets"
-            
             # Prepare asset data for API (match AssetCreateRequest schema)
             # Use ONLY the 16-character UID as database key (no suffix)
             database_key = self.asset_id  # Always use the pure 16-character UID
@@ -4112,29 +4019,13 @@ class TemplateAssetImporter:
             }
             
             
-            # Make API request using curl
+            # POST over the shared keep-alive connection (retried on connection errors)
             try:
+                response = get_http_client(atlas_config.api_base_url).post_json("/api/v1/assets", asset_data)
                 
-                # Convert asset_data to JSON for curl
-                json_data = json.dumps(asset_data)
-                
-                # Use curl via subprocess
-                curl_cmd = [
-                    'curl', '-X', 'POST',
-                    api_url,
-                    '-H', 'Content-Type: application/json',
-                    '-H', 'User-Agent: Houdini-Atlas-Export/1.0',
-                    '-d', json_data,
-                    '--silent',  # Suppress progress output
-                    '--show-error'  # Show errors
-                ]
-                
-                result = subprocess.run(curl_cmd, capture_output=True, text=True, timeout=30)
-                
-                
-                if result.returncode == 0:
+                if response.ok:
                     try:
-                        response_data = json.loads(result.stdout)
+                        response_data = response.json()
                         asset_id = response_data.get("id", "unknown")
                         print(f"   ✅ Asset successfully ingested into database!")
                         print(f"      🆔 Database ID: {asset_id}")
@@ -4142,20 +4033,16 @@ class TemplateAssetImporter:
                         return True
                     except json.JSONDecodeError as e:
                         print(f"   ❌ Invalid JSON response: {e}")
-                        print(f"      Raw response: {result.stdout}")
+                        print(f"      Raw response: {response.data[:500]}")
                         return False
                 else:
-                    print(f"   ❌ Curl request failed with exit code: {result.returncode}")
-                    print(f"      Error output: {result.stderr}")
+                    print(f"   ❌ API request failed with HTTP {response.status}")
+                    print(f"      Error output: {response.data.decode('utf-8', 'replace')[:500]}")
                     return False
-                    
-            except subprocess.TimeoutExpired:
-                print(f"   ❌ API request timed out after 30 seconds")
-                print(f"   💡 Manual ingestion: Use API client to ingest {metadata_file}")
-                return False
             
             except Exception as e:
                 print(f"   ❌ Request failed with error: {e}")
+                print(f"   💡 Manual ingestion: Use API client to ingest {metadata_file}")
                 return False
                 
         except Exception as e:
@@ -1054,6 +1054,25 @@ const AssetLibrary = ({
     }
   };
 
+  // Poll a background job (uploads are processed by the backend job queue) until it finishes
+  const waitForJob = async (statusUrl) => {
+    while (true) {
+      const response = await fetch(`${config.backendUrl}${statusUrl}`);
+      if (!response.ok) {
+        throw new Error(`Job status request failed (${response.status})`);
+      }
+      const job = await response.json();
+      if (job.status === 'succeeded') {
+        return job.result;
+      }
+      if (job.status === 'failed') {
+        throw new Error(job.error || 'Upload job failed');
+      }
+      console.log(`⏳ Upload job ${job.id}: ${job.status} ${Math.round(job.progress)}% ${job.message || ''}`);
+      await new Promise(resolve => setTimeout(resolve, 1000));
+    }
+  };
+
   // Upload Asset functionality
   const handleUploadAsset = async () => {
     // Validate name is always required
@@ -1129,7 +1148,9 @@ const AssetLibrary = ({
       });
 
       if (response.ok) {
-        const result = await response.json();
+        // Upload is queued; copying and conversion finish in the background
+        const queued = await response.json();
+        const result = await waitForJob(queued.status_url);
         console.log('✅ Asset uploaded successfully:', result);
         alert(`✅ Asset "${uploadData.name}" uploaded successfully!\n\nAsset ID: ${result.id}`);
         
@@ -58,7 +58,7 @@ const TextureSetSequence = ({
             
             // If we found a preview, add it first
             if (previewIndex !== -1) {
-              const cacheBust = `_t=${Date.now()}`;
+              const cacheBust = `_t=${asset._image_updated || 0}`;
               frames.push({
                 index: frameIndex++,
                 type: 'preview',
@@ -123,7 +123,7 @@ const TextureSetSequence = ({
                   );
 
                   if (imageIndex !== -1 && imageIndex !== previewIndex) {
-                    const cacheBust = `_t=${Date.now()}`;
+                    const cacheBust = `_t=${asset._image_updated || 0}`;
 
                     frames.push({
                       index: frameIndex++,
@@ -152,7 +152,7 @@ const TextureSetSequence = ({
                   continue;
                 }
 
-                const cacheBust = `_t=${Date.now()}`;
+                const cacheBust = `_t=${asset._image_updated || 0}`;
 
                 // Determine texture type from position order (fallback)
                 const textureTypeMap = ['BC', 'M', 'R', 'N', 'O', 'D'];
@@ -250,7 +250,7 @@ const TextureImage = ({ asset, refreshKey, formatAssetName, openPreview, onFrame
   // For non-texture sets, show regular thumbnail
   return (
     <img
-      src={`${config.backendUrl}/thumbnails/${assetId}?_t=${refreshKey || Date.now()}`}
+      src={`${config.backendUrl}/thumbnails/${assetId}${refreshKey ? `?_t=${refreshKey}` : ''}`}
       alt={formatAssetName(asset)}
       className="w-full h-full object-cover cursor-pointer"
       onClick={() => openPreview(asset)}
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Migrate Atlas_Library documents to the canonical schema
+
+Documents written before backend/core/asset_schema.py (or before its
+SCHEMA_VERSION was bumped) are normalized on the fly by every API
+response. This rewrites them once: each outdated document gets its
+derived response fields (variant, artist, description, paths, metadata
+filter fields) and the current schema_version stamped, so responses
+become a plain projection.
+
+Safe to re-run and to interrupt: only documents not at the current
+version are read, through a streaming cursor, one batch at a time.
+
+Usage:
+    python scripts/database/migrate_asset_schema.py --dry-run
+    python scripts/database/migrate_asset_schema.py --batch-size 500
+"""
+
+import sys
+import time
+import argparse
+from pathlib import Path
+
+# Project root for backend.* imports
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+
+def migrate(asset_queries, batch_size: int, dry_run: bool) -> dict:
+    from backend.core.asset_schema import canonical_fields, SCHEMA_VERSION
+
+    stats = {"outdated": asset_queries.count_assets_outdated(SCHEMA_VERSION), "migrated": 0, "failed": 0}
+    print(f"🔍 {stats['outdated']} documents below schema version {SCHEMA_VERSION}")
+    if dry_run or not stats['outdated']:
+        return stats
+
+    started = time.perf_counter()
+    batch = []
+
+    def flush():
+        try:
+            updated = asset_queries.update_assets_bulk(batch)
+        except Exception as e:
+            print(f"   ❌ Batch of {len(batch)} failed: {e}")
+            updated = 0
+        stats['migrated'] += updated
+        stats['failed'] += len(batch) - updated
+        print(f"   ✅ {stats['migrated']}/{stats['outdated']} migrated")
+
+    # Streaming cursors read from a snapshot, so writing batches while iterating is safe
+    for asset in asset_queries.iter_assets_outdated(SCHEMA_VERSION, batch_size):
+        batch.append({'_key': asset['_key'], **canonical_fields(asset)})
+        if len(batch) >= batch_size:
+            flush()
+            batch = []
+    if batch:
+        flush()
+
+    stats['seconds'] = round(time.perf_counter() - started, 1)
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Migrate Atlas_Library documents to the canonical schema")
+    parser.add_argument("--batch-size", type=int, default=500, help="Documents per bulk update")
+    parser.add_argument("--dry-run", action="store_true", help="Only count outdated documents")
+    args = parser.parse_args()
+
+    from backend.core.database import db_pool, get_asset_queries
+
+    asset_queries = get_asset_queries()
+    if not asset_queries:
+        print("❌ Database not available")
+        return 1
+    try:
+        stats = migrate(asset_queries, args.batch_size, args.dry_run)
+    finally:
+        db_pool.shutdown()
+
+    print(f"📊 Migration {'check' if args.dry_run else 'complete'}: {stats}")
+    return 1 if stats['failed'] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Benchmark asset listing throughput
+
+Offline mode (default) converts synthetic documents shaped like Houdini
+exports - large metadata with texture/path mappings - through the same
+conversion functions GET /api/v1/assets uses, with logging configured as
+the server configures it. Pass --url to time real requests against a
+running backend instead.
+
+Usage:
+    python scripts/development/benchmark_list_assets.py --items 1000 --rounds 20
+    python scripts/development/benchmark_list_assets.py --view grid
+    python scripts/development/benchmark_list_assets.py --url http://localhost:8000 --view grid
+"""
+
+import sys
+import time
+import argparse
+import statistics
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "bl-atlas-houdini" / "python"))
+
+
+def synthetic_asset(i: int) -> dict:
+    uid = f"{i:011X}AA001"
+    textures = {f"/net/library/atlaslib/3D/Assets/{uid}/Textures/tex_{n:03d}.exr": f"tex_{n:03d}.exr" for n in range(40)}
+    return {
+        '_key': uid,
+        'id': uid,
+        'name': f"Asset {i}",
+        'category': "Blacksmith Asset",
+        'asset_type': "Assets",
+        'dimension': "3D",
+        'hierarchy': {'dimension': "3D", 'asset_type': "Assets", 'subcategory': "Blacksmith Asset"},
+        'tags': ["houdini", "redshift", "prop"],
+        'created_at': "2025-01-01T00:00:00",
+        'created_by': "artist",
+        'render_engine': "Redshift",
+        'paths': {'folder_path': f"/net/library/atlaslib/3D/Assets/{uid}",
+                  'copied_files': list(textures)},
+        'file_sizes': {'estimated_total_size': 123456789},
+        'metadata': {
+            'houdini_version': "20.5.410",
+            'branded': False,
+            'texture_info': {'texture_mappings': textures, 'path_mappings': textures},
+            'node_summary': [{'name': f"node{n}", 'type': "geo", 'parms': {'p': n}} for n in range(60)],
+            'export_metadata': {'variant_name': "default", 'branded': False}
+        },
+        'thumbnail_index': {'path': None, 'version': None}
+    }
+
+
+def benchmark_offline(items: int, rounds: int, view: str):
+    from backend.core.structured_logging import configure_logging
+    from backend.api.assets import convert_asset_to_response, convert_asset_to_summary
+    from fastapi.encoders import jsonable_encoder
+    import json
+
+    configure_logging()
+    convert = convert_asset_to_summary if view == "grid" else convert_asset_to_response
+    documents = [synthetic_asset(i) for i in range(items)]
+    timings = []
+    payload = 0
+    for _ in range(rounds):
+        started = time.perf_counter()
+        body = json.dumps(jsonable_encoder([convert(dict(document)) for document in documents]))
+        timings.append(time.perf_counter() - started)
+        payload = len(body)
+    return timings, payload
+
+
+def benchmark_http(url: str, items: int, rounds: int, view: str):
+    from api_client import AtlasHTTPClient
+
+    client = AtlasHTTPClient(url)
+    timings = []
+    payload = 0
+    for _ in range(rounds):
+        started = time.perf_counter()
+        response = client.request('GET', "/api/v1/assets", params={'limit': items, 'view': view})
+        response.raise_for_status()
+        timings.append(time.perf_counter() - started)
+        payload = len(response.data)
+    return timings, payload
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark GET /api/v1/assets throughput")
+    parser.add_argument("--items", type=int, default=1000, help="Assets per page")
+    parser.add_argument("--rounds", type=int, default=20, help="Pages to time")
+    parser.add_argument("--view", choices=["detail", "grid"], default="detail")
+    parser.add_argument("--url", help="Time a running backend instead of the offline conversion")
+    args = parser.parse_args()
+
+    if args.url:
+        timings, payload = benchmark_http(args.url, args.items, args.rounds, args.view)
+    else:
+        timings, payload = benchmark_offline(args.items, args.rounds, args.view)
+
+    median = statistics.median(timings)
+    print(f"📊 view={args.view} items={args.items} rounds={args.rounds}")
+    print(f"   median {median * 1000:.1f}ms per page, {args.items / median:,.0f} assets/s")
+    print(f"   p95 {sorted(timings)[int(len(timings) * 0.95) - 1] * 1000:.1f}ms, payload {payload / 1024:,.0f} KiB")
+
+
+if __name__ == "__main__":
+    main()
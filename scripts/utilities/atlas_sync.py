@@ -19,10 +19,34 @@ import argparse
 from pathlib import Path
 from datetime import datetime
 
-# Add backend to Python path
+# Add the project root (backend.* imports) and backend (assetlibrary.* imports) to Python path
 script_dir = Path(__file__).parent
-backend_path = script_dir.parent / "backend"
-sys.path.insert(0, str(backend_path))
+project_root = script_dir.parent.parent
+sys.path.insert(0, str(project_root))
+sys.path.insert(0, str(project_root / "backend"))
+
+
+def print_entries(title: str, symbol: str, entries: list, limit: int = 10):
+    """Print the first ``limit`` plan entries of one section"""
+    if not entries:
+        return
+    print(f"\n   {title}:")
+    for entry in entries[:limit]:
+        detail = f" (was {entry['previous_path']})" if entry.get('previous_path') else ""
+        print(f"      {symbol} {entry.get('name') or 'Unknown'} (ID: {entry['key']}) {entry.get('path') or ''}{detail}")
+    if len(entries) > limit:
+        print(f"      ... and {len(entries) - limit} more")
+
+
+def print_stats(title: str, stats: dict):
+    print(f"\n📊 {title}:")
+    print(f"   ➕ Assets added: {stats['assets_added']}")
+    print(f"   🔄 Assets updated: {stats['assets_updated']}")
+    print(f"   🚚 Assets moved: {stats['assets_moved']}")
+    print(f"   ➖ Assets removed: {stats['assets_removed']}")
+    print(f"   ➡️ Assets unchanged: {stats['assets_unchanged']}")
+    print(f"   ❌ Errors: {stats['errors']}")
+    print(f"   ⏱️ Phases: {stats['timings']}")
 
 
 def main():
@@ -58,106 +82,66 @@ def main():
         
         if args.check_only:
             print("🔍 DRY RUN - Checking what would change...")
-            
-            # Get current state
-            filesystem_assets = manager.scan_filesystem_assets()
-            database_assets = manager.get_database_assets()
-            
-            filesystem_ids = set(filesystem_assets.keys())
-            database_ids = set(database_assets.keys())
-            
-            assets_to_add = filesystem_ids - database_ids
-            assets_to_remove = database_ids - filesystem_ids
-            assets_to_check = filesystem_ids & database_ids
-            
+
+            plan = manager.reconcile_plan()
+            counts = plan.counts()
+
             print(f"📊 SYNC ANALYSIS:")
-            print(f"   📁 Filesystem assets: {len(filesystem_assets)}")
-            print(f"   🗄️ Database assets: {len(database_assets)}")
-            print(f"   ➕ Would add to database: {len(assets_to_add)}")
-            print(f"   ➖ Would remove from database: {len(assets_to_remove)}")
-            print(f"   🔍 Would check for updates: {len(assets_to_check)}")
-            
-            if assets_to_add:
-                print(f"\n   ASSETS TO ADD:")
-                for asset_id in sorted(list(assets_to_add)[:10]):  # Show first 10
-                    asset = filesystem_assets[asset_id]
-                    print(f"      ➕ {asset['name']} ({asset['asset_type']}/{asset['category']})")
-                if len(assets_to_add) > 10:
-                    print(f"      ... and {len(assets_to_add) - 10} more")
-            
-            if assets_to_remove:
-                print(f"\n   ASSETS TO REMOVE:")
-                for asset_id in sorted(list(assets_to_remove)[:10]):  # Show first 10
-                    asset = database_assets[asset_id]
-                    print(f"      ➖ {asset.get('name', 'Unknown')} (ID: {asset_id})")
-                if len(assets_to_remove) > 10:
-                    print(f"      ... and {len(assets_to_remove) - 10} more")
-            
+            print(f"   📁 Filesystem assets: {counts['filesystem_assets']}")
+            print(f"   🗄️ Database assets: {counts['database_assets']}")
+            print(f"   ➕ Would add to database: {counts['added']}")
+            print(f"   🔄 Would update (metadata changed): {counts['changed']}")
+            print(f"   🚚 Would update (folder moved): {counts['moved']}")
+            print(f"   ➖ Would remove from database: {counts['orphaned']}")
+            print(f"   ➡️ Unchanged: {counts['unchanged']}")
+            print(f"   ⏱️ Phases: {plan.timings}")
+
+            print_entries("ASSETS TO ADD", "➕", plan.added)
+            print_entries("ASSETS TO UPDATE", "🔄", plan.changed)
+            print_entries("ASSETS MOVED", "🚚", plan.moved)
+            print_entries("ASSETS TO REMOVE", "➖", plan.orphaned)
+            if not plan.deletes_allowed:
+                print("\n   ⚠️ No asset folders found (library not mounted?) - orphans would NOT be removed")
+            if plan.untracked:
+                print(f"\n   ℹ️ {len(plan.untracked)} database assets live outside the synced folders and are left alone")
+            for conflict in plan.conflicts[:10]:
+                print(f"   ⚠️ Asset ID {conflict['key']} is used by several folders: {', '.join(conflict['paths'])}")
+
             print(f"\n💡 To perform actual sync, run without --check-only")
-            
+
         elif args.add_only:
             print("➕ ADD-ONLY MODE - Adding new assets to database...")
-            
-            filesystem_assets = manager.scan_filesystem_assets()
-            database_assets = manager.get_database_assets()
-            
-            assets_to_add = set(filesystem_assets.keys()) - set(database_assets.keys())
-            
-            print(f"   Found {len(assets_to_add)} new assets to add...")
-            
-            added_count = 0
-            for asset_id in assets_to_add:
-                asset_data = filesystem_assets[asset_id]
-                if manager.add_asset_to_database(asset_data):
-                    added_count += 1
-                    print(f"   ✅ Added: {asset_data['name']}")
-                else:
-                    print(f"   ❌ Failed: {asset_data['name']}")
-            
-            print(f"\n📊 RESULTS: {added_count}/{len(assets_to_add)} assets added successfully")
-            
+
+            stats = manager.full_bidirectional_sync(actions=('added',))
+            if "error" in stats:
+                print(f"❌ Sync failed: {stats['error']}")
+                return 1
+            print_stats("RESULTS", stats)
+
         elif args.remove_orphans:
             print("➖ REMOVE-ORPHANS MODE - Removing deleted assets from database...")
-            
-            filesystem_assets = manager.scan_filesystem_assets()
-            database_assets = manager.get_database_assets()
-            
-            assets_to_remove = set(database_assets.keys()) - set(filesystem_assets.keys())
-            
-            print(f"   Found {len(assets_to_remove)} orphaned assets to remove...")
-            
-            removed_count = 0
-            for asset_id in assets_to_remove:
-                asset_data = database_assets[asset_id]
-                asset_name = asset_data.get('name', 'Unknown')
-                if manager.remove_asset_from_database(asset_id, asset_name):
-                    removed_count += 1
-                    print(f"   ✅ Removed: {asset_name}")
-                else:
-                    print(f"   ❌ Failed: {asset_name}")
-            
-            print(f"\n📊 RESULTS: {removed_count}/{len(assets_to_remove)} assets removed successfully")
-            
+
+            stats = manager.full_bidirectional_sync(actions=('orphaned',))
+            if "error" in stats:
+                print(f"❌ Sync failed: {stats['error']}")
+                return 1
+            print_stats("RESULTS", stats)
+
         else:
             print("🔄 FULL BIDIRECTIONAL SYNC - Synchronizing all changes...")
-            
+
             # Perform full sync
             stats = manager.full_bidirectional_sync()
-            
+
             if "error" in stats:
                 print(f"❌ Sync failed: {stats['error']}")
                 return 1
-            
-            print(f"\n📊 SYNC COMPLETE:")
-            print(f"   ➕ Assets added: {stats['assets_added']}")
-            print(f"   🔄 Assets updated: {stats['assets_updated']}")
-            print(f"   ➖ Assets removed: {stats['assets_removed']}")
-            print(f"   ➡️ Assets unchanged: {stats['assets_unchanged']}")
-            print(f"   ❌ Errors: {stats['errors']}")
-            
+
+            print_stats("SYNC COMPLETE", stats)
+
             if stats['errors'] > 0:
                 print(f"\n⚠️ Some operations failed - check logs for details")
-        
+
         print(f"\n🏁 Sync utility completed: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
         return 0
         
@@ -2,7 +2,10 @@
 """
 Blacksmith Atlas Metadata Ingestion Script (Curl Version)
 
-This script ingests metadata.json files into the Atlas API using curl via subprocess.
+This script ingests metadata.json files into the Atlas API. Requests go through the
+shared keep-alive client from bl-atlas-houdini/python/api_client.py (one pooled
+connection for the whole run, retries with backoff, gzip request bodies); the
+script kept its historical name from when it shelled out to curl.
 It processes Houdini asset metadata and creates comprehensive asset records.
 
 Usage:
@@ -12,7 +15,6 @@ Usage:
 """
 
 import json
-import subprocess
 import argparse
 import sys
 from pathlib import Path
@@ -28,40 +30,38 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-class AtlasMetadataIngester:
-    """Class to handle ingestion of metadata files into Atlas API using curl"""
+# Shared Atlas HTTP client (bl-atlas-houdini/python/api_client.py)
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "bl-atlas-houdini" / "python"))
+from api_client import AtlasAPIClient, AtlasHTTPClient
+
+class AtlasMetadataIngester(AtlasAPIClient):
+    """
+    Class to handle ingestion of metadata files into Atlas API over a keep-alive connection
+    
+    Shares batching and bulk ingestion with AtlasAPIClient; this class only
+    changes the connection check, the asset payload and logging.
+    """
     
     def __init__(self, api_base_url: str = "http://localhost:8000"):
+        # Own client (user agent, /health check) instead of AtlasAPIClient's config lookup
         self.api_base_url = api_base_url.rstrip('/')
+        self.http = AtlasHTTPClient(self.api_base_url, user_agent="Atlas-Metadata-Ingester/2.0")
         
         # Test API connection
         self._test_connection()
     
     def _test_connection(self):
-        """Test connection to the Atlas API using curl"""
+        """Test connection to the Atlas API"""
         try:
-            curl_cmd = [
-                'curl', '-s', '-f',  # silent, fail on HTTP errors
-                f"{self.api_base_url}/health"
-            ]
-            
-            result = subprocess.run(curl_cmd, capture_output=True, text=True, timeout=10)
+            health_data = self.http.get_json("/health")
+            logger.info(f"✅ Connected to Atlas API v{health_data.get('version', 'unknown')}")
             
-            if result.returncode == 0:
-                health_data = json.loads(result.stdout)
-                logger.info(f"✅ Connected to Atlas API v{health_data.get('version', 'unknown')}")
-                
-                # Check if database is healthy
-                db_status = health_data.get('components', {}).get('database', {}).get('status')
-                if db_status != 'healthy':
-                    logger.warning(f"⚠️ Database status: {db_status}")
-                else:
-                    logger.info(f"📊 Database healthy with {health_data.get('components', {}).get('database', {}).get('assets_count', 0)} assets")
+            # Check if database is healthy
+            db_status = health_data.get('components', {}).get('database', {}).get('status')
+            if db_status != 'healthy':
+                logger.warning(f"⚠️ Database status: {db_status}")
             else:
-                raise Exception(f"API health check failed: {result.stderr}")
-        except subprocess.TimeoutExpired:
-            logger.error(f"❌ Timeout connecting to Atlas API at {self.api_base_url}")
-            raise
+                logger.info(f"📊 Database healthy with {health_data.get('components', {}).get('database', {}).get('assets_count', 0)} assets")
         except json.JSONDecodeError as e:
             logger.error(f"❌ Invalid JSON response from API: {e}")
             raise
@@ -199,50 +199,22 @@ class AtlasMetadataIngester:
         return list(tags)
     
     def create_asset(self, asset_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
-        """Create asset using curl via subprocess"""
+        """Create one asset (POST /api/v1/assets)"""
         try:
-            # Convert asset_data to JSON
-            json_data = json.dumps(asset_data)
+            response = self.http.post_json("/api/v1/assets", asset_data)
             
-            # Use curl via subprocess
-            curl_cmd = [
-                'curl', '-X', 'POST', 
-                f"{self.api_base_url}/api/v1/assets",
-                '-H', 'Content-Type: application/json',
-                '-H', 'User-Agent: Atlas-Metadata-Ingester-Curl/1.0',
-                '-d', json_data,
-                '--silent',  # Suppress progress output
-                '--show-error',  # Show errors
-                '--fail'  # Fail silently on HTTP errors
-            ]
-            
-            result = subprocess.run(curl_cmd, capture_output=True, text=True, timeout=30)
-            
-            if result.returncode == 0:
-                response_data = json.loads(result.stdout)
+            if response.ok:
+                response_data = response.json()
                 logger.info(f"✅ Created asset: {response_data.get('name')} (ID: {response_data.get('id')})")
                 return response_data
             
-            elif result.returncode == 22:  # HTTP error (409, etc.)
-                # Try to parse error response
-                try:
-                    error_data = json.loads(result.stderr) if result.stderr else "HTTP error"
-                    if "already exists" in str(error_data):
-                        logger.warning(f"⚠️ Asset already exists: {asset_data['name']}")
-                        return None
-                    else:
-                        logger.error(f"❌ HTTP error creating asset {asset_data['name']}: {error_data}")
-                        return None
-                except json.JSONDecodeError:
-                    logger.error(f"❌ HTTP error creating asset {asset_data['name']}: {result.stderr}")
-                    return None
+            error_text = response.data.decode('utf-8', 'replace')
+            if "already exists" in error_text:
+                logger.warning(f"⚠️ Asset already exists: {asset_data['name']}")
             else:
-                logger.error(f"❌ Curl failed creating asset {asset_data['name']}: {result.stderr}")
-                return None
-                
-        except subprocess.TimeoutExpired:
-            logger.error(f"❌ Timeout creating asset {asset_data['name']}")
+                logger.error(f"❌ HTTP {response.status} creating asset {asset_data['name']}: {error_text}")
             return None
+                
         except json.JSONDecodeError as e:
             logger.error(f"❌ Invalid JSON response creating asset {asset_data['name']}: {e}")
             return None
@@ -250,8 +222,8 @@ class AtlasMetadataIngester:
             logger.error(f"❌ Unexpected error creating asset {asset_data['name']}: {e}")
             return None
     
-    def ingest_metadata_file(self, metadata_file_path: str) -> Optional[Dict[str, Any]]:
-        """Ingest a single metadata.json file"""
+    def _load_asset_data(self, metadata_file_path: str) -> Optional[Dict[str, Any]]:
+        """Read a metadata file and transform it into an asset payload (None if unusable)"""
         metadata_path = Path(metadata_file_path)
         
         if not metadata_path.exists():
@@ -274,16 +246,7 @@ class AtlasMetadataIngester:
                 return None
             
             # Transform to asset format
-            asset_data = self.transform_metadata_to_asset(metadata, str(metadata_path))
-            
-            # Create asset
-            result = self.create_asset(asset_data)
-            
-            if result:
-                logger.info(f"🎉 Successfully ingested asset: {result['name']}")
-                return result
-            else:
-                return None
+            return self.transform_metadata_to_asset(metadata, str(metadata_path))
                 
         except json.JSONDecodeError as e:
             logger.error(f"❌ Invalid JSON in {metadata_file_path}: {e}")
@@ -292,8 +255,28 @@ class AtlasMetadataIngester:
             logger.error(f"❌ Error processing {metadata_file_path}: {e}")
             return None
     
-    def ingest_directory(self, directory_path: str, recursive: bool = False) -> Dict[str, Any]:
-        """Ingest all metadata files in a directory"""
+    def ingest_metadata_file(self, metadata_file_path: str) -> Optional[Dict[str, Any]]:
+        """Ingest a single metadata.json file"""
+        asset_data = self._load_asset_data(metadata_file_path)
+        if asset_data is None:
+            return None
+        
+        # Create asset
+        result = self.create_asset(asset_data)
+        
+        if result:
+            logger.info(f"🎉 Successfully ingested asset: {result['name']}")
+            return result
+        else:
+            return None
+    
+    def ingest_directory(self, directory_path: str, recursive: bool = False,
+                         batch_size: int = 500) -> Dict[str, Any]:
+        """
+        Ingest all metadata files in a directory
+        
+        Batching and the bulk-endpoint fallback are AtlasAPIClient.ingest_metadata_files.
+        """
         directory = Path(directory_path)
         
         if not directory.exists() or not directory.is_dir():
@@ -312,40 +295,14 @@ class AtlasMetadataIngester:
         
         logger.info(f"📁 Found {len(metadata_files)} metadata files in {directory_path}")
         
-        # Process each file
-        stats = {"success": 0, "failed": 0, "skipped": 0}
-        
-        for metadata_file in metadata_files:
-            result = self.ingest_metadata_file(str(metadata_file))
-            if result:
-                stats["success"] += 1
-            elif result is None:
-                stats["skipped"] += 1
-            else:
-                stats["failed"] += 1
-        
-        logger.info(f"📊 Ingestion complete: {stats['success']} successful, {stats['failed']} failed, {stats['skipped']} skipped")
-        return stats
+        return self.ingest_metadata_files(map(str, metadata_files), batch_size=batch_size)
     
     def get_asset_by_name(self, name: str) -> Optional[Dict[str, Any]]:
-        """Search for an existing asset by name using curl"""
+        """Search for an existing asset by name"""
         try:
-            # Encode the search parameter
-            import urllib.parse
-            search_param = urllib.parse.quote(name)
-            
-            curl_cmd = [
-                'curl', '-s', '-f',
-                f"{self.api_base_url}/api/v1/assets?search={search_param}&limit=1"
-            ]
-            
-            result = subprocess.run(curl_cmd, capture_output=True, text=True, timeout=10)
-            
-            if result.returncode == 0:
-                data = json.loads(result.stdout)
-                if data.get("items") and len(data["items"]) > 0:
-                    return data["items"][0]
-            
+            data = self.http.get_json("/api/v1/assets", params={"search": name, "limit": 1})
+            if data.get("items") and len(data["items"]) > 0:
+                return data["items"][0]
             return None
             
         except Exception as e:
@@ -355,7 +312,7 @@ class AtlasMetadataIngester:
 def main():
     """Main function to handle command line arguments"""
     parser = argparse.ArgumentParser(
-        description="Ingest Houdini metadata.json files into Blacksmith Atlas API using curl"
+        description="Ingest Houdini metadata.json files into Blacksmith Atlas API"
     )
     
     parser.add_argument(
@@ -0,0 +1,58 @@
+# tests/backend/conftest.py - Shared fixtures: repository root on sys.path, scratch ArangoDB database, scratch library
+import os
+import sys
+import uuid
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+
+@pytest.fixture
+def arango_db():
+    """
+    Throwaway ArangoDB database holding an empty Atlas_Library collection
+
+    Uses ARANGO_HOST/ARANGO_PORT/ARANGO_USER/ARANGO_PASSWORD like the backend;
+    skipped when python-arango is missing or the server is not reachable.
+    """
+    arango = pytest.importorskip("arango")
+    client = arango.ArangoClient(hosts=f"http://{os.getenv('ARANGO_HOST', 'localhost')}:"
+                                       f"{os.getenv('ARANGO_PORT', '8529')}")
+    credentials = {'username': os.getenv('ARANGO_USER', 'root'),
+                   'password': os.getenv('ARANGO_PASSWORD', 'atlas_password')}
+    try:
+        system_db = client.db('_system', **credentials)
+        system_db.version()
+    except Exception as e:
+        pytest.skip(f"ArangoDB not available: {e}")
+
+    name = f"atlas_test_{uuid.uuid4().hex[:12]}"
+    system_db.create_database(name)
+    try:
+        db = client.db(name, **credentials)
+        db.create_collection('Atlas_Library')
+        yield db
+    finally:
+        system_db.delete_database(name, ignore_missing=True)
+
+
+@pytest.fixture
+def library(request, tmp_path, monkeypatch):
+    """
+    LibrarySync over a scratch library under tmp_path: ``(sync, roots)``
+
+    Creates 3D/Assets/Props/<name>/metadata.json (asset id = name) for each
+    name; parametrize indirectly with a tuple of names to change the default
+    Chair and Table.
+    """
+    from backend.core.library_sync import LibrarySync
+
+    roots = {"3D": tmp_path / "3D", "2D": tmp_path / "2D"}
+    for name in getattr(request, 'param', ("Chair", "Table")):
+        folder = roots["3D"] / "Assets" / "Props" / name
+        folder.mkdir(parents=True)
+        (folder / "metadata.json").write_text('{"asset_id": "%s"}' % name)
+    monkeypatch.setattr(LibrarySync, 'library_roots', staticmethod(lambda: roots))
+    return LibrarySync(tmp_path / "manifest.json", workers=2), roots
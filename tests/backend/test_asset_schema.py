@@ -0,0 +1,65 @@
+# tests/backend/test_asset_schema.py - Canonical fields after partial updates (PATCH /assets/{id})
+from backend.core.asset_schema import canonical_fields, normalize_asset_document, patch_updates, derived_after_patch
+
+
+def _merge(document, updates):
+    """What an AQL ``UPDATE doc WITH @updates`` stores (objects are merged recursively)"""
+    merged = dict(document)
+    for name, value in updates.items():
+        if isinstance(value, dict) and isinstance(merged.get(name), dict):
+            merged[name] = _merge(merged[name], value)
+        else:
+            merged[name] = value
+    return merged
+
+
+def _houdini_export():
+    return normalize_asset_document({
+        '_key': "3D123456789AA001",
+        'id': "3D123456789AA001",
+        'name': "Chair",
+        'category': "Props",
+        'created_by': "artist",
+        'metadata': {'description': "Exported description", 'export_metadata': {'variant_name': "default"}}
+    })
+
+
+def _patch(document, update):
+    updates = patch_updates(update)
+    updated = _merge(document, updates)
+    return _merge(updated, derived_after_patch(updated, updates))
+
+
+def test_patched_description_wins_over_exported_metadata():
+    document = _patch(_houdini_export(), {'name': "Chair 2", 'description': "Edited", 'tags': ["wood"]})
+    assert document['description'] == "Edited"
+    assert document['metadata']['description'] == "Edited"
+    # Other metadata is kept, and later normalizations keep the edit
+    assert document['metadata']['export_metadata'] == {'variant_name': "default"}
+    assert canonical_fields(document)['description'] == "Edited"
+
+
+def test_patch_without_metadata_description():
+    document = normalize_asset_document({'_key': "A1B2C3D4E5", 'name': "Rock", 'category': "Nature"})
+    document = _patch(document, {'description': "Mossy rock"})
+    assert document['description'] == document['metadata']['description'] == "Mossy rock"
+
+
+def test_patch_keeps_explicit_metadata_keys():
+    updates = patch_updates({'description': "Edited", 'metadata': {'notes': "x"}})
+    assert updates['metadata'] == {'notes': "x", 'description': "Edited"}
+
+
+def test_patch_of_other_fields_leaves_description_alone():
+    original = _houdini_export()
+    updates = patch_updates({'tags': ["wood"]})
+    assert 'metadata' not in updates
+    document = _patch(original, {'tags': ["wood"]})
+    assert document['description'] == "Exported description"
+
+
+def test_changed_derived_fields_are_still_restamped():
+    document = _houdini_export()
+    updates = patch_updates({'created_by': "someone"})
+    updated = _merge(document, updates)
+    assert derived_after_patch(updated, updates) == {'artist': "someone"}
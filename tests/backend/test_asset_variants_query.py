@@ -0,0 +1,38 @@
+# tests/backend/test_asset_variants_query.py - AssetQueries.get_asset_variants against a real ArangoDB
+import pytest
+
+pytest.importorskip("arango")
+
+from backend.assetlibrary.database.arango_queries import AssetQueries  # noqa: E402
+
+
+def _asset(key, variant_id, version, name, variant_name=None):
+    return {
+        '_key': key,
+        'name': name,
+        'base_uid': key[:11],
+        'variant_id': variant_id,
+        'version': version,
+        'metadata': {'export_metadata': {'variant_name': variant_name}} if variant_name else {}
+    }
+
+
+def test_variants_report_the_newest_version_of_each_variant(arango_db):
+    arango_db.collection('Atlas_Library').insert_many([
+        _asset("A1B2C3D4E5FAA001", "AA", 1, "Chair", "default"),
+        _asset("A1B2C3D4E5FAA002", "AA", 2, "Chair v2", "default"),
+        _asset("A1B2C3D4E5FAB001", "AB", 1, "Chair Red", "red"),
+        _asset("FFFFFFFFFFFAA001", "AA", 1, "Other asset")
+    ])
+
+    variants = sorted(AssetQueries({}, db=arango_db).get_asset_variants("A1B2C3D4E5F"),
+                      key=lambda variant: variant['variant_id'])
+
+    assert variants == [
+        {'variant_id': "AA", 'variant_name': "default", 'name': "Chair v2", 'versions': 2, 'latest_version': 2},
+        {'variant_id': "AB", 'variant_name': "red", 'name': "Chair Red", 'versions': 1, 'latest_version': 1}
+    ]
+
+
+def test_unknown_base_uid_has_no_variants(arango_db):
+    assert AssetQueries({}, db=arango_db).get_asset_variants("000000000000") == []
@@ -0,0 +1,85 @@
+# tests/backend/test_asset_versions.py - Asset UID parsing and next-free variant/version lookups
+import pytest
+
+from backend.core.asset_versions import parse_asset_uid, split_base_id, next_variant_id, next_version
+
+
+@pytest.mark.parametrize("asset_id, expected", [
+    # 11-character base (current exports)
+    ("3D123456789AA001", {'base_uid': "3D123456789", 'variant_id': "AA", 'version': 1}),
+    ("3d123456789ab042", {'base_uid': "3D123456789", 'variant_id': "AB", 'version': 42}),
+    # 12- and 9-character bases (older exports)
+    ("3D1234567890ZZ999", {'base_uid': "3D1234567890", 'variant_id': "ZZ", 'version': 999}),
+    ("ABCDEFGHIBA010", {'base_uid': "ABCDEFGHI", 'variant_id': "BA", 'version': 10}),
+    # Legacy base + version without a variant
+    ("ABCDEFGHI007", {'base_uid': "ABCDEFGHI", 'variant_id': None, 'version': 7}),
+    # Malformed
+    ("", None),
+    (None, None),
+    ("A1B2C3D4E5", None),
+    ("3D123456789AA01", None),
+    ("3D123456789AA0001", None),
+    ("3D123456789A1001", None),
+    ("3D1234567_9AA001", None),
+    ("3D12345678AA001", None),
+])
+def test_parse_asset_uid(asset_id, expected):
+    assert parse_asset_uid(asset_id) == expected
+
+
+@pytest.mark.parametrize("base_id, expected", [
+    ("3D123456789", {'base_uid': "3D123456789", 'variant_id': None}),
+    ("3d123456789", {'base_uid': "3D123456789", 'variant_id': None}),
+    ("3D123456789AB", {'base_uid': "3D123456789", 'variant_id': "AB"}),
+    # 12- and 9-character bases (older exports), with and without a variant
+    ("ABCDEFGHIJKL", {'base_uid': "ABCDEFGHIJKL", 'variant_id': None}),
+    ("3D123456789A", {'base_uid': "3D123456789A", 'variant_id': None}),
+    ("3D1234567890ZZ", {'base_uid': "3D1234567890", 'variant_id': "ZZ"}),
+    ("ABCDEFGHI", {'base_uid': "ABCDEFGHI", 'variant_id': None}),
+    # A 9-character base + variant reads as an 11-character base
+    ("ABCDEFGHIBA", {'base_uid': "ABCDEFGHIBA", 'variant_id': None}),
+])
+def test_split_base_id(base_id, expected):
+    assert split_base_id(base_id) == expected
+
+
+@pytest.mark.parametrize("base_id", [
+    "", None, "ABCDEFGH", "3D12345678", "3D123456789A1", "3D1234567890ZZZ", "3D123456789AB001", "3D12345678-"
+])
+def test_split_base_id_rejects_malformed(base_id):
+    with pytest.raises(ValueError):
+        split_base_id(base_id)
+
+
+def _variants(count):
+    return [chr(ord('A') + n // 26) + chr(ord('A') + n % 26) for n in range(count)]
+
+
+@pytest.mark.parametrize("existing, expected", [
+    ([], "AA"),
+    (["AA"], "AB"),
+    (["AA", "AC"], "AB"),
+    (["AB"], "AA"),
+    # Rollover from the second letter to the first
+    (_variants(26), "BA"),
+    (["AZ", *_variants(25)], "BA"),
+    (_variants(26 * 26 - 1), "ZZ"),
+    (_variants(26 * 26), None),
+    # Blank and malformed entries are ignored
+    ([None, "", "A", "AAA"], "AA"),
+])
+def test_next_variant_id(existing, expected):
+    assert next_variant_id(existing) == expected
+
+
+@pytest.mark.parametrize("existing, expected", [
+    ([], 1),
+    ([1], 2),
+    ([3, 1, 2], 4),
+    ([1, 5], 6),
+    ([998], 999),
+    ([999], None),
+    (iter([2, 7]), 8),
+])
+def test_next_version(existing, expected):
+    assert next_version(existing) == expected
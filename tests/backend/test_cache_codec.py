@@ -0,0 +1,108 @@
+# tests/backend/test_cache_codec.py - Cache value codec: round trips, compression threshold, legacy values
+import json
+import pickle
+from datetime import datetime
+
+import pytest
+
+from backend.core import cache_codec as codec_module
+from backend.core.cache_codec import CacheCodec, CacheCodecError, HEADER_MARK, SERIALIZER_IDS, COMPRESSION_IDS
+
+# Module attribute of the optional library each choice needs
+REQUIRES = {'msgpack': 'msgpack', 'zstd': 'zstandard', 'lz4': 'lz4_frame'}
+
+VALUE = {
+    "items": [{"id": f"3D{n:09d}AA001", "name": f"Asset {n}", "tags": ["prop", "wood"], "size": n * 1.5}
+              for n in range(200)],
+    "total": 200,
+    "has_more": False,
+    "next_cursor": None,
+    "unicode": "Ölgemälde ☕"
+}
+
+
+def _codec(serializer, compression, compress_above=16384):
+    for name in (serializer, compression):
+        if name in REQUIRES and getattr(codec_module, REQUIRES[name]) is None:
+            pytest.skip(f"{name} support is not installed")
+    return CacheCodec(serializer=serializer, compression=compression, compress_above=compress_above)
+
+
+def _header(data):
+    return (data[0] >> 2) & 0x07, data[0] & 0x03
+
+
+@pytest.mark.parametrize("compression", ['none', 'zlib', 'lz4', 'zstd'])
+@pytest.mark.parametrize("serializer", ['json', 'msgpack'])
+def test_round_trip(serializer, compression):
+    codec = _codec(serializer, compression, compress_above=1024)
+    encoded = codec.encode(VALUE)
+    assert _header(encoded) == (SERIALIZER_IDS[serializer], COMPRESSION_IDS[compression])
+    assert codec.decode(encoded) == VALUE
+
+    body = json.dumps(VALUE).encode('utf-8')
+    framed = codec.encode_bytes(body)
+    assert _header(framed) == (SERIALIZER_IDS['raw'], COMPRESSION_IDS[compression])
+    assert codec.decode(framed) == body
+
+
+@pytest.mark.parametrize("compression", ['zlib', 'lz4', 'zstd'])
+def test_values_decode_under_another_configuration(compression):
+    written = _codec('json', compression, compress_above=0).encode(VALUE)
+    assert CacheCodec(serializer='json', compression='none').decode(written) == VALUE
+
+
+def test_encode_handles_datetimes_and_sets():
+    codec = CacheCodec(serializer='json', compression='none')
+    value = {"created_at": datetime(2026, 1, 2, 3, 4, 5), "tags": {"wood"}}
+    assert codec.decode(codec.encode(value)) == {"created_at": "2026-01-02T03:04:05", "tags": ["wood"]}
+
+
+def test_encode_refuses_arbitrary_objects():
+    with pytest.raises(TypeError):
+        CacheCodec(serializer='json', compression='none').encode({"value": object()})
+
+
+@pytest.mark.parametrize("size, compressed", [(4095, False), (4096, True), (4097, True)])
+def test_compress_threshold_boundary(size, compressed):
+    codec = CacheCodec(serializer='json', compression='zlib', compress_above=4096)
+    payload = b"a" * size
+    framed = codec.encode_bytes(payload)
+    assert _header(framed)[1] == (COMPRESSION_IDS['zlib'] if compressed else COMPRESSION_IDS['none'])
+    assert (len(framed) < size) is compressed
+    assert codec.decode(framed) == payload
+
+
+def test_incompressible_payload_is_stored_plain():
+    codec = CacheCodec(serializer='json', compression='zlib', compress_above=16)
+    payload = bytes(range(256))
+    framed = codec.encode_bytes(payload)
+    assert _header(framed)[1] == COMPRESSION_IDS['none']
+    assert framed[1:] == payload
+
+
+@pytest.mark.parametrize("legacy", [
+    b"",
+    json.dumps(VALUE).encode('utf-8'),
+    json.dumps([1, 2, 3]).encode('utf-8'),
+    b'"a string"',
+    pickle.dumps(VALUE),
+    pickle.dumps(VALUE, protocol=2),
+])
+def test_values_written_before_the_codec_are_rejected(legacy):
+    with pytest.raises(CacheCodecError):
+        CacheCodec(serializer='json', compression='none').decode(legacy)
+
+
+def test_corrupt_payload_is_rejected():
+    codec = CacheCodec(serializer='json', compression='zlib', compress_above=0)
+    framed = codec.encode(VALUE)
+    with pytest.raises(CacheCodecError):
+        codec.decode(framed[:-10])
+    with pytest.raises(CacheCodecError):
+        codec.decode(bytes((HEADER_MARK | SERIALIZER_IDS['json'] << 2,)) + b"{not json")
+
+
+def test_unknown_serializer_is_refused():
+    with pytest.raises(ValueError):
+        CacheCodec(serializer='pickle')
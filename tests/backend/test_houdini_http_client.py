@@ -0,0 +1,120 @@
+# tests/backend/test_houdini_http_client.py - Which failures the Houdini API client retries, per HTTP method
+import http.client
+import socket
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "bl-atlas-houdini" / "python"))
+
+from api_client import AtlasHTTPClient  # noqa: E402
+
+
+class FakeResponse:
+    # Keeps scripted connections out of the pool unless a test puts one there
+    will_close = True
+
+    def __init__(self, status):
+        self.status = status
+
+    def read(self):
+        return b'{}'
+
+    def getheader(self, name, default=None):
+        return default
+
+    def getheaders(self):
+        return []
+
+
+class FakeConnection:
+    """Plays one scripted outcome: an exception from connect/request/getresponse, or a status"""
+
+    def __init__(self, outcome):
+        self.outcome = outcome
+        self.requests = 0
+
+    def connect(self):
+        if isinstance(self.outcome, ConnectionRefusedError):
+            raise self.outcome
+
+    def request(self, method, url, body=None, headers=None):
+        self.requests += 1
+        if isinstance(self.outcome, (BrokenPipeError, http.client.RemoteDisconnected)):
+            raise self.outcome
+
+    def getresponse(self):
+        if isinstance(self.outcome, Exception):
+            raise self.outcome
+        return FakeResponse(self.outcome)
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def client(monkeypatch):
+    """Client whose new connections play the outcomes in ``client.outcomes`` in turn"""
+    client = AtlasHTTPClient("http://atlas.test", retries=2, backoff=0)
+    client.outcomes = []
+    client.sent = 0
+
+    def new_connection():
+        connection = FakeConnection(client.outcomes.pop(0))
+        original = connection.request
+
+        def request(*args, **kwargs):
+            client.sent += 1
+            return original(*args, **kwargs)
+        connection.request = request
+        return connection
+    monkeypatch.setattr(client, '_new_connection', new_connection)
+    return client
+
+
+@pytest.mark.parametrize("method, retry, retried", [
+    ('GET', None, True),
+    ('PUT', None, True),
+    ('POST', None, False),
+    ('PATCH', None, False),
+    ('POST', True, True),
+    ('GET', False, False),
+])
+def test_read_timeouts_and_5xx_are_retried_only_when_safe(client, method, retry, retried):
+    client.outcomes = [socket.timeout("timed out"), 200]
+    if retried:
+        assert client.request(method, "/api/v1/assets", retry=retry).status == 200
+    else:
+        with pytest.raises(socket.timeout):
+            client.request(method, "/api/v1/assets", retry=retry)
+    assert client.sent == (2 if retried else 1)
+
+    client.sent = 0
+    client.outcomes = [503, 200]
+    assert client.request(method, "/api/v1/assets", retry=retry).status == (200 if retried else 503)
+    assert client.sent == (2 if retried else 1)
+
+
+def test_failed_connect_is_retried_for_any_method(client):
+    client.outcomes = [ConnectionRefusedError(), ConnectionRefusedError(), 201]
+    assert client.request('POST', "/api/v1/assets", body={"name": "a"}).status == 201
+    assert client.sent == 1
+
+    client.outcomes = [ConnectionRefusedError()] * 3
+    with pytest.raises(ConnectionRefusedError):
+        client.request('POST', "/api/v1/assets", body={"name": "a"})
+
+
+@pytest.mark.parametrize("error", [http.client.RemoteDisconnected("closed"), BrokenPipeError()])
+def test_stale_pooled_connection_is_retried_for_any_method(client, error):
+    client._idle.put_nowait(FakeConnection(error))
+    client.outcomes = [201]
+    assert client.request('POST', "/api/v1/assets", body={"name": "a"}).status == 201
+    assert client.sent == 1
+
+
+def test_fresh_connection_closed_mid_request_is_not_retried_for_post(client):
+    client.outcomes = [http.client.RemoteDisconnected("closed"), 201]
+    with pytest.raises(http.client.RemoteDisconnected):
+        client.request('POST', "/api/v1/assets", body={"name": "a"})
@@ -0,0 +1,100 @@
+# tests/backend/test_http_cache.py - Conditional GET: ETag / If-None-Match / If-Modified-Since -> 304
+import asyncio
+import os
+from email.utils import formatdate
+
+import pytest
+
+pytest.importorskip("fastapi")
+
+from fastapi import Request  # noqa: E402
+
+from backend.core.asset_paths import file_version  # noqa: E402
+from backend.core.http_cache import conditional_file_response, IMMUTABLE_CACHE_CONTROL  # noqa: E402
+
+
+def _request(headers=None, query=""):
+    return Request({
+        'type': 'http',
+        'method': 'GET',
+        'path': '/thumbnails/A',
+        'query_string': query.encode('ascii'),
+        'headers': [(name.lower().encode('latin-1'), value.encode('latin-1'))
+                    for name, value in (headers or {}).items()]
+    })
+
+
+def _respond(path, headers=None, query="", version=None):
+    return asyncio.run(conditional_file_response(
+        _request(headers, query), path, media_type="image/png", cache_control="public, max-age=300",
+        headers={"Vary": "Accept"}, version=version
+    ))
+
+
+@pytest.fixture
+def image(tmp_path):
+    path = tmp_path / "thumbnail.png"
+    path.write_bytes(b"\x89PNG fake")
+    os.utime(path, (1_700_000_000, 1_700_000_000))
+    return path
+
+
+def test_full_response_carries_validators(image):
+    response = _respond(image)
+    assert response.status_code == 200
+    assert response.headers["etag"] == f'"{file_version(os.stat(image))}"'
+    assert response.headers["last-modified"] == formatdate(1_700_000_000, usegmt=True)
+    assert response.headers["cache-control"] == "public, max-age=300"
+    assert response.headers["vary"] == "Accept"
+
+
+@pytest.mark.parametrize("if_none_match, modified", [
+    ("{etag}", False),
+    ("W/{etag}", False),
+    ('"other", {etag}', False),
+    ("*", False),
+    ('"other"', True),
+])
+def test_if_none_match(image, if_none_match, modified):
+    etag = f'"{file_version(os.stat(image))}"'
+    response = _respond(image, {"If-None-Match": if_none_match.format(etag=etag)})
+    assert response.status_code == (200 if modified else 304)
+    assert response.headers["etag"] == etag
+
+
+@pytest.mark.parametrize("if_modified_since, modified", [
+    (formatdate(1_700_000_000, usegmt=True), False),
+    (formatdate(1_700_000_100, usegmt=True), False),
+    (formatdate(1_699_999_999, usegmt=True), True),
+    ("not a date", True),
+])
+def test_if_modified_since(image, if_modified_since, modified):
+    response = _respond(image, {"If-Modified-Since": if_modified_since})
+    assert response.status_code == (200 if modified else 304)
+
+
+def test_if_none_match_wins_over_if_modified_since(image):
+    response = _respond(image, {"If-None-Match": '"other"',
+                                "If-Modified-Since": formatdate(1_700_000_100, usegmt=True)})
+    assert response.status_code == 200
+
+
+def test_changed_file_is_served_again(image):
+    etag = _respond(image).headers["etag"]
+    image.write_bytes(b"\x89PNG changed content")
+    response = _respond(image, {"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["etag"] != etag
+
+
+def test_versioned_url_is_immutable(image):
+    version = file_version(os.stat(image))
+    assert _respond(image, query=f"v={version}").headers["cache-control"] == IMMUTABLE_CACHE_CONTROL
+    assert _respond(image, query="v=stale").headers["cache-control"] == "public, max-age=300"
+    # The source version of a derivative decides, not the served file's own
+    assert _respond(image, query="v=source", version="source").headers["cache-control"] == IMMUTABLE_CACHE_CONTROL
+
+
+def test_missing_file_raises(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        _respond(tmp_path / "missing.png")
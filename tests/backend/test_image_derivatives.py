@@ -0,0 +1,103 @@
+# tests/backend/test_image_derivatives.py - Thumbnail format negotiation, size buckets and the derivative cache
+from pathlib import Path
+
+import pytest
+
+from backend.core import image_derivatives
+from backend.core.image_derivatives import (
+    negotiate_format, size_bucket, get_derivative, cached_derivative, SIZE_BUCKETS
+)
+
+PNG = Path("thumb.png")
+EXR = Path("thumb.exr")
+BROWSER_ACCEPT = "image/avif,image/webp,image/apng,image/*,*/*;q=0.8"
+
+
+@pytest.fixture
+def formats(monkeypatch):
+    """Pretend Pillow can encode exactly the given formats"""
+    def install(*names):
+        monkeypatch.setattr(image_derivatives, 'supported_formats', lambda: set(names))
+    install('avif', 'webp', 'jpeg', 'png')
+    return install
+
+
+@pytest.mark.parametrize("width, bucket", [
+    (1, 64), (64, 64), (65, 128), (256, 256), (257, 512), (2048, 2048), (4096, 2048)
+])
+def test_size_bucket(width, bucket):
+    assert size_bucket(width) == bucket
+    assert bucket in SIZE_BUCKETS
+
+
+@pytest.mark.parametrize("requested, accept, source, expected", [
+    # Explicit format wins (jpg is an alias)
+    ("webp", "", PNG, "webp"),
+    ("JPG", BROWSER_ACCEPT, PNG, "jpeg"),
+    # Negotiated from Accept, AVIF first
+    (None, BROWSER_ACCEPT, PNG, "avif"),
+    (None, "image/webp,*/*", PNG, "webp"),
+    # Browser-safe sources are served unchanged when nothing better is accepted
+    (None, "*/*", PNG, None),
+    (None, "", PNG, None),
+    # EXR/TIFF are always converted
+    (None, "*/*", EXR, "png"),
+    (None, "", Path("thumb.TIF"), "png"),
+])
+def test_negotiate_format(formats, requested, accept, source, expected):
+    assert negotiate_format(requested, accept, source) == expected
+
+
+def test_negotiation_skips_formats_pillow_cannot_encode(formats):
+    formats('webp', 'png')
+    assert negotiate_format(None, BROWSER_ACCEPT, PNG) == "webp"
+    # An unavailable explicit format falls back to the Accept header
+    assert negotiate_format("avif", "image/webp", PNG) == "webp"
+    formats()
+    assert negotiate_format(None, BROWSER_ACCEPT, EXR) is None
+
+
+def test_unknown_format_is_rejected(formats):
+    with pytest.raises(ValueError):
+        negotiate_format("gif", "", PNG)
+
+
+@pytest.fixture
+def source(tmp_path, monkeypatch):
+    Image = pytest.importorskip("PIL.Image")
+    monkeypatch.setattr(image_derivatives, '_cache_root', lambda: tmp_path / "cache")
+    path = tmp_path / "thumb.png"
+    Image.new("RGBA", (600, 300), (255, 0, 0, 128)).save(path)
+    return path
+
+
+def test_derivative_is_resized_to_the_bucket_and_cached(source):
+    from PIL import Image
+    assert cached_derivative(source, 200, 'webp') is None
+
+    target, media_type = get_derivative(source, 200, 'webp')
+    assert media_type == "image/webp"
+    with Image.open(target) as image:
+        assert image.size == (256, 128)
+        assert image.mode == "RGBA"
+
+    # Same bucket, same file; found without decoding
+    assert cached_derivative(source, 250, 'webp') == (target, "image/webp")
+    assert get_derivative(source, 250, 'webp')[0] == target
+
+
+def test_jpeg_derivative_drops_alpha_and_never_upscales(source):
+    from PIL import Image
+    target, media_type = get_derivative(source, 1024, 'jpeg')
+    assert media_type == "image/jpeg"
+    with Image.open(target) as image:
+        assert image.size == (600, 300)
+        assert image.mode == "RGB"
+
+
+def test_rewritten_source_gets_a_new_derivative(source):
+    from PIL import Image
+    first, _ = get_derivative(source, 64, 'png')
+    Image.new("RGB", (300, 300)).save(source)
+    assert cached_derivative(source, 64, 'png') is None
+    assert get_derivative(source, 64, 'png')[0] != first
@@ -0,0 +1,171 @@
+# tests/backend/test_job_queue.py - Job queue claims, retries with backoff, and stale-job recovery
+import asyncio
+import time
+from datetime import datetime, timedelta
+
+import pytest
+
+from backend.core.jobs import JobQueue
+
+
+@pytest.fixture
+def queue(tmp_path):
+    return JobQueue(tmp_path / "jobs.sqlite3", workers=1, max_attempts=3, retry_delay=60, stale_after=300)
+
+
+def _run(queue, job):
+    asyncio.run(queue._run_job(job))
+    return queue.get(job['id'])
+
+
+def _make_runnable(queue, job_id):
+    queue._update(job_id, run_after=time.time() - 1)
+
+
+async def _succeed(payload, progress):
+    await progress(50, "Half way")
+    return {"echo": payload['value']}
+
+
+async def _fail(payload, progress):
+    raise RuntimeError("disk full")
+
+
+def test_submit_requires_a_registered_kind(queue):
+    with pytest.raises(ValueError):
+        queue.submit('unknown', {})
+
+
+def test_claim_takes_the_oldest_job_of_a_registered_kind_once(queue):
+    queue.register('convert', _succeed)
+    first = queue.submit('convert', {'value': 1})
+    queue.submit('convert', {'value': 2})
+
+    claimed = queue._claim()
+    assert claimed['id'] == first['id']
+    assert claimed['attempts'] == 1
+    stored = queue.get(first['id'])
+    assert stored['status'] == 'running' and stored['worker'] == queue.worker_id
+
+    assert queue._claim()['payload'] == {'value': 2}
+    assert queue._claim() is None
+
+
+def test_claim_skips_kinds_without_a_handler(tmp_path):
+    producer = JobQueue(tmp_path / "jobs.sqlite3", workers=1)
+    producer.register('upload', _succeed)
+    producer.submit('upload', {'value': 1})
+
+    consumer = JobQueue(tmp_path / "jobs.sqlite3", workers=1)
+    consumer.register('convert', _succeed)
+    assert consumer._claim() is None
+
+
+def test_successful_job_records_its_result(queue):
+    queue.register('convert', _succeed)
+    queue.submit('convert', {'value': 7})
+    job = _run(queue, queue._claim())
+    assert job['status'] == 'succeeded'
+    assert job['result'] == {'echo': 7}
+    assert job['progress'] == 100.0
+    assert job['finished_at'] is not None
+    assert queue.counts()['succeeded'] == 1
+
+
+def test_failed_job_is_retried_with_backoff_then_fails(queue):
+    queue.register('convert', _fail)
+    job_id = queue.submit('convert', {})['id']
+
+    for attempt in (1, 2):
+        before = time.time()
+        job = _run(queue, queue._claim())
+        assert job['status'] == 'queued' and job['attempts'] == attempt
+        assert job['error'] == "RuntimeError: disk full"
+        # Not runnable again until the backoff (retry_delay * 2^(attempt-1)) has passed
+        with queue._connect() as connection:
+            run_after = connection.execute("SELECT run_after FROM jobs WHERE id = ?", (job_id,)).fetchone()[0]
+        assert run_after >= before + 60 * 2 ** (attempt - 1)
+        assert queue._claim() is None
+        _make_runnable(queue, job_id)
+
+    job = _run(queue, queue._claim())
+    assert job['status'] == 'failed' and job['attempts'] == 3
+    assert queue.retried == 2 and queue.failed == 1
+
+
+def test_non_retryable_error_fails_immediately(queue):
+    queue.register('convert', _fail, should_retry=lambda error: not isinstance(error, RuntimeError))
+    queue.submit('convert', {})
+    job = _run(queue, queue._claim())
+    assert job['status'] == 'failed' and job['attempts'] == 1
+
+
+def test_unique_submit_reuses_the_queued_or_running_job(queue):
+    queue.register('convert', _succeed)
+    first = queue.submit('convert', {'source': "a.exr", 'target': "a"}, unique=True)
+    # Same payload in another key order is the same job
+    assert queue.submit('convert', {'target': "a", 'source': "a.exr"}, unique=True)['id'] == first['id']
+    assert queue.submit('convert', {'source': "b.exr", 'target': "b"}, unique=True)['id'] != first['id']
+
+    assert queue._claim()['id'] == first['id']
+    assert queue.submit('convert', {'source': "a.exr", 'target': "a"}, unique=True)['id'] == first['id']
+
+    queue._update(first['id'], status='failed')
+    retry = queue.submit('convert', {'source': "a.exr", 'target': "a"}, unique=True)
+    assert retry['id'] != first['id'] and retry['status'] == 'queued'
+    # Without unique every submit is a new job
+    assert queue.submit('convert', {'source': "a.exr", 'target': "a"})['id'] != retry['id']
+
+
+def test_stale_running_jobs_are_requeued(queue):
+    queue.register('convert', _succeed)
+    stale = queue.submit('convert', {'value': 1})
+    alive = queue.submit('convert', {'value': 2})
+    queue._claim()
+    queue._claim()
+    queue._update(stale['id'], heartbeat_at=time.time() - 301)
+
+    queue._recover_and_purge()
+
+    assert queue.get(stale['id'])['status'] == 'queued'
+    assert queue.get(stale['id'])['worker'] is None
+    assert queue.get(alive['id'])['status'] == 'running'
+    assert queue._claim()['id'] == stale['id']
+
+
+def test_running_queue_requeues_jobs_that_go_stale_after_start(tmp_path, monkeypatch):
+    queue = JobQueue(tmp_path / "jobs.sqlite3", workers=0, stale_after=0.05)
+    queue.register('convert', _succeed)
+    real_sleep = asyncio.sleep
+
+    async def sleep(seconds):
+        # Maintenance waits at least a second; shortened so the test runs quickly
+        await real_sleep(0.05)
+    monkeypatch.setattr(asyncio, 'sleep', sleep)
+
+    async def scenario():
+        await queue.start()
+        # Claimed by a worker that then dies without heartbeating
+        job = queue.submit('convert', {'value': 1})
+        queue._claim()
+        queue._update(job['id'], heartbeat_at=time.time() - 1)
+        await real_sleep(0.3)
+        await queue.stop()
+        return job
+
+    job = asyncio.run(scenario())
+    assert queue.get(job['id'])['status'] == 'queued'
+
+
+def test_finished_jobs_are_purged_after_retention(queue):
+    queue.register('convert', _succeed)
+    old = queue.submit('convert', {'value': 1})
+    recent = queue.submit('convert', {'value': 2})
+    queue._update(old['id'], status='succeeded',
+                  finished_at=(datetime.now() - timedelta(days=queue.retention_days + 1)).isoformat())
+    queue._update(recent['id'], status='failed', finished_at=datetime.now().isoformat())
+
+    queue._recover_and_purge()
+
+    assert queue.get(old['id']) is None
+    assert queue.get(recent['id'])['status'] == 'failed'
@@ -0,0 +1,115 @@
+# tests/backend/test_json_stream.py - Streamed NDJSON / JSON array parsing, malformed bodies and chunk splits
+import asyncio
+
+import pytest
+
+from backend.core.json_stream import iter_json_items, JSONStreamError
+
+
+async def _chunks(parts):
+    for part in parts:
+        yield part
+
+
+def _parse(parts, **kwargs):
+    async def collect():
+        return [item async for item in iter_json_items(_chunks(parts), **kwargs)]
+    return asyncio.run(collect())
+
+
+def _items(body, **kwargs):
+    return [item for _, item, _ in _parse([body.encode()], **kwargs)]
+
+
+def _splits(body):
+    """Every way of cutting the body into two chunks, plus one byte per chunk"""
+    data = body.encode()
+    for cut in range(len(data) + 1):
+        yield [data[:cut], data[cut:]]
+    yield [data[i:i + 1] for i in range(len(data))]
+
+
+VALID = [
+    ('[]', []),
+    (' \n[ ]\n', []),
+    ('[{"a":1}]', [{"a": 1}]),
+    ('[{"a":1},{"b":2}]', [{"a": 1}, {"b": 2}]),
+    ('[ {"a": [1, {"b": "]}"}]} ,\n{"c": null} ]', [{"a": [1, {"b": "]}"}]}, {"c": None}]),
+    ('[12,-3.5e2,true,false,null]', [12, -350.0, True, False, None]),
+    ('["a\\"]b", "c\\\\", "é"]', ['a"]b', 'c\\', 'é']),
+    ('[[1,2],[]]', [[1, 2], []]),
+    ('﻿[{"a":1}]', [{"a": 1}]),
+    ('{"a":1}\n{"b":2}\n', [{"a": 1}, {"b": 2}]),
+    ('{"a":1}\r\n\n{"b":"x\\ny"}', [{"a": 1}, {"b": "x\ny"}]),
+]
+
+
+@pytest.mark.parametrize("body, expected", VALID)
+def test_valid_bodies(body, expected):
+    results = _parse([body.encode()])
+    assert [item for _, item, _ in results] == expected
+    assert [index for index, _, _ in results] == list(range(len(expected)))
+    assert all(error is None for _, _, error in results)
+
+
+@pytest.mark.parametrize("body, expected", VALID)
+def test_chunk_boundaries_do_not_change_the_items(body, expected):
+    for parts in _splits(body):
+        assert [item for _, item, _ in _parse(parts)] == expected, parts
+
+
+@pytest.mark.parametrize("body, yielded", [
+    # Missing, doubled, leading and trailing commas
+    ('[{"a":1}{"b":2}]', [{"a": 1}]),
+    ('[1 2]', [1]),
+    ('[,,{}]', []),
+    ('[,1]', []),
+    ('[1,,2]', [1]),
+    ('[1,]', [1]),
+    # Malformed items
+    ('[{"a":}]', []),
+    ('[1x]', []),
+    ('[tru]', []),
+    ('[{"a":1]', []),
+    # Truncated
+    ('[', []),
+    ('[1', []),
+    ('[{"a":1}', [{"a": 1}]),
+    ('[{"a":1},', [{"a": 1}]),
+    ('["abc', []),
+    # Trailing data
+    ('[1] 2', [1]),
+])
+def test_malformed_arrays_raise_after_the_items_before_the_error(body, yielded):
+    for parts in _splits(body):
+        items = []
+
+        async def collect():
+            async for _, item, _ in iter_json_items(_chunks(parts)):
+                items.append(item)
+        with pytest.raises(JSONStreamError):
+            asyncio.run(collect())
+        assert items == yielded, parts
+
+
+def test_malformed_ndjson_lines_are_reported_and_skipped():
+    results = _parse([b'{"a":1}\n{"a":\n\n[1]\n'])
+    assert [(index, item) for index, item, _ in results] == [(0, {"a": 1}), (1, None), (2, [1])]
+    assert results[1][2].startswith("Invalid JSON")
+
+
+def test_scalar_split_across_chunks_is_one_item():
+    assert [item for _, item, _ in _parse([b'[1', b'2', b'3,4', b'5]'])] == [123, 45]
+
+
+def test_invalid_utf8_raises():
+    with pytest.raises(JSONStreamError):
+        _parse([b'["\xff"]'])
+
+
+@pytest.mark.parametrize("body", ['[{"a": "' + 'x' * 100 + '"}]', '{"a": "' + 'x' * 100 + '"}\n'])
+def test_oversized_item_raises(body):
+    data = body.encode()
+    with pytest.raises(JSONStreamError):
+        _parse([data[i:i + 10] for i in range(0, len(data), 10)], max_item_bytes=50)
+    assert _items(body, max_item_bytes=50)
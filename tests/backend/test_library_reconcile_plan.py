@@ -0,0 +1,60 @@
+# tests/backend/test_library_reconcile_plan.py - Reconcile diff compares folders, not path spellings
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from backend.core import asset_paths
+from backend.core.library_reconcile import LibraryReconciler
+
+NETWORK_ROOT = "/net/library/atlaslib/"
+
+
+class FakeQueries:
+    def __init__(self, documents):
+        self.documents = documents
+
+    def iter_sync_state(self, batch_size=1000):
+        yield from self.documents
+
+
+@pytest.fixture
+def reconciler(library, tmp_path, monkeypatch):
+    """LibraryReconciler over the scratch library, and the metadata hash of each asset"""
+    sync, _ = library
+    # tmp_path stands in for the container mount of the network library
+    monkeypatch.setattr(asset_paths, 'NETWORK_LIBRARY_ROOT', NETWORK_ROOT)
+    monkeypatch.setattr(asset_paths, 'CONTAINER_LIBRARY_ROOT', f"{tmp_path}/")
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        candidates, _ = sync.scan(pool)
+    hashes = dict(sync.fingerprint(candidate) for candidate in candidates)
+    return LibraryReconciler(sync), hashes
+
+
+def _document(key, path, hashes):
+    return {"key": key, "name": key, "path": path, "metadata_hash": hashes.get(key)}
+
+
+@pytest.mark.parametrize('library', [("Chair", "Table", "Lamp", "Stool")], indirect=True)
+def test_plan_treats_path_spellings_of_one_folder_as_unchanged(reconciler, tmp_path):
+    reconciler, hashes = reconciler
+    documents = [
+        # Uploads store the network form, the Houdini exporter the container form
+        _document("Chair", f"{NETWORK_ROOT}3D/Assets/Props/Chair", hashes),
+        _document("Table", f"{tmp_path}/3D/Assets/Props/Table/", hashes),
+        _document("Lamp", f"{NETWORK_ROOT}3D//Assets/Props/Lamp/", hashes),
+        # Really moved: the document still names another folder
+        _document("Stool", f"{NETWORK_ROOT}3D/Assets/Furniture/Stool", hashes),
+        # Folder gone, stored in network form: orphaned, not untracked
+        _document("Sofa", f"{NETWORK_ROOT}3D/Assets/Props/Sofa", hashes),
+        # Outside the synced folders
+        _document("Desk", "/mnt/elsewhere/Desk", hashes),
+    ]
+
+    plan = reconciler.plan(FakeQueries(documents))
+
+    assert plan.unchanged == 3
+    assert [entry['key'] for entry in plan.moved] == ["Stool"]
+    assert plan.moved[0]['path'] == str(tmp_path / "3D" / "Assets" / "Props" / "Stool")
+    assert [entry['key'] for entry in plan.orphaned] == ["Sofa"]
+    assert [entry['key'] for entry in plan.untracked] == ["Desk"]
+    assert plan.added == [] and plan.changed == []
@@ -0,0 +1,92 @@
+# tests/backend/test_library_sync_removals.py - Unreadable or unmounted folders are never synced as deletions
+import errno
+import os
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+
+from backend.core import library_sync
+
+
+def _scan(sync):
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        return sync.scan(pool)
+
+
+def _failing_scandir(monkeypatch, failing_path, error):
+    real_scandir = os.scandir
+
+    def scandir(path):
+        if os.fspath(path) == os.fspath(failing_path):
+            raise OSError(error, os.strerror(error), os.fspath(path))
+        return real_scandir(path)
+    monkeypatch.setattr(os, 'scandir', scandir)
+
+
+def test_scan_finds_asset_folders(library):
+    sync, _ = library
+    candidates, unreadable = _scan(sync)
+    assert sorted(os.path.basename(c['asset_path']) for c in candidates) == ["Chair", "Table"]
+    assert unreadable == []
+
+
+def test_unreadable_subcategory_holds_back_its_removals(library, monkeypatch):
+    sync, roots = library
+    subcategory = roots["3D"] / "Assets" / "Props"
+    _failing_scandir(monkeypatch, subcategory, errno.ESTALE)
+
+    candidates, unreadable = _scan(sync)
+
+    assert candidates == [] and unreadable == [str(subcategory)]
+    vanished = [str(subcategory / name / "metadata.json") for name in ("Chair", "Table")]
+    assert sync.removable(vanished, unreadable) == []
+
+
+def test_missing_metadata_is_removable(library):
+    sync, roots = library
+    metadata = roots["3D"] / "Assets" / "Props" / "Chair" / "metadata.json"
+    metadata.unlink()
+
+    candidates, unreadable = _scan(sync)
+
+    assert [os.path.basename(c['asset_path']) for c in candidates] == ["Table"]
+    assert sync.removable([str(metadata)], unreadable) == [str(metadata)]
+
+
+def test_unmounted_library_holds_back_removals(library):
+    sync, roots = library
+    metadata = str(roots["3D"] / "Assets" / "Props" / "Chair" / "metadata.json")
+    # An empty mount point is left behind when the share is not mounted
+    os.rename(roots["3D"] / "Assets", roots["3D"].parent / "Assets.unmounted")
+
+    assert sync.removable([metadata], []) == []
+
+
+def test_stat_errors_other_than_missing_are_raised(library, monkeypatch):
+    sync, roots = library
+    real_stat = os.stat
+
+    def stat(path, *args, **kwargs):
+        if os.fspath(path).endswith("metadata.json"):
+            raise OSError(errno.EIO, os.strerror(errno.EIO), path)
+        return real_stat(path, *args, **kwargs)
+    monkeypatch.setattr(os, 'stat', stat)
+
+    with pytest.raises(OSError):
+        sync._candidate("3D", "Assets", "Props", str(roots["3D"] / "Assets" / "Props" / "Chair"))
+    candidates, unreadable = _scan(sync)
+    assert candidates == [] and len(unreadable) == 2
+
+
+def test_configured_network_root_resolves_to_container_mount(tmp_path, monkeypatch):
+    mount = tmp_path / "app" / "assets" / "3D"
+    mount.mkdir(parents=True)
+    network = str(tmp_path / "net" / "3D")
+    monkeypatch.setattr(library_sync, '_resolved_roots', {})
+    monkeypatch.setattr(library_sync, 'to_container_path', lambda path: str(mount) if path == network else path)
+    assert library_sync.resolve_library_root(network) == mount
+
+    missing = str(tmp_path / "net" / "2D")
+    assert library_sync.resolve_library_root(missing) == Path(missing)
+    assert missing not in library_sync._resolved_roots
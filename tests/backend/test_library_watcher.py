@@ -0,0 +1,77 @@
+# tests/backend/test_library_watcher.py - Debounced change batches wait without spinning
+import threading
+import time
+
+from backend.core.library_watcher import ChangeBatch
+
+
+class _CountingEvent(threading.Event):
+    def __init__(self):
+        super().__init__()
+        self.waits = 0
+
+    def wait(self, timeout=None):
+        self.waits += 1
+        return super().wait(timeout)
+
+
+def _counting_batch(debounce, max_delay):
+    batch = ChangeBatch(debounce=debounce, max_delay=max_delay)
+    batch._event = _CountingEvent()
+    return batch
+
+
+def test_pending_batch_waits_out_the_debounce_without_spinning():
+    batch = _counting_batch(debounce=0.3, max_delay=30.0)
+    batch.add("/library/Chair")
+
+    started = time.monotonic()
+    cpu_started = time.process_time()
+    ready = batch.wait_ready(threading.Event())
+
+    assert ready == ({"/library/Chair"}, set())
+    assert time.monotonic() - started >= 0.3
+    assert batch._event.waits <= 3
+    assert time.process_time() - cpu_started < 0.1
+
+
+def test_max_delay_flushes_a_batch_that_keeps_changing():
+    batch = _counting_batch(debounce=0.2, max_delay=0.5)
+    stop = threading.Event()
+    result = {}
+
+    def wait():
+        result['ready'] = batch.wait_ready(stop)
+        result['at'] = time.monotonic()
+
+    waiter = threading.Thread(target=wait)
+    started = time.monotonic()
+    batch.add("/library/Chair")
+    waiter.start()
+    while waiter.is_alive() and time.monotonic() - started < 2.0:
+        batch.add("/library/Table")
+        time.sleep(0.05)
+    stop.set()
+    waiter.join()
+
+    assert result['ready'] == ({"/library/Chair", "/library/Table"}, set())
+    assert 0.5 <= result['at'] - started < 1.0
+    # One wake per add() plus the timed waits, never a spin
+    assert batch._event.waits < 40
+
+
+def test_thumbnail_only_folders_are_refreshed_unless_also_changed():
+    batch = ChangeBatch(debounce=0.0, max_delay=1.0)
+    batch.add("/library/Chair", thumbnail_only=True)
+    batch.add("/library/Table", thumbnail_only=True)
+    batch.add("/library/Table")
+
+    assert batch.wait_ready(threading.Event()) == ({"/library/Table"}, {"/library/Chair"})
+
+
+def test_stop_ends_an_idle_wait():
+    batch = ChangeBatch(debounce=0.1, max_delay=1.0)
+    stop = threading.Event()
+    stop.set()
+
+    assert batch.wait_ready(stop) is None
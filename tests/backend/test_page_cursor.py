@@ -0,0 +1,43 @@
+# tests/backend/test_page_cursor.py - Keyset page cursors used by GET /api/v1/assets
+import base64
+import json
+
+import pytest
+
+pytest.importorskip("arango")
+
+from backend.assetlibrary.database.arango_queries import encode_page_cursor, decode_page_cursor  # noqa: E402
+
+
+def _raw_cursor(value) -> str:
+    return base64.urlsafe_b64encode(json.dumps(value).encode('utf-8')).decode('ascii')
+
+
+@pytest.mark.parametrize("asset", [
+    {'_key': "3D123456789AA001", 'created_at': "2026-01-02T03:04:05.678901"},
+    {'_key': "A1B2C3D4E5", 'created_at': None},
+    {'_key': "A1B2C3D4E5"},
+    {'_key': "???>>>~~~", 'created_at': "2026-01-02T03:04:05"},
+])
+def test_cursor_round_trip(asset):
+    cursor = encode_page_cursor(asset)
+    assert set(cursor) <= set("ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789-_=")
+    assert decode_page_cursor(cursor) == (asset.get('created_at'), asset['_key'])
+
+
+@pytest.mark.parametrize("cursor", [
+    "",
+    "not a cursor",
+    "%%%%",
+    "é",
+    base64.urlsafe_b64encode(b"not json").decode('ascii'),
+    _raw_cursor(["2026-01-02T03:04:05"]),
+    _raw_cursor(["2026-01-02T03:04:05", "KEY", "extra"]),
+    _raw_cursor(["2026-01-02T03:04:05", 42]),
+    _raw_cursor(["2026-01-02T03:04:05", None]),
+    _raw_cursor("KEY"),
+])
+def test_malformed_cursor_raises_value_error(cursor):
+    # list_assets turns the ValueError into a 400
+    with pytest.raises(ValueError, match="Invalid page cursor"):
+        decode_page_cursor(cursor)
@@ -0,0 +1,142 @@
+# tests/backend/test_query_cache.py - Query result cache keys, tag invalidation and the generation guard
+import asyncio
+import json
+
+import pytest
+
+from backend.core import query_cache as query_cache_module
+from backend.core.query_cache import (
+    QueryCache, LocalQueryStore, normalize_params, asset_tag, scope_tag, STATS_TAG
+)
+
+
+@pytest.mark.parametrize("first, second", [
+    ({"search": "chair", "tags": ["b", "a"]}, {"tags": ["a", "b", "a"], "search": "chair"}),
+    ({"search": "", "category": None, "tags": []}, {}),
+    ({"limit": 100, "cursor": None}, {"limit": 100}),
+])
+def test_equivalent_parameters_share_a_key(first, second):
+    assert normalize_params(first) == normalize_params(second)
+    assert QueryCache.entry_key("assets:list", first) == QueryCache.entry_key("assets:list", second)
+
+
+@pytest.mark.parametrize("first, second", [
+    ({"limit": 100}, {"limit": 50}),
+    ({"category": "Props"}, {"category": "Lights"}),
+    ({"tags": ["a"]}, {"tags": ["a", "b"]}),
+])
+def test_different_parameters_get_different_keys(first, second):
+    assert QueryCache.entry_key("assets:list", first) != QueryCache.entry_key("assets:list", second)
+    assert QueryCache.entry_key("assets:list", first) != QueryCache.entry_key("assets:stats", first)
+
+
+def test_tags():
+    assert asset_tag("A1") == "asset:A1"
+    assert scope_tag("Props") == "scope:Props"
+    assert scope_tag(None) == scope_tag("") == "scope:*"
+
+
+def test_store_and_lookup():
+    store = LocalQueryStore(max_entries=10, ttl=60)
+    value, generation = store.lookup("k")
+    assert value is None
+    assert store.store("k", b"body", ["asset:A", "scope:*"], generation)
+    assert store.lookup("k")[0] == b"body"
+
+
+def test_invalidate_drops_only_entries_with_the_tags():
+    store = LocalQueryStore(max_entries=10, ttl=60)
+    generation = store.lookup("a")[1]
+    store.store("a", b"A", [asset_tag("A"), scope_tag("Props")], generation)
+    store.store("b", b"B", [asset_tag("B"), scope_tag("Lights")], generation)
+    store.store("stats", b"S", [STATS_TAG], generation)
+
+    assert store.invalidate([asset_tag("A"), STATS_TAG]) == 2
+    assert store.lookup("a")[0] is None
+    assert store.lookup("stats")[0] is None
+    assert store.lookup("b")[0] == b"B"
+    assert store.invalidate([scope_tag("Props")]) == 0
+
+
+def test_result_computed_before_an_invalidation_is_not_stored():
+    store = LocalQueryStore(max_entries=10, ttl=60)
+    _, generation = store.lookup("k")
+    # A write lands while the result is being computed
+    store.invalidate([asset_tag("A")])
+    assert not store.store("k", b"stale", [asset_tag("A")], generation)
+    assert store.lookup("k")[0] is None
+
+
+def test_entries_expire_and_are_evicted_least_recently_used(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(query_cache_module.time, 'monotonic', lambda: now[0])
+    store = LocalQueryStore(max_entries=2, ttl=60)
+    generation = store.lookup("a")[1]
+    for key in ("a", "b"):
+        store.store(key, key.encode(), ["scope:*"], generation)
+    store.lookup("a")
+    store.store("c", b"c", ["scope:*"], generation)
+    assert store.lookup("b")[0] is None
+    assert store.lookup("a")[0] == b"a"
+
+    now[0] += 61
+    assert store.lookup("a")[0] is None
+    assert store.get_stats()['entries'] == 1
+
+
+def test_invalidate_all_drops_everything_and_blocks_pending_stores():
+    store = LocalQueryStore(max_entries=10, ttl=60)
+    generation = store.lookup("a")[1]
+    store.store("a", b"A", ["scope:*"], generation)
+    assert store.invalidate_all() == 1
+    assert store.lookup("a")[0] is None
+    assert not store.store("b", b"B", ["scope:*"], generation)
+
+
+@pytest.fixture
+def cache():
+    cache = QueryCache(ttl=60, local_max_entries=10)
+    cache.store = LocalQueryStore(cache.local_max_entries, cache.ttl)
+    return cache
+
+
+def _cached(cache, params, content, tags):
+    calls = []
+
+    async def compute():
+        calls.append(1)
+        return content, tags
+    body, hit = asyncio.run(cache.cached_json("assets:list", params, compute))
+    return json.loads(body), hit, len(calls)
+
+
+def test_cached_json_hits_until_a_tag_is_invalidated(cache):
+    page = {"items": [{"id": "A"}], "total": 1}
+    tags = [scope_tag("Props"), asset_tag("A")]
+    assert _cached(cache, {"category": "Props"}, page, tags) == (page, False, 1)
+    assert _cached(cache, {"category": "Props"}, page, tags) == (page, True, 0)
+
+    # An edit of a listed asset that does not change list membership
+    cache.invalidate_assets(["A"], membership=False)
+    assert _cached(cache, {"category": "Props"}, page, tags)[1] is False
+
+
+def test_membership_changes_drop_category_and_unfiltered_lists(cache):
+    props = {"items": [], "total": 0}
+    tags = {"props": [scope_tag("Props")], "all": [scope_tag()], "lights": [scope_tag("Lights")],
+            "stats": [STATS_TAG]}
+    params = {"props": {"category": "Props"}, "all": {}, "lights": {"category": "Lights"}, "stats": {"stats": 1}}
+    for name in tags:
+        _cached(cache, params[name], props, tags[name])
+
+    cache.invalidate_assets(["NEW"], ["Props"])
+
+    assert {name: _cached(cache, params[name], props, tags[name])[1] for name in tags} == {
+        "props": False, "all": False, "lights": True, "stats": False
+    }
+
+
+def test_cache_without_a_store_computes_every_time():
+    cache = QueryCache()
+    assert _cached(cache, {}, {"total": 0}, []) == ({"total": 0}, False, 1)
+    assert cache.invalidate_assets(["A"]) == 0
@@ -0,0 +1,129 @@
+# tests/backend/test_sprite_sheets.py - Sprite sheet layout limits, manifest freshness and off-loop builds
+import asyncio
+import os
+
+import pytest
+
+from backend.core import sprite_sheets
+from backend.core.sprite_sheets import (
+    sprite_layout, cached_sprite_sheet, plan_sprite_sheet, render_sprite_sheet, get_sprite_sheet, SPRITE_FORMATS
+)
+
+
+@pytest.mark.parametrize("frame_count, tile_width, tile_height, expected", [
+    (1, 256, 256, (1, 1, 256, 256)),
+    (10, 256, 144, (4, 3, 256, 144)),
+    (256, 1024, 1024, (16, 16, 1023, 1023)),
+    # 300 frames at 1024 px would make an 18 x 17 grid 18432 px wide
+    (300, 1024, 1024, (18, 17, 910, 910)),
+    (300, 1024, 576, (18, 17, 910, 511)),
+    (2000, 32, 32, (45, 45, 32, 32)),
+])
+def test_layout_stays_within_the_webp_limit(frame_count, tile_width, tile_height, expected):
+    limit = SPRITE_FORMATS['webp']['max_dimension']
+    columns, rows, width, height = sprite_layout(frame_count, tile_width, tile_height, limit)
+    assert (columns, rows, width, height) == expected
+    assert columns * rows >= frame_count
+    assert columns * width <= limit and rows * height <= limit
+
+
+@pytest.fixture
+def frames(tmp_path, monkeypatch):
+    Image = pytest.importorskip("PIL.Image")
+    monkeypatch.setattr(sprite_sheets, 'FALLBACK_SPRITE_ROOT', tmp_path / "fallback")
+    folder = tmp_path / "Asset" / "Thumbnail"
+    folder.mkdir(parents=True)
+    paths = []
+    for number in range(1, 11):
+        path = folder / f"thumb.{number:04d}.png"
+        Image.new("RGB", (160, 90), (number * 20, 0, 0)).save(path)
+        paths.append(path)
+    return paths
+
+
+def _build(frames, tile_size=64, image_format='webp'):
+    plan = plan_sprite_sheet("A1", frames, frames[0].parent, tile_size, image_format)
+    return render_sprite_sheet(plan, frames)
+
+
+def test_sheet_is_built_next_to_the_thumbnails_and_then_cached(frames):
+    from PIL import Image
+    assert cached_sprite_sheet("A1", frames, frames[0].parent, 64) is None
+
+    manifest = _build(frames)
+    assert (manifest['columns'], manifest['rows'], manifest['tile_width'], manifest['tile_height']) == (4, 3, 64, 36)
+    assert [entry['frame_number'] for entry in manifest['frames']] == list(range(1, 11))
+    assert manifest['frames'][5]['x'] == 64 and manifest['frames'][5]['y'] == 36
+    with Image.open(manifest['sprite_path']) as sheet:
+        assert sheet.size == (256, 108)
+    assert os.path.dirname(manifest['sprite_path']).endswith("ThumbnailSprite")
+
+    assert cached_sprite_sheet("A1", frames, frames[0].parent, 64) == manifest
+    assert cached_sprite_sheet("A1", frames, frames[0].parent, 128) is None
+    assert cached_sprite_sheet("A1", frames, frames[0].parent, 64, 'jpeg') is None
+
+
+def test_frame_rewritten_in_place_invalidates_the_sheet(frames):
+    from PIL import Image
+    _build(frames)
+    folder_mtime = frames[0].parent.stat().st_mtime_ns
+    Image.new("RGB", (160, 90), (0, 255, 0)).save(frames[3])
+    os.utime(frames[3], ns=(1_700_000_000_000_000_000,) * 2)
+    assert frames[0].parent.stat().st_mtime_ns == folder_mtime
+    assert cached_sprite_sheet("A1", frames, frames[0].parent, 64) is None
+
+
+def test_oversized_sheet_shrinks_tiles_to_the_format_limit(frames, monkeypatch):
+    from PIL import Image
+    monkeypatch.setitem(SPRITE_FORMATS, 'webp', dict(SPRITE_FORMATS['webp'], max_dimension=200))
+    manifest = _build(frames, tile_size=256)
+    assert manifest['sheet_width'] <= 200 and manifest['sheet_height'] <= 200
+    assert manifest['tile_width'] == 50
+    with Image.open(manifest['sprite_path']) as sheet:
+        assert sheet.size == (manifest['sheet_width'], manifest['sheet_height'])
+
+
+def test_plan_reserves_the_sheet_and_one_decoded_frame(frames):
+    plan = plan_sprite_sheet("A1", frames, frames[0].parent, 64, 'jpeg')
+    assert plan['memory_bytes'] == 256 * 108 * 4 + 160 * 90 * 4 * 2
+    assert plan['sprite_file'] == "sprite_64_jpeg.jpg"
+
+
+def test_get_sprite_sheet_builds_once_then_reads_the_cached_manifest(frames, monkeypatch):
+    from backend.core import executors
+    calls = []
+
+    async def run_cpu(func, *args):
+        calls.append(func)
+        return func(*args)
+    monkeypatch.setattr(executors, 'run_cpu', run_cpu)
+
+    async def build_twice():
+        return await asyncio.gather(*(get_sprite_sheet("A1", frames, frames[0].parent, 64) for _ in range(2)))
+    first, second = asyncio.run(build_twice())
+    assert first == second
+    assert calls == [render_sprite_sheet]
+    assert sprite_sheets._build_locks == {}
+
+
+def test_build_lock_entry_outlives_a_failed_build_only_while_waited_on():
+    async def fail_and_wait():
+        holder_in = asyncio.Event()
+
+        async def failing_build():
+            async with sprite_sheets._build_lock("A1:64:webp"):
+                holder_in.set()
+                await asyncio.sleep(0)
+                raise RuntimeError("decode failed")
+
+        async def waiter():
+            await holder_in.wait()
+            async with sprite_sheets._build_lock("A1:64:webp"):
+                return len(sprite_sheets._build_locks)
+
+        return await asyncio.gather(failing_build(), waiter(), return_exceptions=True)
+
+    failed, locks_seen_by_waiter = asyncio.run(fail_and_wait())
+    assert isinstance(failed, RuntimeError)
+    assert locks_seen_by_waiter == 1
+    assert sprite_sheets._build_locks == {}
@@ -0,0 +1,92 @@
+# tests/backend/test_texture_pyramid.py - Zoom pyramid level sizes, tile addressing and manifests
+import os
+from pathlib import Path
+
+import pytest
+
+from backend.core.texture_pyramid import (
+    level_sizes, tile_path, pyramid_dir, build_pyramid, load_manifest, MIN_LEVEL_SIZE, PYRAMID_FOLDER
+)
+
+
+@pytest.mark.parametrize("width, height, expected", [
+    (256, 256, [(256, 256)]),
+    (200, 100, [(200, 100)]),
+    (257, 100, [(257, 100), (128, 50)]),
+    (1024, 512, [(1024, 512), (512, 256), (256, 128)]),
+    (4097, 4097, [(4097, 4097), (2048, 2048), (1024, 1024), (512, 512), (256, 256)]),
+    # Very thin images stop before a side reaches zero
+    (4096, 1, [(4096, 1)]),
+    (4096, 3, [(4096, 3), (2048, 1)]),
+])
+def test_level_sizes(width, height, expected):
+    sizes = level_sizes(width, height)
+    assert sizes == expected
+    assert max(sizes[-1]) <= MIN_LEVEL_SIZE or min(sizes[-1]) < 2
+
+
+MANIFEST = {
+    "format": "webp",
+    "levels": [
+        {"level": 0, "width": 1000, "height": 600, "columns": 2, "rows": 2},
+        {"level": 1, "width": 500, "height": 300, "columns": 1, "rows": 1}
+    ]
+}
+
+
+@pytest.mark.parametrize("level, column, row, expected", [
+    (0, 0, 0, "0/0_0.webp"),
+    (0, 1, 1, "0/1_1.webp"),
+    (1, 0, 0, "1/0_0.webp"),
+    (0, 2, 0, None),
+    (0, 0, 2, None),
+    (1, 1, 0, None),
+    (2, 0, 0, None),
+    (-1, 0, 0, None),
+    (0, -1, 0, None),
+])
+def test_tile_path(level, column, row, expected):
+    path = tile_path("/pyramids/wood", MANIFEST, level, column, row)
+    assert path == (Path("/pyramids/wood") / expected if expected else None)
+
+
+def test_pyramid_dir_is_per_source_under_the_asset_folder():
+    assert pyramid_dir("/lib/Textures/A1", "/lib/Textures/A1/Asset/wood_BC.exr") == \
+        Path("/lib/Textures/A1") / PYRAMID_FOLDER / "wood_BC"
+
+
+@pytest.fixture
+def texture(tmp_path):
+    Image = pytest.importorskip("PIL.Image")
+    pytest.importorskip("numpy")
+    path = tmp_path / "Asset" / "wood.png"
+    path.parent.mkdir()
+    Image.new("RGB", (600, 300), (200, 120, 40)).save(path)
+    return path
+
+
+def test_build_pyramid_writes_every_tile_and_a_current_manifest(texture, tmp_path):
+    target = pyramid_dir(tmp_path, texture)
+    manifest = build_pyramid(texture, target, tile_size=256)
+
+    assert (manifest['width'], manifest['height']) == (600, 300)
+    assert [(level['width'], level['height']) for level in manifest['levels']] == [(600, 300), (300, 150), (150, 75)]
+    for level, info in enumerate(manifest['levels']):
+        for column in range(info['columns']):
+            for row in range(info['rows']):
+                assert tile_path(target, manifest, level, column, row).is_file()
+    assert not list(tmp_path.glob(f"{PYRAMID_FOLDER}/.*.tmp"))
+
+    loaded, watched = load_manifest(target, texture)
+    assert loaded == manifest
+    assert texture in watched
+
+
+def test_manifest_is_stale_once_the_source_changes(texture, tmp_path):
+    from PIL import Image
+    target = pyramid_dir(tmp_path, texture)
+    build_pyramid(texture, target, tile_size=256)
+    Image.new("RGB", (300, 300)).save(texture)
+    os.utime(texture, (1_700_000_000, 1_700_000_000))
+    assert load_manifest(target, texture)[0] is None
+    assert load_manifest(tmp_path / "missing", texture)[0] is None
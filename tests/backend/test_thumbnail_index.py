@@ -0,0 +1,59 @@
+# tests/backend/test_thumbnail_index.py - Thumbnail index: stored entries, page resolution, bounded local cache
+import pytest
+
+from backend.core import asset_paths
+from backend.core.asset_paths import ThumbnailIndex, THUMBNAIL_INDEX_FIELD
+
+
+@pytest.fixture
+def probes(monkeypatch):
+    """Keys resolved against the filesystem, in order"""
+    calls = []
+
+    def resolve(asset_data):
+        calls.append(asset_data['_key'])
+        return {'path': f"/thumbs/{asset_data['_key']}.png", 'mtime': 1.0, 'version': "1-1", 'indexed_at': None}
+    monkeypatch.setattr(asset_paths, 'resolve_thumbnail', resolve)
+    return calls
+
+
+def test_stored_entries_never_probe(probes):
+    stored = {'path': "/thumbs/A.png", 'mtime': 1.0, 'version': "1-1"}
+    assert ThumbnailIndex().lookup({'_key': "A", THUMBNAIL_INDEX_FIELD: stored}) is stored
+    assert probes == []
+
+
+def test_resolve_missing_attaches_entries_to_the_page(probes):
+    index = ThumbnailIndex()
+    stored = {'path': None, 'mtime': None, 'version': None}
+    page = [{'_key': "A"}, {'_key': "B", THUMBNAIL_INDEX_FIELD: stored}, {'_key': "C"}]
+
+    assert index.resolve_missing(page) == 2
+    assert probes == ["A", "C"]
+    assert page[0][THUMBNAIL_INDEX_FIELD]['path'] == "/thumbs/A.png"
+    assert page[1][THUMBNAIL_INDEX_FIELD] is stored
+
+    # Later pages with the same legacy documents are answered from the local cache
+    index.resolve_missing([{'_key': "A"}])
+    assert probes == ["A", "C"]
+
+
+def test_local_entries_are_bounded(probes):
+    index = ThumbnailIndex(max_entries=2)
+    for key in ("A", "B", "C"):
+        index.lookup({'_key': key})
+    index.lookup({'_key': "A"})
+    assert probes == ["A", "B", "C", "A"]
+    assert index.get_stats()['local_entries'] == 2
+
+
+def test_local_entries_expire(probes, monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(asset_paths.time, 'monotonic', lambda: now[0])
+    index = ThumbnailIndex(ttl=60)
+    index.lookup({'_key': "A"})
+    now[0] += 59
+    index.lookup({'_key': "A"})
+    now[0] += 2
+    index.lookup({'_key': "A"})
+    assert probes == ["A", "A"]